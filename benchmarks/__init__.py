@@ -0,0 +1,7 @@
+"""
+PPT Parser 性能基准
+提供合成测试数据生成器和各项性能基准脚本
+
+运行方式（在项目根目录）:
+    python -m benchmarks.bench_fused_pipeline
+"""
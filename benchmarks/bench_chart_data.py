@@ -0,0 +1,66 @@
+"""
+图表数据处理性能基准
+测量构建含有大型图表数据的文档、以及写出其图表部件的耗时
+
+运行方式:
+    python -m benchmarks.bench_chart_data [--points 1000000] [--max-points 2000]
+"""
+
+import argparse
+import asyncio
+import io
+import math
+import time
+
+from ppt_parser.core import ChartDataProcessor, DocumentBuilder
+from ppt_parser.core.chart_data import HAS_NUMPY
+
+
+def chart_deck(points: int) -> dict:
+    """只有一个折线图的文档数据"""
+    data = [math.sin(index / 1000) + (index % 97) / 97 for index in range(points)]
+    return {
+        "title": "监控",
+        "slides": [
+            {
+                "title": "页",
+                "elements": [
+                    {
+                        "type": "chart",
+                        "content": {"type": "line", "data": data},
+                        "position": {"x": 0, "y": 0},
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def measure(builder: DocumentBuilder, data: dict) -> tuple:
+    """返回构建和写出的耗时（秒）"""
+    start = time.perf_counter()
+    document = asyncio.run(builder.build_document(data))
+    built = time.perf_counter()
+    document.save(io.BytesIO())
+    return built - start, time.perf_counter() - built
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="图表数据处理性能基准")
+    parser.add_argument("--points", type=int, default=1_000_000, help="数据点数量")
+    parser.add_argument("--max-points", type=int, default=2000, help="降采样目标点数")
+    args = parser.parse_args()
+
+    data = chart_deck(args.points)
+    print(f"数据点: {args.points}, NumPy: {'可用' if HAS_NUMPY else '不可用'}")
+
+    build, write = measure(DocumentBuilder(), data)
+    print(f"原始列表:    构建 {build * 1000:8.1f}ms  写出 {write * 1000:8.1f}ms")
+    for method in ("lttb", "minmax"):
+        processor = ChartDataProcessor(max_points=args.max_points, method=method)
+        build, write = measure(DocumentBuilder(chart_data=processor), data)
+        print(f"{method:6s}降采样: 构建 {build * 1000:8.1f}ms  写出 {write * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
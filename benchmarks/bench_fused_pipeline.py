@@ -0,0 +1,60 @@
+"""
+融合解析管道性能基准
+对比默认流程与融合模式的解析耗时
+
+运行方式:
+    python -m benchmarks.bench_fused_pipeline [--slides 2000] [--elements 10]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from ppt_parser.core import ParserEngine
+from ppt_parser.plugins import JSONPlugin
+from .deck_generator import generate_deck_json
+
+
+def create_engine(fused: bool) -> ParserEngine:
+    """创建注册了JSON插件的解析引擎"""
+    engine = ParserEngine(fused=fused)
+    engine.plugin_manager.register_plugin(JSONPlugin())
+    return engine
+
+
+async def measure(engine: ParserEngine, input_data: str, repeat: int) -> List[float]:
+    """测量多次解析的耗时（秒）"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await engine.parse(input_data)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="融合解析管道性能基准")
+    parser.add_argument("--slides", type=int, default=2000, help="幻灯片数量")
+    parser.add_argument("--elements", type=int, default=10, help="每页元素数量")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    args = parser.parse_args()
+
+    input_data = generate_deck_json(args.slides, args.elements)
+    print(
+        f"输入: {args.slides}页 x {args.elements}个元素, "
+        f"{len(input_data.encode('utf-8')) / 1024 / 1024:.1f}MB"
+    )
+
+    default_best = min(
+        asyncio.run(measure(create_engine(False), input_data, args.repeat))
+    )
+    fused_best = min(asyncio.run(measure(create_engine(True), input_data, args.repeat)))
+
+    print(f"默认流程: {default_best * 1000:.1f}ms")
+    print(f"融合模式: {fused_best * 1000:.1f}ms")
+    print(f"加速比:   {default_best / fused_best:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+图片尺寸读取性能基准
+测量首次读取（解析文件头）和缓存命中时每秒可以处理的图片数量
+
+运行方式:
+    python -m benchmarks.bench_image_info [--images 5000]
+"""
+
+import argparse
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+
+from ppt_parser.core import ImageSizeCache
+
+
+def write_images(root: Path, count: int) -> None:
+    """生成PNG和JPEG交替的图片文件，JPEG带有64KB的EXIF段"""
+    for index in range(count):
+        if index % 2:
+            data = (
+                b"\xff\xd8\xff\xe1"
+                + struct.pack(">H", 65535)
+                + os.urandom(65533)
+                + b"\xff\xc0"
+                + struct.pack(">HBHHB", 17, 8, 1080, 1920, 3)
+                + os.urandom(128 * 1024)
+            )
+            (root / f"{index}.jpg").write_bytes(data)
+        else:
+            data = (
+                b"\x89PNG\r\n\x1a\n"
+                + struct.pack(">I4sII", 13, b"IHDR", 1024, 768)
+                + os.urandom(128 * 1024)
+            )
+            (root / f"{index}.png").write_bytes(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="图片尺寸读取性能基准")
+    parser.add_argument("--images", type=int, default=5000, help="图片数量")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        write_images(root, args.images)
+        names = sorted(os.listdir(root))
+        cache = ImageSizeCache(media_root=root)
+
+        start = time.perf_counter()
+        for name in names:
+            cache.info(name)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in names:
+            cache.info(name)
+        warm = time.perf_counter() - start
+
+    print(f"图片: {args.images}个（PNG/JPEG各半，每个约130KB）")
+    print(f"首次读取: {args.images / cold:10.0f}个/秒")
+    print(f"缓存命中: {args.images / warm:10.0f}个/秒")
+
+
+if __name__ == "__main__":
+    main()
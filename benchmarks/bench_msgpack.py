@@ -0,0 +1,126 @@
+"""
+MessagePack输入性能基准
+在不同规模的合成文档上对比MessagePack与JSON的数据大小、编码耗时、解码耗时
+以及通过引擎完整解析的耗时
+
+运行方式:
+    python -m benchmarks.bench_msgpack [--slides 100 2000] [--elements 10]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from ppt_parser.core import ParserEngine
+from ppt_parser.plugins import JSONPlugin, MessagePackPlugin
+from ppt_parser.plugins import json_backends, msgpack_codec
+from .deck_generator import generate_deck
+
+
+def best_of(function: Callable[[], Any], repeat: int) -> float:
+    """多次运行的最短耗时（毫秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def encoders() -> List[Tuple[str, Callable[[Any], bytes]]]:
+    """上游服务可用的编码方式"""
+    result = [
+        ("json", lambda deck: json.dumps(deck, ensure_ascii=False).encode("utf-8")),
+        ("msgpack/python", msgpack_codec.packb),
+    ]
+    if msgpack_codec.HAS_MSGPACK:
+        result.append(
+            ("msgpack/msgpack", lambda deck: msgpack_codec.msgpack.packb(deck))
+        )
+    return result
+
+
+def decoders(json_data: bytes, msgpack_data: bytes) -> List[Tuple[str, Callable]]:
+    """每个解码后端及其对应的输入"""
+    result = []
+    for name in json_backends.available_backends():
+        backend = json_backends.get_backend(name)
+        result.append(
+            (f"json/{name}", lambda backend=backend: backend.loads(json_data, 10))
+        )
+    for name in msgpack_codec.available_backends():
+        unpack = msgpack_codec.UNPACKERS[name]
+        result.append(
+            (f"msgpack/{name}", lambda unpack=unpack: unpack(msgpack_data, 10))
+        )
+    return result
+
+
+async def parse_timings(
+    json_data: bytes, msgpack_data: bytes, repeat: int
+) -> Dict[str, float]:
+    """通过引擎完整解析（解码、验证和构建）的最短耗时（毫秒）"""
+    timings = {}
+    cases = [
+        (f"json/{backend}", JSONPlugin(backend=backend), json_data)
+        for backend in json_backends.available_backends()
+    ] + [
+        (f"msgpack/{backend}", MessagePackPlugin(backend=backend), msgpack_data)
+        for backend in msgpack_codec.available_backends()
+    ]
+    for name, plugin, data in cases:
+        engine = ParserEngine()
+        engine.plugin_manager.register_plugin(plugin)
+        format_type = plugin.get_format_type()
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await engine.parse(data, format_type)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best * 1000
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MessagePack输入性能基准")
+    parser.add_argument(
+        "--slides", type=int, nargs="+", default=[100, 2000], help="幻灯片数量"
+    )
+    parser.add_argument("--elements", type=int, default=10, help="每页元素数量")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    args = parser.parse_args()
+
+    # 引擎日志会干扰输出
+    ParserEngine().logger.disabled = True
+
+    for slides in args.slides:
+        deck = generate_deck(slides, args.elements)
+        json_data = json.dumps(deck, ensure_ascii=False).encode("utf-8")
+        msgpack_data = msgpack_codec.packb(deck)
+        print(f"\n输入: {slides}页 x {args.elements}个元素")
+        print(
+            f"  大小: JSON {len(json_data) / 1024:.0f}KB, "
+            f"MessagePack {len(msgpack_data) / 1024:.0f}KB "
+            f"({len(msgpack_data) / len(json_data):.0%})"
+        )
+
+        print("  编码:")
+        for name, encode in encoders():
+            elapsed = best_of(lambda: encode(deck), args.repeat)
+            print(f"    {name:18s} {elapsed:8.1f}ms")
+
+        print("  解码（含深度检查）:")
+        for name, decode in decoders(json_data, msgpack_data):
+            elapsed = best_of(decode, args.repeat)
+            print(f"    {name:18s} {elapsed:8.1f}ms")
+
+        print("  完整解析:")
+        timings = asyncio.run(parse_timings(json_data, msgpack_data, args.repeat))
+        for name, elapsed in timings.items():
+            print(f"    {name:18s} {elapsed:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+PPTX写入性能基准
+测量不同工作进程数量下写出PPTX的吞吐量，并检查输出与单进程写出的字节相同
+
+运行方式:
+    python -m benchmarks.bench_pptx_writer [--slides 2000] [--workers 1 2 4]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from ppt_parser.core import ParserEngine
+from ppt_parser.models.document import Document
+from ppt_parser.plugins import JSONPlugin
+from .deck_generator import generate_deck_json
+
+# 合成数据中引用的图片数量（images/1.png ~ images/20.png）
+_IMAGE_COUNT = 20
+
+
+def create_media(root: Path) -> None:
+    """生成合成数据引用的图片文件"""
+    (root / "images").mkdir()
+    for index in range(1, _IMAGE_COUNT + 1):
+        (root / "images" / f"{index}.png").write_bytes(
+            b"\x89PNG\r\n\x1a\n" + os.urandom(16 * 1024)
+        )
+
+
+def measure(
+    document: Document, media_root: Path, workers: int, repeat: int
+) -> Tuple[List[float], bytes]:
+    """测量多次写出的耗时（秒），同时返回最后一次的输出"""
+    timings = []
+    for _ in range(repeat):
+        output = io.BytesIO()
+        start = time.perf_counter()
+        document.save(output, media_root=str(media_root), workers=workers)
+        timings.append(time.perf_counter() - start)
+    return timings, output.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PPTX写入性能基准")
+    parser.add_argument("--slides", type=int, default=2000, help="幻灯片数量")
+    parser.add_argument("--elements", type=int, default=10, help="每页元素数量")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, os.cpu_count() or 1],
+        help="要测量的工作进程数量",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数")
+    args = parser.parse_args()
+
+    engine = ParserEngine()
+    engine.plugin_manager.register_plugin(JSONPlugin())
+    document = asyncio.run(engine.parse(generate_deck_json(args.slides, args.elements)))
+    print(f"输入: {args.slides}页 x {args.elements}个元素, CPU核数: {os.cpu_count()}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        media_root = Path(directory)
+        create_media(media_root)
+
+        serial_timings, expected = measure(document, media_root, 0, args.repeat)
+        serial_best = min(serial_timings)
+        print(
+            f"单进程:     {serial_best * 1000:8.1f}ms  "
+            f"{args.slides / serial_best:8.0f}页/秒  "
+            f"输出 {len(expected) / 1024 / 1024:.1f}MB"
+        )
+        for workers in sorted(set(args.workers)):
+            timings, output = measure(document, media_root, workers, args.repeat)
+            best = min(timings)
+            identical = "相同" if output == expected else "不同!"
+            print(
+                f"{workers:2d}个工作进程: {best * 1000:8.1f}ms  "
+                f"{args.slides / best:8.0f}页/秒  "
+                f"加速比 {serial_best / best:.2f}x  输出{identical}"
+            )
+
+
+if __name__ == "__main__":
+    main()
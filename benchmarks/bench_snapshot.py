@@ -0,0 +1,102 @@
+"""
+文档快照性能基准
+在不同规模的合成文档上对比二进制快照与 to_dict/from_dict（以及JSON文本）
+的数据大小、保存耗时和重新加载耗时
+
+跳过验证的重新加载要求至少达到 from_dict 的 TARGET_SPEEDUP 倍速度，每个文档
+规模都检查 Document.from_bytes(trusted=True)，未达到时以非零状态退出。
+
+运行方式:
+    python -m benchmarks.bench_snapshot [--slides 100 2000] [--elements 10]
+        [--target 10]
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Callable
+
+from ppt_parser.models.compact import CompactDocument
+from ppt_parser.models.document import Document
+from .deck_generator import generate_deck
+
+TARGET_SPEEDUP = 10.0
+
+
+def best_of(function: Callable[[], Any], repeat: int) -> float:
+    """多次运行的最短耗时（毫秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="文档快照性能基准")
+    parser.add_argument(
+        "--slides", type=int, nargs="+", default=[100, 2000], help="幻灯片数量"
+    )
+    parser.add_argument("--elements", type=int, default=10, help="每页元素数量")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=TARGET_SPEEDUP,
+        help="from_bytes(trusted=True) 至少达到 from_dict 的多少倍速度",
+    )
+    args = parser.parse_args()
+
+    failures = []
+
+    for slides in args.slides:
+        document = Document.from_dict(generate_deck(slides, args.elements))
+        data = document.to_dict()
+        text = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        snapshot = document.to_bytes()
+        print(f"\n文档: {slides}页 x {args.elements}个元素")
+        print(
+            f"  大小: JSON {len(text) / 1024:.0f}KB, "
+            f"快照 {len(snapshot) / 1024:.0f}KB ({len(snapshot) / len(text):.0%})"
+        )
+
+        print("  保存:")
+        for name, save in [
+            ("to_dict", document.to_dict),
+            ("to_dict + JSON", lambda: json.dumps(document.to_dict()).encode()),
+            ("to_bytes", document.to_bytes),
+        ]:
+            print(f"    {name:28s} {best_of(save, args.repeat):8.1f}ms")
+
+        print("  加载:")
+        baseline = best_of(lambda: Document.from_dict(data), args.repeat)
+        for name, load in [
+            ("JSON + from_dict", lambda: Document.from_dict(json.loads(text))),
+            ("from_bytes", lambda: Document.from_bytes(snapshot)),
+            ("from_bytes(trusted=True)", lambda: Document.from_bytes(snapshot, True)),
+            (
+                "CompactDocument.from_bytes",
+                lambda: CompactDocument.from_bytes(snapshot),
+            ),
+        ]:
+            elapsed = best_of(load, args.repeat)
+            print(
+                f"    {name:28s} {elapsed:8.1f}ms "
+                f"（from_dict {baseline:.1f}ms 的 {baseline / elapsed:.1f} 倍速度）"
+            )
+            if name == "from_bytes(trusted=True)" and baseline / elapsed < args.target:
+                failures.append(
+                    f"{slides}页: {baseline / elapsed:.1f}倍，低于{args.target:g}倍"
+                )
+
+    if failures:
+        print("\n跳过验证的加载未达到目标速度:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
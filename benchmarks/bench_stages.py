@@ -0,0 +1,301 @@
+"""
+解析阶段性能基准
+在可配置的合成文档上分别测量解析管道每个阶段的耗时、吞吐量和峰值内存，
+并与保存的基准结果比较，出现性能回退时以非零状态退出，可以直接用于CI检查
+
+阶段:
+    decode    JSONPlugin.decode，只解码，不检查深度
+    depth     check_json_depth
+    validate  Validator.validate
+    build     DocumentBuilder.build_document
+    to_dict   Document.to_dict
+    engine    ParserEngine.parse 的完整耗时，供参考
+
+基准结果保存在 benchmarks/baselines/stages.json。不同机器的速度不同，每个场景
+都运行固定的校准任务，按本机与基准机器的速度比例换算基准耗时；峰值内存与机器
+无关，直接比较。
+
+运行方式:
+    python -m benchmarks.bench_stages [--scenarios small mixed] [--repeat 5]
+        [--tolerance 0.5] [--update-baseline]
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from ppt_parser.core import DocumentBuilder, ParserEngine, Validator
+from ppt_parser.plugins import JSONPlugin
+from ppt_parser.plugins.json_plugin import check_json_depth
+from .deck_generator import generate_deck
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "stages.json"
+
+# 场景名称 -> generate_deck 的参数
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "small": {"num_slides": 100, "elements_per_slide": 10},
+    "large": {"num_slides": 2000, "elements_per_slide": 10},
+    "mixed": {
+        "num_slides": 500,
+        "elements_per_slide": 20,
+        "type_mix": {"text": 6, "image": 2, "shape": 1, "chart": 1},
+        "style_variants": 4,
+    },
+    "nested_charts": {
+        "num_slides": 500,
+        "elements_per_slide": 10,
+        "type_mix": {"chart": 1},
+        "nesting_depth": 4,
+    },
+}
+
+# 差值低于这些值时不算回退，避免很短的阶段受计时噪声影响
+MIN_REGRESSION_MS = 1.0
+MIN_REGRESSION_KB = 64.0
+
+
+class StageResult(NamedTuple):
+    """单个阶段的测量结果"""
+
+    ms: float
+    peak_kb: float
+
+
+def best_of(function: Callable[[], Any], repeat: int) -> float:
+    """多次运行的最短耗时（毫秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def peak_memory(function: Callable[[], Any]) -> float:
+    """运行期间新分配内存的峰值（KB），结果在测量结束前一直保留"""
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        result = function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del result
+    return (peak - start) / 1024
+
+
+def calibration_task() -> Callable[[], Any]:
+    """
+    固定的校准任务，用于换算不同机器的基准耗时
+
+    任务与被测阶段相似：JSON编解码以及遍历嵌套的字典和列表。
+    """
+    deck = generate_deck(200, 10, seed=0)
+
+    def task() -> int:
+        data = json.loads(json.dumps(deck))
+        return sum(
+            len(element["style"]) + len(element["position"])
+            for slide in data["slides"]
+            for element in slide["elements"]
+        )
+
+    return task
+
+
+def stage_functions(text: str) -> Dict[str, Callable[[], Any]]:
+    """每个阶段的被测函数，输入由前一阶段预先准备好"""
+    loop = asyncio.new_event_loop()
+    run = loop.run_until_complete
+    plugin = JSONPlugin()
+    validator = Validator()
+    builder = DocumentBuilder()
+    engine = ParserEngine()
+    engine.logger.disabled = True
+    engine.plugin_manager.register_plugin(plugin)
+
+    data = run(plugin.decode(text))
+    document = run(builder.build_document(data))
+    return {
+        "decode": lambda: run(plugin.decode(text)),
+        "depth": lambda: check_json_depth(text, plugin.MAX_DEPTH),
+        "validate": lambda: run(validator.validate(data)),
+        "build": lambda: run(builder.build_document(data)),
+        "to_dict": document.to_dict,
+        "engine": lambda: run(engine.parse(text)),
+    }
+
+
+def measure_scenario(options: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """
+    测量一个场景中所有阶段的耗时和峰值内存
+
+    校准任务和各阶段轮流运行，每个阶段取多轮中的最短耗时，机器负载的短时波动
+    对校准任务和所有阶段的影响相同。
+    """
+    deck = generate_deck(**options)
+    text = json.dumps(deck, ensure_ascii=False)
+    elements = sum(len(slide["elements"]) for slide in deck["slides"])
+    functions = stage_functions(text)
+    calibration = calibration_task()
+
+    timings = {name: float("inf") for name in functions}
+    calibration_ms = float("inf")
+    for _ in range(repeat):
+        calibration_ms = min(calibration_ms, best_of(calibration, 1))
+        for name, function in functions.items():
+            timings[name] = min(timings[name], best_of(function, 1))
+    stages = {
+        name: StageResult(timings[name], peak_memory(function))._asdict()
+        for name, function in functions.items()
+    }
+    return {
+        "elements": elements,
+        "input_bytes": len(text.encode("utf-8")),
+        "calibration_ms": calibration_ms,
+        "stages": stages,
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    scale: float,
+    tolerance: float,
+    memory_tolerance: float,
+) -> List[str]:
+    """
+    与基准结果比较
+
+    Args:
+        current: 本次的场景结果
+        baseline: 基准的场景结果
+        scale: 本机校准耗时与基准校准耗时之比
+        tolerance: 允许的耗时增幅
+        memory_tolerance: 允许的峰值内存增幅
+
+    Returns:
+        List[str]: 回退的描述，没有回退时为空
+    """
+    regressions = []
+    for name, result in current["stages"].items():
+        expected = baseline["stages"].get(name)
+        if expected is None:
+            continue
+        expected_ms = expected["ms"] * scale
+        if (
+            result["ms"] > expected_ms * (1 + tolerance)
+            and result["ms"] - expected_ms > MIN_REGRESSION_MS
+        ):
+            regressions.append(
+                f"{name} 耗时 {result['ms']:.1f}ms，基准换算为 {expected_ms:.1f}ms"
+            )
+        if (
+            result["peak_kb"] > expected["peak_kb"] * (1 + memory_tolerance)
+            and result["peak_kb"] - expected["peak_kb"] > MIN_REGRESSION_KB
+        ):
+            regressions.append(
+                f"{name} 峰值内存 {result['peak_kb']:.0f}KB，"
+                f"基准为 {expected['peak_kb']:.0f}KB"
+            )
+    return regressions
+
+
+def print_scenario(
+    name: str, result: Dict[str, Any], baseline: Any, scale: float
+) -> None:
+    """输出一个场景的结果表格"""
+    megabytes = result["input_bytes"] / 1024 / 1024
+    print(f"\n场景 {name}: {result['elements']}个元素, {megabytes:.1f}MB")
+    if baseline is not None:
+        print(f"  本机当前速度为基准机器的 {1 / scale:.2f} 倍（校准任务）")
+    print(
+        f"  {'阶段':10s}{'耗时(ms)':>10s}{'元素/秒':>12s}{'MB/秒':>9s}"
+        f"{'峰值内存(KB)':>14s}{'与基准相比':>12s}"
+    )
+    for stage, values in result["stages"].items():
+        seconds = values["ms"] / 1000
+        change = ""
+        if baseline is not None and stage in baseline["stages"]:
+            expected = baseline["stages"][stage]["ms"] * scale
+            change = f"{values['ms'] / expected - 1:+.0%}"
+        print(
+            f"  {stage:10s}{values['ms']:10.1f}"
+            f"{result['elements'] / seconds:12.0f}{megabytes / seconds:9.1f}"
+            f"{values['peak_kb']:14.0f}{change:>12s}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="解析阶段性能基准")
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=sorted(SCENARIOS),
+        default=list(SCENARIOS),
+        help="要运行的场景",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    parser.add_argument(
+        "--baseline", type=Path, default=DEFAULT_BASELINE, help="基准结果文件"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="允许的耗时增幅（0.5表示50%%）"
+    )
+    parser.add_argument("--memory-tolerance", type=float, default=0.1, help="允许的峰值内存增幅")
+    parser.add_argument("--update-baseline", action="store_true", help="用本次结果更新基准文件")
+    args = parser.parse_args()
+
+    baseline: Dict[str, Any] = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    print(f"JSON解码后端: {JSONPlugin().backend.name}")
+
+    results = baseline.get("scenarios", {}) if args.update_baseline else {}
+    regressions = []
+    for name in args.scenarios:
+        result = measure_scenario(SCENARIOS[name], args.repeat)
+        expected = baseline.get("scenarios", {}).get(name)
+        scale = 1.0
+        if expected is not None:
+            scale = result["calibration_ms"] / expected["calibration_ms"]
+        print_scenario(name, result, expected, scale)
+        if expected is not None and not args.update_baseline:
+            regressions += [
+                f"{name}: {message}"
+                for message in compare(
+                    result, expected, scale, args.tolerance, args.memory_tolerance
+                )
+            ]
+        results[name] = result
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps(
+                {"python": platform.python_version(), "scenarios": results},
+                indent=2,
+                ensure_ascii=False,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        print(f"\n已更新基准结果: {args.baseline}")
+        return
+
+    if regressions:
+        print("\n性能回退:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+    print("\n全部通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+启动性能基准
+在新的解释器进程中测量导入时间（python -X importtime）和首次解析的耗时，
+与保存的基准结果比较，出现回退时以非零状态退出，可以直接用于CI检查
+
+检查项:
+    - 导入 ppt_parser.core 的总耗时，以及耗时最多的模块；
+    - 从开始导入到第一次 parse 完成的耗时；
+    - 只导入包本身时不应加载的模块（pydantic 等），与机器性能无关。
+
+基准结果保存在 benchmarks/baselines/startup.json。不同机器的速度不同，每轮测量
+都在新进程中运行固定的校准任务（导入一组标准库模块），按本机与基准机器的速度
+比例换算基准耗时。
+
+运行方式:
+    python -m benchmarks.bench_startup [--repeat 5] [--tolerance 0.5]
+        [--update-baseline]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "startup.json"
+
+# 测量导入耗时的语句
+IMPORT_STATEMENTS = (
+    "import ppt_parser.core",
+    "from ppt_parser.core import ParserEngine",
+)
+
+# 校准任务：导入一组固定的标准库模块。与被测的导入过程一样，主要耗时在读取
+# 字节码和执行模块代码上，随机器速度和负载同比例变化
+CALIBRATION_STATEMENT = (
+    "import asyncio, dataclasses, decimal, email.message, json, logging, typing"
+)
+
+# 差值低于此值时不算回退，避免进程启动的计时噪声
+MIN_REGRESSION_MS = 5.0
+
+# 导入后检查的语句 -> 执行后不应出现在 sys.modules 中的模块
+LAZY_IMPORTS = {
+    "import ppt_parser.core": ("pydantic", "asyncio", "ppt_parser.models.document"),
+    "import ppt_parser.exceptions": ("pydantic",),
+    "import ppt_parser.plugins": ("pydantic", "ppt_parser.plugins.json_plugin"),
+    "import ppt_parser.writer": ("pydantic", "ppt_parser.writer.pptx_writer"),
+    "from ppt_parser.plugins import JSONPlugin": ("pydantic",),
+}
+
+# 测量首次解析的子进程脚本
+_FIRST_PARSE_SCRIPT = """
+import time
+start = time.perf_counter()
+import asyncio
+from ppt_parser.core import ParserEngine
+imported = time.perf_counter()
+engine = ParserEngine()
+asyncio.run(engine.parse({source!r}))
+parsed = time.perf_counter()
+print((imported - start) * 1000, (parsed - imported) * 1000)
+"""
+
+# 首次解析使用的输入，覆盖全部元素类型
+_SAMPLE_DOCUMENT = json.dumps(
+    {
+        "title": "启动基准",
+        "slides": [
+            {
+                "title": "第一页",
+                "elements": [
+                    {
+                        "type": element_type,
+                        "content": "内容",
+                        "position": {"x": 10, "y": 10},
+                        "style": {"font_size": 12},
+                    }
+                    for element_type in ("text", "image", "shape", "chart")
+                ],
+            }
+        ],
+    },
+    ensure_ascii=False,
+)
+
+
+class ImportRecord(NamedTuple):
+    """-X importtime 输出中的一行，时间单位为微秒"""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """
+    解析 -X importtime 的输出
+
+    Args:
+        output: 子进程的标准错误输出
+
+    Returns:
+        List[ImportRecord]: 每个被导入的模块的记录
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # 表头
+            continue
+        records.append(ImportRecord(fields[2].strip(), int(fields[0]), int(fields[1])))
+    return records
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    """在新的解释器进程中运行，失败时抛出异常"""
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    )
+
+
+def import_time(statement: str) -> Tuple[float, List[ImportRecord]]:
+    """
+    在新进程中测量导入语句的耗时
+
+    Returns:
+        Tuple[float, List[ImportRecord]]: 总耗时（毫秒）和逐模块记录
+    """
+    records = parse_importtime(run_python("-X", "importtime", "-c", statement).stderr)
+    return sum(record.self_us for record in records) / 1000, records
+
+
+def first_parse_time() -> Tuple[float, float]:
+    """
+    在新进程中测量导入引擎和第一次解析的耗时
+
+    Returns:
+        Tuple[float, float]: 导入耗时和首次解析耗时（毫秒）
+    """
+    script = _FIRST_PARSE_SCRIPT.format(source=_SAMPLE_DOCUMENT)
+    imported, parsed = run_python("-c", script).stdout.split()[-2:]
+    return float(imported), float(parsed)
+
+
+def measure(repeat: int) -> Tuple[Dict[str, Any], List[ImportRecord]]:
+    """
+    测量校准任务、各导入语句和首次解析的耗时
+
+    各项轮流运行，每项取多轮中的最短耗时，机器负载的短时波动对校准任务和
+    被测项的影响相同。
+
+    Returns:
+        Tuple[Dict[str, Any], List[ImportRecord]]: 测量结果，以及最后一个导入
+            语句耗时最短的一次的逐模块记录
+    """
+    calibration_ms = float("inf")
+    imports = {statement: float("inf") for statement in IMPORT_STATEMENTS}
+    records: List[ImportRecord] = []
+    first_parse = (float("inf"), float("inf"))
+    for _ in range(repeat):
+        calibration_ms = min(calibration_ms, import_time(CALIBRATION_STATEMENT)[0])
+        for statement in IMPORT_STATEMENTS:
+            total, statement_records = import_time(statement)
+            if total < imports[statement]:
+                imports[statement] = total
+                records = statement_records
+        timings = first_parse_time()
+        if sum(timings) < sum(first_parse):
+            first_parse = timings
+    return {
+        "calibration_ms": calibration_ms,
+        "imports": imports,
+        "first_parse": {"import_ms": first_parse[0], "parse_ms": first_parse[1]},
+        "first_parse_ms": sum(first_parse),
+    }, records
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], scale: float, tolerance: float
+) -> List[str]:
+    """
+    与基准结果比较
+
+    Args:
+        current: 本次的测量结果
+        baseline: 基准的测量结果
+        scale: 本机校准耗时与基准校准耗时之比
+        tolerance: 允许的耗时增幅
+
+    Returns:
+        List[str]: 回退的描述，没有回退时为空
+    """
+    checks = [
+        (f"{statement} 的导入耗时", ms, baseline["imports"].get(statement))
+        for statement, ms in current["imports"].items()
+    ]
+    checks.append(("首次解析耗时", current["first_parse_ms"], baseline.get("first_parse_ms")))
+    regressions = []
+    for name, ms, expected in checks:
+        if expected is None:
+            continue
+        expected_ms = expected * scale
+        if ms > expected_ms * (1 + tolerance) and ms - expected_ms > MIN_REGRESSION_MS:
+            regressions.append(f"{name} {ms:.1f}ms，基准换算为 {expected_ms:.1f}ms")
+    return regressions
+
+
+def check_lazy_imports() -> Dict[str, List[str]]:
+    """
+    检查导入语句是否加载了不应加载的模块
+
+    Returns:
+        Dict[str, List[str]]: 导入语句 -> 被提前加载的模块，全部通过时为空
+    """
+    failures = {}
+    for statement, forbidden in LAZY_IMPORTS.items():
+        script = (
+            f"import sys\n{statement}\n"
+            f"print(' '.join(name for name in {forbidden!r} if name in sys.modules))"
+        )
+        loaded = run_python("-c", script).stdout.split()
+        if loaded:
+            failures[statement] = loaded
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="启动性能基准")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    parser.add_argument("--top", type=int, default=15, help="显示耗时最多的模块数量")
+    parser.add_argument(
+        "--baseline", type=Path, default=DEFAULT_BASELINE, help="基准结果文件"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="允许的耗时增幅（0.5表示50%%）"
+    )
+    parser.add_argument("--update-baseline", action="store_true", help="用本次结果更新基准文件")
+    args = parser.parse_args()
+
+    baseline: Dict[str, Any] = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    result, records = measure(args.repeat)
+    scale = 1.0
+    if baseline:
+        scale = result["calibration_ms"] / baseline["calibration_ms"]
+        print(f"本机当前速度为基准机器的 {1 / scale:.2f} 倍（校准任务）\n")
+
+    for statement, total in result["imports"].items():
+        change = ""
+        if statement in baseline.get("imports", {}):
+            change = (
+                f"，与基准相比 {total / (baseline['imports'][statement] * scale) - 1:+.0%}"
+            )
+        print(f"{statement}: {total:.1f}ms{change}")
+    print(f"\n耗时最多的模块（{IMPORT_STATEMENTS[-1]}，累计/自身，毫秒）:")
+    for record in sorted(records, key=lambda record: -record.cumulative_us)[: args.top]:
+        print(
+            f"  {record.cumulative_us / 1000:8.1f}  {record.self_us / 1000:8.1f}  "
+            f"{record.module}"
+        )
+
+    first_parse = result["first_parse"]
+    print(
+        f"\n首次解析: 导入 {first_parse['import_ms']:.1f}ms + "
+        f"解析 {first_parse['parse_ms']:.1f}ms = {result['first_parse_ms']:.1f}ms"
+    )
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps(
+                {"python": platform.python_version(), **result},
+                indent=2,
+                ensure_ascii=False,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        print(f"\n已更新基准结果: {args.baseline}")
+        return
+
+    failures = compare(result, baseline, scale, args.tolerance) if baseline else []
+    for statement, loaded in check_lazy_imports().items():
+        failures.append(f"{statement} 提前加载了: {', '.join(loaded)}")
+
+    if failures:
+        print("\n未通过:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\n全部通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+验证器性能基准
+对比由模型生成的验证器与原先逐项检查的验证器的耗时
+
+运行方式:
+    python -m benchmarks.bench_validator [--slides 2000] [--elements 10]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from ppt_parser.core import Validator
+from ppt_parser.exceptions import ValidationError
+from .deck_generator import generate_deck
+
+
+class LegacyValidator:
+    """原先的验证器实现，每次调用都重新遍历字段列表，仅用于对比"""
+
+    async def validate(self, data: Dict[str, Any]) -> bool:
+        for field in ["title", "slides"]:
+            if field not in data:
+                raise ValidationError(f"缺少必需字段: {field}")
+        if not isinstance(data["slides"], list):
+            raise ValidationError("slides必须是列表类型")
+        if not isinstance(data["title"], str) or not data["title"].strip():
+            raise ValidationError("文档标题不能为空")
+        if "metadata" in data and not isinstance(data["metadata"], dict):
+            raise ValidationError("metadata必须是字典类型")
+        for slide_data in data["slides"]:
+            self._validate_slide(slide_data)
+        return True
+
+    def _validate_slide(self, slide_data: Dict[str, Any]) -> None:
+        if not isinstance(slide_data, dict):
+            raise ValidationError("幻灯片数据必须是字典类型")
+        for field in ["title", "elements"]:
+            if field not in slide_data:
+                raise ValidationError(f"幻灯片缺少必需字段: {field}")
+        if not isinstance(slide_data["elements"], list):
+            raise ValidationError("elements必须是列表类型")
+        for element_data in slide_data["elements"]:
+            self._validate_element(element_data)
+
+    def _validate_element(self, element_data: Dict[str, Any]) -> None:
+        if not isinstance(element_data, dict):
+            raise ValidationError("元素数据必须是字典类型")
+        for field in ["type", "content", "position"]:
+            if field not in element_data:
+                raise ValidationError(f"元素缺少必需字段: {field}")
+        if not isinstance(element_data["position"], dict):
+            raise ValidationError("position必须是字典类型")
+        if "x" not in element_data["position"] or "y" not in element_data["position"]:
+            raise ValidationError("position必须包含x和y坐标")
+        if "style" in element_data and not isinstance(element_data["style"], dict):
+            raise ValidationError("style必须是字典类型")
+
+
+async def measure(validator: Any, data: Dict[str, Any], repeat: int) -> List[float]:
+    """测量多次验证的耗时（秒）"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await validator.validate(data)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def measure_errors(data: Dict[str, Any], repeat: int) -> float:
+    """测量完整模式下收集所有错误的最短耗时（秒）"""
+    validator = Validator(mode="exhaustive", max_errors=len(data["slides"]))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            await validator.validate(data)
+        except ValidationError:
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="验证器性能基准")
+    parser.add_argument("--slides", type=int, default=2000, help="幻灯片数量")
+    parser.add_argument("--elements", type=int, default=10, help="每页元素数量")
+    parser.add_argument("--repeat", type=int, default=20, help="重复次数")
+    args = parser.parse_args()
+
+    data = generate_deck(args.slides, args.elements)
+    print(f"输入: {args.slides}页 x {args.elements}个元素")
+
+    legacy_best = min(asyncio.run(measure(LegacyValidator(), data, args.repeat)))
+    compiled_best = min(asyncio.run(measure(Validator(), data, args.repeat)))
+
+    print(f"原验证器:   {legacy_best * 1000:.2f}ms")
+    print(f"生成验证器: {compiled_best * 1000:.2f}ms")
+    print(f"加速比:     {legacy_best / compiled_best:.2f}x")
+
+    # 每页一个错误时完整收集的耗时
+    for slide_data in data["slides"]:
+        del slide_data["elements"][0]["position"]["x"]
+    errors_best = asyncio.run(measure_errors(data, max(args.repeat // 4, 1)))
+    print(f"完整模式（{args.slides}个错误）: {errors_best * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+合成演示文稿数据生成器
+生成可复现的大规模测试数据，用于性能基准
+"""
+
+import json
+import random
+from typing import Dict, Any, List, Optional
+
+ELEMENT_TYPES = ["text", "image", "shape", "chart"]
+
+# JSONPlugin.MAX_DEPTH 为10，图表内容位于深度5，其下最多还能嵌套4层容器
+MAX_NESTING_DEPTH = 4
+
+
+def generate_deck(
+    num_slides: int = 100,
+    elements_per_slide: int = 10,
+    seed: int = 0,
+    type_mix: Optional[Dict[str, float]] = None,
+    style_variants: Optional[int] = None,
+    nesting_depth: int = 0,
+) -> Dict[str, Any]:
+    """
+    生成合成的文档数据
+
+    Args:
+        num_slides: 幻灯片数量
+        elements_per_slide: 每页元素数量
+        seed: 随机种子，相同的参数和种子生成相同的数据
+        type_mix: 元素类型 -> 权重，None表示按 ELEMENT_TYPES 的顺序轮流生成
+        style_variants: 不同样式的数量，元素从中随机选取；None表示每个元素
+            单独随机生成样式
+        nesting_depth: 图表内容中额外嵌套的层数，不超过 MAX_NESTING_DEPTH
+
+    Returns:
+        Dict[str, Any]: 文档数据字典
+
+    Raises:
+        ValueError: 参数无效
+    """
+    if not 0 <= nesting_depth <= MAX_NESTING_DEPTH:
+        raise ValueError(f"nesting_depth必须在0到{MAX_NESTING_DEPTH}之间")
+    if type_mix is not None and (
+        not type_mix
+        or not set(type_mix) <= set(ELEMENT_TYPES)
+        or sum(type_mix.values()) <= 0
+    ):
+        raise ValueError(f"type_mix的键必须是{ELEMENT_TYPES}之一且权重之和大于0")
+    if style_variants is not None and style_variants < 1:
+        raise ValueError("style_variants必须大于0")
+
+    rng = random.Random(seed)
+    styles = None
+    if style_variants is not None:
+        style_rng = random.Random(f"{seed}-styles")
+        styles = [_generate_style(style_rng) for _ in range(style_variants)]
+
+    slides: List[Dict[str, Any]] = []
+    for slide_index in range(num_slides):
+        elements = []
+        for element_index in range(elements_per_slide):
+            if type_mix is None:
+                element_type = ELEMENT_TYPES[element_index % len(ELEMENT_TYPES)]
+            else:
+                element_type = rng.choices(
+                    list(type_mix), weights=list(type_mix.values())
+                )[0]
+            elements.append(_generate_element(rng, element_type, styles, nesting_depth))
+        slides.append({"title": f"第{slide_index + 1}页", "elements": elements})
+
+    return {
+        "title": "合成测试文档",
+        "metadata": {"author": "benchmark", "version": "1.0"},
+        "slides": slides,
+    }
+
+
+def generate_deck_json(
+    num_slides: int = 100, elements_per_slide: int = 10, seed: int = 0, **options: Any
+) -> str:
+    """生成合成的文档JSON字符串，options与 generate_deck 相同"""
+    return json.dumps(
+        generate_deck(num_slides, elements_per_slide, seed, **options),
+        ensure_ascii=False,
+    )
+
+
+def _generate_element(
+    rng: random.Random,
+    element_type: str,
+    styles: Optional[List[Dict[str, Any]]],
+    nesting_depth: int,
+) -> Dict[str, Any]:
+    """生成单个元素数据"""
+    if element_type == "chart":
+        content: Any = {
+            "type": "bar",
+            "data": [rng.randint(0, 100) for _ in range(8)],
+        }
+        node = content
+        for level in range(nesting_depth):
+            node["detail"] = {"level": level + 1}
+            node = node["detail"]
+    elif element_type == "image":
+        content = f"images/{rng.randint(1, 20)}.png"
+    else:
+        content = f"文本内容 {rng.randint(0, 10 ** 6)}"
+
+    position = {"x": rng.uniform(0, 900), "y": rng.uniform(0, 900)}
+    if styles is None:
+        style = _generate_style(rng)
+    else:
+        style = dict(rng.choice(styles))
+
+    return {
+        "type": element_type,
+        "content": content,
+        "position": position,
+        "style": style,
+        "size": {"width": rng.uniform(50, 400), "height": rng.uniform(20, 300)},
+    }
+
+
+def _generate_style(rng: random.Random) -> Dict[str, Any]:
+    """生成随机样式"""
+    return {
+        "font_size": rng.choice([12, 18, 24, 32]),
+        "color": rng.choice(["#000000", "#FF0000", "#333333"]),
+        "bold": rng.random() < 0.2,
+    }
@@ -0,0 +1,46 @@
+"""
+包的延迟导出
+包的 __init__ 只登记导出名称所在的子模块，首次访问名称时才导入子模块，
+只使用其中一部分功能的程序不需要为其他模块付出导入时间。
+
+使用示例:
+    ```python
+    __getattr__, __dir__, __all__ = _lazy.attach(
+        __name__, {"ParserEngine": ".parser_engine"}
+    )
+    ```
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def attach(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """
+    生成包的 __getattr__、__dir__ 和 __all__
+
+    Args:
+        package: 包名，即包的 __name__
+        exports: 导出名称 -> 所在的子模块（相对于包的模块名），按 __all__ 的顺序排列
+
+    Returns:
+        (__getattr__, __dir__, __all__)
+    """
+    names = list(exports)
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        # 写入模块属性，之后的访问不再经过 __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(names))
+
+    return __getattr__, __dir__, names
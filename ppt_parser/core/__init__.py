@@ -1,11 +1,51 @@
 """
 PPT解析器核心模块
 提供PPT文档解析和生成的核心功能
+
+导出的名称在首次访问时才导入所在的子模块，只使用其中一部分功能的程序
+不需要为其他模块（以及它们依赖的 pydantic、asyncio 等）付出导入时间。
 """
 
-from .parser_engine import ParserEngine
-from .validator import Validator
-from .document_builder import DocumentBuilder
-from .plugin_manager import PluginManager
+from typing import TYPE_CHECKING
+from .. import _lazy
+
+# 导出名称 -> 所在的子模块
+__getattr__, __dir__, __all__ = _lazy.attach(
+    __name__,
+    {
+        "ParserEngine": ".parser_engine",
+        "Validator": ".validator",
+        "DocumentBuilder": ".document_builder",
+        "PluginManager": ".plugin_manager",
+        "ParseExecutor": ".parse_executor",
+        "BatchResult": ".batch",
+        "ParseCache": ".parse_cache",
+        "MemoryCacheBackend": ".parse_cache",
+        "DiskCacheBackend": ".parse_cache",
+        "FlyweightCache": ".flyweight",
+        "ImageSizeCache": ".image_info",
+        "ChartDataProcessor": ".chart_data",
+        "Instrumentation": ".instrumentation",
+        "InMemoryCollector": ".instrumentation",
+        "PrometheusExporter": ".instrumentation",
+        "ParseStats": ".instrumentation",
+    },
+)
 
-__all__ = ["ParserEngine", "Validator", "DocumentBuilder", "PluginManager"]
+if TYPE_CHECKING:
+    from .parser_engine import ParserEngine
+    from .validator import Validator
+    from .document_builder import DocumentBuilder
+    from .plugin_manager import PluginManager
+    from .parse_executor import ParseExecutor
+    from .batch import BatchResult
+    from .parse_cache import ParseCache, MemoryCacheBackend, DiskCacheBackend
+    from .flyweight import FlyweightCache
+    from .image_info import ImageSizeCache
+    from .chart_data import ChartDataProcessor
+    from .instrumentation import (
+        Instrumentation,
+        InMemoryCollector,
+        PrometheusExporter,
+        ParseStats,
+    )
@@ -0,0 +1,125 @@
+"""
+批量解析模块
+以有限的并发度批量解析输入，并逐项返回结果或错误
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Set,
+    Union,
+)
+from ..exceptions import ParseError, PPTParserBaseError
+from ..models.document import Document
+
+BatchInputs = Union[Iterable[Any], AsyncIterable[Any]]
+
+
+@dataclass
+class BatchResult:
+    """
+    单项批量解析结果
+
+    Attributes:
+        index: 输入在批次中的序号（从0开始）
+        document: 解析成功时生成的文档对象
+        error: 解析失败时的异常
+    """
+
+    index: int
+    document: Optional[Document] = None
+    error: Optional[PPTParserBaseError] = None
+
+    @property
+    def ok(self) -> bool:
+        """是否解析成功"""
+        return self.error is None
+
+
+async def run_batch(
+    parse: Callable[[Any], Awaitable[Document]],
+    inputs: BatchInputs,
+    concurrency: int,
+    ordered: bool = False,
+) -> AsyncIterator[BatchResult]:
+    """
+    以有限的并发度批量执行解析
+
+    输入按需读取，不会一次性展开。尚未返回给调用方的项目（包括正在解析的和
+    为保持顺序而暂存的）不超过concurrency个，因此内存占用与批次大小无关。
+
+    Args:
+        parse: 解析单个输入的协程函数
+        inputs: 输入的同步或异步可迭代对象
+        concurrency: 最大并发数
+        ordered: True表示按输入顺序返回结果，False表示按完成顺序返回
+
+    Yields:
+        BatchResult: 每个输入的解析结果
+    """
+    if concurrency < 1:
+        raise ValueError("并发数必须大于0")
+
+    async def run_one(index: int, input_data: Any) -> BatchResult:
+        try:
+            return BatchResult(index=index, document=await parse(input_data))
+        except PPTParserBaseError as e:
+            return BatchResult(index=index, error=e)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # 例如工作进程意外退出，同样只影响当前项目
+            return BatchResult(index=index, error=ParseError(f"解析过程出错: {str(e)}"))
+
+    iterator = _aiter(inputs)
+    pending: Set["asyncio.Task[BatchResult]"] = set()
+    completed: Dict[int, BatchResult] = {}
+    next_index = 0  # 下一个要读取的输入序号
+    next_yield = 0  # 按顺序返回时下一个要返回的序号
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) + len(completed) < concurrency:
+                try:
+                    input_data = await iterator.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.create_task(run_one(next_index, input_data)))
+                next_index += 1
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                result = task.result()
+                if not ordered:
+                    yield result
+                    continue
+                completed[result.index] = result
+            while next_yield in completed:
+                yield completed.pop(next_yield)
+                next_yield += 1
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _aiter(inputs: BatchInputs) -> AsyncIterator[Any]:
+    """将同步或异步可迭代对象统一为异步迭代器"""
+    if hasattr(inputs, "__aiter__"):
+        async for item in inputs:  # type: ignore[union-attr]
+            yield item
+    else:
+        for item in inputs:  # type: ignore[union-attr]
+            yield item
@@ -0,0 +1,338 @@
+"""
+图表数据处理模块
+在构建文档时将图表元素的数据系列转换为数值数组，并按需降采样到目标点数
+
+安装了 NumPy 时数据转换为 float64 的 numpy.ndarray，转换、降采样和格式化都以
+向量运算完成；否则转换为标准库的 array.array("d")，用纯Python实现相同的算法。
+缺失的数据点（None）保存为NaN。
+
+支持的降采样方法:
+    - lttb: Largest-Triangle-Three-Buckets，保留折线的视觉形状，适合折线图；
+    - minmax: 按固定大小分桶，保留每个桶中的最小值和最大值，适合突出峰值。
+"""
+
+import math
+from array import array
+from typing import Any, List, Literal, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 取决于运行环境
+    np = None
+
+HAS_NUMPY = np is not None
+
+DownsampleMethod = Literal["lttb", "minmax"]
+
+# 默认的最大数据点数
+DEFAULT_MAX_POINTS = 2000
+
+SeriesArray = Union[array, "np.ndarray"]
+
+
+def to_array(values: Sequence[Any]) -> Optional[SeriesArray]:
+    """
+    将数据系列转换为数值数组
+
+    Args:
+        values: 数值列表，None表示缺失的数据点
+
+    Returns:
+        Optional[SeriesArray]: 数值数组，包含非数值的数据时返回None
+            （保持原样，由写入器报告错误）
+    """
+    if np is not None:
+        try:
+            converted = np.asarray(values)
+        except ValueError:
+            # 长度不一致的嵌套列表
+            return None
+        if converted.ndim != 1:
+            return None
+        if converted.dtype.kind in "iuf":
+            return converted.astype(np.float64, copy=False)
+        if converted.dtype.kind != "O":
+            return None
+        # 含有None或超出int64范围的整数，逐个检查
+    if not all(
+        value is None
+        or (isinstance(value, (int, float)) and not isinstance(value, bool))
+        for value in values
+    ):
+        return None
+    if np is not None:
+        return np.array(
+            [math.nan if value is None else value for value in values],
+            dtype=np.float64,
+        )
+    return array("d", [math.nan if value is None else value for value in values])
+
+
+def lttb_indices(values: SeriesArray, target: int) -> List[int]:
+    """
+    用LTTB算法选出要保留的数据点
+
+    缺失的数据点不参与选择。第一个和最后一个有效数据点总是保留。
+
+    Args:
+        values: 数值数组
+        target: 目标点数（至少为3）
+
+    Returns:
+        List[int]: 按升序排列的数据点序号
+    """
+    if np is not None:
+        values = np.asarray(values, dtype=np.float64)
+        xs = np.flatnonzero(~np.isnan(values))
+        ys = values[xs]
+    else:
+        xs = [index for index, value in enumerate(values) if not math.isnan(value)]
+        ys = [values[index] for index in xs]
+    count = len(xs)
+    if target >= count or target < 3:
+        return [int(index) for index in xs]
+
+    every = (count - 2) / (target - 2)
+    selected = [0]
+    anchor = 0
+    for bucket in range(target - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_start = end
+        next_end = min(int((bucket + 2) * every) + 1, count)
+        anchor_x = xs[anchor]
+        anchor_y = ys[anchor]
+        if np is not None:
+            average_x = xs[next_start:next_end].mean()
+            average_y = ys[next_start:next_end].mean()
+            areas = np.abs(
+                (anchor_x - average_x) * (ys[start:end] - anchor_y)
+                - (anchor_x - xs[start:end]) * (average_y - anchor_y)
+            )
+            anchor = start + int(areas.argmax())
+        else:
+            span = next_end - next_start
+            average_x = sum(xs[next_start:next_end]) / span
+            average_y = sum(ys[next_start:next_end]) / span
+            best_area = -1.0
+            for point in range(start, end):
+                area = abs(
+                    (anchor_x - average_x) * (ys[point] - anchor_y)
+                    - (anchor_x - xs[point]) * (average_y - anchor_y)
+                )
+                if area > best_area:
+                    best_area = area
+                    anchor = point
+        selected.append(anchor)
+    selected.append(count - 1)
+    return [int(xs[index]) for index in selected]
+
+
+def minmax_indices(values: SeriesArray, target: int) -> List[int]:
+    """
+    按固定大小分桶，选出每个桶中最小值和最大值所在的数据点
+
+    桶的大小为 ceil(n / (target // 2))，因此结果最多包含target个数据点。
+    缺失的数据点不参与选择，全部缺失的桶不选出数据点。
+
+    Args:
+        values: 数值数组
+        target: 目标点数（至少为2）
+
+    Returns:
+        List[int]: 按升序排列的数据点序号
+    """
+    count = len(values)
+    if target >= count:
+        if np is not None:
+            return [int(index) for index in np.flatnonzero(~np.isnan(values))]
+        return [index for index, value in enumerate(values) if not math.isnan(value)]
+    size = math.ceil(count / max(target // 2, 1))
+
+    if np is not None:
+        values = np.asarray(values, dtype=np.float64)
+        buckets = math.ceil(count / size)
+        padded = np.full(buckets * size, np.nan)
+        padded[:count] = values
+        rows = padded.reshape(buckets, size)
+        missing = np.isnan(rows)
+        lows = np.where(missing, np.inf, rows).argmin(axis=1)
+        highs = np.where(missing, -np.inf, rows).argmax(axis=1)
+        valid = ~missing.all(axis=1)
+        offsets = np.arange(buckets) * size
+        first = np.minimum(lows, highs) + offsets
+        second = np.maximum(lows, highs) + offsets
+        pairs = np.stack([first, second], axis=1)[valid].ravel()
+        # 最小值和最大值是同一个点时只保留一次
+        keep = np.ones(len(pairs), dtype=bool)
+        keep[1::2] = pairs[1::2] != pairs[0::2]
+        return [int(index) for index in pairs[keep]]
+
+    selected: List[int] = []
+    for offset in range(0, count, size):
+        low: Optional[int] = None
+        high: Optional[int] = None
+        for index in range(offset, min(offset + size, count)):
+            value = values[index]
+            if math.isnan(value):
+                continue
+            if low is None or value < values[low]:
+                low = index
+            if high is None or value > values[high]:
+                high = index
+        if low is None or high is None:
+            continue
+        selected.append(min(low, high))
+        if low != high:
+            selected.append(max(low, high))
+    return selected
+
+
+def is_series_array(values: Any) -> bool:
+    """是否为 to_array 转换出的数值数组"""
+    if np is not None and isinstance(values, np.ndarray):
+        return values.ndim == 1
+    return isinstance(values, array)
+
+
+def take(values: Any, indices: List[int]) -> Any:
+    """按序号取出数组或列表中的元素，保持原有类型"""
+    if np is not None and isinstance(values, np.ndarray):
+        return values[np.asarray(indices, dtype=np.intp)]
+    if isinstance(values, array):
+        return array(values.typecode, [values[index] for index in indices])
+    return [values[index] for index in indices]
+
+
+def format_points(values: SeriesArray) -> List[Optional[str]]:
+    """
+    将数值数组格式化为图表中的数值文本
+
+    Args:
+        values: 数值数组
+
+    Returns:
+        List[Optional[str]]: 每个数据点的文本，缺失的数据点为None
+
+    Raises:
+        ValueError: 数组中含有无穷大
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        if np.isinf(values).any():
+            raise ValueError("图表数据必须是有限的数值")
+        missing = np.isnan(values)
+        texts: List[Optional[str]] = list(map(repr, values.tolist()))
+        if missing.any():
+            for index in np.flatnonzero(missing).tolist():
+                texts[index] = None
+        return texts
+    texts = []
+    for value in values:
+        if math.isnan(value):
+            texts.append(None)
+        elif math.isinf(value):
+            raise ValueError("图表数据必须是有限的数值")
+        else:
+            texts.append(repr(value))
+    return texts
+
+
+class ChartDataProcessor:
+    """
+    图表数据处理器
+
+    构建文档时将图表元素内容中的 data（以及 series 中每个系列的 data）转换为
+    数值数组；数据点超过max_points时按指定方法降采样，labels/categories
+    按相同的序号取出。多个系列共用同一组序号（由第一个系列选出），
+    保证各系列与标签一一对应；各系列长度不一致时不降采样。
+
+    转换后的内容包含数组，写入PPTX和pickle序列化都不受影响，但不能直接
+    用 model_dump_json 输出，需要时先用 list() 转换。
+
+    示例:
+        ```python
+        engine = ParserEngine(chart_data=ChartDataProcessor(max_points=1000))
+        document = await engine.parse(input_json)
+        ```
+    """
+
+    def __init__(
+        self,
+        max_points: Optional[int] = DEFAULT_MAX_POINTS,
+        method: DownsampleMethod = "lttb",
+    ):
+        """
+        初始化图表数据处理器
+
+        Args:
+            max_points: 每个图表的最大数据点数，None表示不降采样
+            method: 降采样方法，"lttb"或"minmax"
+
+        Raises:
+            ValueError: 参数无效
+        """
+        if method not in ("lttb", "minmax"):
+            raise ValueError(f"不支持的降采样方法: {method}")
+        if max_points is not None and max_points < 3:
+            raise ValueError("max_points不能小于3")
+        self.max_points = max_points
+        self.method = method
+
+    def process(self, content: Any) -> Any:
+        """
+        处理图表元素的内容
+
+        Args:
+            content: 图表元素的内容
+
+        Returns:
+            Any: 数据已转换为数组的新内容；无法处理的内容原样返回
+        """
+        if not isinstance(content, dict):
+            return content
+        if "series" in content:
+            series = content["series"]
+            if not isinstance(series, list) or not all(
+                isinstance(item, dict) and isinstance(item.get("data"), list)
+                for item in series
+            ):
+                return content
+            converted = [to_array(item["data"]) for item in series]
+        elif isinstance(content.get("data"), list):
+            converted = [to_array(content["data"])]
+        else:
+            return content
+        columns = [column for column in converted if column is not None]
+        if not columns or len(columns) != len(converted):
+            return content
+
+        count = len(columns[0])
+        indices = None
+        if all(len(column) == count for column in columns):
+            # 长度不一致的系列无法共用序号，只转换不降采样
+            indices = self._select(columns[0])
+        if indices is not None:
+            columns = [take(column, indices) for column in columns]
+
+        result = dict(content)
+        if "series" in content:
+            result["series"] = [
+                {**item, "data": column}
+                for item, column in zip(content["series"], columns)
+            ]
+        else:
+            result["data"] = columns[0]
+        if indices is not None:
+            for key in ("labels", "categories"):
+                labels = content.get(key)
+                if isinstance(labels, list) and len(labels) == count:
+                    result[key] = take(labels, indices)
+        return result
+
+    def _select(self, values: SeriesArray) -> Optional[List[int]]:
+        """选出要保留的数据点序号，不需要降采样时返回None"""
+        if self.max_points is None or len(values) <= self.max_points:
+            return None
+        if self.method == "lttb":
+            return lttb_indices(values, self.max_points)
+        return minmax_indices(values, self.max_points)
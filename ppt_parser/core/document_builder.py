@@ -3,14 +3,121 @@
 负责将验证后的数据构建为文档对象
 """
 
-from typing import Dict, Any, List
+import os
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Literal,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+from pydantic import TypeAdapter, ValidationError as PydanticValidationError
 from ..exceptions import BuildDocumentError
 from ..models.document import Document, Slide, Element, Position, Style
+from ..models.compact import CompactDocument
+from ..models.construct import construct, construct_with_defaults
+from .gc_pause import gc_paused
+
+if TYPE_CHECKING:
+    from .chart_data import ChartDataProcessor
+    from .flyweight import FlyweightCache
+    from .image_info import ImageSizeCache
+
+# 构建模式
+#   loop: 逐个构建幻灯片和元素模型
+#   compiled: 用一次 pydantic-core 验证调用构建整个文档
+#   trusted: 不做模型验证，直接创建模型对象，只用于已经验证过的可信数据。
+#            Validator 只检查必需字段和容器类型，字段取值的约束（元素类型、坐标
+#            范围和单位、颜色格式、字体大小和透明度的范围与类型）都由模型负责，
+#            trusted 模式下这些约束都不会被检查
+BuildMode = Literal["loop", "compiled", "trusted"]
+
+# 构建时从输入中读取的字段，与逐个构建的模式保持一致
+_SLIDE_FIELDS = ("title", "background", "layout")
+_ELEMENT_FIELDS = ("type", "content", "position", "style", "size")
+
+# 补全元素内容和大小的函数：(类型, 内容, 大小, 位置单位) -> (内容, 大小)
+ElementCompleter = Callable[[Any, Any, Any, str], Tuple[Any, Any]]
+
+
+@lru_cache(maxsize=None)
+def _document_adapter() -> TypeAdapter:
+    """整个文档的编译验证器，首次使用时创建"""
+    return TypeAdapter(Document)
 
 
 class DocumentBuilder:
     """文档构建器，负责构建PPT文档对象"""
 
+    def __init__(
+        self,
+        flyweights: Optional["FlyweightCache"] = None,
+        mode: BuildMode = "loop",
+        image_sizes: Optional["ImageSizeCache"] = None,
+        chart_data: Optional["ChartDataProcessor"] = None,
+        pause_gc: bool = False,
+    ):
+        """
+        初始化文档构建器
+
+        Args:
+            flyweights: 享元缓存，设置后内容相同的样式和位置只验证一次，
+                并在元素之间共享同一个不可变实例（只用于loop模式）
+            mode: build_document 的构建模式。loop逐个构建模型；compiled用一次
+                编译好的验证器调用构建整个文档，错误信息中带有幻灯片和元素序号；
+                trusted跳过模型验证，只能用于已经完整验证过的数据：解析引擎的
+                Validator不检查字段取值，元素类型、坐标范围和单位、颜色格式、
+                字体大小和透明度等模型约束都不会被检查，字段也不做类型转换。
+                写入PPTX时会重新检查写入XML的颜色和数值，不合法时抛出WriteError
+            image_sizes: 图片尺寸缓存，设置后没有指定大小（或只指定了宽度或高度）
+                的图片元素按图片文件头中的像素尺寸和宽高比补全大小
+            chart_data: 图表数据处理器，设置后图表元素的数据系列转换为数值数组，
+                并按需降采样
+            pause_gc: compiled和trusted模式构建整个文档期间是否暂停循环垃圾回收。
+                大文档可以减少三到四成的构建时间；回收的开关是进程级的，
+                多个线程同时构建时在最后一个构建结束后才恢复
+        """
+        if mode not in ("loop", "compiled", "trusted"):
+            raise ValueError(f"不支持的构建模式: {mode}")
+        self.flyweights = flyweights
+        self.mode = mode
+        self.image_sizes = image_sizes
+        self.chart_data = chart_data
+        self.pause_gc = pause_gc
+        self._completer: Optional[ElementCompleter] = (
+            self._complete_element
+            if image_sizes is not None or chart_data is not None
+            else None
+        )
+
+    @property
+    def config_key(self) -> Tuple[Any, ...]:
+        """
+        构建器的配置，配置相同的构建器对相同的数据构建出相同的文档
+
+        解析执行器的工作进程按此复用构建器，解析缓存用它区分不同配置的结果。
+        """
+        image_sizes = None
+        if self.image_sizes is not None:
+            media_root = self.image_sizes.media_root
+            image_sizes = (
+                os.path.abspath(media_root) if media_root is not None else None,
+                self.image_sizes.max_entries,
+            )
+        return (
+            self.mode,
+            self.flyweights.max_entries if self.flyweights is not None else None,
+            image_sizes,
+            (
+                (self.chart_data.max_points, self.chart_data.method)
+                if self.chart_data is not None
+                else None
+            ),
+        )
+
     async def build_document(self, data: Dict[str, Any]) -> Document:
         """
         构建文档对象
@@ -24,6 +131,11 @@ class DocumentBuilder:
         Raises:
             BuildDocumentError: 构建过程出错
         """
+        if self.mode == "compiled":
+            return self._build_compiled(data)
+        if self.mode == "trusted":
+            return self._build_trusted(data)
+
         try:
             document = Document(title=data["title"], metadata=data.get("metadata", {}))
 
@@ -36,9 +148,54 @@ class DocumentBuilder:
             return document
 
         except KeyError as e:
-            raise BuildDocumentError(f"缺少必需字段: {str(e)}")
+            raise BuildDocumentError(f"缺少必需字段: {str(e)}") from e
+        except Exception as e:
+            raise BuildDocumentError(f"文档构建失败: {str(e)}") from e
+
+    async def build_compact_document(self, data: Dict[str, Any]) -> CompactDocument:
+        """
+        构建紧凑文档对象
+
+        逐页构建幻灯片并立即转存到列中，同一时刻只有一页幻灯片的元素对象存在。
+
+        Args:
+            data: 验证后的数据字典
+
+        Returns:
+            CompactDocument: 构建的紧凑文档
+
+        Raises:
+            BuildDocumentError: 构建过程出错
+        """
+        try:
+            header = Document(title=data["title"], metadata=data.get("metadata", {}))
+            document = CompactDocument(title=header.title, metadata=header.metadata)
+
+            if "slides" in data:
+                for slide_data in data["slides"]:
+                    document.append_slide(await self._build_slide(slide_data))
+
+            return document
+
+        except KeyError as e:
+            raise BuildDocumentError(f"缺少必需字段: {str(e)}") from e
         except Exception as e:
-            raise BuildDocumentError(f"文档构建失败: {str(e)}")
+            raise BuildDocumentError(f"文档构建失败: {str(e)}") from e
+
+    async def build_slide(self, slide_data: Dict[str, Any]) -> Slide:
+        """
+        构建单个幻灯片对象，用于流式解析
+
+        Args:
+            slide_data: 验证后的幻灯片数据字典
+
+        Returns:
+            Slide: 构建的幻灯片对象
+
+        Raises:
+            BuildDocumentError: 构建过程出错
+        """
+        return await self._build_slide(slide_data)
 
     async def _build_slide(self, slide_data: Dict[str, Any]) -> Slide:
         """构建幻灯片对象"""
@@ -58,26 +215,212 @@ class DocumentBuilder:
             return slide
 
         except KeyError as e:
-            raise BuildDocumentError(f"幻灯片缺少必需字段: {str(e)}")
+            raise BuildDocumentError(f"幻灯片缺少必需字段: {str(e)}") from e
         except Exception as e:
-            raise BuildDocumentError(f"幻灯片构建失败: {str(e)}")
+            raise BuildDocumentError(f"幻灯片构建失败: {str(e)}") from e
 
     async def _build_element(self, element_data: Dict[str, Any]) -> Element:
         """构建元素对象"""
         try:
-            position = Position(**element_data["position"])
-            style = Style(**(element_data.get("style", {})))
+            if self.flyweights is not None:
+                position = self.flyweights.position(element_data["position"])
+                style = self.flyweights.style(element_data.get("style", {}))
+            else:
+                position = Position(**element_data["position"])
+                style = Style(**(element_data.get("style", {})))
+
+            content = element_data["content"]
+            size = element_data.get("size")
+            if self._completer is not None:
+                content, size = self._completer(
+                    element_data["type"], content, size, position.unit
+                )
 
             element = Element(
                 type=element_data["type"],
-                content=element_data["content"],
+                content=content,
                 position=position,
                 style=style,
-                size=element_data.get("size"),
+                size=size,
             )
             return element
 
         except KeyError as e:
-            raise BuildDocumentError(f"元素缺少必需字段: {str(e)}")
+            raise BuildDocumentError(f"元素缺少必需字段: {str(e)}") from e
+        except Exception as e:
+            raise BuildDocumentError(f"元素构建失败: {str(e)}") from e
+
+    def _complete_element(
+        self, element_type: Any, content: Any, size: Any, unit: str
+    ) -> Tuple[Any, Any]:
+        """补全图片元素的大小，转换图表元素的数据"""
+        if element_type == "image" and self.image_sizes is not None:
+            size = self.image_sizes.default_size(content, size, unit)
+        elif element_type == "chart" and self.chart_data is not None:
+            content = self.chart_data.process(content)
+        return content, size
+
+    def _build_compiled(self, data: Dict[str, Any]) -> Document:
+        """用一次编译验证器调用构建整个文档"""
+        try:
+            with gc_paused(self.pause_gc):
+                return _document_adapter().validate_python(
+                    _project_document(data, self._completer)
+                )
+        except PydanticValidationError as e:
+            raise _build_error_from_pydantic(e) from e
         except Exception as e:
-            raise BuildDocumentError(f"元素构建失败: {str(e)}")
+            raise BuildDocumentError(f"文档构建失败: {str(e)}") from e
+
+    def _build_trusted(self, data: Dict[str, Any]) -> Document:
+        """不经验证，按输入的字段直接创建模型对象，只遍历一次数据"""
+        completer = self._completer
+
+        def element(element_data: Dict[str, Any]) -> Element:
+            position = construct_with_defaults(Position, element_data["position"])
+            content = element_data["content"]
+            size = element_data.get("size")
+            if completer is not None:
+                content, size = completer(
+                    element_data["type"], content, size, position.unit
+                )
+            return construct(
+                Element,
+                {
+                    "type": element_data["type"],
+                    "content": content,
+                    "position": position,
+                    "style": construct_with_defaults(
+                        Style, element_data.get("style", {})
+                    ),
+                    "size": size,
+                },
+                {"type", "content", "position", "style", "size"},
+                {},
+            )
+
+        try:
+            with gc_paused(self.pause_gc):
+                slides = [
+                    construct(
+                        Slide,
+                        {
+                            "title": slide_data["title"],
+                            "elements": [
+                                element(element_data)
+                                for element_data in slide_data.get("elements", ())
+                            ],
+                            "background": slide_data.get("background"),
+                            "layout": slide_data.get("layout"),
+                            "notes": None,
+                        },
+                        {"title", "elements", "background", "layout"},
+                        {},
+                    )
+                    for slide_data in data.get("slides", ())
+                ]
+            return construct(
+                Document,
+                {
+                    "title": data["title"],
+                    "slides": slides,
+                    "theme": None,
+                    "metadata": data.get("metadata", {}),
+                },
+                {"title", "slides", "metadata"},
+            )
+        except KeyError as e:
+            raise BuildDocumentError(f"缺少必需字段: {str(e)}") from e
+        except Exception as e:
+            raise BuildDocumentError(f"文档构建失败: {str(e)}") from e
+
+
+def _project_document(
+    data: Dict[str, Any], completer: Optional[ElementCompleter] = None
+) -> Dict[str, Any]:
+    """
+    只保留逐个构建模式会读取的字段
+
+    缺少的字段不补默认值，由验证器报告；不是字典的幻灯片和元素原样保留，
+    由验证器报告类型错误。
+    """
+    document = {"metadata": data.get("metadata", {})}
+    if "title" in data:
+        document["title"] = data["title"]
+
+    slides = data.get("slides", [])
+    if isinstance(slides, list):
+        slides = [_project_slide(slide_data, completer) for slide_data in slides]
+    document["slides"] = slides
+    return document
+
+
+def _project_slide(
+    slide_data: Any, completer: Optional[ElementCompleter] = None
+) -> Any:
+    """只保留幻灯片会被读取的字段"""
+    if not isinstance(slide_data, dict):
+        return slide_data
+    slide = {key: slide_data[key] for key in _SLIDE_FIELDS if key in slide_data}
+    elements = slide_data.get("elements", [])
+    if isinstance(elements, list):
+        elements = [
+            (
+                _project_element(element, completer)
+                if isinstance(element, dict)
+                else element
+            )
+            for element in elements
+        ]
+    slide["elements"] = elements
+    return slide
+
+
+def _project_element(
+    element: Dict[str, Any], completer: Optional[ElementCompleter]
+) -> Dict[str, Any]:
+    """只保留元素会被读取的字段，并补全元素的内容和大小"""
+    projected = {key: element[key] for key in _ELEMENT_FIELDS if key in element}
+    if completer is not None and "content" in element:
+        position = element.get("position")
+        unit = position.get("unit", "px") if isinstance(position, dict) else "px"
+        content, size = completer(
+            element.get("type"), element["content"], element.get("size"), unit
+        )
+        projected["content"] = content
+        if size is not None:
+            projected["size"] = size
+    return projected
+
+
+def _build_error_from_pydantic(error: PydanticValidationError) -> BuildDocumentError:
+    """
+    将整个文档的验证错误转换为构建错误
+
+    根据第一个错误的位置确定出错的幻灯片和元素序号，所有错误的位置和信息
+    保存在details["errors"]中。
+    """
+    errors = error.errors(include_url=False)
+    loc = errors[0]["loc"]
+
+    details: Dict[str, Any] = {}
+    stage = "document"
+    if len(loc) >= 2 and loc[0] == "slides" and isinstance(loc[1], int):
+        stage = "slide"
+        details["slide_index"] = loc[1]
+        if len(loc) >= 4 and loc[2] == "elements" and isinstance(loc[3], int):
+            stage = "element"
+            details["element_index"] = loc[3]
+    details["errors"] = [
+        {"loc": ".".join(str(part) for part in item["loc"]), "msg": item["msg"]}
+        for item in errors
+    ]
+
+    prefix = {"document": "", "slide": "幻灯片", "element": "元素"}[stage]
+    field_depth = {"document": 1, "slide": 3, "element": 5}[stage]
+    if errors[0]["type"] == "missing" and len(loc) == field_depth:
+        # 与逐个构建模式的提示保持一致
+        message = f"{prefix}缺少必需字段: '{loc[-1]}'"
+    else:
+        message = f"{prefix or '文档'}构建失败: {str(error)}"
+    return BuildDocumentError(message, stage=stage, details=details)
@@ -0,0 +1,181 @@
+"""
+享元缓存模块
+对内容相同的样式和位置数据只验证一次，并在元素之间共享同一个不可变模型实例
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Tuple, Type, TypeVar
+from ..models.document import FrozenPosition, FrozenStyle, Position, Style
+
+# 默认最多缓存的不同取值数量
+DEFAULT_MAX_ENTRIES = 4096
+
+ModelT = TypeVar("ModelT", Position, Style)
+
+
+@dataclass
+class FlyweightStats:
+    """
+    享元缓存统计信息
+
+    Attributes:
+        hits: 命中次数
+        misses: 未命中次数（包括无法缓存的取值）
+        evictions: 淘汰的条目数
+        entries: 当前条目数
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class FlyweightCache:
+    """
+    样式和位置的享元缓存
+
+    以字段内容为键，每个不同的取值只创建并验证一次模型，之后直接返回同一个
+    不可变实例；字段顺序不同的相同内容也共享实例。缓存按最近最少使用的顺序
+    淘汰，条目数不超过max_entries。验证失败的取值不缓存。
+
+    键按值相等比较，因此 True、1 和 1.0 这类相等的取值共用一个实例。
+    Style 和 Position 的字段对这些取值的验证结果完全相同，共用是安全的。
+
+    共享的实例是 FrozenStyle 和 FrozenPosition，修改其字段会抛出异常；
+    它们与内容相同的 Style 和 Position 比较时视为相等。
+
+    示例:
+        ```python
+        engine = ParserEngine(flyweights=FlyweightCache())
+        document = await engine.parse(input_json)
+        print(engine.document_builder.flyweights.stats.hit_rate)
+        ```
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        初始化享元缓存
+
+        Args:
+            max_entries: 样式和位置合计的最大条目数
+        """
+        if max_entries <= 0:
+            raise ValueError("享元缓存条目数必须大于0")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[type, Hashable], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = FlyweightStats()
+
+    def position(self, data: Dict[str, Any]) -> Position:
+        """
+        获取与数据对应的共享位置实例
+
+        Args:
+            data: 位置数据字典
+
+        Returns:
+            Position: 不可变的位置实例
+
+        Raises:
+            pydantic.ValidationError: 数据验证失败
+        """
+        return self._get(FrozenPosition, data)
+
+    def style(self, data: Dict[str, Any]) -> Style:
+        """
+        获取与数据对应的共享样式实例
+
+        Args:
+            data: 样式数据字典
+
+        Returns:
+            Style: 不可变的样式实例
+
+        Raises:
+            pydantic.ValidationError: 数据验证失败
+        """
+        return self._get(FrozenStyle, data)
+
+    def clear(self) -> None:
+        """清空缓存（统计信息保留）"""
+        with self._lock:
+            self._entries.clear()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """序列化时只保留配置，传给解析执行器的工作进程后从空缓存开始"""
+        return {"max_entries": self.max_entries}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        FlyweightCache.__init__(self, **state)
+
+    @property
+    def stats(self) -> FlyweightStats:
+        """当前的统计信息"""
+        with self._lock:
+            return FlyweightStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+            )
+
+    def _get(self, model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+        """按字段内容查找实例，未命中时创建并缓存"""
+        entries = self._entries
+        stats = self._stats
+        # 查找、调整淘汰顺序和更新统计在同一次加锁中完成，模型在锁外创建
+        with self._lock:
+            try:
+                key = (model, tuple(data.items()))
+                instance = entries.get(key)
+            except (AttributeError, TypeError):
+                # 不是字典或取值不可哈希，直接创建，由模型报告错误
+                stats.misses += 1
+                cacheable = False
+            else:
+                cacheable = True
+                if instance is not None:
+                    entries.move_to_end(key)
+                    stats.hits += 1
+                    return instance
+                stats.misses += 1
+                # 字段顺序不同但内容相同的取值共享同一个实例
+                canonical = (model, tuple(sorted(key[1], key=_field_name)))
+                instance = entries.get(canonical)
+                if instance is not None:
+                    entries.move_to_end(canonical)
+                    self._store(key, instance)
+                    return instance
+
+        instance = model(**data)
+        if not cacheable:
+            return instance
+        with self._lock:
+            # 其他线程可能已经缓存了同一取值，沿用先缓存的实例
+            instance = entries.setdefault(canonical, instance)
+            entries.move_to_end(canonical)
+            self._store(key, instance)
+        return instance
+
+    def _store(self, key: Tuple[type, Hashable], instance: Any) -> None:
+        """在持有锁时写入条目并淘汰超出的条目"""
+        entries = self._entries
+        entries[key] = instance
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self._stats.evictions += 1
+
+
+def _field_name(item: Tuple[str, Any]) -> str:
+    """按字段名排序"""
+    return item[0]
@@ -0,0 +1,214 @@
+"""
+融合解析管道模块
+在一次遍历中完成深度检查、结构验证和文档构建
+"""
+
+from typing import Dict, Any, List, Optional
+from pydantic import ValidationError as PydanticValidationError
+from ..exceptions import ParseError, BuildDocumentError
+from ..models.document import Document, Slide, Element, Position, Style
+from .validator import compile_schema
+
+# 这些字段只接受标量值，嵌套容器会被模型拒绝，深度检查可以推迟到构建失败时
+_SCALAR_FIELDS = {
+    "position": frozenset(Position.model_fields),
+    "style": frozenset(Style.model_fields),
+}
+
+
+class FusedPipeline:
+    """
+    融合解析管道
+
+    默认流程会对同一棵数据树遍历多次：解码器重建对象检查深度、插件检查结构、
+    验证器再次检查、构建器逐个创建模型。融合管道对解码后的原始数据只遍历一次，
+    在访问每个节点时同时完成深度检查、结构验证和模型构建。
+
+    结构验证使用与 Validator 相同的由模型生成的规则，抛出的异常类型与默认流程
+    保持一致：
+        ParseError: 深度超限或根节点不是对象
+        ValidationError: 结构验证失败
+        BuildDocumentError: 模型构建失败
+
+    当输入同时存在多处错误时，默认流程按阶段报告错误，融合管道按文档顺序报告
+    遇到的第一个错误。
+    """
+
+    def __init__(self, max_depth: Optional[int] = None):
+        """
+        初始化融合管道
+
+        Args:
+            max_depth: 最大嵌套深度，None表示不限制
+        """
+        self.max_depth = max_depth
+        # 幻灯片和元素在遍历到时逐个验证，文档和幻灯片只检查自身的字段
+        self._document_schema = compile_schema(Document, shallow=True)
+        self._slide_schema = compile_schema(Slide, shallow=True)
+        self._element_schema = compile_schema(Element)
+
+    def run(self, data: Any) -> Document:
+        """
+        验证并构建文档对象
+
+        Args:
+            data: 解码后的原始数据
+
+        Returns:
+            Document: 构建的文档对象
+
+        Raises:
+            ParseError: 数据结构无效或嵌套深度超过限制
+            ValidationError: 数据验证失败
+            BuildDocumentError: 文档构建失败
+        """
+        # 深度检查先于结构检查，与默认流程中解码阶段先行的顺序一致
+        if not isinstance(data, dict):
+            self._check_depth(data, 0)
+            raise ParseError("JSON根节点必须是对象")
+        self._check_container(0, len(data))
+        for key, value in data.items():
+            if key == "slides" and isinstance(value, list):
+                self._check_container(1, len(value))
+            else:
+                self._check_depth(value, 1)
+
+        # 与默认流程中的插件一致，幻灯片不是对象时在验证之前报告为ParseError
+        slides_data = data.get("slides")
+        if isinstance(slides_data, list):
+            for slide_data in slides_data:
+                if not isinstance(slide_data, dict):
+                    self._check_depth(slide_data, 2)
+                    raise ParseError("幻灯片必须是对象")
+
+        self._document_schema.validate(data)
+
+        slides = [
+            self._run_slide(slide_data, index)
+            for index, slide_data in enumerate(data["slides"])
+        ]
+
+        try:
+            return Document(
+                title=data["title"], metadata=data.get("metadata", {}), slides=slides
+            )
+        except PydanticValidationError as e:
+            raise BuildDocumentError(f"文档构建失败: {str(e)}", stage="document") from e
+
+    def _run_slide(self, slide_data: Any, slide_index: int) -> Slide:
+        """验证并构建单个幻灯片"""
+        pointer = f"/slides/{slide_index}"
+        self._check_container(2, len(slide_data))
+        for key, value in slide_data.items():
+            if key == "elements" and isinstance(value, list):
+                self._check_container(3, len(value))
+            else:
+                self._check_depth(value, 3)
+
+        self._slide_schema.validate(slide_data, pointer)
+
+        elements = [
+            self._run_element(element_data, slide_index, element_index)
+            for element_index, element_data in enumerate(slide_data["elements"])
+        ]
+
+        try:
+            return Slide(
+                title=slide_data["title"],
+                background=slide_data.get("background"),
+                layout=slide_data.get("layout"),
+                elements=elements,
+            )
+        except PydanticValidationError as e:
+            raise BuildDocumentError(
+                f"幻灯片构建失败: {str(e)}",
+                stage="slide",
+                details={"slide_index": slide_index},
+            ) from e
+
+    def _run_element(
+        self, element_data: Any, slide_index: int, element_index: int
+    ) -> Element:
+        """验证并构建单个元素"""
+        pointer = f"/slides/{slide_index}/elements/{element_index}"
+        if not isinstance(element_data, dict):
+            self._check_depth(element_data, 4)
+            self._element_schema.validate(element_data, pointer)
+        self._check_container(4, len(element_data))
+        for key, value in element_data.items():
+            if not isinstance(value, (dict, list)) or key == "size":
+                continue
+            scalar_fields = _SCALAR_FIELDS.get(key)
+            if (
+                scalar_fields is None
+                or not isinstance(value, dict)
+                or not value.keys() <= scalar_fields
+            ):
+                self._check_depth(value, 5)
+
+        self._element_schema.validate(element_data, pointer)
+
+        fields: Dict[str, Any] = {
+            "type": element_data["type"],
+            "content": element_data["content"],
+            "position": element_data["position"],
+            "style": element_data.get("style", {}),
+            "size": element_data.get("size"),
+        }
+        try:
+            return Element.model_validate(fields)
+        except PydanticValidationError as e:
+            # 被推迟的深度检查，保证过深的输入仍然报告为ParseError
+            self._check_depth(element_data, 4)
+            raise BuildDocumentError(
+                f"元素构建失败: {str(e)}",
+                stage="element",
+                details={"slide_index": slide_index, "element_index": element_index},
+            ) from e
+
+    def _check_container(self, depth: int, size: int) -> None:
+        """
+        检查已知结构容器自身的深度（其子节点由调用方继续检查）
+
+        Args:
+            depth: 容器所在的深度
+            size: 容器中的子节点数量
+
+        Raises:
+            ParseError: 超过最大嵌套深度
+        """
+        max_depth = self.max_depth
+        if max_depth is None:
+            return
+        if depth > max_depth or (size and depth >= max_depth):
+            raise ParseError("JSON结构嵌套深度超过限制")
+
+    def _check_depth(self, value: Any, depth: int) -> None:
+        """
+        检查子树的嵌套深度，语义与DepthLimitedJSONDecoder一致
+
+        Args:
+            value: 要检查的值
+            depth: 该值所在的深度
+
+        Raises:
+            ParseError: 超过最大嵌套深度
+        """
+        max_depth = self.max_depth
+        if max_depth is None:
+            return
+        if depth > max_depth:
+            raise ParseError("JSON结构嵌套深度超过限制")
+        if not isinstance(value, (dict, list)):
+            return
+
+        # 使用显式栈代替递归
+        stack: List[Any] = [(value, depth)]
+        while stack:
+            node, node_depth = stack.pop()
+            children = node.values() if isinstance(node, dict) else node
+            if children and node_depth >= max_depth:
+                raise ParseError("JSON结构嵌套深度超过限制")
+            for child in children:
+                if isinstance(child, (dict, list)):
+                    stack.append((child, node_depth + 1))
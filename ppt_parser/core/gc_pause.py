@@ -0,0 +1,49 @@
+"""
+循环垃圾回收的暂停控制
+
+一次性构建整个文档时会连续创建大量容器对象，频繁触发的分代回收每次都要遍历
+已创建的对象，占用了相当一部分构建时间。gc 的开关是进程级的状态，多个线程
+同时构建时不能各自开关：这里按引用计数管理，第一个进入的构建暂停回收，
+最后一个退出的构建恢复回收。
+"""
+
+import gc
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+_lock = threading.Lock()
+# 正在暂停回收的构建数量
+_depth = 0
+# 第一个构建进入时回收是否处于开启状态，最后一个构建退出时按此恢复
+_was_enabled = False
+
+
+@contextmanager
+def gc_paused(enabled: bool = True) -> Iterator[None]:
+    """
+    在上下文期间暂停循环垃圾回收
+
+    可以在多个线程中同时使用，所有上下文都退出后才恢复回收；进入时回收
+    已经关闭的，退出后仍保持关闭。
+
+    Args:
+        enabled: 为False时不做任何操作，便于按配置选择是否暂停
+    """
+    global _depth, _was_enabled  # pylint: disable=global-statement
+    if not enabled:
+        yield
+        return
+    with _lock:
+        if _depth == 0:
+            _was_enabled = gc.isenabled()
+            if _was_enabled:
+                gc.disable()
+        _depth += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _depth -= 1
+            if _depth == 0 and _was_enabled:
+                gc.enable()
@@ -0,0 +1,311 @@
+"""
+图片尺寸读取模块
+只解析图片文件头获取像素尺寸，不解码图片数据，用于在构建文档时补全图片元素的大小
+
+支持 PNG、JPEG、GIF、BMP 和 WebP。除 JPEG 外只读取文件开头的几十个字节；
+JPEG 逐段跳过，直到遇到帧头（SOF）为止。
+"""
+
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, NamedTuple, Optional, Tuple, Union
+from .parse_cache import CacheStats
+
+# 默认最多缓存的图片数量
+DEFAULT_MAX_ENTRIES = 16384
+
+# 每个位置单位对应的像素数，图片的一个像素按1px（96DPI）换算
+PX_PER_UNIT = {"px": 1.0, "pt": 96 / 72, "in": 96.0, "cm": 96 / 2.54}
+
+# 除JPEG外，识别格式和读取尺寸需要的文件头长度
+_HEADER_SIZE = 32
+
+# 没有长度字段的JPEG标记
+_JPEG_STANDALONE_MARKERS = frozenset([0x01, *range(0xD0, 0xD9)])
+
+# 带有图像尺寸的JPEG帧头标记（C4、C8、CC不是帧头）
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+class ImageInfo(NamedTuple):
+    """
+    图片信息
+
+    Attributes:
+        format: 图片格式，"png"、"jpeg"、"gif"、"bmp"或"webp"
+        width: 宽度（像素）
+        height: 高度（像素）
+    """
+
+    format: str
+    width: int
+    height: int
+
+
+def read_image_info(source: Union[str, os.PathLike, BinaryIO]) -> Optional[ImageInfo]:
+    """
+    读取图片的格式和像素尺寸
+
+    Args:
+        source: 图片文件路径，或从图片开头读取的二进制文件对象
+
+    Returns:
+        Optional[ImageInfo]: 图片信息，不是支持的格式或文件头不完整时返回None
+
+    Raises:
+        OSError: 无法读取文件
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as image:
+            return read_image_info(image)
+
+    header = source.read(_HEADER_SIZE)
+    if header.startswith(b"\xff\xd8"):
+        return _jpeg_info(source, header[2:])
+    try:
+        return _header_info(header)
+    except (struct.error, IndexError):
+        # 文件头不完整
+        return None
+
+
+def _header_info(header: bytes) -> Optional[ImageInfo]:
+    """从文件开头的字节中读取PNG、GIF、BMP和WebP的尺寸"""
+    if header.startswith(b"\x89PNG\r\n\x1a\n") and header[12:16] == b"IHDR":
+        width, height = struct.unpack_from(">II", header, 16)
+        return ImageInfo("png", width, height)
+
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        width, height = struct.unpack_from("<HH", header, 6)
+        return ImageInfo("gif", width, height)
+
+    if header.startswith(b"BM"):
+        (dib_size,) = struct.unpack_from("<I", header, 14)
+        if dib_size == 12:
+            width, height = struct.unpack_from("<HH", header, 18)
+        else:
+            # 高度为负数表示自上而下存储的位图
+            width, height = struct.unpack_from("<ii", header, 18)
+        return ImageInfo("bmp", abs(width), abs(height))
+
+    if header.startswith(b"RIFF") and header[8:12] == b"WEBP":
+        chunk = header[12:16]
+        if chunk == b"VP8 " and header[23:26] == b"\x9d\x01\x2a":
+            width, height = struct.unpack_from("<HH", header, 26)
+            return ImageInfo("webp", width & 0x3FFF, height & 0x3FFF)
+        if chunk == b"VP8L" and header[20] == 0x2F:
+            (bits,) = struct.unpack_from("<I", header, 21)
+            return ImageInfo("webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+        if chunk == b"VP8X":
+            width = int.from_bytes(header[24:27], "little") + 1
+            height = int.from_bytes(header[27:30], "little") + 1
+            return ImageInfo("webp", width, height)
+    return None
+
+
+def _jpeg_info(source: BinaryIO, buffered: bytes) -> Optional[ImageInfo]:
+    """
+    逐段跳过JPEG的标记段，从第一个帧头中读取尺寸
+
+    Args:
+        source: 图片文件对象，位置在已读取的文件头之后
+        buffered: 已经读取但尚未解析的字节（SOI标记之后）
+    """
+    data = bytearray(buffered)
+
+    def take(count: int) -> Optional[bytes]:
+        """从已读取的字节和文件中取出count个字节"""
+        if len(data) < count:
+            data.extend(source.read(count - len(data)))
+            if len(data) < count:
+                return None
+        chunk = bytes(data[:count])
+        del data[:count]
+        return chunk
+
+    while True:
+        prefix = take(1)
+        if prefix is None:
+            return None
+        if prefix != b"\xff":
+            # 标记之间不应有其他数据，文件已损坏
+            return None
+        marker = take(1)
+        # 标记前可以有任意多个填充字节0xFF
+        while marker == b"\xff":
+            marker = take(1)
+        if marker is None:
+            return None
+        code = marker[0]
+        if code in _JPEG_STANDALONE_MARKERS:
+            continue
+        if code == 0xD9:
+            return None
+
+        length_bytes = take(2)
+        if length_bytes is None:
+            return None
+        (length,) = struct.unpack(">H", length_bytes)
+        if length < 2:
+            return None
+        if code in _JPEG_SOF_MARKERS:
+            frame = take(5)
+            if frame is None:
+                return None
+            height, width = struct.unpack_from(">HH", frame, 1)
+            return ImageInfo("jpeg", width, height)
+
+        skip = length - 2
+        if len(data) >= skip:
+            del data[:skip]
+        else:
+            skip -= len(data)
+            data.clear()
+            source.seek(skip, os.SEEK_CUR)
+
+
+class ImageSizeCache:
+    """
+    图片尺寸缓存
+
+    以(路径, 修改时间, 文件大小)为键缓存图片信息，文件没有变化时不再读取。
+    缓存按最近最少使用的顺序淘汰，条目数不超过max_entries。
+    无法识别的图片同样会被缓存（结果为None），不存在的文件不缓存。
+
+    示例:
+        ```python
+        engine = ParserEngine(image_sizes=ImageSizeCache(media_root="assets"))
+        document = await engine.parse(input_json)
+        ```
+    """
+
+    def __init__(
+        self,
+        media_root: Optional[Union[str, os.PathLike]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        初始化图片尺寸缓存
+
+        Args:
+            media_root: 图片元素中相对路径的基准目录，默认为当前工作目录
+            max_entries: 最大条目数
+        """
+        if max_entries <= 0:
+            raise ValueError("图片尺寸缓存条目数必须大于0")
+        self.media_root = media_root
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int, int], Optional[ImageInfo]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        """缓存统计信息的快照"""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+            )
+
+    def info(self, path: Union[str, os.PathLike]) -> Optional[ImageInfo]:
+        """
+        获取图片信息
+
+        Args:
+            path: 图片路径，相对路径基于media_root
+
+        Returns:
+            Optional[ImageInfo]: 图片信息，文件不存在或无法识别时返回None
+        """
+        path = os.fspath(path)
+        if self.media_root is not None:
+            path = os.path.join(self.media_root, path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return self._entries[key]
+            self._stats.misses += 1
+
+        try:
+            info = read_image_info(path)
+        except OSError:
+            return None
+        with self._lock:
+            self._entries[key] = info
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+        return info
+
+    def default_size(
+        self, content: Any, size: Optional[Dict[str, Any]], unit: str = "px"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        补全图片元素的大小
+
+        没有指定大小时使用图片的像素尺寸；只指定了宽度或高度时按图片的
+        宽高比计算另一边。已经指定了宽度和高度，或无法读取图片时原样返回。
+
+        Args:
+            content: 图片元素的内容（图片路径）
+            size: 元素原有的大小
+            unit: 元素位置的单位，补全的大小使用相同的单位
+
+        Returns:
+            Optional[Dict[str, Any]]: 补全后的大小
+        """
+        if size is not None and (
+            not isinstance(size, dict) or ("width" in size and "height" in size)
+        ):
+            return size
+        if not isinstance(content, str) or unit not in PX_PER_UNIT:
+            return size
+        info = self.info(content)
+        if info is None or not info.width or not info.height:
+            return size
+
+        result = dict(size or {})
+        if not all(
+            isinstance(result[key], (int, float))
+            for key in ("width", "height")
+            if key in result
+        ):
+            # 无效的大小交给模型验证报告
+            return size
+        if "width" in result:
+            result["height"] = result["width"] * info.height / info.width
+        elif "height" in result:
+            result["width"] = result["height"] * info.width / info.height
+        else:
+            scale = PX_PER_UNIT[unit]
+            result["width"] = info.width / scale
+            result["height"] = info.height / scale
+        return result
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """序列化时只保留配置，传给解析执行器的工作进程后从空缓存开始"""
+        return {"media_root": self.media_root, "max_entries": self.max_entries}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        ImageSizeCache.__init__(self, **state)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,96 @@
+"""
+增量解析模块
+为幻灯片数据计算内容摘要，并记录已构建的幻灯片对象对应的摘要，
+使重新解析时可以复用内容未变化的幻灯片
+"""
+
+import hashlib
+import marshal
+import threading
+import weakref
+from typing import Any, Dict, List, Optional
+from ..models.document import Document, Slide
+
+
+def slide_digest(slide_data: Dict[str, Any], config: Any = None) -> str:
+    """
+    计算幻灯片数据子树的内容摘要
+
+    使用marshal序列化，比JSON编码快一个数量级。选用不含对象引用的格式版本2，
+    输出只取决于数据的值和字段顺序；字段顺序不同的相同内容会被视为已修改，
+    只会导致重建而不会错误复用。
+
+    Args:
+        slide_data: 解码后的幻灯片数据字典
+        config: 影响构建结果的配置，按repr计入摘要，例如
+            DocumentBuilder.config_key；配置不同时相同的数据得到不同的摘要
+
+    Returns:
+        str: 十六进制的摘要
+    """
+    digest = hashlib.blake2b(repr(config).encode("utf-8"), digest_size=16)
+    digest.update(marshal.dumps(slide_data, 2))
+    return digest.hexdigest()
+
+
+class SlideDigestIndex:
+    """
+    幻灯片摘要索引
+
+    记录幻灯片对象由哪份数据构建而来。摘要保存在索引中而不是模型上，
+    因此不影响模型的比较和序列化；幻灯片对象被回收时对应的记录自动删除。
+    """
+
+    def __init__(self):
+        self._digests: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def record(self, slide: Slide, digest: str) -> None:
+        """
+        记录幻灯片对象的摘要
+
+        Args:
+            slide: 构建的幻灯片对象
+            digest: 构建所用数据的摘要
+        """
+        key = id(slide)
+        with self._lock:
+            if key not in self._digests:
+                weakref.finalize(slide, self._discard, key)
+            self._digests[key] = digest
+
+    def lookup(self, slide: Slide) -> Optional[str]:
+        """
+        查询幻灯片对象的摘要
+
+        Args:
+            slide: 幻灯片对象
+
+        Returns:
+            Optional[str]: 摘要，不是由增量解析构建的幻灯片返回None
+        """
+        return self._digests.get(id(slide))
+
+    def reusable_slides(self, document: Document) -> Dict[str, List[Slide]]:
+        """
+        按摘要对文档中可复用的幻灯片分组
+
+        Args:
+            document: 上一次解析的文档对象
+
+        Returns:
+            Dict[str, List[Slide]]: 摘要到幻灯片对象列表的映射（保持原有顺序）
+        """
+        groups: Dict[str, List[Slide]] = {}
+        for slide in document.slides:
+            digest = self.lookup(slide)
+            if digest is not None:
+                groups.setdefault(digest, []).append(slide)
+        return groups
+
+    def _discard(self, key: int) -> None:
+        with self._lock:
+            self._digests.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._digests)
@@ -0,0 +1,340 @@
+"""
+解析埋点模块
+在解析引擎的各个阶段周围提供可替换的计时和追踪钩子，并记录每次解析的计数
+
+阶段名称:
+    parse         一次完整的解析（包括缓存查找），ParserEngine的每个parse_*方法
+                  都会记录，流式解析包括调用方处理幻灯片的时间
+    cache_lookup  查找解析缓存
+    decode        插件解码输入（包括嵌套深度检查和根节点检查）
+    validate      验证数据
+    build         构建文档
+    fused         融合解析模式下的解码、验证和构建
+    executor      在解析执行器中完成的解码、验证和构建
+    cache_store   写入解析缓存
+
+示例:
+    ```python
+    exporter = PrometheusExporter()
+    engine = ParserEngine(instrumentation=exporter)
+    ...
+    text = exporter.render()  # 由 /metrics 接口返回
+    ```
+"""
+
+import math
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import ContextManager, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Prometheus 文本格式的 Content-Type
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 未注册的格式类型在解析计数中记录的名称，格式类型由调用方传入，
+# 原样记录会让指标的标签取值无限增长
+UNKNOWN_FORMAT = "unknown"
+
+# 阶段耗时直方图的默认桶上限（秒）
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class ParseStats:
+    """
+    单次解析的计数
+
+    Attributes:
+        format_type: 数据格式类型，未注册的格式类型为UNKNOWN_FORMAT
+        input_bytes: 输入数据的UTF-8编码大小
+        slides: 生成的幻灯片数量，解析失败时为0（流式解析为失败前已生成的数量）
+        elements: 生成的元素数量，解析失败时为0（流式解析为失败前已生成的数量）
+        cache_hit: 是否命中解析缓存
+        error: 解析失败时的异常类型名称
+    """
+
+    format_type: str
+    input_bytes: int = 0
+    slides: int = 0
+    elements: int = 0
+    cache_hit: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """是否解析成功"""
+        return self.error is None
+
+
+class SpanRecord(NamedTuple):
+    """一个已结束的阶段"""
+
+    name: str
+    seconds: float
+    ok: bool
+
+
+class _Span:
+    """计时的阶段，结束时调用所属埋点对象的record_span"""
+
+    __slots__ = ("_instrumentation", "_name", "_start")
+
+    def __init__(self, instrumentation: "Instrumentation", name: str):
+        self._instrumentation = instrumentation
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self._instrumentation.record_span(
+            self._name, time.perf_counter() - self._start, exc_type is None
+        )
+
+
+class Instrumentation:
+    """
+    解析埋点的基类
+
+    span为每个阶段返回一个上下文管理器，默认实现用perf_counter计时并在阶段
+    结束时调用record_span；每次解析结束（无论成功与否）时调用record_parse。
+    子类通常只需要覆盖这两个钩子；接入OpenTelemetry等追踪系统时可以覆盖span，
+    返回追踪系统自己的上下文管理器。
+
+    钩子在解析所在的线程中同步调用，可能被多个事件循环或线程同时调用，
+    不应执行耗时的操作。
+    """
+
+    # 为False时解析引擎不统计输入大小和元素数量，也不调用record_parse
+    enabled = True
+
+    def span(self, name: str) -> ContextManager[None]:
+        """
+        开始一个阶段
+
+        Args:
+            name: 阶段名称
+
+        Returns:
+            ContextManager[None]: 阶段的上下文管理器
+        """
+        return _Span(self, name)
+
+    def record_span(self, name: str, seconds: float, ok: bool) -> None:
+        """
+        阶段结束时调用
+
+        Args:
+            name: 阶段名称
+            seconds: 阶段耗时（秒）
+            ok: 阶段是否正常结束，抛出异常时为False
+        """
+
+    def record_parse(self, stats: ParseStats) -> None:
+        """
+        一次解析结束时调用
+
+        Args:
+            stats: 本次解析的计数
+        """
+
+
+class NullInstrumentation(Instrumentation):
+    """不做任何记录的埋点，解析引擎的默认值"""
+
+    enabled = False
+
+    # 所有阶段共用同一个空上下文管理器，不创建对象也不读取时钟
+    _NULL_SPAN = nullcontext()
+
+    def span(self, name: str) -> ContextManager[None]:
+        return self._NULL_SPAN
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class InMemoryCollector(Instrumentation):
+    """
+    在内存中保存所有阶段和解析计数的埋点，用于测试和调试
+
+    Attributes:
+        spans: 按结束顺序排列的阶段记录
+        parses: 按结束顺序排列的解析计数
+    """
+
+    def __init__(self):
+        self.spans: List[SpanRecord] = []
+        self.parses: List[ParseStats] = []
+
+    def record_span(self, name: str, seconds: float, ok: bool) -> None:
+        self.spans.append(SpanRecord(name, seconds, ok))
+
+    def record_parse(self, stats: ParseStats) -> None:
+        self.parses.append(stats)
+
+    def span_names(self) -> List[str]:
+        """按结束顺序排列的阶段名称"""
+        return [span.name for span in self.spans]
+
+    def total_seconds(self, name: str) -> float:
+        """
+        某个阶段的累计耗时
+
+        Args:
+            name: 阶段名称
+
+        Returns:
+            float: 累计耗时（秒）
+        """
+        return math.fsum(span.seconds for span in self.spans if span.name == name)
+
+    def clear(self) -> None:
+        """清空已记录的内容"""
+        self.spans.clear()
+        self.parses.clear()
+
+
+class _Histogram:
+    """单个标签组合的直方图"""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * buckets
+        self.total = 0.0
+        self.count = 0
+
+
+def _escape(value: str) -> str:
+    """转义Prometheus标签值"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """按Prometheus文本格式输出数值"""
+    return "+Inf" if value == math.inf else repr(value)
+
+
+class PrometheusExporter(Instrumentation):
+    """
+    汇总阶段耗时和解析计数，输出Prometheus文本格式的埋点
+
+    输出的指标:
+        ppt_parser_stage_duration_seconds  各阶段耗时的直方图，标签stage和status
+        ppt_parser_parses_total            解析次数，标签format和status
+        ppt_parser_cache_hits_total        缓存命中次数，标签format
+        ppt_parser_input_bytes_total       输入数据的字节数，标签format
+        ppt_parser_slides_total            生成的幻灯片数量，标签format
+        ppt_parser_elements_total          生成的元素数量，标签format
+
+    format标签的取值只有已注册的格式类型和UNKNOWN_FORMAT。所有方法都是线程安全的。
+    """
+
+    def __init__(
+        self, namespace: str = "ppt_parser", buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        """
+        初始化导出器
+
+        Args:
+            namespace: 指标名称的前缀
+            buckets: 阶段耗时直方图的桶上限（秒），按升序排列
+
+        Raises:
+            ValueError: buckets为空或未按升序排列
+        """
+        buckets = tuple(float(bucket) for bucket in buckets)
+        if not buckets or list(buckets) != sorted(set(buckets)):
+            raise ValueError("buckets必须是非空的升序序列")
+        if buckets[-1] != math.inf:
+            buckets += (math.inf,)
+        self.namespace = namespace
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], _Histogram] = {}
+        self._parses: Dict[Tuple[str, str], int] = {}
+        # 格式类型 -> [缓存命中次数, 输入字节数, 幻灯片数量, 元素数量]
+        self._totals: Dict[str, List[int]] = {}
+
+    def record_span(self, name: str, seconds: float, ok: bool) -> None:
+        key = (name, "ok" if ok else "error")
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram.counts[index] += 1
+                    break
+            histogram.total += seconds
+            histogram.count += 1
+
+    def record_parse(self, stats: ParseStats) -> None:
+        key = (stats.format_type, "ok" if stats.ok else "error")
+        with self._lock:
+            self._parses[key] = self._parses.get(key, 0) + 1
+            totals = self._totals.setdefault(stats.format_type, [0, 0, 0, 0])
+            totals[0] += stats.cache_hit
+            totals[1] += stats.input_bytes
+            totals[2] += stats.slides
+            totals[3] += stats.elements
+
+    def render(self) -> str:
+        """
+        输出Prometheus文本格式的指标
+
+        Returns:
+            str: 指标文本，HTTP响应的Content-Type应为PROMETHEUS_CONTENT_TYPE
+        """
+        prefix = self.namespace
+        lines: List[str] = []
+        with self._lock:
+            name = f"{prefix}_stage_duration_seconds"
+            lines.append(f"# HELP {name} 解析各阶段的耗时")
+            lines.append(f"# TYPE {name} histogram")
+            for (stage, status), histogram in sorted(self._histograms.items()):
+                labels = f'stage="{_escape(stage)}",status="{status}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{name}_bucket{{{labels},le="{_format_value(bound)}"}} '
+                        f"{cumulative}"
+                    )
+                lines.append(f"{name}_sum{{{labels}}} {_format_value(histogram.total)}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+            name = f"{prefix}_parses_total"
+            lines.append(f"# HELP {name} 解析次数")
+            lines.append(f"# TYPE {name} counter")
+            for (format_type, status), count in sorted(self._parses.items()):
+                lines.append(
+                    f'{name}{{format="{_escape(format_type)}",status="{status}"}} {count}'
+                )
+
+            for index, (suffix, description) in enumerate(
+                [
+                    ("cache_hits_total", "解析缓存命中次数"),
+                    ("input_bytes_total", "输入数据的字节数"),
+                    ("slides_total", "生成的幻灯片数量"),
+                    ("elements_total", "生成的元素数量"),
+                ]
+            ):
+                name = f"{prefix}_{suffix}"
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} counter")
+                for format_type, totals in sorted(self._totals.items()):
+                    lines.append(
+                        f'{name}{{format="{_escape(format_type)}"}} {totals[index]}'
+                    )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """清空所有指标"""
+        with self._lock:
+            self._histograms.clear()
+            self._parses.clear()
+            self._totals.clear()
@@ -1,35 +1,266 @@
 """
 核心模块日志配置
 提供统一的日志记录机制
+
+默认的同步模式在调用线程中直接写入标准错误。高负载时可以切换到队列模式，
+调用线程只把日志记录放入有界队列，由后台线程格式化并写入目标处理器：
+
+    ```python
+    CoreLogger.configure(mode="queue", queue_size=10000, info_sample_every=10)
+    ```
 """
+import atexit
 import logging
-from typing import Optional
+import queue
+import threading
+from collections import defaultdict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Literal, Optional, Sequence, Tuple
+
+LogMode = Literal["sync", "queue"]
+DropPolicy = Literal["drop_new", "drop_oldest"]
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# 队列模式下默认最多缓存的日志记录数
+DEFAULT_QUEUE_SIZE = 10000
+
+# 解析引擎通过extra附加的结构化字段，按此顺序输出
+STRUCTURED_FIELDS = (
+    "parse_id",
+    "format_type",
+    "duration_ms",
+    "input_bytes",
+    "slides",
+    "elements",
+)
+
+
+class StructuredFormatter(logging.Formatter):
+    """在消息末尾以key=value的形式附加结构化字段的格式化器"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = [
+            f"{name}={getattr(record, name)}"
+            for name in STRUCTURED_FIELDS
+            if getattr(record, name, None) is not None
+        ]
+        return f"{text} {' '.join(fields)}" if fields else text
+
+
+class SamplingFilter(logging.Filter):
+    """
+    对高频的低级别日志采样
+
+    级别不高于level的记录按调用位置（记录器名称和行号）分别计数，每个位置每
+    every条只保留第一条，出现次数少的消息不会被高频消息挤掉；更高级别的记录
+    全部保留。调用位置的数量是有限的，消息内容即使每次都不同也不会让计数无限增长。
+    """
+
+    def __init__(self, every: int, level: int = logging.INFO):
+        """
+        初始化采样过滤器
+
+        Args:
+            every: 每多少条记录保留一条
+            level: 参与采样的最高级别
+
+        Raises:
+            ValueError: every小于1
+        """
+        super().__init__()
+        if every < 1:
+            raise ValueError("every必须大于等于1")
+        self.every = every
+        self.level = level
+        self._counts: Dict[Tuple[str, int], int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level:
+            return True
+        with self._lock:
+            key = (record.name, record.lineno)
+            count = self._counts[key]
+            self._counts[key] = count + 1
+        return count % self.every == 0
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    写入有界队列的处理器，队列已满时按丢弃策略丢弃记录而不阻塞调用线程
+
+    Attributes:
+        dropped: 已丢弃的记录数
+    """
+
+    def __init__(self, log_queue: queue.Queue, drop_policy: DropPolicy = "drop_new"):
+        """
+        初始化处理器
+
+        Args:
+            log_queue: 有界队列
+            drop_policy: 队列已满时的策略，"drop_new"丢弃新记录，
+                "drop_oldest"丢弃队列中最早的记录
+
+        Raises:
+            ValueError: 不支持的丢弃策略
+        """
+        if drop_policy not in ("drop_new", "drop_oldest"):
+            raise ValueError(f"不支持的丢弃策略: {drop_policy}")
+        super().__init__(log_queue)
+        # QueueHandler.queue 的类型只声明了 put_nowait
+        self._log_queue = log_queue
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        self._drop_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        只合并消息参数，格式化（包括时间和异常堆栈）留给后台线程
+
+        参数在这里合并，调用方之后修改参数对象不会影响日志内容。
+        """
+        message = record.getMessage()
+        if record.args or record.msg is not message:
+            record = logging.makeLogRecord(record.__dict__)
+            record.msg = message
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self._log_queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.drop_policy == "drop_oldest":
+            try:
+                self._log_queue.get_nowait()
+                self._log_queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        with self._drop_lock:
+            self.dropped += 1
+
+
+class _Listener(QueueListener):
+    """停止时等待队列腾出空间再放入结束标记，队列已满时也能正常停止"""
+
+    queue: "queue.Queue[Optional[logging.LogRecord]]"
+    _sentinel = None
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
 
 
 class CoreLogger:
     """核心日志记录器"""
 
     _instance: Optional[logging.Logger] = None
+    # 由CoreLogger添加到日志记录器上的处理器
+    _handlers: List[logging.Handler] = []
+    _listener: Optional[QueueListener] = None
+    _queue_handler: Optional[BoundedQueueHandler] = None
+    _sampling: Optional[SamplingFilter] = None
+    _atexit_registered = False
 
     @classmethod
     def get_logger(cls) -> logging.Logger:
-        """获取日志记录器单例"""
+        """获取日志记录器单例，尚未配置时使用同步模式"""
         if cls._instance is None:
-            # 创建日志记录器
-            logger = logging.getLogger("ppt_parser")
-            logger.setLevel(logging.INFO)
+            return cls.configure()
+        return cls._instance
 
+    @classmethod
+    def configure(
+        cls,
+        mode: LogMode = "sync",
+        level: int = logging.INFO,
+        handlers: Optional[Sequence[logging.Handler]] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        drop_policy: DropPolicy = "drop_new",
+        info_sample_every: int = 1,
+    ) -> logging.Logger:
+        """
+        配置日志记录器，替换之前由CoreLogger添加的处理器
+
+        Args:
+            mode: "sync"在调用线程中写入；"queue"放入有界队列，由后台线程写入
+            level: 日志级别
+            handlers: 目标处理器，默认为输出到标准错误的处理器
+            queue_size: 队列模式下最多缓存的记录数
+            drop_policy: 队列已满时的策略，见 BoundedQueueHandler
+            info_sample_every: INFO及以下级别的记录每多少条保留一条，1表示不采样
+
+        Returns:
+            logging.Logger: 配置后的日志记录器
+
+        Raises:
+            ValueError: 参数无效
+        """
+        if mode not in ("sync", "queue"):
+            raise ValueError(f"不支持的日志模式: {mode}")
+        if queue_size < 1:
+            raise ValueError("queue_size必须大于等于1")
+        if drop_policy not in ("drop_new", "drop_oldest"):
+            raise ValueError(f"不支持的丢弃策略: {drop_policy}")
+        sampling = SamplingFilter(info_sample_every)
+
+        if handlers is None:
             # 创建控制台处理器
             console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.INFO)
+            console_handler.setLevel(level)
+            console_handler.setFormatter(StructuredFormatter(LOG_FORMAT))
+            handlers = [console_handler]
 
-            # 设置日志格式
-            formatter = logging.Formatter(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        cls.shutdown()
+        logger = logging.getLogger("ppt_parser")
+        logger.setLevel(level)
+
+        if mode == "queue":
+            queue_handler = BoundedQueueHandler(queue.Queue(queue_size), drop_policy)
+            listener = _Listener(
+                queue_handler.queue, *handlers, respect_handler_level=True
             )
-            console_handler.setFormatter(formatter)
+            listener.start()
+            cls._listener = listener
+            cls._queue_handler = queue_handler
+            cls._handlers = [queue_handler]
+            if not cls._atexit_registered:
+                # 退出前写完队列中剩余的记录
+                atexit.register(cls.shutdown)
+                cls._atexit_registered = True
+        else:
+            cls._handlers = list(handlers)
 
-            logger.addHandler(console_handler)
-            cls._instance = logger
+        if info_sample_every > 1:
+            cls._sampling = sampling
+        for handler in cls._handlers:
+            if cls._sampling is not None:
+                handler.addFilter(sampling)
+            logger.addHandler(handler)
+        cls._instance = logger
+        return logger
 
-        return cls._instance
+    @classmethod
+    def dropped(cls) -> int:
+        """队列模式下因队列已满而丢弃的记录数"""
+        return cls._queue_handler.dropped if cls._queue_handler is not None else 0
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """停止后台线程（先写完队列中的记录），并移除CoreLogger添加的处理器"""
+        if cls._listener is not None:
+            cls._listener.stop()
+            cls._listener = None
+        logger = logging.getLogger("ppt_parser")
+        for handler in cls._handlers:
+            logger.removeHandler(handler)
+            if cls._sampling is not None:
+                handler.removeFilter(cls._sampling)
+        cls._handlers = []
+        cls._sampling = None
+        cls._queue_handler = None
+        cls._instance = None
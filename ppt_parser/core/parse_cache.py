@@ -0,0 +1,360 @@
+"""
+解析缓存模块
+按输入内容、格式类型和引擎配置缓存解析结果，支持按字节预算的LRU淘汰和
+本地磁盘持久化
+
+条目保存为文档快照（见 ppt_parser.models.snapshot），不使用pickle，
+读取缓存目录中的文件不会执行任意代码。
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+from pydantic import ValidationError as PydanticValidationError
+from ..models.document import Document
+from ..models.snapshot import SnapshotError
+
+# 缓存格式版本，模型或序列化方式变化时递增，使旧的磁盘缓存自动失效
+CACHE_FORMAT_VERSION = 2
+
+# 默认内存预算（64MB）
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# 计算字符串输入的键时每次编码的字符数，临时内存与输入长度无关
+_HASH_STEP = 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    """
+    缓存统计信息
+
+    Attributes:
+        hits: 命中次数
+        misses: 未命中次数
+        evictions: 淘汰的条目数
+        entries: 当前条目数
+        size_bytes: 当前占用的字节数
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CacheBackend(ABC):
+    """缓存存储后端的基类，按键存取序列化后的字节数据"""
+
+    # 条目是否只可能由本进程写入。为True时加载条目跳过模型验证，
+    # 否则（例如磁盘上的文件可能被其他进程修改）加载时完整验证
+    TRUSTED = False
+
+    def __init__(self, max_bytes: int):
+        """
+        初始化存储后端
+
+        Args:
+            max_bytes: 字节预算，超出时按最近最少使用的顺序淘汰
+        """
+        if max_bytes <= 0:
+            raise ValueError("缓存字节预算必须大于0")
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """读取条目并标记为最近使用，不存在时返回None"""
+
+    @abstractmethod
+    def put(self, key: str, value: bytes) -> int:
+        """
+        写入条目
+
+        Returns:
+            int: 为腾出空间而淘汰的条目数
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """清空所有条目"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """当前条目数"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """内存存储后端"""
+
+    TRUSTED = True
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(max_bytes)
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: bytes) -> int:
+        if len(value) > self.max_bytes:
+            # 单个条目超出预算时不缓存
+            return 0
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= len(old)
+            self._entries[key] = value
+            self.size_bytes += len(value)
+
+            evicted = 0
+            while self.size_bytes > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self.size_bytes -= len(dropped)
+                evicted += 1
+            return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheBackend(CacheBackend):
+    """
+    本地磁盘存储后端
+
+    每个条目保存为目录中的一个文件，文件的修改时间记录最近使用时间，
+    重启后按修改时间恢复LRU顺序。缓存目录应当只对当前服务可写，
+    读取的条目会经过快照校验和模型验证，被修改或损坏的条目按未命中处理。
+    """
+
+    SUFFIX = ".cache"
+
+    def __init__(self, directory: Union[str, os.PathLike], max_bytes: int):
+        super().__init__(max_bytes)
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+
+        # 按修改时间恢复已有条目的LRU顺序
+        existing = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.SUFFIX):
+                stat = os.stat(os.path.join(self.directory, name))
+                existing.append((stat.st_mtime_ns, name[: -len(self.SUFFIX)], stat))
+        for _, key, stat in sorted(existing):
+            self._entries[key] = stat.st_size
+            self.size_bytes += stat.st_size
+        self._evict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    value = f.read()
+                os.utime(path)
+            except FileNotFoundError:
+                # 文件被外部删除
+                self.size_bytes -= self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: bytes) -> int:
+        if len(value) > self.max_bytes:
+            return 0
+        with self._lock:
+            # 先写入临时文件再替换，避免读到写了一半的条目
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(value)
+            os.replace(temp_path, self._path(key))
+
+            self.size_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(value)
+            self.size_bytes += len(value)
+            return self._evict()
+
+    def _evict(self) -> int:
+        evicted = 0
+        while self.size_bytes > self.max_bytes:
+            key, size = self._entries.popitem(last=False)
+            self.size_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in self._entries:
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ParseCache:
+    """
+    解析缓存
+
+    以输入内容、格式类型和引擎配置的哈希作为键缓存解析结果。条目以文档快照
+    保存，每次命中都会加载出新的Document，调用方之间不会共享可变对象。
+    只缓存解析成功、且能保存为快照的结果（图表数据处理器生成的数组等
+    快照无法保存的值不缓存）；命中时的文档与原文档相等，但享元缓存中的
+    FrozenStyle 和 FrozenPosition 加载为普通的 Style 和 Position。
+
+    示例:
+        ```python
+        cache = ParseCache(max_bytes=256 * 1024 * 1024)
+        engine = ParserEngine(cache=cache)
+        ...
+        print(cache.stats.hit_rate)
+        ```
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backend: Optional[CacheBackend] = None,
+    ):
+        """
+        初始化解析缓存
+
+        Args:
+            max_bytes: 内存字节预算，指定backend时忽略
+            backend: 存储后端，默认为内存后端
+        """
+        self.backend = backend if backend is not None else MemoryCacheBackend(max_bytes)
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        input_data: Union[str, bytes, bytearray, memoryview],
+        format_type: str,
+        config: Any = None,
+    ) -> str:
+        """
+        计算缓存键
+
+        内容相同的字符串和UTF-8字节数据得到相同的键。字符串分段编码后计入哈希，
+        不复制整个输入；含有单独代理字符的字符串也能计算键，由解析阶段报告错误。
+
+        Args:
+            input_data: 输入数据字符串或缓冲区对象
+            format_type: 数据格式类型
+            config: 影响解析结果的配置，由字符串、数值、None和元组组成，
+                按repr计入哈希，例如 DocumentBuilder.config_key
+
+        Returns:
+            str: 十六进制的缓存键
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(
+            f"{CACHE_FORMAT_VERSION}:{format_type}:{config!r}:".encode("utf-8")
+        )
+        if isinstance(input_data, str):
+            for start in range(0, len(input_data), _HASH_STEP):
+                chunk = input_data[start : start + _HASH_STEP]
+                digest.update(chunk.encode("utf-8", "surrogatepass"))
+        else:
+            digest.update(memoryview(input_data))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Document]:
+        """
+        读取缓存的文档
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[Document]: 新加载的文档对象，未命中或条目无效时返回None
+        """
+        value = self.backend.get(key)
+        document = None
+        if value is not None:
+            try:
+                document = Document.from_bytes(value, trusted=self.backend.TRUSTED)
+            except (SnapshotError, PydanticValidationError):
+                # 条目损坏或被修改，按未命中处理，之后的解析结果会覆盖它
+                document = None
+        with self._lock:
+            if document is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+        return document
+
+    def put(self, key: str, document: Document) -> None:
+        """
+        缓存文档，文档含有快照无法保存的值时不缓存
+
+        Args:
+            key: 缓存键
+            document: 要缓存的文档对象
+        """
+        try:
+            value = document.to_bytes()
+        except SnapshotError:
+            return
+        evicted = self.backend.put(key, value)
+        with self._lock:
+            self._stats.evictions += evicted
+
+    def clear(self) -> None:
+        """清空缓存（统计信息保留）"""
+        self.backend.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """当前的统计信息"""
+        with self._lock:
+            hits, misses, evictions = (
+                self._stats.hits,
+                self._stats.misses,
+                self._stats.evictions,
+            )
+        return CacheStats(
+            hits=hits,
+            misses=misses,
+            evictions=evictions,
+            entries=len(self.backend),
+            size_bytes=self.backend.size_bytes,
+        )
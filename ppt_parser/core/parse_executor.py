@@ -0,0 +1,205 @@
+"""
+解析执行器模块
+在线程池或进程池中运行CPU密集的解析阶段，避免阻塞事件循环
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Literal, Optional, Sequence, Type
+from ..models.document import Document
+from ..plugins.base_plugin import BasePlugin, InputData
+from ..plugins.json_plugin import JSONPlugin
+from .document_builder import DocumentBuilder
+from .parser_engine import ParserEngine
+
+ExecutorKind = Literal["thread", "process"]
+
+# 预热用的最小文档
+_WARM_UP_INPUT = (
+    '{"title": "warm-up", "slides": [{"title": "warm-up", "elements": ['
+    '{"type": "text", "content": "", "position": {"x": 0, "y": 0},'
+    ' "style": {"font_size": 12, "color": "#000000"}, "size": {"width": 1}}]}]}'
+)
+
+# 每个工作线程（或工作进程的主线程）各自持有的解析引擎和事件循环
+_worker_state = threading.local()
+
+
+def _init_worker(plugin_types: Sequence[Type[BasePlugin]]) -> None:
+    """
+    初始化工作线程或进程
+
+    创建工作者专用的解析引擎和事件循环，并用每个插件解析一次最小文档，
+    使插件模块、pydantic模型和验证器在处理第一个请求之前就已加载完成。
+    """
+    engine = ParserEngine()
+    loop = asyncio.new_event_loop()
+    _worker_state.engine = engine
+    _worker_state.loop = loop
+    _worker_state.default_builder = engine.document_builder
+    _worker_state.builders = {}
+
+    for plugin_type in plugin_types:
+        plugin = plugin_type()
+        engine.plugin_manager.register_plugin(plugin)
+        for fused in (False, True):
+            engine.fused = fused
+            try:
+                loop.run_until_complete(engine._run_stages(plugin, _WARM_UP_INPUT))
+            except Exception:  # pylint: disable=broad-exception-caught
+                # 预热输入不一定适用于所有插件，预热失败不影响正常使用
+                pass
+
+
+def _run_in_worker(
+    plugin: BasePlugin,
+    input_data: InputData,
+    fused: bool,
+    builder: Optional[DocumentBuilder] = None,
+    copied: bool = False,
+) -> Document:
+    """
+    在工作者中执行解析、验证和构建阶段
+
+    Args:
+        plugin: 解析插件
+        input_data: 输入的数据字符串或缓冲区对象
+        fused: 是否使用融合解析模式
+        builder: 调用方的文档构建器，None表示使用默认配置
+        copied: builder是否为序列化后的副本（进程池）
+    """
+    if getattr(_worker_state, "engine", None) is None:
+        _init_worker(())
+    engine: ParserEngine = _worker_state.engine
+    engine.fused = fused
+    if builder is None:
+        builder = _worker_state.default_builder
+    elif copied:
+        # 副本中的享元缓存和图片尺寸缓存只有配置，按配置保留第一次收到的副本，
+        # 之后配置相同的请求复用其中已经缓存的条目
+        key = (builder.config_key, builder.pause_gc)
+        builder = _worker_state.builders.setdefault(key, builder)
+    engine.document_builder = builder
+    return _worker_state.loop.run_until_complete(engine._run_stages(plugin, input_data))
+
+
+def _ping() -> None:
+    """空任务，用于提前启动工作者"""
+
+
+class ParseExecutor:
+    """
+    解析执行器
+
+    将解析、验证和构建这几个CPU密集的阶段放到线程池或进程池中运行，
+    调用方的协程只等待结果。每个工作者在启动时创建自己的解析引擎并完成预热，
+    之后的请求都复用该引擎。
+
+    线程池的开销较小，但受GIL限制，适合避免阻塞事件循环；进程池可以利用多核，
+    但输入数据和结果需要在进程间序列化。
+
+    示例:
+        ```python
+        async with ParseExecutor("process", max_workers=4) as executor:
+            engine = ParserEngine(executor=executor)
+            engine.plugin_manager.register_plugin(JSONPlugin())
+            document = await engine.parse(config)
+        ```
+    """
+
+    def __init__(
+        self,
+        kind: ExecutorKind = "thread",
+        max_workers: Optional[int] = None,
+        plugins: Sequence[Type[BasePlugin]] = (JSONPlugin,),
+    ):
+        """
+        初始化解析执行器
+
+        Args:
+            kind: 执行器类型，"thread"为线程池，"process"为进程池
+            max_workers: 最大工作者数量，None表示与concurrent.futures的默认值一致
+            plugins: 工作者启动时预热的插件类型
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"不支持的执行器类型: {kind}")
+
+        if max_workers is None:
+            cpu_count = os.cpu_count() or 1
+            max_workers = cpu_count if kind == "process" else min(32, cpu_count + 4)
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.plugins = tuple(plugins)
+        executor_type: Callable[..., Executor] = (
+            ThreadPoolExecutor if kind == "thread" else ProcessPoolExecutor
+        )
+        self._executor = executor_type(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(self.plugins,),
+        )
+
+    async def start(self) -> None:
+        """提前启动并预热工作者，避免第一批请求承担启动开销"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, _ping)
+                for _ in range(self.max_workers)
+            )
+        )
+
+    async def run(
+        self,
+        plugin: BasePlugin,
+        input_data: InputData,
+        fused: bool = False,
+        builder: Optional[DocumentBuilder] = None,
+    ) -> Document:
+        """
+        在工作者中解析输入数据
+
+        Args:
+            plugin: 解析插件，进程池模式下会被序列化传给工作进程
+            input_data: 输入的数据字符串或缓冲区对象。线程池直接共享缓冲区；
+                进程池无法序列化memoryview，会先复制为bytes
+            fused: 是否使用融合解析模式
+            builder: 文档构建器，工作者按它的构建模式、享元缓存、图片尺寸缓存和
+                图表数据处理器构建文档，None表示使用默认配置。线程池直接使用该
+                构建器（缓存由所有工作线程共享）；进程池中每个工作进程按配置
+                创建自己的构建器，缓存的条目不在进程之间共享
+
+        Returns:
+            Document: 生成的文档对象
+        """
+        if self.kind == "process" and not isinstance(input_data, (str, bytes)):
+            input_data = bytes(input_data)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            _run_in_worker,
+            plugin,
+            input_data,
+            fused,
+            builder,
+            self.kind == "process",
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        关闭执行器
+
+        Args:
+            wait: 是否等待正在运行的任务完成
+        """
+        self._executor.shutdown(wait=wait)
+
+    async def __aenter__(self) -> "ParseExecutor":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.shutdown()
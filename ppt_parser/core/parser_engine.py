@@ -2,14 +2,90 @@
 解析引擎模块
 负责协调整个解析过程，包括数据解析、验证和文档构建
 """
-from typing import Dict, Any, Optional
+from contextlib import contextmanager
+from typing import (
+    Dict,
+    Any,
+    AsyncIterator,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+import itertools
 import logging
+import mmap
+import os
+import time
 from ..exceptions import ParseError, ValidationError, BuildDocumentError
 from .validator import Validator
-from .document_builder import DocumentBuilder
+from .document_builder import BuildMode, DocumentBuilder
 from .plugin_manager import PluginManager
+from .fused_pipeline import FusedPipeline
+from .stream_source import (
+    DEFAULT_CHUNK_SIZE,
+    STR_SOURCE_MESSAGE,
+    StreamSource,
+    iter_chunks,
+)
+from .batch import BatchInputs, BatchResult, run_batch
+from .incremental import SlideDigestIndex, slide_digest
 from .logger import CoreLogger
-from ..models.document import Document
+from .instrumentation import (
+    NULL_INSTRUMENTATION,
+    UNKNOWN_FORMAT,
+    Instrumentation,
+    ParseStats,
+)
+from ..models.document import Document, Slide
+from ..models.compact import CompactDocument
+from ..plugins.base_plugin import BasePlugin, InputData, decode_text
+
+if TYPE_CHECKING:
+    # 以下模块只在注解中使用，可选的缓存和处理器由调用方创建并传入，
+    # 导入引擎时不需要加载它们
+    from .chart_data import ChartDataProcessor
+    from .flyweight import FlyweightCache
+    from .image_info import ImageSizeCache
+    from .parse_cache import ParseCache
+    from .parse_executor import ParseExecutor
+
+# 日志中标识一次解析的编号，在进程内唯一
+_parse_ids = itertools.count(1)
+
+# 分段计算字符串编码大小时每段的字符数
+_SIZE_STEP = 1024 * 1024
+
+
+async def _count_chunks(
+    chunks: AsyncIterator[bytes], stats: ParseStats
+) -> AsyncIterator[bytes]:
+    """将读取到的数据块大小累计到stats.input_bytes"""
+    async for chunk in chunks:
+        stats.input_bytes += len(chunk)
+        yield chunk
+
+
+def _utf8_size(text: str, limit: Optional[int] = None) -> int:
+    """
+    分段计算字符串的UTF-8编码大小，临时内存与分段长度有关而与字符串长度无关
+
+    Args:
+        text: 字符串
+        limit: 累计大小超过此值时停止计算，返回的大小只保证大于limit
+
+    Returns:
+        int: UTF-8编码大小
+    """
+    if text.isascii():
+        return len(text)
+    size = 0
+    for start in range(0, len(text), _SIZE_STEP):
+        size += len(text[start : start + _SIZE_STEP].encode("utf-8", "surrogatepass"))
+        if limit is not None and size > limit:
+            break
+    return size
 
 
 class ParserEngine:
@@ -18,19 +94,62 @@ class ParserEngine:
     # 输入数据大小限制（10MB）
     MAX_INPUT_SIZE = 10 * 1024 * 1024
 
-    def __init__(self):
-        """初始化解析引擎"""
+    def __init__(
+        self,
+        fused: bool = False,
+        executor: Optional["ParseExecutor"] = None,
+        cache: Optional["ParseCache"] = None,
+        flyweights: Optional["FlyweightCache"] = None,
+        build_mode: BuildMode = "loop",
+        image_sizes: Optional["ImageSizeCache"] = None,
+        chart_data: Optional["ChartDataProcessor"] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        pause_gc: bool = False,
+    ):
+        """
+        初始化解析引擎
+
+        Args:
+            fused: 是否启用融合解析模式，在一次遍历中完成深度检查、验证和构建
+            executor: 解析执行器，设置后解析、验证和构建在线程池或进程池中运行，
+                协程只等待结果，不阻塞事件循环
+            cache: 解析缓存，设置后内容相同的输入直接返回缓存结果的副本
+            flyweights: 享元缓存，设置后构建文档时内容相同的样式和位置只验证一次，
+                并共享同一个不可变实例（融合解析模式不使用）
+            build_mode: 文档构建模式，见 DocumentBuilder。"trusted"跳过模型验证，
+                验证阶段（Validator）只检查结构，不能代替模型的取值约束，
+                只应用于来源可信的数据
+            image_sizes: 图片尺寸缓存，设置后构建文档时按图片文件头补全图片元素的
+                大小（融合解析模式不使用）
+            chart_data: 图表数据处理器，设置后构建文档时图表数据转换为数值数组并
+                按需降采样（融合解析模式不使用）
+            instrumentation: 解析埋点，在parse（以及基于它的parse_bytes、parse_file
+                和parse_many）的各个阶段周围计时并记录每次解析的计数，默认不记录
+            pause_gc: compiled和trusted构建模式下构建文档期间是否暂停循环垃圾回收，
+                见 DocumentBuilder
+        """
         self.plugin_manager = PluginManager()
         self.validator = Validator()
-        self.document_builder = DocumentBuilder()
+        self.document_builder = DocumentBuilder(
+            flyweights=flyweights,
+            mode=build_mode,
+            image_sizes=image_sizes,
+            chart_data=chart_data,
+            pause_gc=pause_gc,
+        )
         self.logger = CoreLogger.get_logger()
+        self.fused = fused
+        self.executor = executor
+        self.cache = cache
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self._slide_digests = SlideDigestIndex()
 
-    async def parse(self, input_data: str, format_type: str = "json") -> Document:
+    async def parse(self, input_data: InputData, format_type: str = "json") -> Document:
         """
         解析输入数据并生成文档对象
 
         Args:
-            input_data: 输入的数据字符串
+            input_data: 输入的数据字符串，也可以是bytes、memoryview等缓冲区对象
             format_type: 数据格式类型，默认为json
 
         Returns:
@@ -41,38 +160,616 @@ class ParserEngine:
             ValidationError: 数据验证失败
             BuildDocumentError: 文档构建失败
         """
+        if not self.instrumentation.enabled:
+            return await self._parse(input_data, format_type, None)
+
+        with self._recorded(format_type) as stats:
+            document = await self._parse(input_data, format_type, stats)
+            self._count_document(stats, document)
+            return document
+
+    @contextmanager
+    def _recorded(self, format_type: str) -> Iterator[Optional[ParseStats]]:
+        """
+        在parse阶段中执行一次解析，结束时（无论成功与否）调用record_parse
+
+        所有parse_*方法共用这一记录方式，埋点未启用时不计时也不记录。
+
+        Args:
+            format_type: 数据格式类型
+
+        Yields:
+            Optional[ParseStats]: 本次解析的计数，由调用方填写输入大小和生成的
+                数量，埋点未启用时为None
+        """
+        instrumentation = self.instrumentation
+        if not instrumentation.enabled:
+            yield None
+            return
+
+        stats = ParseStats(format_type)
+        try:
+            with instrumentation.span("parse"):
+                yield stats
+        except Exception as e:
+            stats.error = type(e).__name__
+            raise
+        finally:
+            stats.format_type = self._stats_format(format_type)
+            instrumentation.record_parse(stats)
+
+    @staticmethod
+    def _count_document(stats: Optional[ParseStats], document: Document) -> None:
+        """将文档的幻灯片和元素数量记入计数"""
+        if stats is None:
+            return
+        stats.slides = len(document.slides)
+        stats.elements = sum(len(slide.elements) for slide in document.slides)
+
+    def _stats_format(self, format_type: str) -> str:
+        """解析计数中的格式类型，未注册的格式类型记为UNKNOWN_FORMAT"""
+        manager = self.plugin_manager
+        if manager.is_loaded(format_type) or format_type in (
+            manager.get_supported_formats()
+        ):
+            return format_type
+        return UNKNOWN_FORMAT
+
+    async def _parse(
+        self, input_data: InputData, format_type: str, stats: Optional[ParseStats]
+    ) -> Document:
+        """
+        执行parse的各个阶段
+
+        Args:
+            input_data: 输入的数据字符串或缓冲区对象
+            format_type: 数据格式类型
+            stats: 本次解析的计数，埋点未启用时为None
+
+        Returns:
+            Document: 生成的文档对象
+        """
+        span = self.instrumentation.span
+        parse_id = next(_parse_ids)
+        start = time.perf_counter()
+        source = input_data
         try:
             # 检查输入数据大小
-            if len(input_data.encode("utf-8")) > self.MAX_INPUT_SIZE:
-                raise ParseError("输入数据超过大小限制")
+            input_bytes = self._check_input_size(input_data)
+            if stats is not None:
+                stats.input_bytes = self._input_bytes(input_data, input_bytes)
 
-            self.logger.info(f"开始解析数据，格式类型: {format_type}")
+            self.logger.info(
+                "开始解析数据，格式类型: %s",
+                format_type,
+                extra={"parse_id": parse_id, "format_type": format_type},
+            )
 
             # 获取适当的解析插件
             plugin = self.plugin_manager.get_plugin(format_type)
             if not plugin:
-                self.logger.error(f"不支持的格式类型: {format_type}")
+                self.logger.error("不支持的格式类型: %s", format_type)
                 raise ParseError(f"不支持的格式类型: {format_type}")
 
-            # 解析数据
-            self.logger.debug("开始数据解析")
-            parsed_data = await plugin.parse(input_data)
+            cache_key = None
+            if self.cache is not None:
+                with span("cache_lookup"):
+                    cache_key = self.cache.make_key(
+                        input_data, format_type, self._cache_config()
+                    )
+                    cached = self.cache.get(cache_key)
+                if cached is not None:
+                    if stats is not None:
+                        stats.cache_hit = True
+                    self._log_parse_done(
+                        "文档解析完成（缓存命中）",
+                        parse_id,
+                        format_type,
+                        start,
+                        source,
+                        input_bytes,
+                        cached,
+                    )
+                    return cached
+
+            input_data = self._prepare_input(plugin, input_data)
+
+            if self.executor is not None:
+                self.logger.debug("提交到解析执行器")
+                with span("executor"):
+                    document = await self.executor.run(
+                        plugin, input_data, self.fused, self.document_builder
+                    )
+            else:
+                document = await self._run_stages(plugin, input_data)
+
+            if self.cache is not None and cache_key is not None:
+                with span("cache_store"):
+                    self.cache.put(cache_key, document)
+
+            self._log_parse_done(
+                "文档解析完成",
+                parse_id,
+                format_type,
+                start,
+                source,
+                input_bytes,
+                document,
+            )
+            return document
+
+        except (ParseError, ValidationError, BuildDocumentError):
+            raise
+        except Exception as e:
+            self.logger.exception("解析过程出现未预期的错误")
+            raise ParseError(f"解析过程出错: {str(e)}") from e
+
+    async def parse_bytes(
+        self, buffer: Union[bytes, bytearray, memoryview], format_type: str = "json"
+    ) -> Document:
+        """
+        解析字节数据并生成文档对象
 
-            # 验证数据
-            self.logger.debug("开始数据验证")
+        缓冲区按原样交给插件，只在插件需要时才解码为字符串。
+
+        Args:
+            buffer: bytes、bytearray、memoryview等缓冲区对象
+            format_type: 数据格式类型，默认为json
+
+        Returns:
+            Document: 生成的文档对象
+
+        Raises:
+            ParseError: 解析过程出错
+            ValidationError: 数据验证失败
+            BuildDocumentError: 文档构建失败
+        """
+        return await self.parse(buffer, format_type)
+
+    async def parse_file(
+        self, path: Union[str, os.PathLike], format_type: str = "json"
+    ) -> Document:
+        """
+        解析文件并生成文档对象
+
+        文件通过mmap映射到内存，以memoryview的形式交给插件，不会先读取出一份
+        完整的副本。大小限制根据文件元数据检查，超出限制的文件不会被映射。
+
+        Args:
+            path: 文件路径
+            format_type: 数据格式类型，默认为json
+
+        Returns:
+            Document: 生成的文档对象
+
+        Raises:
+            ParseError: 文件无法读取或解析过程出错
+            ValidationError: 数据验证失败
+            BuildDocumentError: 文档构建失败
+        """
+        with self._recorded(format_type) as stats:
+            try:
+                file = open(path, "rb")
+            except OSError as e:
+                raise ParseError(f"无法读取文件: {str(e)}") from e
+
+            with file:
+                size = os.fstat(file.fileno()).st_size
+                if size > self.MAX_INPUT_SIZE:
+                    raise ParseError("输入数据超过大小限制")
+                if size == 0:
+                    # 空文件无法映射
+                    document = await self._parse(b"", format_type, stats)
+                    self._count_document(stats, document)
+                    return document
+
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        document = await self._parse(view, format_type, stats)
+                    finally:
+                        view.release()
+                    self._count_document(stats, document)
+                    return document
+
+    async def parse_compact(
+        self, input_data: InputData, format_type: str = "json"
+    ) -> CompactDocument:
+        """
+        解析输入数据并生成紧凑文档对象
+
+        适用于元素数量非常多的文档。元素数据按列存储，内存占用约为普通文档的
+        十分之一，访问元素时才创建 Element 对象。紧凑模式不使用融合解析、
+        解析执行器和解析缓存。
+
+        Args:
+            input_data: 输入的数据字符串或缓冲区对象
+            format_type: 数据格式类型，默认为json
+
+        Returns:
+            CompactDocument: 生成的紧凑文档对象
+
+        Raises:
+            ParseError: 解析过程出错
+            ValidationError: 数据验证失败
+            BuildDocumentError: 文档构建失败
+        """
+        with self._recorded(format_type) as stats:
+            return await self._parse_compact(input_data, format_type, stats)
+
+    async def _parse_compact(
+        self, input_data: InputData, format_type: str, stats: Optional[ParseStats]
+    ) -> CompactDocument:
+        """parse_compact的实现，stats为本次解析的计数，埋点未启用时为None"""
+        try:
+            input_bytes = self._check_input_size(input_data)
+            if stats is not None:
+                stats.input_bytes = self._input_bytes(input_data, input_bytes)
+
+            self.logger.info("开始紧凑解析数据，格式类型: %s", format_type)
+
+            plugin = self.plugin_manager.get_plugin(format_type)
+            if not plugin:
+                self.logger.error("不支持的格式类型: %s", format_type)
+                raise ParseError(f"不支持的格式类型: {format_type}")
+
+            parsed_data = await plugin.parse(self._prepare_input(plugin, input_data))
             if not await self.validator.validate(parsed_data):
                 self.logger.error("数据验证失败")
                 raise ValidationError("数据验证失败")
 
-            # 构建文档
-            self.logger.debug("开始构建文档")
-            document = await self.document_builder.build_document(parsed_data)
+            document = await self.document_builder.build_compact_document(parsed_data)
+            if stats is not None:
+                stats.slides = len(document.slides)
+                stats.elements = document.element_count
+            self.logger.info("紧凑解析完成，共%d个元素", document.element_count)
+            return document
+
+        except (ParseError, ValidationError, BuildDocumentError):
+            raise
+        except Exception as e:
+            self.logger.exception("紧凑解析过程出现未预期的错误")
+            raise ParseError(f"解析过程出错: {str(e)}") from e
+
+    async def parse_incremental(
+        self,
+        input_data: InputData,
+        previous: Optional[Document] = None,
+        format_type: str = "json",
+    ) -> Document:
+        """
+        增量解析输入数据，复用上一次解析结果中内容未变化的幻灯片
+
+        对每个幻灯片的数据子树计算摘要，摘要与上一次文档中某个幻灯片相同时直接
+        复用该幻灯片对象，只有新增或修改过的幻灯片才会验证和构建，调整幻灯片
+        顺序也不会导致重建。文档标题、元数据等顶层字段每次都重新验证和构建。
+
+        只有由parse_incremental在相同的构建器配置下构建的幻灯片可以被复用，
+        首次调用时previous传入None即可。被复用的幻灯片对象会同时出现在新旧两个文档中，调用方不应
+        修改它们。增量解析始终在当前事件循环中执行，不使用解析执行器和解析缓存。
+
+        示例:
+            ```python
+            document = await engine.parse_incremental(input_json)
+            ...
+            document = await engine.parse_incremental(new_input_json, document)
+            ```
+
+        Args:
+            input_data: 输入的数据字符串或缓冲区对象
+            previous: 上一次增量解析返回的文档对象
+            format_type: 数据格式类型，默认为json
+
+        Returns:
+            Document: 生成的文档对象
+
+        Raises:
+            ParseError: 解析过程出错
+            ValidationError: 数据验证失败
+            BuildDocumentError: 文档构建失败
+        """
+        with self._recorded(format_type) as stats:
+            return await self._parse_incremental(
+                input_data, previous, format_type, stats
+            )
+
+    async def _parse_incremental(
+        self,
+        input_data: InputData,
+        previous: Optional[Document],
+        format_type: str,
+        stats: Optional[ParseStats],
+    ) -> Document:
+        """parse_incremental的实现，stats为本次解析的计数，埋点未启用时为None"""
+        try:
+            input_bytes = self._check_input_size(input_data)
+            if stats is not None:
+                stats.input_bytes = self._input_bytes(input_data, input_bytes)
+
+            self.logger.info("开始增量解析数据，格式类型: %s", format_type)
+
+            plugin = self.plugin_manager.get_plugin(format_type)
+            if not plugin:
+                self.logger.error("不支持的格式类型: %s", format_type)
+                raise ParseError(f"不支持的格式类型: {format_type}")
+
+            parsed_data = await plugin.parse(self._prepare_input(plugin, input_data))
+
+            # 先验证顶层字段，幻灯片在下面按需逐个验证
+            slides_data: Any = parsed_data.get("slides")
+            if isinstance(slides_data, list):
+                header = dict(parsed_data, slides=[])
+            else:
+                header = parsed_data
+            if not await self.validator.validate(header):
+                self.logger.error("数据验证失败")
+                raise ValidationError("数据验证失败")
+
+            reusable = {}
+            if previous is not None:
+                reusable = self._slide_digests.reusable_slides(previous)
 
-            self.logger.info("文档解析完成")
+            document = await self.document_builder.build_document(header)
+            # 构建器的配置（包括构建模式）变化后，之前构建的幻灯片不再复用
+            config = self.document_builder.config_key
+            reused = 0
+            for index, slide_data in enumerate(slides_data):
+                digest = slide_digest(slide_data, config)
+                candidates = reusable.get(digest)
+                if candidates:
+                    slide = candidates.pop(0)
+                    reused += 1
+                else:
+                    await self.validator.validate_slide(slide_data, index)
+                    slide = await self.document_builder.build_slide(slide_data)
+                    self._slide_digests.record(slide, digest)
+                document.slides.append(slide)
+
+            self._count_document(stats, document)
+            self.logger.info("增量解析完成，复用%d页，重建%d页", reused, len(slides_data) - reused)
             return document
 
         except (ParseError, ValidationError, BuildDocumentError):
             raise
         except Exception as e:
-            self.logger.exception("解析过程出现未预期的错误")
-            raise ParseError(f"解析过程出错: {str(e)}")
+            self.logger.exception("增量解析过程出现未预期的错误")
+            raise ParseError(f"解析过程出错: {str(e)}") from e
+
+    async def parse_many(
+        self,
+        inputs: BatchInputs,
+        format_type: str = "json",
+        concurrency: Optional[int] = None,
+        ordered: bool = False,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        批量解析输入数据
+
+        每个输入独立解析，单个输入失败只会体现在对应的结果中，不会中断整个批次。
+        配置了解析执行器时，输入会分发到各个工作者并行解析，每个工作者复用
+        自己的插件、验证器和构建器；否则在当前事件循环中依次解析。
+
+        示例:
+            ```python
+            async for result in engine.parse_many(inputs, concurrency=8):
+                if result.ok:
+                    save(result.index, result.document)
+                else:
+                    report(result.index, result.error)
+            ```
+
+        Args:
+            inputs: 输入数据字符串的同步或异步可迭代对象
+            format_type: 数据格式类型，默认为json
+            concurrency: 同时处理（含已完成但尚未返回）的最大输入数，
+                默认为执行器工作者数量的2倍，未配置执行器时为1
+            ordered: True表示按输入顺序返回结果，False表示按完成顺序返回
+
+        Yields:
+            BatchResult: 每个输入的解析结果
+        """
+        if concurrency is None:
+            concurrency = 2 * self.executor.max_workers if self.executor else 1
+
+        self.logger.info("开始批量解析，格式类型: %s，并发数: %d", format_type, concurrency)
+        succeeded = failed = 0
+        async for result in run_batch(
+            lambda input_data: self.parse(input_data, format_type),
+            inputs,
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            if result.ok:
+                succeeded += 1
+            else:
+                failed += 1
+            yield result
+        self.logger.info("批量解析完成，成功: %d，失败: %d", succeeded, failed)
+
+    def _check_input_size(self, input_data: InputData) -> Optional[int]:
+        """
+        检查输入数据的UTF-8编码大小是否超过限制，不复制输入数据
+
+        Returns:
+            Optional[int]: 输入数据的UTF-8编码大小，较短的字符串不需要计算
+                大小即可确定未超过限制，此时返回None
+
+        Raises:
+            ParseError: 输入数据超过大小限制
+        """
+        if not isinstance(input_data, str):
+            size = memoryview(input_data).nbytes
+        elif len(input_data) * 4 <= self.MAX_INPUT_SIZE:
+            # 每个字符最多编码为4个字节
+            return None
+        elif len(input_data) > self.MAX_INPUT_SIZE:
+            size = len(input_data)
+        else:
+            size = _utf8_size(input_data, self.MAX_INPUT_SIZE)
+        if size > self.MAX_INPUT_SIZE:
+            raise ParseError("输入数据超过大小限制")
+        return size
+
+    def _cache_config(self) -> Tuple[Any, ...]:
+        """影响解析结果的引擎配置，计入缓存键"""
+        return (self.fused, self.document_builder.config_key)
+
+    @staticmethod
+    def _input_bytes(input_data: InputData, size: Optional[int]) -> int:
+        """
+        输入数据的UTF-8编码大小，不复制整个输入
+
+        Args:
+            input_data: 输入的数据字符串或缓冲区对象
+            size: _check_input_size的返回值
+        """
+        if size is not None:
+            return size
+        if isinstance(input_data, str):
+            return _utf8_size(input_data)
+        return memoryview(input_data).nbytes
+
+    def _log_parse_done(
+        self,
+        message: str,
+        parse_id: int,
+        format_type: str,
+        start: float,
+        input_data: InputData,
+        input_size: Optional[int],
+        document: Document,
+    ) -> None:
+        """
+        记录解析完成的日志，附带耗时和大小等结构化字段
+
+        INFO级别未启用时直接返回，不计算这些字段。
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info(
+            message,
+            extra={
+                "parse_id": parse_id,
+                "format_type": format_type,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "input_bytes": self._input_bytes(input_data, input_size),
+                "slides": len(document.slides),
+                "elements": sum(len(slide.elements) for slide in document.slides),
+            },
+        )
+
+    @staticmethod
+    def _prepare_input(plugin: BasePlugin, input_data: InputData) -> InputData:
+        """不接收缓冲区的插件在调用前先将输入解码为字符串"""
+        if plugin.ACCEPTS_BUFFERS:
+            return input_data
+        return decode_text(input_data)
+
+    async def _run_stages(self, plugin: BasePlugin, input_data: InputData) -> Document:
+        """
+        依次执行解析、验证和构建阶段
+
+        Args:
+            plugin: 解析插件
+            input_data: 输入的数据字符串或缓冲区对象
+
+        Returns:
+            Document: 生成的文档对象
+        """
+        span = self.instrumentation.span
+        if self.fused:
+            self.logger.debug("开始融合解析")
+            with span("fused"):
+                raw_data = await plugin.decode(input_data)
+                pipeline = FusedPipeline(max_depth=getattr(plugin, "MAX_DEPTH", None))
+                return pipeline.run(raw_data)
+
+        # 解析数据
+        self.logger.debug("开始数据解析")
+        with span("decode"):
+            parsed_data = await plugin.parse(input_data)
+
+        # 验证数据
+        self.logger.debug("开始数据验证")
+        with span("validate"):
+            valid = await self.validator.validate(parsed_data)
+        if not valid:
+            self.logger.error("数据验证失败")
+            raise ValidationError("数据验证失败")
+
+        # 构建文档
+        self.logger.debug("开始构建文档")
+        with span("build"):
+            return await self.document_builder.build_document(parsed_data)
+
+    async def parse_stream(
+        self,
+        source: StreamSource,
+        format_type: str = "json",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[Slide]:
+        """
+        流式解析输入数据，逐个生成幻灯片对象
+
+        输入按块读取，每读取到一个完整的幻灯片就立即验证、构建并返回，
+        内存占用只取决于最大的单个幻灯片。总输入大小不受MAX_INPUT_SIZE限制，
+        该限制改为作用于单个幻灯片。文档标题等顶层字段在流结束后验证。
+
+        示例:
+            ```python
+            async for slide in engine.parse_stream(Path("deck.json")):
+                handle(slide)
+            ```
+
+        Args:
+            source: 输入源，可以是文件路径（os.PathLike）、字节数据、文件对象或
+                数据块迭代器，见 iter_chunks。字符串不作为输入源
+            format_type: 数据格式类型，默认为json
+            chunk_size: 每次读取的字节数
+
+        Yields:
+            Slide: 验证并构建后的幻灯片对象
+
+        Raises:
+            ParseError: 解析过程出错
+            ValidationError: 数据验证失败
+            BuildDocumentError: 幻灯片构建失败
+        """
+        with self._recorded(format_type) as stats:
+            try:
+                if isinstance(source, str):
+                    raise ParseError(STR_SOURCE_MESSAGE)
+                self.logger.info("开始流式解析数据，格式类型: %s", format_type)
+
+                plugin = self.plugin_manager.get_plugin(format_type)
+                if not plugin:
+                    self.logger.error("不支持的格式类型: %s", format_type)
+                    raise ParseError(f"不支持的格式类型: {format_type}")
+
+                chunks = iter_chunks(source, chunk_size)
+                if stats is not None:
+                    chunks = _count_chunks(chunks, stats)
+
+                fields: Dict[str, Any] = {}
+                slide_count = 0
+                async for slide_data in plugin.iter_slides(
+                    chunks,
+                    max_slide_size=self.MAX_INPUT_SIZE,
+                    fields=fields,
+                ):
+                    await self.validator.validate_slide(slide_data, slide_count)
+                    slide = await self.document_builder.build_slide(slide_data)
+                    slide_count += 1
+                    if stats is not None:
+                        stats.slides = slide_count
+                        stats.elements += len(slide.elements)
+                    yield slide
+
+                await self.validator.validate_header(fields)
+                self.logger.info("流式解析完成，共%d页幻灯片", slide_count)
+
+            except (ParseError, ValidationError, BuildDocumentError):
+                raise
+            except Exception as e:
+                self.logger.exception("流式解析过程出现未预期的错误")
+                raise ParseError(f"解析过程出错: {str(e)}") from e
@@ -1,20 +1,74 @@
 """
 插件管理器模块
 负责管理和加载不同格式的解析插件
+
+除了手动注册的插件实例外，插件管理器还可以发现已安装的插件：其他包在
+"ppt_parser.plugins" 入口点组下声明 "格式类型 = 模块:插件类"，例如
+pyproject.toml 中:
+
+    [tool.poetry.plugins."ppt_parser.plugins"]
+    yaml = "ppt_parser_yaml:YAMLPlugin"
+
+发现插件时只记录格式类型和导入路径，插件模块在第一次 get_plugin 时才导入，
+启动时间不随已安装插件的数量增长。
 """
 
-from typing import List  # 添加此行
-from typing import Dict, Optional
+import importlib
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from ..plugins.base_plugin import BasePlugin
 from ..exceptions import PluginError
 
+# 插件入口点组名
+ENTRY_POINT_GROUP = "ppt_parser.plugins"
+
+# 内置插件：格式类型 -> "模块:插件类"。不依赖包的安装元数据，从源码目录运行时同样可用
+BUILTIN_PLUGINS = {
+    "json": "ppt_parser.plugins.json_plugin:JSONPlugin",
+    "msgpack": "ppt_parser.plugins.msgpack_plugin:MessagePackPlugin",
+}
+
+
+@lru_cache(maxsize=None)
+def _entry_point_plugins() -> Tuple[Tuple[str, str], ...]:
+    """
+    读取已安装包声明的插件入口点，每个进程只扫描一次
+
+    Returns:
+        Tuple[Tuple[str, str], ...]: (格式类型, "模块:插件类")列表
+    """
+    # 扫描安装元数据较慢，只在需要时导入
+    from importlib.metadata import entry_points
+
+    return tuple(
+        (entry_point.name, entry_point.value)
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP)
+    )
+
 
 class PluginManager:
-    """插件管理器，负责管理解析器插件"""
+    """
+    插件管理器，负责管理解析器插件
 
-    def __init__(self):
-        """初始化插件管理器"""
+    插件有两种状态：已加载（plugins 中的实例）和可用但尚未加载（只记录了
+    导入路径）。内置插件在创建时登记；入口点中的插件在第一次查找不到
+    格式类型、或调用 get_supported_formats 时登记。同名时手动注册的插件优先，
+    其次是内置插件，最后是入口点中的插件。
+    """
+
+    def __init__(self, discover: bool = True):
+        """
+        初始化插件管理器
+
+        Args:
+            discover: 是否发现内置插件和已安装包中的插件，False表示只使用
+                手动注册的插件
+        """
         self.plugins: Dict[str, BasePlugin] = {}
+        self._available: Dict[str, str] = dict(BUILTIN_PLUGINS) if discover else {}
+        self._discovered = not discover
+        self._lock = threading.Lock()
 
     def register_plugin(self, plugin: BasePlugin) -> None:
         """
@@ -29,20 +83,41 @@ class PluginManager:
         try:
             format_type = plugin.get_format_type()
             self.plugins[format_type] = plugin
+            self._available.pop(format_type, None)
         except Exception as e:
-            raise PluginError(f"插件注册失败: {str(e)}", plugin_name=str(plugin))
+            raise PluginError(f"插件注册失败: {str(e)}", plugin_name=str(plugin)) from e
+
+    def register_lazy(self, format_type: str, target: str) -> None:
+        """
+        登记一个尚未加载的插件，第一次获取时才导入
+
+        Args:
+            format_type: 格式类型
+            target: 插件类的导入路径，格式为"模块:插件类"
+        """
+        self._available[format_type] = target
 
     def get_plugin(self, format_type: str) -> Optional[BasePlugin]:
         """
-        获取指定格式的插件
+        获取指定格式的插件，尚未加载的插件在此时导入并创建实例
 
         Args:
             format_type: 格式类型
 
         Returns:
             Optional[BasePlugin]: 对应的插件实例，如果不存在返回None
+
+        Raises:
+            PluginError: 插件导入或创建失败
         """
-        return self.plugins.get(format_type)
+        plugin = self.plugins.get(format_type)
+        if plugin is not None:
+            return plugin
+        if format_type not in self._available:
+            self._discover_entry_points()
+            if format_type not in self._available:
+                return None
+        return self._load(format_type)
 
     def unregister_plugin(self, format_type: str) -> None:
         """
@@ -53,12 +128,70 @@ class PluginManager:
         """
         if format_type in self.plugins:
             del self.plugins[format_type]
+        self._available.pop(format_type, None)
 
     def get_supported_formats(self) -> List[str]:
         """
-        获取所有支持的格式类型
+        获取所有支持的格式类型，包括可用但尚未加载的插件
 
         Returns:
             List[str]: 支持的格式类型列表
         """
-        return list(self.plugins.keys())
+        self._discover_entry_points()
+        return list(self.plugins) + [
+            format_type
+            for format_type in self._available
+            if format_type not in self.plugins
+        ]
+
+    def is_loaded(self, format_type: str) -> bool:
+        """
+        检查插件是否已经加载
+
+        Args:
+            format_type: 格式类型
+
+        Returns:
+            bool: 已加载返回True，尚未加载或不存在返回False
+        """
+        return format_type in self.plugins
+
+    def _discover_entry_points(self) -> None:
+        """登记入口点中的插件，已有同名插件时不覆盖"""
+        if self._discovered:
+            return
+        self._discovered = True
+        try:
+            found = _entry_point_plugins()
+        except Exception:  # pylint: disable=broad-exception-caught
+            # 安装元数据损坏不影响内置和手动注册的插件
+            found = ()
+        for format_type, target in found:
+            if format_type not in self.plugins:
+                self._available.setdefault(format_type, target)
+
+    def _load(self, format_type: str) -> BasePlugin:
+        """导入插件类并创建实例"""
+        with self._lock:
+            plugin = self.plugins.get(format_type)
+            if plugin is not None:
+                return plugin
+            target = self._available[format_type]
+            module_name, _, class_name = target.partition(":")
+            try:
+                plugin_class: Any = importlib.import_module(module_name)
+                for attribute in class_name.split("."):
+                    plugin_class = getattr(plugin_class, attribute)
+                plugin = plugin_class()
+            except Exception as e:
+                raise PluginError(f"插件加载失败: {str(e)}", plugin_name=target) from e
+            if not isinstance(plugin, BasePlugin):
+                raise PluginError("插件必须继承BasePlugin", plugin_name=target)
+            if plugin.get_format_type() != format_type:
+                raise PluginError(
+                    f"插件的格式类型与登记的不一致: {plugin.get_format_type()}",
+                    plugin_name=target,
+                )
+            self.plugins[format_type] = plugin
+            del self._available[format_type]
+            return plugin
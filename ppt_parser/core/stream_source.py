@@ -0,0 +1,100 @@
+"""
+流式输入模块
+将文件路径、文件对象和字节流统一转换为数据块的异步迭代器
+"""
+
+import asyncio
+import inspect
+import os
+from typing import Any, AsyncIterator, Iterator, Union
+
+# 默认读取块大小（64KB）
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+StreamSource = Union[os.PathLike, bytes, bytearray, memoryview, Any]
+
+# 字符串既可能是文件路径也可能是JSON文本，不作为输入源，避免按路径打开JSON文本
+STR_SOURCE_MESSAGE = "字符串不能作为流式输入源: 文件路径请使用pathlib.Path，JSON文本请编码为bytes或使用parse"
+
+# 同步迭代器结束的标记
+_END = object()
+
+
+async def iter_chunks(
+    source: StreamSource, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    按块读取输入源
+
+    支持的输入源:
+        - 文件路径（os.PathLike，例如pathlib.Path）
+        - bytes、bytearray或memoryview
+        - 带有read方法的文件对象，read可以是同步方法或协程（如aiohttp的StreamReader）
+        - 产生数据块的同步或异步迭代器
+
+    文件路径、同步的read方法和同步迭代器都在线程池中读取，不阻塞事件循环。
+    迭代器产生的文本数据块会按UTF-8编码为字节。
+
+    Args:
+        source: 输入源
+        chunk_size: 每次读取的字节数
+
+    Yields:
+        bytes: 数据块
+
+    Raises:
+        TypeError: 输入源是字符串
+    """
+    if isinstance(source, str):
+        raise TypeError(STR_SOURCE_MESSAGE)
+
+    if isinstance(source, os.PathLike):
+        with open(source, "rb") as f:
+            while True:
+                chunk = await asyncio.to_thread(f.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source).cast("B")
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start : start + chunk_size])
+
+    elif hasattr(source, "read"):
+        read = source.read
+        blocking = not inspect.iscoroutinefunction(read)
+        while True:
+            if blocking:
+                chunk = await asyncio.to_thread(read, chunk_size)
+            else:
+                chunk = read(chunk_size)
+            if inspect.isawaitable(chunk):
+                chunk = await chunk
+            if not chunk:
+                break
+            yield _to_bytes(chunk)
+
+    elif hasattr(source, "__aiter__"):
+        async for chunk in source:
+            yield _to_bytes(chunk)
+
+    else:
+        iterator = iter(source)
+        while True:
+            chunk = await asyncio.to_thread(_next_chunk, iterator)
+            if chunk is _END:
+                break
+            yield _to_bytes(chunk)
+
+
+def _next_chunk(iterator: Iterator[Any]) -> Any:
+    """读取迭代器的下一个数据块，迭代结束时返回_END"""
+    return next(iterator, _END)
+
+
+def _to_bytes(chunk: Any) -> bytes:
+    """将数据块转换为字节"""
+    if isinstance(chunk, str):
+        return chunk.encode("utf-8")
+    return bytes(chunk)
@@ -1,16 +1,212 @@
 """
 数据验证器模块
 负责验证解析后的数据是否符合要求
+
+验证规则由 Document、Slide、Element 模型的字段定义生成：必需字段取自模型，
+字段的容器类型（字典、列表、嵌套模型）取自字段注解。每个模型的规则在首次使用
+时生成为一个专用的检查函数并缓存，之后每次验证只执行这段直线代码。
+
+检查函数只返回是否通过；未通过时再按同一份规则逐项检查，生成带有JSON指针
+路径（例如 /slides/0/elements/1/position）的错误列表。
 """
 
-from typing import Dict, Any, List, Optional
+import typing
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+)
+from pydantic import BaseModel
 from ..exceptions import ValidationError
 from ..models.document import Document, Slide, Element
 
+# 验证模式
+#   fail_fast: 遇到第一个错误就停止
+#   exhaustive: 收集所有错误，最多max_errors个
+ValidationMode = Literal["fail_fast", "exhaustive"]
+
+# 完整模式下默认最多收集的错误数量
+DEFAULT_MAX_ERRORS = 100
+
+# 模型在错误提示中的名称
+_MODEL_PREFIXES: Dict[Type[BaseModel], str] = {
+    Document: "",
+    Slide: "幻灯片",
+    Element: "元素",
+}
+
+# 模型定义之外、解析器额外要求的必需字段
+_REQUIRED_FIELDS: Dict[Type[BaseModel], Tuple[str, ...]] = {
+    Document: ("slides",),
+    Slide: ("elements",),
+}
+
+# 必须是非空白字符串的字段及其错误提示
+_NON_BLANK_FIELDS: Dict[Tuple[Type[BaseModel], str], str] = {
+    (Document, "title"): "文档标题不能为空"
+}
+
+_CONTAINER_NAMES = {dict: "字典", list: "列表"}
+
+# 生成的检查函数中表示字段不存在
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """
+    单个字段的验证规则
+
+    Attributes:
+        name: 字段名
+        kind: 字段值的类型，dict或list；str表示非空白字符串
+        message: 类型不符时的错误提示
+        nullable: 是否允许为None
+        model: 嵌套模型（kind为dict）或列表元素模型（kind为list）的规则
+    """
+
+    name: str
+    kind: Type[Any]
+    message: str
+    nullable: bool = False
+    model: Optional["ModelRules"] = None
+
+
+@dataclass(frozen=True)
+class ModelRules:
+    """
+    单个模型的验证规则
+
+    Attributes:
+        prefix: 缺少必需字段时错误提示的前缀
+        noun: 数据不是字典时错误提示中的名称
+        required: 必需字段
+        fields: 需要检查取值的字段
+    """
+
+    prefix: str
+    noun: str
+    required: Tuple[str, ...]
+    fields: Tuple[FieldRule, ...]
+
+    @property
+    def is_empty(self) -> bool:
+        """除了必须是字典之外没有其他规则"""
+        return not self.required and not self.fields
+
+
+class _ErrorLimitReached(Exception):
+    """收集的错误数量达到上限"""
+
+
+class CompiledSchema:
+    """
+    由模型生成的验证器
+
+    check 是生成的检查函数，只返回是否通过；validate 在检查未通过时收集
+    错误并抛出 ValidationError。
+
+    Attributes:
+        rules: 生成检查函数所用的规则
+        check: 检查数据是否通过验证的函数
+        source: 检查函数的源代码，便于调试
+    """
+
+    def __init__(self, rules: ModelRules, shallow: bool = False):
+        """
+        生成验证器
+
+        Args:
+            rules: 模型规则
+            shallow: 为True时不检查列表字段中的各个元素，只检查列表本身
+        """
+        self.rules = rules
+        self.shallow = shallow
+        self.check, self.source = _generate_check(rules, shallow)
+
+    def collect_errors(
+        self, value: Any, pointer: str = "", max_errors: int = DEFAULT_MAX_ERRORS
+    ) -> Tuple[List[Tuple[str, str]], bool]:
+        """
+        按规则逐项检查数据，收集错误
+
+        Args:
+            value: 要检查的数据
+            pointer: 数据在整个文档中的JSON指针
+            max_errors: 最多收集的错误数量
+
+        Returns:
+            Tuple[List[Tuple[str, str]], bool]: (JSON指针, 错误信息)列表，
+                以及是否因达到上限而停止
+        """
+        errors: List[Tuple[str, str]] = []
+        try:
+            _collect(self.rules, value, pointer, errors, max_errors, self.shallow)
+        except _ErrorLimitReached:
+            return errors, True
+        return errors, False
+
+    def validate(
+        self, value: Any, pointer: str = "", max_errors: Optional[int] = 1
+    ) -> None:
+        """
+        验证数据
+
+        Args:
+            value: 要验证的数据
+            pointer: 数据在整个文档中的JSON指针
+            max_errors: 最多报告的错误数量，1表示遇到第一个错误就停止，
+                None表示不限制
+
+        Raises:
+            ValidationError: 验证失败，错误信息为第一个错误，
+                validation_errors中是所有收集到的错误
+        """
+        if self.check(value):
+            return
+
+        # 上限为0时永远不会触发，即不限制
+        errors, truncated = self.collect_errors(value, pointer, max_errors or 0)
+        first_pointer, message = errors[0]
+        error = ValidationError(message, field=first_pointer)
+        for error_pointer, error_message in errors:
+            error.add_validation_error(field=error_pointer, error=error_message)
+        if truncated and max_errors != 1:
+            error.add_detail("truncated", True)
+        raise error
+
 
 class Validator:
     """数据验证器，负责验证解析后的数据"""
 
+    def __init__(
+        self, mode: ValidationMode = "fail_fast", max_errors: int = DEFAULT_MAX_ERRORS
+    ):
+        """
+        初始化验证器
+
+        Args:
+            mode: 验证模式。fail_fast遇到第一个错误就停止；exhaustive收集所有
+                错误，每个错误的JSON指针和信息通过add_validation_error记录在
+                异常中，异常信息为第一个错误
+            max_errors: exhaustive模式下最多收集的错误数量，达到上限时异常的
+                details["truncated"]为True
+        """
+        if mode not in ("fail_fast", "exhaustive"):
+            raise ValueError(f"不支持的验证模式: {mode}")
+        if max_errors <= 0:
+            raise ValueError("错误数量上限必须大于0")
+        self.mode = mode
+        self.max_errors = max_errors
+
     async def validate(self, data: Dict[str, Any]) -> bool:
         """
         验证数据是否符合要求
@@ -24,75 +220,260 @@ class Validator:
         Raises:
             ValidationError: 验证失败
         """
-        try:
-            # 验证基本结构
-            self._validate_structure(data)
+        return self._run(compile_schema(Document), data, "")
+
+    async def validate_slide(
+        self, slide_data: Dict[str, Any], index: Optional[int] = None
+    ) -> bool:
+        """
+        验证单个幻灯片数据，用于流式解析
+
+        Args:
+            slide_data: 要验证的幻灯片数据字典
+            index: 幻灯片在文档中的序号，用于错误的JSON指针
+
+        Returns:
+            bool: 验证是否通过
+
+        Raises:
+            ValidationError: 验证失败
+        """
+        pointer = f"/slides/{index}" if index is not None else ""
+        return self._run(compile_schema(Slide), slide_data, pointer)
+
+    async def validate_header(self, data: Dict[str, Any]) -> bool:
+        """
+        验证除幻灯片之外的文档属性，用于流式解析
+
+        Args:
+            data: 文档顶层字段字典
 
-            # 验证文档属性
-            self._validate_document(data)
+        Returns:
+            bool: 验证是否通过
 
-            # 验证幻灯片
-            if "slides" in data:
-                for slide_data in data["slides"]:
-                    self._validate_slide(slide_data)
+        Raises:
+            ValidationError: 验证失败
+        """
+        return self._run(
+            compile_schema(Document, exclude=frozenset({"slides"})), data, ""
+        )
 
+    def _run(self, schema: CompiledSchema, data: Any, pointer: str) -> bool:
+        """按当前模式执行验证"""
+        try:
+            max_errors = 1 if self.mode == "fail_fast" else self.max_errors
+            schema.validate(data, pointer, max_errors)
             return True
 
         except ValidationError:
             raise
         except Exception as e:
-            raise ValidationError(f"验证过程出错: {str(e)}")
-
-    def _validate_structure(self, data: Dict[str, Any]) -> None:
-        """验证数据基本结构"""
-        required_fields = ["title", "slides"]
-        for field in required_fields:
-            if field not in data:
-                raise ValidationError(f"缺少必需字段: {field}")
-
-        if not isinstance(data["slides"], list):
-            raise ValidationError("slides必须是列表类型")
-
-    def _validate_document(self, data: Dict[str, Any]) -> None:
-        """验证文档属性"""
-        if not isinstance(data["title"], str) or not data["title"].strip():
-            raise ValidationError("文档标题不能为空")
-
-        if "metadata" in data and not isinstance(data["metadata"], dict):
-            raise ValidationError("metadata必须是字典类型")
-
-    def _validate_slide(self, slide_data: Dict[str, Any]) -> None:
-        """验证幻灯片数据"""
-        if not isinstance(slide_data, dict):
-            raise ValidationError("幻灯片数据必须是字典类型")
-
-        required_fields = ["title", "elements"]
-        for field in required_fields:
-            if field not in slide_data:
-                raise ValidationError(f"幻灯片缺少必需字段: {field}")
-
-        if not isinstance(slide_data["elements"], list):
-            raise ValidationError("elements必须是列表类型")
-
-        for element_data in slide_data["elements"]:
-            self._validate_element(element_data)
-
-    def _validate_element(self, element_data: Dict[str, Any]) -> None:
-        """验证元素数据"""
-        if not isinstance(element_data, dict):
-            raise ValidationError("元素数据必须是字典类型")
-
-        required_fields = ["type", "content", "position"]
-        for field in required_fields:
-            if field not in element_data:
-                raise ValidationError(f"元素缺少必需字段: {field}")
-
-        # 验证position
-        if not isinstance(element_data["position"], dict):
-            raise ValidationError("position必须是字典类型")
-        if "x" not in element_data["position"] or "y" not in element_data["position"]:
-            raise ValidationError("position必须包含x和y坐标")
-
-        # 验证style
-        if "style" in element_data and not isinstance(element_data["style"], dict):
-            raise ValidationError("style必须是字典类型")
+            raise ValidationError(f"验证过程出错: {str(e)}") from e
+
+
+@lru_cache(maxsize=None)
+def compile_schema(
+    model: Type[BaseModel],
+    shallow: bool = False,
+    exclude: FrozenSet[str] = frozenset(),
+) -> CompiledSchema:
+    """
+    获取模型的验证器，首次调用时生成
+
+    Args:
+        model: Document、Slide或Element模型
+        shallow: 为True时不检查列表字段中的各个元素
+        exclude: 不检查的字段
+
+    Returns:
+        CompiledSchema: 缓存的验证器
+    """
+    return CompiledSchema(_model_rules(model, _MODEL_PREFIXES[model], exclude), shallow)
+
+
+def _model_rules(
+    model: Type[BaseModel], prefix: str, exclude: FrozenSet[str] = frozenset()
+) -> ModelRules:
+    """从模型的字段定义生成规则"""
+    extra_required = _REQUIRED_FIELDS.get(model, ())
+    required = []
+    fields = []
+    for name, field in model.model_fields.items():
+        if name in exclude:
+            continue
+        if field.is_required() or name in extra_required:
+            required.append(name)
+
+        blank_message = _NON_BLANK_FIELDS.get((model, name))
+        if blank_message is not None:
+            fields.append(FieldRule(name, str, blank_message))
+            continue
+
+        annotation, nullable = _unwrap_optional(field.annotation)
+        origin = typing.get_origin(annotation)
+        if origin in (list, dict):
+            kind = origin
+            item = typing.get_args(annotation)[0] if origin is list else None
+            nested = None
+            if item is not None and _is_model(item):
+                nested = _model_rules(item, _MODEL_PREFIXES.get(item, name))
+        elif _is_model(annotation):
+            kind = dict
+            nested = _model_rules(annotation, name)
+            if nested.is_empty:
+                nested = None
+        else:
+            continue
+        message = f"{name}必须是{_CONTAINER_NAMES[kind]}类型"
+        fields.append(FieldRule(name, kind, message, nullable, nested))
+
+    return ModelRules(
+        prefix=prefix,
+        noun=prefix or "文档",
+        required=tuple(required),
+        fields=tuple(fields),
+    )
+
+
+def _unwrap_optional(annotation: Any) -> Tuple[Any, bool]:
+    """拆开Optional[X]，返回X以及是否允许None"""
+    if typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0], True
+    return annotation, False
+
+
+def _is_model(annotation: Any) -> bool:
+    """注解是否为pydantic模型"""
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _generate_check(
+    rules: ModelRules, shallow: bool
+) -> Tuple[Callable[[Any], bool], str]:
+    """
+    生成检查函数
+
+    规则展开为一串条件判断，嵌套模型和列表元素的检查直接内联在循环中，
+    运行时不需要遍历规则表，也没有逐个元素的函数调用。
+
+    Returns:
+        Tuple[Callable[[Any], bool], str]: 检查函数及其源代码
+    """
+    lines = ["def check(v0):"]
+    names = iter(range(1, 1 << 16))
+
+    def emit(model_rules: ModelRules, var: str, indent: str, descend: bool) -> None:
+        condition = " or ".join(
+            [f"not isinstance({var}, dict)"]
+            + [f"{field!r} not in {var}" for field in model_rules.required]
+        )
+        lines.extend([f"{indent}if {condition}:", f"{indent}    return False"])
+
+        for field in model_rules.fields:
+            value = f"v{next(names)}"
+            if field.name in model_rules.required:
+                lines.append(f"{indent}{value} = {var}[{field.name!r}]")
+                guards: List[str] = []
+            elif field.nullable:
+                # 不存在和为None一样跳过
+                lines.append(f"{indent}{value} = {var}.get({field.name!r})")
+                guards = []
+            else:
+                lines.append(f"{indent}{value} = {var}.get({field.name!r}, _MISSING)")
+                guards = [f"{value} is not _MISSING"]
+            if field.nullable:
+                guards.append(f"{value} is not None")
+
+            if field.kind is str:
+                failed = f"not isinstance({value}, str) or not {value}.strip()"
+            elif field.model is None or (field.kind is list and not descend):
+                failed = f"not isinstance({value}, {field.kind.__name__})"
+            else:
+                # 嵌套模型或列表元素，内联展开
+                body = indent
+                if guards:
+                    lines.append(f"{indent}if {' and '.join(guards)}:")
+                    body += "    "
+                if field.kind is dict:
+                    emit(field.model, value, body, True)
+                else:
+                    item = f"v{next(names)}"
+                    lines.extend(
+                        [
+                            f"{body}if not isinstance({value}, list):",
+                            f"{body}    return False",
+                            f"{body}for {item} in {value}:",
+                        ]
+                    )
+                    emit(field.model, item, body + "    ", True)
+                continue
+
+            if guards:
+                failed = f"{' and '.join(guards)} and ({failed})"
+            lines.extend([f"{indent}if {failed}:", f"{indent}    return False"])
+
+    emit(rules, "v0", "    ", not shallow)
+    lines.append("    return True")
+    source = "\n".join(lines)
+    namespace: Dict[str, Any] = {"_MISSING": _MISSING}
+    exec(compile(source, "<validator>", "exec"), namespace)  # pylint: disable=exec-used
+    return namespace["check"], source
+
+
+def _collect(
+    rules: ModelRules,
+    value: Any,
+    pointer: str,
+    errors: List[Tuple[str, str]],
+    max_errors: int,
+    shallow: bool = False,
+) -> None:
+    """
+    按规则逐项检查数据，将错误追加到errors中
+
+    与生成的检查函数使用同一份规则、相同的检查顺序。
+
+    Raises:
+        _ErrorLimitReached: 错误数量达到max_errors
+    """
+
+    def add(error_pointer: str, message: str) -> None:
+        errors.append((error_pointer, message))
+        if len(errors) == max_errors:
+            raise _ErrorLimitReached()
+
+    if not isinstance(value, dict):
+        add(pointer, f"{rules.noun}数据必须是字典类型")
+        return
+
+    for name in rules.required:
+        if name not in value:
+            add(f"{pointer}/{name}", f"{rules.prefix}缺少必需字段: {name}")
+
+    for field in rules.fields:
+        if field.name not in value:
+            continue
+        field_value: Any = value[field.name]
+        if field_value is None and field.nullable:
+            continue
+        field_pointer = f"{pointer}/{field.name}"
+
+        if field.kind is str:
+            if not isinstance(field_value, str) or not field_value.strip():
+                add(field_pointer, field.message)
+            continue
+        if not isinstance(field_value, field.kind):
+            add(field_pointer, field.message)
+            continue
+        if field.model is None:
+            continue
+
+        if field.kind is dict:
+            _collect(field.model, field_value, field_pointer, errors, max_errors)
+        elif not shallow:
+            for index, item in enumerate(field_value):
+                _collect(
+                    field.model, item, f"{field_pointer}/{index}", errors, max_errors
+                )
@@ -1,18 +1,30 @@
 """
 PPT解析器异常处理模块
 定义了所有自定义异常类
+
+异常类在首次访问时才导入所在的子模块。
 """
 
-from .base_exception import PPTParserBaseError
-from .parse_error import ParseError
-from .validation_error import ValidationError
-from .build_document_error import BuildDocumentError
-from .plugin_error import PluginError  # 添加这一行
+from typing import TYPE_CHECKING
+from .. import _lazy
+
+# 导出名称 -> 所在的子模块
+__getattr__, __dir__, __all__ = _lazy.attach(
+    __name__,
+    {
+        "PPTParserBaseError": ".base_exception",
+        "ParseError": ".parse_error",
+        "ValidationError": ".validation_error",
+        "BuildDocumentError": ".build_document_error",
+        "PluginError": ".plugin_error",
+        "WriteError": ".write_error",
+    },
+)
 
-__all__ = [
-    "PPTParserBaseError",
-    "ParseError",
-    "ValidationError",
-    "BuildDocumentError",
-    "PluginError",  # 添加这一行
-]
+if TYPE_CHECKING:
+    from .base_exception import PPTParserBaseError
+    from .parse_error import ParseError
+    from .validation_error import ValidationError
+    from .build_document_error import BuildDocumentError
+    from .plugin_error import PluginError
+    from .write_error import WriteError
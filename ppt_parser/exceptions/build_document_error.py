@@ -12,8 +12,8 @@ class BuildDocumentError(PPTParserBaseError):
     def __init__(
         self,
         message: str,
-        stage: str = None,
-        element_id: str = None,
+        stage: Optional[str] = None,
+        element_id: Optional[str] = None,
         details: Optional[Dict[str, Any]] = None,
     ):
         """
@@ -21,6 +21,9 @@ class ErrorCode(Enum):
     RESOURCE_NOT_FOUND = auto()  # 资源未找到
     INVALID_ELEMENT = auto()  # 元素无效
 
+    # 写入错误
+    WRITE_ERROR = auto()  # 一般写入错误
+
     @classmethod
     def get_message(cls, code: "ErrorCode") -> str:
         """获取错误代码对应的默认消息"""
@@ -34,5 +37,6 @@ class ErrorCode(Enum):
             cls.BUILD_ERROR: "文档构建错误",
             cls.RESOURCE_NOT_FOUND: "资源未找到",
             cls.INVALID_ELEMENT: "无效的元素",
+            cls.WRITE_ERROR: "文档写入错误",
         }
         return messages.get(code, "未知错误")
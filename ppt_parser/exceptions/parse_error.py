@@ -12,8 +12,8 @@ class ParseError(PPTParserBaseError):
     def __init__(
         self,
         message: str,
-        position: int = None,
-        input_data: str = None,
+        position: Optional[int] = None,
+        input_data: Optional[str] = None,
         details: Optional[Dict[str, Any]] = None,
     ):
         """
@@ -12,8 +12,8 @@ class ValidationError(PPTParserBaseError):
     def __init__(
         self,
         message: str,
-        field: str = None,
-        validation_errors: List[Dict[str, Any]] = None,
+        field: Optional[str] = None,
+        validation_errors: Optional[List[Dict[str, Any]]] = None,
         details: Optional[Dict[str, Any]] = None,
     ):
         """
@@ -0,0 +1,33 @@
+"""
+写入错误异常类
+用于处理将文档写出为PPTX文件过程中的错误
+"""
+from typing import Dict, Any, Optional
+from .base_exception import PPTParserBaseError
+
+
+class WriteError(PPTParserBaseError):
+    """写入错误异常类"""
+
+    def __init__(
+        self,
+        message: str,
+        slide_index: Optional[int] = None,
+        details: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        初始化写入错误异常
+
+        Args:
+            message: 错误信息
+            slide_index: 出错幻灯片的序号
+            details: 其他详细信息
+        """
+        error_details = details or {}
+        if slide_index is not None:
+            error_details["slide_index"] = slide_index
+
+        super().__init__(
+            message=message, error_code="WRITE_ERROR", details=error_details
+        )
+        self.slide_index = slide_index
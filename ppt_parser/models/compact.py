@@ -0,0 +1,540 @@
+"""
+紧凑文档数据模型
+按列存储所有元素的数据，用于元素数量非常多的文档
+
+每个元素的位置、大小、样式和类型分别存放在按字段划分的类型化数组中，
+样式中的字符串和文本内容按值去重。访问元素时才临时创建 Element 对象，
+遍历幻灯片和元素的代码无需修改即可使用。
+
+使用示例:
+    ```python
+    compact = CompactDocument.from_document(document)
+    for slide in compact.slides:
+        for element in slide.elements:
+            print(element.type, element.position.x)
+    document = compact.to_document()
+    ```
+"""
+
+import math
+from array import array
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+from .document import (
+    Document,
+    Element,
+    ElementType,
+    Position,
+    PositionUnit,
+    Slide,
+    Style,
+)
+
+# 元素类型和位置单位的编码表，数组中保存的是在表中的序号
+ELEMENT_TYPES: Tuple[ElementType, ...] = ("text", "image", "shape", "chart")
+POSITION_UNITS: Tuple[PositionUnit, ...] = ("px", "pt", "in", "cm")
+
+_TYPE_CODES = {value: code for code, value in enumerate(ELEMENT_TYPES)}
+_UNIT_CODES = {value: code for code, value in enumerate(POSITION_UNITS)}
+
+# 可选布尔值的编码，每个样式标志占2位
+_BOOL_CODES = {None: 0, False: 1, True: 2}
+_BOOL_VALUES = (None, False, True)
+_STYLE_FLAGS = ("bold", "italic", "underline")
+
+# 大小字段的编码位
+_HAS_SIZE = 1
+_HAS_WIDTH = 2
+_HAS_HEIGHT = 4
+
+_NONE_STRING = -1
+_MAX_FONT_SIZE = 32767
+
+
+class CompactDocument:
+    """
+    按列存储元素数据的文档
+
+    幻灯片和元素通过 slides 以只读视图的形式访问，每次访问元素都会创建新的
+    Element 对象，修改该对象不会影响紧凑文档。元素内容不会被复制，图表数据等
+    可变内容与紧凑文档共享，调用方不应修改。
+
+    无法用列存储精确表示的元素（例如带有额外字段的元素）按原样保存。
+    """
+
+    def __init__(
+        self,
+        title: str,
+        theme: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        初始化紧凑文档
+
+        Args:
+            title: 文档标题
+            theme: 主题设置
+            metadata: 元数据
+            extra: 文档的额外字段
+        """
+        self.title = title
+        self.theme = theme
+        self.metadata = metadata if metadata is not None else {}
+        self.extra = extra or {}
+
+        # 幻灯片级别的字段，以及每页幻灯片的元素在列中的起始位置
+        self._slide_fields: List[Dict[str, Any]] = []
+        self._slide_extras: List[Optional[Dict[str, Any]]] = []
+        self._slide_offsets = array("q", [0])
+
+        # 元素列
+        self._types = array("B")
+        self._x = array("d")
+        self._y = array("d")
+        self._units = array("B")
+        self._font_size = array("h")  # 0 表示未设置
+        self._font_family = array("i")  # 字符串表序号，-1 表示未设置
+        self._color = array("i")
+        self._background_color = array("i")
+        self._flags = array("B")  # bold、italic、underline 各占2位
+        self._opacity = array("d")  # NaN 表示未设置
+        self._rotation = array("d")
+        self._size_flags = array("B")
+        self._width = array("d")
+        self._height = array("d")
+        self._content: List[Any] = []
+
+        # 无法按列存储的元素
+        self._overflow: Dict[int, Element] = {}
+
+        # 去重后的字符串
+        self._strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+        self._content_strings: Dict[str, str] = {}
+
+    @classmethod
+    def from_document(cls, document: Document) -> "CompactDocument":
+        """
+        从文档对象创建紧凑文档
+
+        Args:
+            document: 文档对象
+
+        Returns:
+            CompactDocument: 紧凑文档
+        """
+        compact = cls(
+            title=document.title,
+            theme=document.theme,
+            metadata=document.metadata,
+            extra=document.__pydantic_extra__,
+        )
+        for slide in document.slides:
+            compact.append_slide(slide)
+        return compact
+
+    def append_slide(self, slide: Slide) -> None:
+        """
+        追加幻灯片，幻灯片的元素数据被复制到列中
+
+        Args:
+            slide: 幻灯片对象
+        """
+        fields = dict(slide.__dict__)
+        fields.pop("elements")
+        self._slide_fields.append(fields)
+        self._slide_extras.append(slide.__pydantic_extra__ or None)
+
+        for element in slide.elements:
+            self._append_element(element)
+        self._slide_offsets.append(len(self._types))
+
+    def to_document(self) -> Document:
+        """
+        转换为完整的文档对象
+
+        Returns:
+            Document: 文档对象
+        """
+        return Document.model_construct(
+            title=self.title,
+            slides=[slide.to_slide() for slide in self.slides],
+            theme=self.theme,
+            metadata=self.metadata,
+            **self.extra,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式，与 Document.to_dict 的结果一致"""
+        return self.to_document().to_dict()
+
+    def to_bytes(self) -> bytes:
+        """
+        保存为二进制快照，与 Document.to_bytes 的格式相同
+
+        Returns:
+            bytes: 快照数据
+
+        Raises:
+            SnapshotError: 文档中含有无法保存的值
+        """
+        from .snapshot import dumps
+
+        return dumps(self)
+
+    @classmethod
+    def from_bytes(cls, data: Any) -> "CompactDocument":
+        """
+        从二进制快照加载紧凑文档
+
+        数值列直接从快照数据复制，不创建元素对象，也不做模型验证，
+        只用于本服务生成的可信快照。
+
+        Args:
+            data: Document.to_bytes 或 to_bytes 生成的快照数据
+
+        Returns:
+            CompactDocument: 紧凑文档
+
+        Raises:
+            SnapshotError: 快照数据无效或版本不受支持
+        """
+        from .snapshot import loads_compact
+
+        return loads_compact(data)
+
+    def save(
+        self, target: Any, media_root: Optional[str] = None, workers: int = 0
+    ) -> None:
+        """
+        保存为PPTX文件，与 Document.save 相同
+
+        写入时每次只创建一页幻灯片的元素对象。
+
+        Args:
+            target: 输出文件路径或可写的二进制文件对象
+            media_root: 图片元素中相对路径的基准目录，默认为当前工作目录
+            workers: 渲染幻灯片的工作进程数量，0表示在当前进程中渲染，
+                输出与并行数量无关
+
+        Raises:
+            WriteError: 写入失败
+        """
+        from ..writer import save_document
+
+        save_document(self, target, media_root=media_root, workers=workers)
+
+    @property
+    def slides(self) -> "CompactSlides":
+        """幻灯片视图序列"""
+        return CompactSlides(self)
+
+    @property
+    def element_count(self) -> int:
+        """元素总数"""
+        return len(self._types)
+
+    @property
+    def nbytes(self) -> int:
+        """元素列占用的字节数（不含元素内容和字符串）"""
+        columns = (
+            self._types,
+            self._x,
+            self._y,
+            self._units,
+            self._font_size,
+            self._font_family,
+            self._color,
+            self._background_color,
+            self._flags,
+            self._opacity,
+            self._rotation,
+            self._size_flags,
+            self._width,
+            self._height,
+        )
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def _append_element(self, element: Element) -> None:
+        """将元素数据追加到各列，无法按列表示的元素按原样保存"""
+        if not self._pack_element(element):
+            self._overflow[len(self._types)] = element.model_copy(deep=True)
+            self._append_placeholder()
+
+    def _pack_element(self, element: Element) -> bool:
+        """尝试按列保存元素，成功时返回True"""
+        if element.__pydantic_extra__:
+            return False
+        type_code = _TYPE_CODES.get(element.type)
+        position = element.position
+        unit_code = _UNIT_CODES.get(position.unit)
+        style = element.style
+        if (
+            type_code is None
+            or unit_code is None
+            or not _is_float(position.x)
+            or not _is_float(position.y)
+        ):
+            return False
+
+        font_size = style.font_size
+        if font_size is not None and (
+            type(font_size) is not int or not 0 < font_size <= _MAX_FONT_SIZE
+        ):
+            return False
+
+        flags = 0
+        for shift, name in enumerate(_STYLE_FLAGS):
+            value = getattr(style, name)
+            if value is not None and type(value) is not bool:
+                return False
+            flags |= _BOOL_CODES[value] << (2 * shift)
+
+        strings = []
+        for value in (style.font_family, style.color, style.background_color):
+            if value is not None and type(value) is not str:
+                return False
+            strings.append(value)
+
+        optional_floats = []
+        for value in (style.opacity, style.rotation):
+            if value is not None and not _is_float(value):
+                return False
+            optional_floats.append(math.nan if value is None else value)
+
+        size = element.size
+        size_flags = 0
+        width = height = 0.0
+        if size is not None:
+            size_flags = _HAS_SIZE
+            for key, value in size.items():
+                if not _is_float(value):
+                    return False
+                if key == "width":
+                    size_flags |= _HAS_WIDTH
+                    width = value
+                elif key == "height":
+                    size_flags |= _HAS_HEIGHT
+                    height = value
+                else:
+                    return False
+
+        content = element.content
+        if type(content) is str:
+            content = self._content_strings.setdefault(content, content)
+
+        self._types.append(type_code)
+        self._x.append(position.x)
+        self._y.append(position.y)
+        self._units.append(unit_code)
+        self._font_size.append(font_size or 0)
+        self._font_family.append(self._string_code(strings[0]))
+        self._color.append(self._string_code(strings[1]))
+        self._background_color.append(self._string_code(strings[2]))
+        self._flags.append(flags)
+        self._opacity.append(optional_floats[0])
+        self._rotation.append(optional_floats[1])
+        self._size_flags.append(size_flags)
+        self._width.append(width)
+        self._height.append(height)
+        self._content.append(content)
+        return True
+
+    def _append_placeholder(self) -> None:
+        """为按原样保存的元素追加占位数据，保持各列对齐"""
+        for column in (
+            self._types,
+            self._x,
+            self._y,
+            self._units,
+            self._font_size,
+            self._flags,
+            self._opacity,
+            self._rotation,
+            self._size_flags,
+            self._width,
+            self._height,
+        ):
+            column.append(0)
+        for column in (self._font_family, self._color, self._background_color):
+            column.append(_NONE_STRING)
+        self._content.append(None)
+
+    def _string_code(self, value: Optional[str]) -> int:
+        """获取字符串在字符串表中的序号"""
+        if value is None:
+            return _NONE_STRING
+        code = self._string_index.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._string_index[value] = code
+        return code
+
+    def _string(self, code: int) -> Optional[str]:
+        """根据序号获取字符串"""
+        return None if code == _NONE_STRING else self._strings[code]
+
+    def _element(self, index: int) -> Element:
+        """创建第index个元素的 Element 对象"""
+        element = self._overflow.get(index)
+        if element is not None:
+            return element.model_copy(deep=True)
+
+        flags = self._flags[index]
+        opacity = self._opacity[index]
+        rotation = self._rotation[index]
+        style = Style.model_construct(
+            font_size=self._font_size[index] or None,
+            font_family=self._string(self._font_family[index]),
+            color=self._string(self._color[index]),
+            bold=_BOOL_VALUES[flags & 3],
+            italic=_BOOL_VALUES[(flags >> 2) & 3],
+            underline=_BOOL_VALUES[(flags >> 4) & 3],
+            background_color=self._string(self._background_color[index]),
+            opacity=None if math.isnan(opacity) else opacity,
+            rotation=None if math.isnan(rotation) else rotation,
+        )
+        position = Position.model_construct(
+            x=self._x[index],
+            y=self._y[index],
+            unit=POSITION_UNITS[self._units[index]],
+        )
+
+        size = None
+        size_flags = self._size_flags[index]
+        if size_flags:
+            size = {}
+            if size_flags & _HAS_WIDTH:
+                size["width"] = self._width[index]
+            if size_flags & _HAS_HEIGHT:
+                size["height"] = self._height[index]
+
+        return Element.model_construct(
+            type=ELEMENT_TYPES[self._types[index]],
+            content=self._content[index],
+            position=position,
+            style=style,
+            size=size,
+        )
+
+
+class CompactSlides(Sequence["CompactSlide"]):
+    """紧凑文档的幻灯片视图序列"""
+
+    def __init__(self, document: CompactDocument):
+        self._document = document
+
+    def __len__(self) -> int:
+        return len(self._document._slide_fields)
+
+    @overload
+    def __getitem__(self, index: int) -> "CompactSlide":
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List["CompactSlide"]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union["CompactSlide", List["CompactSlide"]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("幻灯片序号超出范围")
+        return CompactSlide(self._document, index)
+
+
+class CompactSlide:
+    """
+    紧凑文档中单页幻灯片的只读视图
+
+    title、background、layout、notes 等字段与 Slide 一致，
+    elements 为按需创建 Element 对象的序列。
+    """
+
+    def __init__(self, document: CompactDocument, index: int):
+        self._document = document
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        fields = self._document._slide_fields[self._index]
+        if name in fields:
+            return fields[name]
+        extra = self._document._slide_extras[self._index]
+        if extra and name in extra:
+            return extra[name]
+        raise AttributeError(name)
+
+    @property
+    def elements(self) -> "CompactElements":
+        """元素视图序列"""
+        offsets = self._document._slide_offsets
+        return CompactElements(
+            self._document, offsets[self._index], offsets[self._index + 1]
+        )
+
+    def to_slide(self) -> Slide:
+        """
+        转换为完整的幻灯片对象
+
+        Returns:
+            Slide: 幻灯片对象
+        """
+        extra = self._document._slide_extras[self._index] or {}
+        return Slide.model_construct(
+            elements=list(self.elements),
+            **self._document._slide_fields[self._index],
+            **extra,
+        )
+
+
+class CompactElements(Sequence[Element]):
+    """单页幻灯片的元素视图序列，每次访问都创建新的 Element 对象"""
+
+    def __init__(self, document: CompactDocument, start: int, stop: int):
+        self._document = document
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> Element:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Element]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Element, List[Element]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("元素序号超出范围")
+        return self._document._element(self._start + index)
+
+    def __iter__(self) -> Iterator[Element]:
+        for index in range(self._start, self._stop):
+            yield self._document._element(index)
+
+
+def _is_float(value: Any) -> bool:
+    """是否为可以无损存入double数组的浮点数（NaN用于表示未设置）"""
+    return type(value) is float and not math.isnan(value)
@@ -0,0 +1,73 @@
+"""
+不经验证批量创建模型对象
+
+model_construct 对每个字段都要查找默认值和别名，一次创建几万个对象时占用了大部分
+构建时间。这里直接设置实例的 __dict__ 和 pydantic 的内部槽，调用方负责提供已经
+完整的字段字典，只用于已经验证过的可信数据。
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Optional, Set, Tuple, Type, TypeVar
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_new = object.__new__
+_setattr = object.__setattr__
+# BaseModel 的槽，直接调用描述符比按名称调用 object.__setattr__ 快一倍
+_set_fields_set = BaseModel.__dict__["__pydantic_fields_set__"].__set__
+_set_extra = BaseModel.__dict__["__pydantic_extra__"].__set__
+_set_private = BaseModel.__dict__["__pydantic_private__"].__set__
+
+
+def construct(
+    model: Type[ModelT],
+    fields: Dict[str, Any],
+    fields_set: Set[str],
+    extra: Optional[Dict[str, Any]] = None,
+) -> ModelT:
+    """
+    用完整的字段字典创建模型对象
+
+    Args:
+        model: 模型类
+        fields: 模型的所有字段，直接作为实例的 __dict__，不会复制
+        fields_set: 视为已设置的字段名
+        extra: 额外字段，模型允许额外字段时至少为空字典
+
+    Returns:
+        模型对象
+    """
+    instance = _new(model)
+    _setattr(instance, "__dict__", fields)
+    _set_fields_set(instance, fields_set)
+    _set_extra(instance, extra)
+    _set_private(instance, None)
+    return instance
+
+
+def construct_with_defaults(model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    """
+    与 model_construct 相同：data 中没有的字段取默认值，模型没有的字段被忽略
+
+    只用于所有默认值都不可变、没有默认值工厂的模型（Position 和 Style）。
+    """
+    names, defaults = _fields(model)
+    fields = {**defaults, **data}
+    if len(fields) == len(names):
+        return construct(model, fields, set(data))
+    fields = {name: fields[name] for name in names if name in fields}
+    return construct(model, fields, set(data) & fields.keys())
+
+
+@lru_cache(maxsize=None)
+def _fields(model: Type[BaseModel]) -> Tuple[Tuple[str, ...], Dict[str, Any]]:
+    """模型的字段名和有默认值的字段"""
+    fields = model.model_fields
+    defaults = {
+        name: field.default
+        for name, field in fields.items()
+        if field.default is not PydanticUndefined
+    }
+    return tuple(fields), defaults
@@ -22,9 +22,16 @@ PPT文档数据模型
         ]
     )
     ```
+
+所有模型都设置了 defer_build，验证器在第一次创建或验证模型时才生成，
+导入本模块不需要为生成验证器付出时间。
 """
 from typing import List, Dict, Any, Optional, Literal
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# 元素类型和位置单位的取值
+ElementType = Literal["text", "image", "shape", "chart"]
+PositionUnit = Literal["px", "pt", "in", "cm"]
 
 
 class Position(BaseModel):
@@ -37,9 +44,11 @@ class Position(BaseModel):
         unit: 单位 ("px", "pt", "in", "cm")
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     x: float = Field(ge=0, le=1000, description="X坐标")
     y: float = Field(ge=0, le=1000, description="Y坐标")
-    unit: Literal["px", "pt", "in", "cm"] = Field(default="px", description="单位")
+    unit: PositionUnit = Field(default="px", description="单位")
 
 
 class Style(BaseModel):
@@ -58,6 +67,8 @@ class Style(BaseModel):
         rotation: 旋转角度 (0-360)
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     font_size: Optional[int] = Field(None, ge=1, le=1000, description="字体大小")
     font_family: Optional[str] = Field(None, description="字体系列")
     color: Optional[str] = Field(
@@ -73,6 +84,7 @@ class Style(BaseModel):
     rotation: Optional[float] = Field(0.0, ge=0, le=360, description="旋转角度")
 
     @field_validator("color", "background_color", mode="before")
+    @classmethod
     def validate_color(cls, v):
         """验证颜色格式"""
         if v is not None and not v.startswith("#"):
@@ -80,6 +92,36 @@ class Style(BaseModel):
         return v
 
 
+class FrozenPosition(Position):
+    """
+    不可变的元素位置信息，可以在多个元素之间共享
+
+    与内容相同的 Position 比较时视为相等。
+    """
+
+    model_config = ConfigDict(frozen=True, title="Position")
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Position):
+            return self.__dict__ == other.__dict__
+        return NotImplemented
+
+
+class FrozenStyle(Style):
+    """
+    不可变的元素样式信息，可以在多个元素之间共享
+
+    与内容相同的 Style 比较时视为相等。
+    """
+
+    model_config = ConfigDict(frozen=True, title="Style")
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Style):
+            return self.__dict__ == other.__dict__
+        return NotImplemented
+
+
 class Element(BaseModel):
     """
     PPT元素基类
@@ -92,7 +134,7 @@ class Element(BaseModel):
         size: 元素大小
     """
 
-    type: Literal["text", "image", "shape", "chart"] = Field(..., description="元素类型")
+    type: ElementType = Field(..., description="元素类型")
     content: Any = Field(..., description="元素内容")
     position: Position = Field(..., description="元素位置")
     style: Style = Field(default_factory=Style, description="元素样式")
@@ -102,6 +144,7 @@ class Element(BaseModel):
         """模型配置"""
 
         extra = "allow"
+        defer_build = True
         json_schema_extra = {  # 将 schema_extra 改为 json_schema_extra
             "example": {
                 "type": "text",
@@ -134,6 +177,7 @@ class Slide(BaseModel):
         """模型配置"""
 
         extra = "allow"
+        defer_build = True
 
 
 class Document(BaseModel):
@@ -169,7 +213,68 @@ class Document(BaseModel):
         """从字典创建文档对象"""
         return cls.model_validate(data)  # 使用 model_validate 替代 parse_obj
 
+    def to_bytes(self) -> bytes:
+        """
+        保存为紧凑的二进制快照
+
+        快照带有版本号，不使用pickle，可以用 from_bytes 或
+        CompactDocument.from_bytes 重新加载。
+
+        Returns:
+            bytes: 快照数据
+
+        Raises:
+            SnapshotError: 文档中含有无法保存的值
+        """
+        from .snapshot import dumps
+
+        return dumps(self)
+
+    @classmethod
+    def from_bytes(cls, data: Any, trusted: bool = False) -> "Document":
+        """
+        从二进制快照加载文档
+
+        Args:
+            data: to_bytes 生成的快照数据
+            trusted: 是否跳过模型验证，只用于本服务生成的可信快照。
+                仍会创建所有元素对象，需要更快的加载时用
+                CompactDocument.from_bytes
+
+        Returns:
+            Document: 文档对象
+
+        Raises:
+            SnapshotError: 快照数据无效或版本不受支持
+            pydantic.ValidationError: 未跳过验证且数据不符合模型定义
+        """
+        from .snapshot import loads
+
+        return loads(data, trusted=trusted)
+
+    def save(
+        self, target: Any, media_root: Optional[str] = None, workers: int = 0
+    ) -> None:
+        """
+        保存为PPTX文件
+
+        幻灯片逐个写入压缩包，内存占用与幻灯片数量无关。
+
+        Args:
+            target: 输出文件路径或可写的二进制文件对象
+            media_root: 图片元素中相对路径的基准目录，默认为当前工作目录
+            workers: 渲染幻灯片的工作进程数量，0表示在当前进程中渲染，
+                输出与并行数量无关
+
+        Raises:
+            WriteError: 写入失败
+        """
+        from ..writer import save_document
+
+        save_document(self, target, media_root=media_root, workers=workers)
+
     class Config:
         """模型配置"""
 
         extra = "allow"
+        defer_build = True
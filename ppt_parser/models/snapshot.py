@@ -0,0 +1,621 @@
+"""
+文档快照
+把解析后的文档保存为紧凑、带版本号的二进制数据，用于在处理阶段之间以及
+工作进程重启后缓存文档。快照不使用pickle，加载时不会执行任意代码。
+
+格式（整数和浮点数均为小端序）:
+    头部      标识"PPTS"、版本号(u16)、保留(u16)、幻灯片数、元素数、样式数、
+              字符串数(各u32)以及头部之后所有数据的CRC32(u32)
+    字符串表  UTF-8数据的字节数(u64)和数据
+    对象数据  字节数(u64)和MessagePack数据：文档的字段、幻灯片的额外字段、
+              不是字符串的字段值和元素内容，以及无法按列保存的元素
+    数值列    每个字符串的结束位置(i64)；每页幻灯片的元素起始位置(i64)，
+              以及标题、背景、布局和备注的值序号(i32)；去重后的样式表；
+              元素类型、位置、大小、样式表序号和内容的值序号
+
+值序号为非负数时表示字符串表中的字符串，为负数n时表示对象数据中第~n个值，
+其中-1固定表示None。样式中的字符串、元素内容和幻灯片字段共用一个字符串表，
+相同的字符串只保存一次。格式变化时版本号递增，加载时拒绝不认识的版本。
+
+跳过验证的 Document 加载按列直接创建模型对象，但每个元素仍要在Python中创建
+Element、Position 和 Style 三个对象，速度约为 Document.from_dict 的1到3倍，
+没有达到10倍的目标（python -m benchmarks.bench_snapshot 会检查并报告）。
+需要快速重新加载时使用 CompactDocument.from_bytes，它只复制数值列，不创建
+元素对象。不跳过验证的加载执行与 from_dict 相同的模型验证，不会比它快。
+
+使用示例:
+    ```python
+    data = document.to_bytes()
+    document = Document.from_bytes(data)  # 完整验证
+    document = Document.from_bytes(data, trusted=True)  # 跳过验证
+    compact = CompactDocument.from_bytes(data)  # 不创建元素对象
+    ```
+"""
+
+import math
+import struct
+import sys
+import zlib
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+from pydantic import BaseModel
+from ..core.gc_pause import gc_paused
+from ..plugins.msgpack_codec import MessagePackError, packb, unpackb
+from .construct import construct
+from .compact import ELEMENT_TYPES, POSITION_UNITS, CompactDocument
+from .document import Document, Element, Position, Slide, Style
+
+SnapshotData = Union[bytes, bytearray, memoryview]
+
+MAGIC = b"PPTS"
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIIII")
+_LENGTH = struct.Struct("<Q")
+
+# 按列保存的幻灯片字段
+_SLIDE_FIELDS = ("title", "background", "layout", "notes")
+
+# 样式表和元素列：(CompactDocument中的列名, 数组类型)
+_STYLE_COLUMNS = (
+    ("_font_size", "h"),
+    ("_font_family", "i"),
+    ("_color", "i"),
+    ("_background_color", "i"),
+    ("_flags", "B"),
+    ("_opacity", "d"),
+    ("_rotation", "d"),
+)
+_ELEMENT_COLUMNS = (
+    ("_types", "B"),
+    ("_units", "B"),
+    ("_x", "d"),
+    ("_y", "d"),
+    ("_size_flags", "B"),
+    ("_width", "d"),
+    ("_height", "d"),
+)
+_STYLE_ROW = struct.Struct("<" + "".join(code for _, code in _STYLE_COLUMNS))
+
+# 与 CompactDocument 中的编码相同
+_BOOL_VALUES = (None, False, True)
+_HAS_WIDTH = 2
+_HAS_HEIGHT = 4
+
+_NONE_CODE = -1
+_SWAP_BYTES = sys.byteorder == "big"
+
+
+class SnapshotError(ValueError):
+    """快照数据无效"""
+
+
+class _Snapshot(NamedTuple):
+    """读出的快照内容，数值列尚未转换为模型字段"""
+
+    strings: List[str]
+    objects: Dict[str, Any]
+    slide_offsets: array
+    slide_columns: List[array]
+    styles: List[array]
+    style_codes: array
+    columns: List[array]
+    content_codes: array
+
+
+def dumps(document: Union[Document, CompactDocument]) -> bytes:
+    """
+    将文档保存为快照
+
+    Args:
+        document: Document 或 CompactDocument
+
+    Returns:
+        bytes: 快照数据
+
+    Raises:
+        SnapshotError: 文档中含有无法保存的值，例如超出64位范围的整数
+    """
+    if isinstance(document, CompactDocument):
+        compact = document
+    else:
+        compact = CompactDocument.from_document(document)
+
+    strings = list(compact._strings)
+    string_index = dict(compact._string_index)
+    values: List[Any] = [None]
+
+    def value_code(value: Any) -> int:
+        """字符串取字符串表序号，其他值追加到对象数据"""
+        if value is None:
+            return _NONE_CODE
+        if type(value) is str:
+            code = string_index.get(value)
+            if code is None:
+                code = string_index[value] = len(strings)
+                strings.append(value)
+            return code
+        values.append(value)
+        return ~(len(values) - 1)
+
+    slide_columns = [
+        array("i", [value_code(fields.get(name)) for fields in compact._slide_fields])
+        for name in _SLIDE_FIELDS
+    ]
+
+    # 相同的样式只保存一次，按列的原始字节去重，NaN和-0.0都能区分
+    style_index: Dict[bytes, int] = {}
+    style_codes = array("i")
+    styles = [array(code) for _, code in _STYLE_COLUMNS]
+    for row in zip(*(getattr(compact, name) for name, _ in _STYLE_COLUMNS)):
+        key = _STYLE_ROW.pack(*row)
+        code = style_index.get(key)
+        if code is None:
+            code = style_index[key] = len(style_index)
+            for column, value in zip(styles, row):
+                column.append(value)
+        style_codes.append(code)
+
+    content_codes = array("i", map(value_code, compact._content))
+
+    objects = {
+        "document": [
+            {
+                "title": compact.title,
+                "theme": compact.theme,
+                "metadata": compact.metadata,
+            },
+            compact.extra,
+        ],
+        "slide_extras": [
+            [index, extra] for index, extra in enumerate(compact._slide_extras) if extra
+        ],
+        "values": values,
+        "overflow": [
+            [index, _element_state(element), element.__pydantic_extra__ or {}]
+            for index, element in compact._overflow.items()
+        ],
+    }
+    try:
+        object_data = packb(objects)
+    except (TypeError, OverflowError, UnicodeEncodeError) as e:
+        raise SnapshotError(f"文档中含有无法保存的值: {str(e)}") from e
+
+    text = "".join(strings).encode("utf-8", "surrogatepass")
+    string_ends = array("q")
+    end = 0
+    for value in strings:
+        end += len(value)
+        string_ends.append(end)
+
+    columns = [string_ends, compact._slide_offsets, *slide_columns, *styles]
+    columns.append(style_codes)
+    columns += [getattr(compact, name) for name, _ in _ELEMENT_COLUMNS]
+    columns.append(content_codes)
+    body = b"".join(
+        [
+            _LENGTH.pack(len(text)),
+            text,
+            _LENGTH.pack(len(object_data)),
+            object_data,
+            *map(_column_bytes, columns),
+        ]
+    )
+
+    header = _HEADER.pack(
+        MAGIC,
+        SNAPSHOT_VERSION,
+        0,
+        len(compact._slide_fields),
+        compact.element_count,
+        len(style_index),
+        len(strings),
+        zlib.crc32(body),
+    )
+    return header + body
+
+
+def loads(data: SnapshotData, trusted: bool = False) -> Document:
+    """
+    从快照加载文档
+
+    Args:
+        data: 快照数据
+        trusted: 是否跳过模型验证。只应用于本服务生成的可信快照，
+            跳过验证时快照中的字段值不会被检查。仍会创建所有元素对象，
+            只需要遍历或写出文档时用 loads_compact 更快
+
+    Returns:
+        Document: 文档对象
+
+    Raises:
+        SnapshotError: 快照数据无效或版本不受支持
+        pydantic.ValidationError: 未跳过验证且文档数据不符合模型定义
+    """
+    # 创建的对象之间没有循环引用，暂停回收不会造成内存泄漏
+    with gc_paused():
+        snapshot = _read(data)
+        if trusted:
+            return _build_document(snapshot)
+        state, extra = _document_parts(snapshot, _state)
+    return Document.model_validate({**state, **extra})
+
+
+def loads_compact(data: SnapshotData) -> CompactDocument:
+    """
+    从快照加载紧凑文档
+
+    数值列直接从快照数据复制，不创建元素对象，也不做模型验证，只应用于可信的快照。
+
+    Args:
+        data: 快照数据
+
+    Returns:
+        CompactDocument: 紧凑文档
+
+    Raises:
+        SnapshotError: 快照数据无效或版本不受支持
+    """
+    with gc_paused():
+        snapshot = _read(data)
+    objects = snapshot.objects
+    try:
+        fields, extra = objects["document"]
+        compact = CompactDocument(
+            title=fields["title"],
+            theme=fields["theme"],
+            metadata=fields["metadata"],
+            extra=extra,
+        )
+        compact._slide_fields = _slide_fields(snapshot)
+        compact._slide_extras = [None] * len(compact._slide_fields)
+        for index, extra in objects["slide_extras"]:
+            compact._slide_extras[index] = extra
+        compact._slide_offsets = snapshot.slide_offsets
+
+        style_codes = snapshot.style_codes
+        for (name, code), column in zip(_STYLE_COLUMNS, snapshot.styles):
+            style_values = column.tolist()
+            setattr(compact, name, array(code, [style_values[c] for c in style_codes]))
+        for (name, _), column in zip(_ELEMENT_COLUMNS, snapshot.columns):
+            setattr(compact, name, column)
+        compact._content = _decode_values(snapshot, snapshot.content_codes)
+        compact._overflow = {
+            index: _construct_element(fields, extra, _construct)
+            for index, fields, extra in objects["overflow"]
+        }
+    except (KeyError, TypeError, ValueError, IndexError) as e:
+        raise SnapshotError(f"快照数据结构无效: {str(e)}") from e
+
+    compact._strings = snapshot.strings
+    compact._string_index = {value: code for code, value in enumerate(snapshot.strings)}
+    return compact
+
+
+def _read(data: SnapshotData) -> _Snapshot:
+    """检查头部和校验和，读出字符串表、对象数据和数值列"""
+    view = memoryview(data).cast("B")
+    if len(view) < _HEADER.size:
+        raise SnapshotError("快照数据不完整")
+    (
+        magic,
+        version,
+        _,
+        slide_count,
+        element_count,
+        style_count,
+        string_count,
+        checksum,
+    ) = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise SnapshotError("不是文档快照数据")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"不支持的快照版本: {version}")
+    body = view[_HEADER.size :]
+    if zlib.crc32(body) != checksum:
+        raise SnapshotError("快照数据校验失败")
+
+    offset = 0
+
+    def take(size: int) -> memoryview:
+        nonlocal offset
+        if size > len(body) - offset:
+            raise SnapshotError("快照数据不完整")
+        offset += size
+        return body[offset - size : offset]
+
+    def section() -> memoryview:
+        return take(_LENGTH.unpack(take(_LENGTH.size))[0])
+
+    def column(code: str, count: int) -> array:
+        values = array(code)
+        values.frombytes(take(count * values.itemsize))
+        if _SWAP_BYTES:
+            values.byteswap()
+        return values
+
+    try:
+        text = str(section(), "utf-8", "surrogatepass")
+    except UnicodeDecodeError as e:
+        raise SnapshotError(f"字符串表无效: {str(e)}") from e
+    try:
+        objects = unpackb(section())
+    except (MessagePackError, RecursionError) as e:
+        raise SnapshotError(f"对象数据无效: {str(e)}") from e
+
+    string_ends = column("q", string_count)
+    slide_offsets = column("q", slide_count + 1)
+    slide_columns = [column("i", slide_count) for _ in _SLIDE_FIELDS]
+    styles = [column(code, style_count) for _, code in _STYLE_COLUMNS]
+    style_codes = column("i", element_count)
+    columns = [column(code, element_count) for _, code in _ELEMENT_COLUMNS]
+    content_codes = column("i", element_count)
+    if offset != len(body):
+        raise SnapshotError("快照数据末尾有多余的字节")
+
+    if (string_ends[-1] if string_count else 0) != len(text):
+        raise SnapshotError("字符串表无效")
+    strings = [text[start:end] for start, end in zip([0, *string_ends], string_ends)]
+
+    if not (
+        isinstance(objects, dict)
+        and isinstance(objects.get("values"), list)
+        and objects["values"][:1] == [None]
+        and isinstance(objects.get("slide_extras"), list)
+        and isinstance(objects.get("overflow"), list)
+    ):
+        raise SnapshotError("对象数据无效")
+
+    # 检查所有序号都在范围内，之后按序号取值时不会出错
+    value_range = (-len(objects["values"]), string_count - 1)
+    checks = [
+        (slide_offsets, (0, element_count)),
+        (style_codes, (0, style_count - 1)),
+        (content_codes, value_range),
+        (columns[0], (0, len(ELEMENT_TYPES) - 1)),
+        (columns[1], (0, len(POSITION_UNITS) - 1)),
+    ]
+    checks += [(values, value_range) for values in slide_columns]
+    checks += [(styles[index], (-1, string_count - 1)) for index in (1, 2, 3)]
+    for values, (low, high) in checks:
+        if values and not low <= min(values) <= max(values) <= high:
+            raise SnapshotError("快照中的序号超出范围")
+    if slide_offsets[0] != 0 or slide_offsets[-1] != element_count:
+        raise SnapshotError("快照中的幻灯片位置无效")
+    for items, count in (
+        (objects["slide_extras"], slide_count),
+        (objects["overflow"], element_count),
+    ):
+        for item in items:
+            if not (
+                isinstance(item, list)
+                and len(item) in (2, 3)
+                and type(item[0]) is int
+                and 0 <= item[0] < count
+            ):
+                raise SnapshotError("快照中的序号超出范围")
+
+    return _Snapshot(
+        strings,
+        objects,
+        slide_offsets,
+        slide_columns,
+        styles,
+        style_codes,
+        columns,
+        content_codes,
+    )
+
+
+def _document_parts(
+    snapshot: _Snapshot, build: Callable[..., Any]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """创建所有幻灯片和元素，返回文档的字段和额外字段"""
+    objects = snapshot.objects
+    # 样式中的字符串序号-1表示None，对应列表末尾追加的None
+    strings: List[Optional[str]] = [*snapshot.strings, None]
+
+    style_states = [_style_state(row, strings) for row in zip(*snapshot.styles)]
+
+    types, units, xs, ys, size_flags, widths, heights = snapshot.columns
+    try:
+        elements: List[Element] = []
+        append = elements.append
+        for type_code, content, x, y, unit, style_code, has_size, width, height in zip(
+            types,
+            _decode_values(snapshot, snapshot.content_codes),
+            xs,
+            ys,
+            units,
+            snapshot.style_codes,
+            size_flags,
+            widths,
+            heights,
+        ):
+            size = None
+            if has_size:
+                size = {}
+                if has_size & _HAS_WIDTH:
+                    size["width"] = width
+                if has_size & _HAS_HEIGHT:
+                    size["height"] = height
+            position = build(
+                Position, {"x": x, "y": y, "unit": POSITION_UNITS[unit]}, None
+            )
+            style = build(Style, style_states[style_code].copy(), None)
+            append(
+                build(
+                    Element,
+                    {
+                        "type": ELEMENT_TYPES[type_code],
+                        "content": content,
+                        "position": position,
+                        "style": style,
+                        "size": size,
+                    },
+                    {},
+                )
+            )
+        for index, fields, extra in objects["overflow"]:
+            elements[index] = _construct_element(fields, extra, build)
+
+        slide_extras = dict(objects["slide_extras"])
+        offsets = snapshot.slide_offsets
+        slides = []
+        for index, fields in enumerate(_slide_fields(snapshot)):
+            fields["elements"] = elements[offsets[index] : offsets[index + 1]]
+            slides.append(build(Slide, fields, slide_extras.get(index, {})))
+
+        fields, extra = objects["document"]
+        return {**fields, "slides": slides}, extra
+    except (KeyError, TypeError, ValueError, IndexError) as e:
+        raise SnapshotError(f"快照数据结构无效: {str(e)}") from e
+
+
+def _build_document(snapshot: _Snapshot) -> Document:
+    """
+    跳过验证时直接按列创建模型对象
+
+    样式表的每一行只转换一次，元素、位置和样式的字段字典直接作为对象的
+    __dict__，不生成中间的字段字典。
+    """
+    objects = snapshot.objects
+    strings: List[Optional[str]] = [*snapshot.strings, None]
+    style_states = [_style_state(row, strings) for row in zip(*snapshot.styles)]
+    types, units, xs, ys, size_flags, widths, heights = snapshot.columns
+    try:
+        elements: List[Element] = []
+        append = elements.append
+        for type_code, content, x, y, unit, style_code, has_size, width, height in zip(
+            types,
+            _decode_values(snapshot, snapshot.content_codes),
+            xs,
+            ys,
+            units,
+            snapshot.style_codes,
+            size_flags,
+            widths,
+            heights,
+        ):
+            size = None
+            if has_size:
+                size = {}
+                if has_size & _HAS_WIDTH:
+                    size["width"] = width
+                if has_size & _HAS_HEIGHT:
+                    size["height"] = height
+            position = construct(
+                Position,
+                {"x": x, "y": y, "unit": POSITION_UNITS[unit]},
+                {"x", "y", "unit"},
+            )
+            style_fields = style_states[style_code].copy()
+            style = construct(Style, style_fields, set(style_fields))
+            element = construct(
+                Element,
+                {
+                    "type": ELEMENT_TYPES[type_code],
+                    "content": content,
+                    "position": position,
+                    "style": style,
+                    "size": size,
+                },
+                {"type", "content", "position", "style", "size"},
+                {},
+            )
+            append(element)
+        for index, fields, extra in objects["overflow"]:
+            elements[index] = _construct_element(fields, extra, _construct)
+
+        slide_extras = dict(objects["slide_extras"])
+        offsets = snapshot.slide_offsets
+        slides = []
+        for index, fields in enumerate(_slide_fields(snapshot)):
+            fields["elements"] = elements[offsets[index] : offsets[index + 1]]
+            slides.append(_construct(Slide, fields, slide_extras.get(index, {})))
+
+        fields, extra = objects["document"]
+        return _construct(Document, {**fields, "slides": slides}, extra)
+    except (KeyError, TypeError, ValueError, IndexError) as e:
+        raise SnapshotError(f"快照数据结构无效: {str(e)}") from e
+
+
+def _style_state(row: Tuple[Any, ...], strings: List[Optional[str]]) -> Dict[str, Any]:
+    """样式表中一行的字段"""
+    font_size, font_family, color, background, flags, opacity, rotation = row
+    return {
+        "font_size": font_size or None,
+        "font_family": strings[font_family],
+        "color": strings[color],
+        "bold": _BOOL_VALUES[flags & 3],
+        "italic": _BOOL_VALUES[(flags >> 2) & 3],
+        "underline": _BOOL_VALUES[(flags >> 4) & 3],
+        "background_color": strings[background],
+        "opacity": None if math.isnan(opacity) else opacity,
+        "rotation": None if math.isnan(rotation) else rotation,
+    }
+
+
+def _decode_values(snapshot: _Snapshot, codes: array) -> List[Any]:
+    """按值序号取出字符串表或对象数据中的值"""
+    strings = snapshot.strings
+    values = snapshot.objects["values"]
+    return [strings[code] if code >= 0 else values[~code] for code in codes]
+
+
+def _slide_fields(snapshot: _Snapshot) -> List[Dict[str, Any]]:
+    """每页幻灯片按列保存的字段"""
+    columns = [_decode_values(snapshot, codes) for codes in snapshot.slide_columns]
+    return [dict(zip(_SLIDE_FIELDS, row)) for row in zip(*columns)]
+
+
+def _element_state(element: Element) -> Dict[str, Any]:
+    """无法按列保存的元素的字段，位置和样式转换为字典"""
+    state = dict(element.__dict__)
+    for name in ("position", "style"):
+        if isinstance(state.get(name), BaseModel):
+            state[name] = dict(state[name].__dict__)
+    return state
+
+
+def _construct_element(
+    fields: Dict[str, Any], extra: Dict[str, Any], build: Callable[..., Any]
+) -> Any:
+    """创建按原样保存的元素"""
+    fields = dict(fields)
+    for name, model in (("position", Position), ("style", Style)):
+        if isinstance(fields.get(name), dict):
+            fields[name] = build(model, fields[name], None)
+    return build(Element, fields, extra)
+
+
+def _construct(
+    model: Type[BaseModel], state: Dict[str, Any], extra: Optional[Dict[str, Any]]
+) -> Any:
+    """不经验证直接创建模型对象，state中的字段都视为已设置"""
+    return construct(model, state, set(state), extra)
+
+
+def _state(
+    _model: Type[BaseModel], state: Dict[str, Any], extra: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """需要验证时只生成字段字典，由 Document.model_validate 统一验证"""
+    return {**state, **extra} if extra else state
+
+
+def _column_bytes(column: array) -> bytes:
+    """数值列的小端序字节"""
+    if _SWAP_BYTES:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
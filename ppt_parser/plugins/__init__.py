@@ -1,9 +1,24 @@
 """
 PPT解析器插件系统
 提供了基础插件接口和具体的解析器插件实现
+
+插件类在首次访问时才导入所在的子模块。
 """
 
-from .base_plugin import BasePlugin
-from .json_plugin import JSONPlugin
+from typing import TYPE_CHECKING
+from .. import _lazy
+
+# 导出名称 -> 所在的子模块
+__getattr__, __dir__, __all__ = _lazy.attach(
+    __name__,
+    {
+        "BasePlugin": ".base_plugin",
+        "JSONPlugin": ".json_plugin",
+        "MessagePackPlugin": ".msgpack_plugin",
+    },
+)
 
-__all__ = ["BasePlugin", "JSONPlugin"]
+if TYPE_CHECKING:
+    from .base_plugin import BasePlugin
+    from .json_plugin import JSONPlugin
+    from .msgpack_plugin import MessagePackPlugin
@@ -4,7 +4,35 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterable, AsyncIterator, Optional, Union
+from ..exceptions import ParseError
+
+# 插件可以接收的输入数据：字符串或bytes、memoryview、mmap等缓冲区对象
+InputData = Union[str, bytes, bytearray, memoryview]
+
+
+def decode_text(input_data: InputData, encoding: str = "utf-8") -> str:
+    """
+    将输入数据解码为字符串
+
+    缓冲区对象直接解码，不会先复制出中间的bytes对象。
+
+    Args:
+        input_data: 输入数据，已是字符串时原样返回
+        encoding: 缓冲区的文本编码
+
+    Returns:
+        str: 解码后的字符串
+
+    Raises:
+        ParseError: 输入数据不是有效的文本编码
+    """
+    if isinstance(input_data, str):
+        return input_data
+    try:
+        return str(input_data, encoding)
+    except UnicodeDecodeError as e:
+        raise ParseError(f"输入数据不是有效的{encoding}编码: {str(e)}") from e
 
 
 class BasePlugin(ABC):
@@ -12,6 +40,10 @@ class BasePlugin(ABC):
     解析器插件的基类
     所有具体的解析器插件都必须继承此类并实现其抽象方法
 
+    ACCEPTS_BUFFERS为False的插件只会收到字符串，缓冲区输入由引擎先按UTF-8
+    解码；设为True的插件会直接收到bytes、memoryview等缓冲区对象，
+    可以自行决定是否以及何时解码。
+
     示例:
         ```python
         class CustomPlugin(BasePlugin):
@@ -24,6 +56,9 @@ class BasePlugin(ABC):
         ```
     """
 
+    # 插件是否直接接收缓冲区输入
+    ACCEPTS_BUFFERS = False
+
     @abstractmethod
     def get_format_type(self) -> str:
         """
@@ -32,15 +67,14 @@ class BasePlugin(ABC):
         Returns:
             str: 格式类型标识符（如 'json', 'yaml' 等）
         """
-        pass
 
     @abstractmethod
-    async def parse(self, input_data: str) -> Dict[str, Any]:
+    async def parse(self, input_data: InputData) -> Dict[str, Any]:
         """
         解析输入数据
 
         Args:
-            input_data: 要解析的数据字符串
+            input_data: 要解析的数据，ACCEPTS_BUFFERS为False时总是字符串
 
         Returns:
             Dict[str, Any]: 解析后的数据字典
@@ -48,20 +82,61 @@ class BasePlugin(ABC):
         Raises:
             ParseError: 解析过程中出现错误
         """
-        pass
+
+    async def decode(self, input_data: InputData) -> Any:
+        """
+        仅解码输入数据，不做结构检查
+
+        融合解析管道使用此方法获取原始数据，并在一次遍历中完成深度检查和
+        结构验证。默认实现直接调用parse，插件可以覆盖此方法跳过重复的检查。
+
+        Args:
+            input_data: 要解码的数据，ACCEPTS_BUFFERS为False时总是字符串
+
+        Returns:
+            Any: 解码后的原始数据
+
+        Raises:
+            ParseError: 解码过程中出现错误
+        """
+        return await self.parse(input_data)
+
+    async def iter_slides(  # pylint: disable=unused-argument
+        self,
+        chunks: AsyncIterable[bytes],
+        max_slide_size: Optional[int] = None,
+        fields: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        增量解析字节流，逐个返回幻灯片数据
+
+        默认实现不支持流式解析，插件可以覆盖此方法。
+
+        Args:
+            chunks: 输入数据块的异步迭代器
+            max_slide_size: 单个幻灯片的最大字节数
+            fields: 用于接收除slides之外的顶层字段的字典，流结束后填充
+
+        Yields:
+            Dict[str, Any]: 幻灯片数据字典
+
+        Raises:
+            ParseError: 解析过程中出现错误或插件不支持流式解析
+        """
+        raise ParseError(f"格式类型不支持流式解析: {self.get_format_type()}")
+        yield  # pragma: no cover
 
     @abstractmethod
-    async def validate_format(self, input_data: str) -> bool:
+    async def validate_format(self, input_data: InputData) -> bool:
         """
         验证输入数据格式是否符合要求
 
         Args:
-            input_data: 要验证的数据字符串
+            input_data: 要验证的数据，ACCEPTS_BUFFERS为False时总是字符串
 
         Returns:
             bool: 格式是否有效
         """
-        pass
 
     def get_plugin_info(self) -> Dict[str, str]:
         """
@@ -0,0 +1,224 @@
+"""
+JSON解码后端模块
+JSONPlugin 通过解码后端把JSON文本转换为Python对象
+
+支持的后端（按默认的优先顺序）:
+    - orjson: 需要安装 orjson；
+    - msgspec: 需要安装 msgspec；
+    - json: 标准库，总是可用。
+
+所有后端的结果、深度限制和错误都与标准库后端一致：嵌套深度在解码前用
+check_json_depth 检查；第三方解码器只作为快速路径，它们拒绝的输入（语法错误、
+NaN、孤立的代理字符、UTF-16编码等）以及它们与标准库结果可能不同的输入
+（超出64位的整数）都交给标准库重新处理，因此错误信息和异常类型与标准库完全相同。
+"""
+
+import json
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Type
+from .base_plugin import InputData
+from .json_plugin import check_json_depth
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - 取决于运行环境
+    msgspec = None
+
+# 连续19位以上的数字可能超出64位整数的范围，第三方解码器会把它解码为浮点数。
+# 扫描时先把数字映射为"0"、其他字节映射为空格，再查找连续的"0"，比正则表达式
+# 快一个数量级。字符串中的长数字同样会命中，只是多走一次标准库，结果不受影响。
+_DIGIT_MASK = bytes(0x30 if 0x30 <= code <= 0x39 else 0x20 for code in range(256))
+_LONG_NUMBER = b"0" * 19
+
+# 扫描长数字时每次处理的字节数（字符串为字符数），字符串和mmap等大缓冲区
+# 不会被整体复制
+_SCAN_CHUNK_SIZE = 1024 * 1024
+
+
+def _has_long_number(data: InputData) -> bool:
+    """字符串或UTF-8文本中是否有连续19位以上的数字"""
+    text = data if isinstance(data, str) else memoryview(data)
+    overlap = len(_LONG_NUMBER) - 1
+    for start in range(0, len(text), _SCAN_CHUNK_SIZE):
+        piece = text[max(start - overlap, 0) : start + _SCAN_CHUNK_SIZE]
+        if isinstance(piece, str):
+            chunk = piece.encode("utf-8", "surrogatepass")
+        else:
+            chunk = bytes(piece)
+        if _LONG_NUMBER in chunk.translate(_DIGIT_MASK):
+            return True
+    return False
+
+
+def stdlib_loads(input_data: InputData, max_depth: Optional[int] = None) -> Any:
+    """
+    用标准库解码JSON文本，所有后端的结果和错误以此为准
+
+    str、bytes和bytearray与json.loads的处理相同；memoryview、mmap等其他缓冲区
+    按检测到的编码直接解码为字符串，不会先复制出一份bytes。
+
+    Args:
+        input_data: JSON文本
+        max_depth: 最大嵌套深度，None表示不检查
+
+    Returns:
+        Any: 解码后的Python对象
+
+    Raises:
+        json.JSONDecodeError: JSON语法错误
+        UnicodeDecodeError: 文本编码错误
+        RecursionError: 超过最大嵌套深度
+    """
+    if isinstance(input_data, str):
+        text = input_data
+    else:
+        if isinstance(input_data, (bytes, bytearray)):
+            encoding = json.detect_encoding(input_data)
+        else:
+            encoding = json.detect_encoding(bytes(memoryview(input_data)[:4]))
+        text = str(input_data, encoding, "surrogatepass")
+    if max_depth is not None:
+        check_json_depth(text, max_depth)
+    # 不传cls，使用json模块缓存的默认解码器
+    return json.loads(text)
+
+
+class JSONBackend(ABC):
+    """
+    JSON解码后端的基类
+
+    后端不保存状态，插件可以连同后端一起序列化传给工作进程。
+    """
+
+    # 后端名称
+    name = ""
+
+    @abstractmethod
+    def loads(self, input_data: InputData, max_depth: Optional[int] = None) -> Any:
+        """
+        解码JSON文本，结果和错误与 stdlib_loads 相同
+
+        Args:
+            input_data: JSON文本
+            max_depth: 最大嵌套深度，None表示不检查
+
+        Returns:
+            Any: 解码后的Python对象
+
+        Raises:
+            json.JSONDecodeError: JSON语法错误
+            UnicodeDecodeError: 文本编码错误
+            RecursionError: 超过最大嵌套深度
+        """
+
+    def __repr__(self) -> str:
+        return f"<JSONBackend {self.name}>"
+
+
+class StdlibBackend(JSONBackend):
+    """标准库json模块"""
+
+    name = "json"
+
+    def loads(self, input_data: InputData, max_depth: Optional[int] = None) -> Any:
+        return stdlib_loads(input_data, max_depth)
+
+
+class FastBackend(JSONBackend):
+    """
+    以第三方解码器为快速路径的后端
+
+    字符串和UTF-8缓冲区都原样交给解码器，不会先编码为字节或解码为字符串；
+    其他编码的缓冲区直接交给标准库。快速路径中的任何失败（包括含有孤立代理
+    字符的字符串）都交给标准库重新处理。
+    """
+
+    @abstractmethod
+    def _decode(self, data: InputData) -> Any:
+        """用第三方解码器解码字符串或UTF-8文本"""
+
+    def loads(self, input_data: InputData, max_depth: Optional[int] = None) -> Any:
+        if not isinstance(input_data, str):
+            if json.detect_encoding(bytes(memoryview(input_data)[:4])) != "utf-8":
+                return stdlib_loads(input_data, max_depth)
+        if not _has_long_number(input_data):
+            try:
+                if max_depth is not None:
+                    check_json_depth(input_data, max_depth)
+                return self._decode(input_data)
+            except Exception:  # pylint: disable=broad-exception-caught
+                # 由标准库给出一致的结果或错误
+                pass
+        return stdlib_loads(input_data, max_depth)
+
+
+class OrjsonBackend(FastBackend):
+    """orjson解码器"""
+
+    name = "orjson"
+
+    def _decode(self, data: InputData) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecBackend(FastBackend):
+    """msgspec解码器"""
+
+    name = "msgspec"
+
+    def _decode(self, data: InputData) -> Any:
+        return msgspec.json.decode(data)
+
+
+# 后端名称 -> 后端类，按默认的优先顺序排列
+_BACKENDS: Dict[str, Type[JSONBackend]] = {
+    "orjson": OrjsonBackend,
+    "msgspec": MsgspecBackend,
+    "json": StdlibBackend,
+}
+
+# 后端名称 -> 依赖的模块是否已安装
+_AVAILABLE = {
+    "orjson": orjson is not None,
+    "msgspec": msgspec is not None,
+    "json": True,
+}
+
+
+def available_backends() -> List[str]:
+    """
+    获取当前环境中可用的后端名称
+
+    Returns:
+        List[str]: 按默认优先顺序排列的后端名称
+    """
+    return [name for name in _BACKENDS if _AVAILABLE[name]]
+
+
+@lru_cache(maxsize=None)
+def get_backend(name: Optional[str] = None) -> JSONBackend:
+    """
+    获取解码后端
+
+    Args:
+        name: 后端名称，None表示使用可用的最快后端
+
+    Returns:
+        JSONBackend: 解码后端
+
+    Raises:
+        ValueError: 后端名称未知或后端未安装
+    """
+    if name is None:
+        name = available_backends()[0]
+    if name not in _BACKENDS:
+        raise ValueError(f"未知的JSON解码后端: {name}")
+    if not _AVAILABLE[name]:
+        raise ValueError(f"JSON解码后端未安装: {name}")
+    return _BACKENDS[name]()
@@ -4,69 +4,144 @@ JSON格式解析插件
 """
 
 import json
-from typing import Dict, Any
+import re
+from functools import lru_cache
+from typing import (
+    Dict,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Match,
+    Optional,
+    Pattern,
+    Union,
+)
 from ..exceptions import ParseError
-from .base_plugin import BasePlugin
+from .base_plugin import BasePlugin, InputData
 
 
 class JSONPlugin(BasePlugin):
-    """JSON格式解析插件"""
+    """
+    JSON格式解析插件
+
+    解码由可选择的后端完成（见 json_backends），默认使用已安装的最快后端。
+    不同后端的解析结果、深度限制和错误信息相同。
+
+    示例:
+        ```python
+        engine.plugin_manager.register_plugin(JSONPlugin(backend="json"))
+        ```
+    """
 
     VERSION = "1.0.0"
     MAX_DEPTH = 10  # 最大递归深度限制
+    ACCEPTS_BUFFERS = True
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        初始化插件
+
+        Args:
+            backend: 解码后端名称（"orjson"、"msgspec"或"json"），
+                None表示使用已安装的最快后端
+
+        Raises:
+            ValueError: 后端名称未知或后端未安装
+        """
+        from .json_backends import get_backend
+
+        self.backend = get_backend(backend)
 
     def get_format_type(self) -> str:
         """获取插件支持的格式类型"""
         return "json"
 
-    async def validate_format(self, input_data: str) -> bool:
+    async def validate_format(self, input_data: InputData) -> bool:
         """验证JSON格式是否有效"""
         try:
-            # 使用自定义的JSON解码器检查深度
-            json.loads(
-                input_data, cls=DepthLimitedJSONDecoder, max_depth=self.MAX_DEPTH
-            )
+            self.backend.loads(input_data, self.MAX_DEPTH)
             return True
-        except (json.JSONDecodeError, RecursionError):
+        except (json.JSONDecodeError, UnicodeDecodeError, RecursionError):
             return False
 
-    async def parse(self, input_data: str) -> Dict[str, Any]:
+    async def parse(self, input_data: InputData) -> Dict[str, Any]:
         """解析JSON数据"""
         try:
-            # 使用自定义的JSON解码器进行解析
-            data = json.loads(
-                input_data, cls=DepthLimitedJSONDecoder, max_depth=self.MAX_DEPTH
-            )
+            # 嵌套深度在解码前检查
+            data = self.backend.loads(input_data, self.MAX_DEPTH)
 
+            # 必需字段和字段类型由验证器根据模型定义检查
             if not isinstance(data, dict):
                 raise ParseError("JSON根节点必须是对象")
 
-            required_fields = ["title", "slides"]
-            for field in required_fields:
-                if field not in data:
-                    raise ParseError(f"缺少必需字段: {field}")
-
-            # 验证slides数组
-            if not isinstance(data["slides"], list):
-                raise ParseError("slides必须是数组")
-
-            for slide in data["slides"]:
-                self._validate_slide(slide)
+            slides = data.get("slides")
+            if isinstance(slides, list):
+                for slide in slides:
+                    self._validate_slide(slide)
 
             return data
 
         except json.JSONDecodeError as e:
-            raise ParseError(f"JSON解析错误: {str(e)}")
-        except RecursionError:
-            raise ParseError("JSON结构嵌套深度超过限制")
+            raise ParseError(f"JSON解析错误: {str(e)}") from e
+        except UnicodeDecodeError as e:
+            raise ParseError(f"JSON文本编码错误: {str(e)}") from e
+        except RecursionError as e:
+            raise ParseError("JSON结构嵌套深度超过限制") from e
         except ParseError:
             raise
         except Exception as e:
-            raise ParseError(f"解析过程出错: {str(e)}")
+            raise ParseError(f"解析过程出错: {str(e)}") from e
+
+    async def decode(self, input_data: InputData) -> Any:
+        """
+        仅解码JSON数据
+
+        不做深度检查和结构检查，由融合解析管道在遍历时统一完成。
+        """
+        try:
+            return self.backend.loads(input_data)
+        except json.JSONDecodeError as e:
+            raise ParseError(f"JSON解析错误: {str(e)}") from e
+        except UnicodeDecodeError as e:
+            raise ParseError(f"JSON文本编码错误: {str(e)}") from e
+        except RecursionError as e:
+            raise ParseError("JSON结构嵌套深度超过限制") from e
+
+    async def iter_slides(
+        self,
+        chunks: AsyncIterable[bytes],
+        max_slide_size: Optional[int] = None,
+        fields: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """增量解析JSON字节流，逐个返回幻灯片数据"""
+        from .json_stream import IncrementalSlideReader
+
+        reader = IncrementalSlideReader(
+            max_depth=self.MAX_DEPTH, max_slide_size=max_slide_size
+        )
+        async for chunk in chunks:
+            for slide in reader.feed(chunk):
+                self._validate_slide(slide)
+                yield slide
+        reader.close()
+
+        if fields is not None:
+            fields.update(reader.fields)
+
+    def _validate_slide(self, slide: Any) -> None:
+        """验证幻灯片的基本结构"""
+        if not isinstance(slide, dict):
+            raise ParseError("幻灯片必须是对象")
 
 
 class DepthLimitedJSONDecoder(json.JSONDecoder):
-    """带深度限制的JSON解码器"""
+    """
+    带深度限制的JSON解码器
+
+    插件本身不再使用这个类（深度检查由解码后端在解码前完成），保留给需要
+    配合 json.loads(cls=...) 使用的调用方。
+    """
 
     def __init__(self, *args, max_depth=None, **kwargs):
         """
@@ -78,10 +153,13 @@ class DepthLimitedJSONDecoder(json.JSONDecoder):
         self.max_depth = max_depth
         super().__init__(*args, **kwargs)
 
-    def decode(self, s: str) -> Any:
+    def decode(self, s: str, *args: Any, **kwargs: Any) -> Any:
         """
         解码JSON字符串
 
+        解码前先扫描输入中的括号检查嵌套深度，过深的输入在分配任何对象之前
+        就会被拒绝。
+
         Args:
             s: JSON字符串
 
@@ -91,17 +169,79 @@ class DepthLimitedJSONDecoder(json.JSONDecoder):
         Raises:
             RecursionError: 超过最大递归深度
         """
-
-        def check_depth(obj, current_depth=0):
-            """检查对象的嵌套深度"""
-            if current_depth > self.max_depth:
+        if self.max_depth is not None:
+            check_json_depth(s, self.max_depth)
+        return super().decode(s, *args, **kwargs)
+
+
+# 深度扫描使用的词法片段
+_JSON_STRING = r'"[^"\\]*+(?:\\.[^"\\]*+)*+"'  # 字符串（含转义字符）
+_JSON_OTHER = r'[^"\[\]{}]++'  # 括号和字符串之外的内容
+_JSON_EMPTY = r"[\[{]\s*+[\]}]"  # 空容器
+
+# 逐个括号扫描的模式：每次匹配跳过非括号内容，停在下一个括号上。
+# 分组1为左括号，分组2表示紧随其后的右括号（即空容器）。
+_DEPTH_TOKEN = rf"(?:{_JSON_OTHER}|{_JSON_STRING})*+(?:([\[{{])(\s*+[\]}}])?|[\]}}])"
+_DEPTH_TOKEN_STR = re.compile(_DEPTH_TOKEN, re.DOTALL)
+_DEPTH_TOKEN_BYTES = re.compile(_DEPTH_TOKEN.encode("ascii"), re.DOTALL)
+
+
+@lru_cache(maxsize=None)
+def _depth_pattern(max_depth: int, binary: bool) -> Pattern:
+    """
+    构建只匹配嵌套深度不超过max_depth的JSON文本的正则表达式
+
+    正则表达式不支持递归，但深度有上限时可以逐层展开。所有量词都是占有的，
+    各分支的首字符互不相同，因此匹配不会回溯，耗时与输入长度成线性关系。
+    """
+    container = _JSON_EMPTY
+    for _ in range(max_depth):
+        container = rf"[\[{{](?:{_JSON_STRING}|{container}|{_JSON_OTHER})*+[\]}}]"
+    pattern = rf"(?:{_JSON_STRING}|{container}|{_JSON_OTHER})*+"
+    return re.compile(pattern.encode("ascii") if binary else pattern, re.DOTALL)
+
+
+def check_json_depth(
+    data: Union[str, bytes, bytearray, memoryview], max_depth: int
+) -> None:
+    """
+    在不解码的情况下检查JSON文本的嵌套深度
+
+    只扫描字符串之外的括号，不构建任何对象，也不使用递归。深度语义与
+    逐层检查解码结果一致：根节点深度为0，任何值的深度都不能超过max_depth，
+    即非空容器所在的深度必须小于max_depth。
+
+    Args:
+        data: JSON文本，支持str以及bytes等缓冲区对象
+        max_depth: 最大嵌套深度
+
+    Raises:
+        RecursionError: 超过最大嵌套深度
+    """
+    binary = not isinstance(data, str)
+
+    # 快速路径：一次正则匹配确认整个输入没有超过深度限制
+    if _depth_pattern(max_depth, binary).fullmatch(data):
+        return
+
+    # 输入过深或者格式无效，逐个括号扫描确定原因
+    match: Callable[[Any, int], Optional[Match[Any]]] = (
+        _DEPTH_TOKEN_BYTES if binary else _DEPTH_TOKEN_STR
+    ).match
+    depth = 0
+    pos = 0
+    while True:
+        token = match(data, pos)
+        if token is None:
+            # 剩余内容中没有括号，或者遇到未闭合的字符串（交由解码器报告语法错误）
+            return
+        kind = token.lastindex
+        if kind is None:
+            depth -= 1
+        elif kind == 1:
+            if depth >= max_depth:
                 raise RecursionError("Exceeded maximum depth")
-
-            if isinstance(obj, dict):
-                return {k: check_depth(v, current_depth + 1) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [check_depth(item, current_depth + 1) for item in obj]
-            return obj
-
-        obj = super().decode(s)
-        return check_depth(obj)
+            depth += 1
+        elif depth > max_depth:
+            raise RecursionError("Exceeded maximum depth")
+        pos = token.end()
@@ -0,0 +1,322 @@
+"""
+JSON增量读取模块
+从字节流中逐个切分出slides数组中的幻灯片，内存占用只取决于最大的单个幻灯片
+"""
+
+import json
+import re
+from typing import Dict, Any, List, Optional, Pattern, Union
+from ..exceptions import ParseError
+from .json_plugin import _DEPTH_TOKEN_BYTES, _JSON_OTHER, _JSON_STRING
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*+")
+_STRING = re.compile(_JSON_STRING.encode("ascii"), re.DOTALL)
+# 字符串开头引号之后的内容，停在结束引号、末尾不完整的转义序列或缓冲区末尾
+_STRING_BODY = re.compile(rb'[^"\\]*+(?:\\.[^"\\]*+)*+', re.DOTALL)
+# 完整的字符串和括号之外的内容，停在括号或未结束的字符串上
+_SKIP = re.compile(f"(?:{_JSON_OTHER}|{_JSON_STRING})*+".encode("ascii"), re.DOTALL)
+# 标量值必须后跟分隔符才能确认已经读取完整
+_SCALAR = re.compile(rb"[^ \t\n\r,\]}]++(?=[ \t\n\r,\]}])")
+
+
+def _skip(pattern: Pattern[bytes], buffer: Union[bytes, bytearray], pos: int) -> int:
+    """跳过pattern匹配的内容并返回之后的位置，pattern可以匹配空串，总能匹配"""
+    match = pattern.match(buffer, pos)
+    return match.end() if match else pos
+
+
+# 读取器状态
+_START = "start"  # 等待根对象
+_FIRST_KEY = "first_key"  # 等待第一个字段名或根对象结束
+_KEY = "key"  # 等待字段名
+_COLON = "colon"  # 等待冒号
+_VALUE = "value"  # 等待字段值
+_FIELD = "field"  # 正在读取顶层字段值
+_FIRST_SLIDE = "first_slide"  # 等待第一个幻灯片或slides数组结束
+_SLIDE = "slide"  # 正在读取幻灯片
+_AFTER_SLIDE = "after_slide"  # 等待逗号或slides数组结束
+_NEXT_SLIDE = "next_slide"  # 等待下一个幻灯片
+_AFTER_FIELD = "after_field"  # 等待逗号或根对象结束
+_DONE = "done"  # 根对象已结束
+
+
+class IncrementalSlideReader:
+    """
+    增量JSON读取器
+
+    按块接收字节数据，识别根对象中的slides数组，每读取到一个完整的幻灯片
+    就立即解码并返回。已处理的数据会从缓冲区中丢弃，其他顶层字段保存在
+    fields中。嵌套深度在切分时按照DepthLimitedJSONDecoder的语义检查。
+
+    示例:
+        ```python
+        reader = IncrementalSlideReader(max_depth=10)
+        for chunk in chunks:
+            for slide in reader.feed(chunk):
+                handle(slide)
+        reader.close()
+        ```
+    """
+
+    def __init__(
+        self, max_depth: Optional[int] = None, max_slide_size: Optional[int] = None
+    ):
+        """
+        初始化读取器
+
+        Args:
+            max_depth: 最大嵌套深度，None表示不限制
+            max_slide_size: 单个幻灯片（或顶层字段）的最大字节数，None表示不限制
+        """
+        self.max_depth = max_depth
+        self.max_slide_size = max_slide_size
+        self.fields: Dict[str, Any] = {}
+        self._buffer = bytearray()
+        self._pos = 0
+        self._state = _START
+        self._key = ""
+        self._has_slides = False
+        # 正在读取的值的起始位置、扫描位置和当前深度，以及扫描位置是否在字符串中。
+        # 一块数据在字符串中间结束时，下一块从字符串中断开的位置继续扫描，
+        # 而不是从字符串开头重新扫描，扫描的总耗时与值的大小成线性关系
+        self._value_start = 0
+        self._scan_pos = 0
+        self._scan_depth = 0
+        self._in_string = False
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """
+        输入一块数据
+
+        Args:
+            chunk: 字节数据
+
+        Returns:
+            List[Dict[str, Any]]: 本次读取到的完整幻灯片
+
+        Raises:
+            ParseError: 数据格式无效、嵌套过深或幻灯片过大
+        """
+        self._buffer += chunk
+        slides: List[Dict[str, Any]] = []
+        self._advance(slides)
+        self._compact()
+        return slides
+
+    def close(self) -> None:
+        """
+        结束输入并检查数据完整性
+
+        Raises:
+            ParseError: 数据不完整或缺少必需字段
+        """
+        if self._state != _DONE:
+            raise ParseError("JSON解析错误: 数据不完整")
+        if "title" not in self.fields:
+            raise ParseError("缺少必需字段: title")
+        if not self._has_slides:
+            raise ParseError("缺少必需字段: slides")
+
+    def _advance(self, slides: List[Dict[str, Any]]) -> None:
+        """在缓冲区数据允许的范围内推进状态机"""
+        buffer = self._buffer
+        while True:
+            state = self._state
+            if state in (_FIELD, _SLIDE):
+                end = self._scan_value()
+                if end is None:
+                    return
+                value = self._decode(buffer[self._value_start : end])
+                if state == _SLIDE:
+                    slides.append(value)
+                    self._state = _AFTER_SLIDE
+                else:
+                    self.fields[self._key] = value
+                    self._state = _AFTER_FIELD
+                self._pos = end
+                continue
+
+            pos = _skip(_WHITESPACE, buffer, self._pos)
+            self._pos = pos
+            if pos >= len(buffer):
+                return
+            char = buffer[pos]
+
+            if state == _START:
+                if char != ord("{"):
+                    raise ParseError("JSON根节点必须是对象")
+                self._pos = pos + 1
+                self._state = _FIRST_KEY
+            elif state in (_FIRST_KEY, _KEY):
+                if char == ord("}") and state == _FIRST_KEY:
+                    self._pos = pos + 1
+                    self._state = _DONE
+                    continue
+                if char != ord('"'):
+                    raise ParseError("JSON解析错误: 期望字段名")
+                match = _STRING.match(buffer, pos)
+                if match is None:
+                    return
+                self._key = json.loads(match.group())
+                self._pos = match.end()
+                self._state = _COLON
+            elif state == _COLON:
+                if char != ord(":"):
+                    raise ParseError("JSON解析错误: 期望冒号")
+                self._pos = pos + 1
+                self._state = _VALUE
+            elif state == _VALUE:
+                if self._key == "slides":
+                    if char != ord("["):
+                        raise ParseError("slides必须是数组")
+                    self._has_slides = True
+                    self._pos = pos + 1
+                    self._state = _FIRST_SLIDE
+                else:
+                    self._start_value(pos, _FIELD)
+            elif state == _FIRST_SLIDE:
+                if char == ord("]"):
+                    self._pos = pos + 1
+                    self._state = _AFTER_FIELD
+                else:
+                    self._start_value(pos, _SLIDE)
+            elif state == _AFTER_SLIDE:
+                if char == ord(","):
+                    self._pos = pos + 1
+                    self._state = _NEXT_SLIDE
+                elif char == ord("]"):
+                    self._pos = pos + 1
+                    self._state = _AFTER_FIELD
+                else:
+                    raise ParseError("JSON解析错误: 期望逗号或']'")
+            elif state == _NEXT_SLIDE:
+                self._start_value(pos, _SLIDE)
+            elif state == _AFTER_FIELD:
+                if char == ord(","):
+                    self._pos = pos + 1
+                    self._state = _KEY
+                elif char == ord("}"):
+                    self._pos = pos + 1
+                    self._state = _DONE
+                else:
+                    raise ParseError("JSON解析错误: 期望逗号或'}'")
+            else:
+                raise ParseError("JSON解析错误: 根对象之后存在多余数据")
+
+    def _start_value(self, pos: int, state: str) -> None:
+        """开始读取一个值"""
+        self._value_start = pos
+        self._scan_pos = pos
+        self._scan_depth = 0
+        self._in_string = False
+        self._state = state
+
+    def _scan_value(self) -> Optional[int]:
+        """
+        扫描正在读取的值
+
+        Returns:
+            Optional[int]: 值的结束位置，数据不完整时返回None
+        """
+        buffer = self._buffer
+        start = self._value_start
+        first = buffer[start]
+
+        if first == ord("{") or first == ord("["):
+            end = self._scan_container()
+        elif first == ord('"'):
+            if self._scan_pos == start:
+                self._scan_pos = start + 1
+                self._in_string = True
+            end = self._scan_pos if self._scan_string() else None
+        else:
+            match = _SCALAR.match(buffer, start)
+            end = match.end() if match else None
+
+        size = (len(buffer) if end is None else end) - start
+        if self.max_slide_size is not None and size > self.max_slide_size:
+            raise ParseError("幻灯片数据超过大小限制")
+        return end
+
+    def _scan_string(self) -> bool:
+        """
+        从扫描位置继续扫描字符串的剩余部分
+
+        Returns:
+            bool: 字符串是否已经结束，结束时扫描位置移到结束引号之后
+        """
+        buffer = self._buffer
+        end = _skip(_STRING_BODY, buffer, self._scan_pos)
+        if end < len(buffer) and buffer[end] == ord('"'):
+            self._scan_pos = end + 1
+            self._in_string = False
+            return True
+        # 数据在字符串中间或者转义序列中间结束，下次从这里继续
+        self._scan_pos = end
+        return False
+
+    def _scan_container(self) -> Optional[int]:
+        """逐个括号扫描容器，返回容器的结束位置"""
+        if self._in_string and not self._scan_string():
+            return None
+        buffer = self._buffer
+        match = _DEPTH_TOKEN_BYTES.match
+        max_depth = self.max_depth
+        # 幻灯片位于第2层，顶层字段位于第1层
+        base_depth = 2 if self._state == _SLIDE else 1
+        pos = self._scan_pos
+        depth = self._scan_depth
+        try:
+            while True:
+                token = match(buffer, pos)
+                if token is None:
+                    # 跳过已经完整的内容，停在未结束的字符串上
+                    pos = _skip(_SKIP, buffer, pos)
+                    if pos < len(buffer):
+                        self._scan_pos = pos + 1
+                        self._in_string = True
+                        self._scan_string()
+                        pos = self._scan_pos
+                    return None
+                kind = token.lastindex
+                if kind == 1 and _skip(_WHITESPACE, buffer, token.end()) == len(buffer):
+                    # 左括号之后还没有数据，无法确定是否为空容器
+                    pos = token.end() - 1
+                    return None
+                if kind is None:
+                    depth -= 1
+                elif max_depth is not None and (
+                    base_depth + depth >= max_depth
+                    if kind == 1
+                    else base_depth + depth > max_depth
+                ):
+                    raise ParseError("JSON结构嵌套深度超过限制")
+                elif kind == 1:
+                    depth += 1
+                pos = token.end()
+                if depth == 0:
+                    return pos
+        finally:
+            self._scan_pos = pos
+            self._scan_depth = depth
+
+    def _decode(self, raw: bytearray) -> Any:
+        """解码切分出的值，深度已经在扫描时检查过"""
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ParseError(f"JSON解析错误: {str(e)}") from e
+        except RecursionError as e:
+            raise ParseError("JSON结构嵌套深度超过限制") from e
+
+    def _compact(self) -> None:
+        """丢弃已经处理完的数据"""
+        if self._state in (_FIELD, _SLIDE):
+            consumed = self._value_start
+        else:
+            consumed = self._pos
+        if consumed:
+            del self._buffer[:consumed]
+            self._pos -= consumed
+            self._value_start -= consumed
+            self._scan_pos -= consumed
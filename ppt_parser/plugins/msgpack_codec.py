@@ -0,0 +1,389 @@
+"""
+MessagePack编解码模块
+内置纯Python实现的MessagePack编码器和解码器，安装了 msgpack 时解码使用其C扩展
+
+只支持与JSON对应的数据模型：nil、布尔值、整数、浮点数、字符串、二进制数据、
+数组和键为字符串的映射。扩展类型（包括时间戳）不支持。
+
+解码时的限制与 JSONPlugin 相同:
+    - 嵌套深度：根节点深度为0，非空容器所在的深度必须小于max_depth；
+    - 长度：字符串、二进制数据、数组和映射声明的长度不能超过剩余的字节数，
+      伪造的长度不会导致预先分配大量内存。
+"""
+
+import struct
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - 取决于运行环境
+    msgpack = None
+
+HAS_MSGPACK = msgpack is not None
+
+# 解码函数接收的缓冲区类型
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class MessagePackError(ValueError):
+    """MessagePack数据无效"""
+
+
+_UNPACK_FLOAT64 = struct.Struct(">d").unpack_from
+_UNPACK_UINT16 = struct.Struct(">H").unpack_from
+_UNPACK_UINT32 = struct.Struct(">I").unpack_from
+
+# 定长数值的类型标记 -> (解码函数, 字节数)
+_NUMBERS = {
+    0xCA: (struct.Struct(">f").unpack_from, 4),
+    0xCB: (_UNPACK_FLOAT64, 8),
+    0xCC: (struct.Struct(">B").unpack_from, 1),
+    0xCD: (_UNPACK_UINT16, 2),
+    0xCE: (_UNPACK_UINT32, 4),
+    0xCF: (struct.Struct(">Q").unpack_from, 8),
+    0xD0: (struct.Struct(">b").unpack_from, 1),
+    0xD1: (struct.Struct(">h").unpack_from, 2),
+    0xD2: (struct.Struct(">i").unpack_from, 4),
+    0xD3: (struct.Struct(">q").unpack_from, 8),
+}
+
+# 带长度的类型标记 -> (种类, 长度的解码函数, 长度字段的字节数)
+_SIZED = {
+    0xD9: ("str", struct.Struct(">B").unpack_from, 1),
+    0xDA: ("str", _UNPACK_UINT16, 2),
+    0xDB: ("str", _UNPACK_UINT32, 4),
+    0xC4: ("bin", struct.Struct(">B").unpack_from, 1),
+    0xC5: ("bin", _UNPACK_UINT16, 2),
+    0xC6: ("bin", _UNPACK_UINT32, 4),
+    0xDC: ("array", _UNPACK_UINT16, 2),
+    0xDD: ("array", _UNPACK_UINT32, 4),
+    0xDE: ("map", _UNPACK_UINT16, 2),
+    0xDF: ("map", _UNPACK_UINT32, 4),
+}
+
+_CONSTANTS = {0xC0: None, 0xC2: False, 0xC3: True}
+
+# 扩展类型的标记
+_EXT_CODES = frozenset([0xC7, 0xC8, 0xC9, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8])
+
+
+def unpackb_python(data: Buffer, max_depth: Optional[int] = None) -> Any:
+    """
+    用内置的纯Python解码器解码MessagePack数据
+
+    bytes以外的缓冲区先复制为bytes，切片bytes比切片memoryview快。
+    常见的类型（短整数、短字符串、float64、小数组和小映射）在内层分支中
+    直接处理，其他类型查表。
+
+    Args:
+        data: MessagePack数据，bytes、memoryview等缓冲区对象
+        max_depth: 最大嵌套深度，None表示不检查
+
+    Returns:
+        Any: 解码后的Python对象
+
+    Raises:
+        MessagePackError: 数据无效
+        RecursionError: 超过最大嵌套深度
+    """
+    buf = data if type(data) is bytes else bytes(memoryview(data))
+    end = len(buf)
+    pos = 0
+
+    def text(start: int, size: int) -> str:
+        """读取从start开始的size字节UTF-8字符串"""
+        nonlocal pos
+        pos = start + size
+        if pos > end:
+            raise MessagePackError(f"数据不完整（位置 {start}）")
+        try:
+            return buf[start:pos].decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise MessagePackError(f"字符串不是有效的UTF-8编码（位置 {start}）") from e
+
+    def enter(count: int, min_size: int, depth: int) -> None:
+        """检查容器的深度和声明的元素数量"""
+        if count and max_depth is not None and depth >= max_depth:
+            raise RecursionError("Exceeded maximum depth")
+        if count * min_size > end - pos:
+            raise MessagePackError(f"数据不完整（位置 {pos}）")
+
+    def array(count: int, depth: int) -> List[Any]:
+        enter(count, 1, depth)
+        depth += 1
+        return [value(depth) for _ in range(count)]
+
+    def mapping(count: int, depth: int) -> Dict[str, Any]:
+        enter(count, 2, depth)
+        depth += 1
+        result = {}
+        for _ in range(count):
+            start = pos
+            code = buf[start]
+            if 0xA0 <= code <= 0xBF:
+                key = text(start + 1, code & 0x1F)
+            else:
+                key = value(depth)
+                if type(key) is not str:
+                    raise MessagePackError(f"映射的键必须是字符串（位置 {start}）")
+            result[key] = value(depth)
+        return result
+
+    def value(depth: int) -> Any:
+        """解码当前位置的一个值"""
+        nonlocal pos
+        code = buf[pos]
+        pos += 1
+        if code <= 0x7F:
+            return code
+        if code >= 0xA0:
+            if code <= 0xBF:
+                return text(pos, code & 0x1F)
+            if code >= 0xE0:
+                return code - 0x100
+        elif code <= 0x8F:
+            return mapping(code & 0x0F, depth)
+        elif code <= 0x9F:
+            return array(code & 0x0F, depth)
+        if code == 0xCB:
+            (number,) = _UNPACK_FLOAT64(buf, pos)
+            pos += 8
+            return number
+        if code in _NUMBERS:
+            unpack, size = _NUMBERS[code]
+            (number,) = unpack(buf, pos)
+            pos += size
+            return number
+        if code in _CONSTANTS:
+            return _CONSTANTS[code]
+        if code in _SIZED:
+            kind, unpack, size = _SIZED[code]
+            (count,) = unpack(buf, pos)
+            pos += size
+            if kind == "str":
+                return text(pos, count)
+            if kind == "array":
+                return array(count, depth)
+            if kind == "map":
+                return mapping(count, depth)
+            start = pos
+            pos += count
+            if pos > end:
+                raise MessagePackError(f"数据不完整（位置 {start}）")
+            return buf[start:pos]
+        if code in _EXT_CODES:
+            raise MessagePackError(f"不支持扩展类型（位置 {pos - 1}）")
+        raise MessagePackError(f"无效的类型标记 0x{code:02x}（位置 {pos - 1}）")
+
+    try:
+        result = value(0)
+    except (IndexError, struct.error) as e:
+        raise MessagePackError("数据不完整") from e
+    if pos != end:
+        raise MessagePackError(f"数据末尾有多余的字节（位置 {pos}）")
+    return result
+
+
+def _reject_ext(code: int, data: bytes) -> Any:
+    """msgpack扩展类型的回调，与内置解码器一样拒绝扩展类型"""
+    raise MessagePackError("不支持扩展类型")
+
+
+def _check_decoded(value: Any, max_depth: Optional[int]) -> None:
+    """
+    检查msgpack解码结果的深度、映射键和扩展类型，与内置解码器的限制一致
+
+    Raises:
+        MessagePackError: 映射的键不是字符串，或含有时间戳
+        RecursionError: 超过最大嵌套深度
+    """
+    timestamp = msgpack.Timestamp
+    stack = [(value, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if type(node) is dict:
+            for key in node:
+                if type(key) is not str:
+                    raise MessagePackError("映射的键必须是字符串")
+            items: Iterable[Any] = node.values()
+        elif type(node) is list:
+            items = node
+        else:
+            if type(node) is timestamp:
+                raise MessagePackError("不支持扩展类型")
+            continue
+        if items and max_depth is not None and depth >= max_depth:
+            raise RecursionError("Exceeded maximum depth")
+        for item in items:
+            if type(item) in (dict, list, timestamp):
+                stack.append((item, depth + 1))
+
+
+def unpackb_accelerated(data: Buffer, max_depth: Optional[int] = None) -> Any:
+    """
+    用msgpack的C扩展解码，限制与内置解码器相同
+
+    msgpack的解码器本身限制嵌套层数（最多1024层），超深的输入不会耗尽栈；
+    深度限制在解码后检查。解码失败时由内置解码器重新解码，给出一致的错误。
+
+    Raises:
+        MessagePackError: 数据无效
+        RecursionError: 超过最大嵌套深度
+    """
+    try:
+        value = msgpack.unpackb(
+            data, raw=False, strict_map_key=False, ext_hook=_reject_ext
+        )
+    except Exception:  # pylint: disable=broad-exception-caught
+        return unpackb_python(data, max_depth)
+    _check_decoded(value, max_depth)
+    return value
+
+
+# 解码后端名称 -> 解码函数
+UNPACKERS: Dict[str, Callable[[Buffer, Optional[int]], Any]] = {
+    "msgpack": unpackb_accelerated,
+    "python": unpackb_python,
+}
+
+
+def available_backends() -> List[str]:
+    """
+    获取当前环境中可用的解码后端名称
+
+    Returns:
+        List[str]: 按默认优先顺序排列的后端名称
+    """
+    return ["msgpack", "python"] if HAS_MSGPACK else ["python"]
+
+
+def unpackb(
+    data: Buffer, max_depth: Optional[int] = None, backend: Optional[str] = None
+) -> Any:
+    """
+    解码MessagePack数据
+
+    Args:
+        data: MessagePack数据，bytes、memoryview等缓冲区对象
+        max_depth: 最大嵌套深度，None表示不检查
+        backend: 解码后端名称（"msgpack"或"python"），None表示使用可用的最快后端
+
+    Returns:
+        Any: 解码后的Python对象
+
+    Raises:
+        MessagePackError: 数据无效
+        RecursionError: 超过最大嵌套深度
+        ValueError: 后端名称未知或后端未安装
+    """
+    if backend is None:
+        backend = available_backends()[0]
+    elif backend not in available_backends():
+        raise ValueError(f"不可用的MessagePack解码后端: {backend}")
+    return UNPACKERS[backend](data, max_depth)
+
+
+def packb(value: Any) -> bytes:
+    """
+    将Python对象编码为MessagePack数据
+
+    整数使用能容纳其值的最短编码，浮点数使用float64，元组按数组编码。
+    同一对象用纯Python和msgpack编码的结果相同。
+
+    Args:
+        value: 要编码的对象
+
+    Returns:
+        bytes: MessagePack数据
+
+    Raises:
+        TypeError: 对象中含有不支持的类型，或映射的键不是字符串
+        OverflowError: 整数超出64位范围
+    """
+    parts: List[bytes] = []
+    _pack(value, parts.append)
+    return b"".join(parts)
+
+
+def _pack(value: Any, write: Callable[[bytes], Any]) -> None:
+    """编码一个值"""
+    if value is None:
+        write(b"\xc0")
+    elif value is True:
+        write(b"\xc3")
+    elif value is False:
+        write(b"\xc2")
+    elif isinstance(value, int):
+        write(_pack_int(value))
+    elif isinstance(value, float):
+        write(struct.pack(">Bd", 0xCB, value))
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        write(_pack_header(len(data), 0xA0, 31, (0xD9, 0xDA, 0xDB)))
+        write(data)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        write(_pack_header(len(data), None, 0, (0xC4, 0xC5, 0xC6)))
+        write(data)
+    elif isinstance(value, (list, tuple)):
+        write(_pack_header(len(value), 0x90, 15, (None, 0xDC, 0xDD)))
+        for item in value:
+            _pack(item, write)
+    elif isinstance(value, dict):
+        write(_pack_header(len(value), 0x80, 15, (None, 0xDE, 0xDF)))
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f"映射的键必须是字符串: {key!r}")
+            _pack(key, write)
+            _pack(item, write)
+    else:
+        raise TypeError(f"不支持编码的类型: {type(value).__name__}")
+
+
+def _pack_int(value: int) -> bytes:
+    """整数的最短编码"""
+    if 0 <= value <= 0x7F:
+        return bytes((value,))
+    if -32 <= value < 0:
+        return bytes((value & 0xFF,))
+    if value > 0:
+        for code, fmt, limit in (
+            (0xCC, ">BB", 0xFF),
+            (0xCD, ">BH", 0xFFFF),
+            (0xCE, ">BI", 0xFFFFFFFF),
+            (0xCF, ">BQ", 0xFFFFFFFFFFFFFFFF),
+        ):
+            if value <= limit:
+                return struct.pack(fmt, code, value)
+    else:
+        for code, fmt, limit in (
+            (0xD0, ">Bb", -0x80),
+            (0xD1, ">Bh", -0x8000),
+            (0xD2, ">Bi", -0x80000000),
+            (0xD3, ">Bq", -0x8000000000000000),
+        ):
+            if value >= limit:
+                return struct.pack(fmt, code, value)
+    raise OverflowError(f"整数超出MessagePack的64位范围: {value}")
+
+
+def _pack_header(size: int, fix_code: Optional[int], fix_limit: int, codes) -> bytes:
+    """
+    字符串、二进制数据、数组和映射的类型标记和长度
+
+    Args:
+        size: 长度
+        fix_code: 固定长度格式的标记，None表示没有
+        fix_limit: 固定长度格式可表示的最大长度
+        codes: 8位、16位、32位长度格式的标记，None表示没有该格式
+    """
+    if fix_code is not None and size <= fix_limit:
+        return bytes((fix_code | size,))
+    code8, code16, code32 = codes
+    if code8 is not None and size <= 0xFF:
+        return struct.pack(">BB", code8, size)
+    if size <= 0xFFFF:
+        return struct.pack(">BH", code16, size)
+    if size <= 0xFFFFFFFF:
+        return struct.pack(">BI", code32, size)
+    raise OverflowError("长度超出MessagePack的32位范围")
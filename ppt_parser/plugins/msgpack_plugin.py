@@ -0,0 +1,94 @@
+"""
+MessagePack格式解析插件
+实现了对MessagePack二进制数据的解析支持，用于服务之间直接传递文档数据，
+省去先序列化为JSON文本再解析的开销
+
+上游服务可以用 msgpack 库或 msgpack_codec.packb 编码文档数据:
+
+    ```python
+    from ppt_parser.plugins.msgpack_codec import packb
+
+    document = await engine.parse(packb(deck), format_type="msgpack")
+    ```
+"""
+
+from typing import Dict, Any, Optional
+from ..exceptions import ParseError
+from .base_plugin import BasePlugin, InputData
+from .msgpack_codec import UNPACKERS, MessagePackError, available_backends
+
+
+class MessagePackPlugin(BasePlugin):
+    """
+    MessagePack格式解析插件
+
+    解码由内置的纯Python解码器完成，安装了 msgpack 时默认使用其C扩展。
+    嵌套深度限制与 JSONPlugin 相同，输入大小由引擎的 MAX_INPUT_SIZE 限制，
+    数据中声明的长度不能超过输入本身的大小。
+    """
+
+    VERSION = "1.0.0"
+    MAX_DEPTH = 10  # 最大递归深度限制，与JSONPlugin相同
+    ACCEPTS_BUFFERS = True
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        初始化插件
+
+        Args:
+            backend: 解码后端名称（"msgpack"或"python"），
+                None表示使用已安装的最快后端
+
+        Raises:
+            ValueError: 后端名称未知或后端未安装
+        """
+        if backend is None:
+            backend = available_backends()[0]
+        elif backend not in available_backends():
+            raise ValueError(f"不可用的MessagePack解码后端: {backend}")
+        self.backend = backend
+
+    def get_format_type(self) -> str:
+        """获取插件支持的格式类型"""
+        return "msgpack"
+
+    async def validate_format(self, input_data: InputData) -> bool:
+        """验证MessagePack格式是否有效"""
+        try:
+            self._unpack(input_data, self.MAX_DEPTH)
+            return True
+        except ParseError:
+            return False
+
+    async def parse(self, input_data: InputData) -> Dict[str, Any]:
+        """解析MessagePack数据"""
+        data = self._unpack(input_data, self.MAX_DEPTH)
+
+        # 必需字段和字段类型由验证器根据模型定义检查
+        if not isinstance(data, dict):
+            raise ParseError("MessagePack根节点必须是映射")
+        slides = data.get("slides")
+        if isinstance(slides, list):
+            for slide in slides:
+                if not isinstance(slide, dict):
+                    raise ParseError("幻灯片必须是映射")
+        return data
+
+    async def decode(self, input_data: InputData) -> Any:
+        """
+        仅解码MessagePack数据
+
+        不做深度检查和结构检查，由融合解析管道在遍历时统一完成。
+        """
+        return self._unpack(input_data, None)
+
+    def _unpack(self, input_data: InputData, max_depth: Optional[int]) -> Any:
+        """解码输入数据，错误统一转换为ParseError"""
+        if isinstance(input_data, str):
+            raise ParseError("MessagePack输入必须是字节数据")
+        try:
+            return UNPACKERS[self.backend](input_data, max_depth)
+        except MessagePackError as e:
+            raise ParseError(f"MessagePack解析错误: {str(e)}") from e
+        except RecursionError as e:
+            raise ParseError("MessagePack结构嵌套深度超过限制") from e
@@ -3,10 +3,11 @@ PPT Parser 测试模块
 提供测试配置和通用测试辅助工具
 """
 
-import pytest
 import json
-from typing import Dict, Any
 from pathlib import Path
+from typing import Dict, Any
+
+import pytest
 
 # 测试数据目录
 TEST_DATA_DIR = Path(__file__).parent / "test_data"
@@ -50,24 +51,15 @@ SAMPLE_DOCUMENT = {
     ],
 }
 
-# 测试用例标记
-pytest.mark.asyncio  # 用于异步测试
-pytest.mark.integration  # 用于集成测试
-pytest.mark.unit  # 用于单元测试
-
 
 # 通用测试异常
 class TestError(Exception):
     """测试相关的异常基类"""
 
-    pass
-
 
 class TestDataError(TestError):
     """测试数据相关的异常"""
 
-    pass
-
 
 # 测试辅助函数
 def assert_document_structure(data: Dict[str, Any]) -> None:
@@ -151,7 +143,7 @@ def requires_test_data(filename: str):
                 test_data = load_test_json(filename)
                 return func(*args, test_data=test_data, **kwargs)
             except (FileNotFoundError, json.JSONDecodeError) as e:
-                raise TestDataError(f"加载测试数据失败: {str(e)}")
+                raise TestDataError(f"加载测试数据失败: {str(e)}") from e
 
         return wrapper
 
@@ -0,0 +1,32 @@
+"""
+测试公共夹具
+提供注册了JSON插件的解析引擎
+"""
+
+from typing import Any, Callable
+import pytest
+from ppt_parser.core import ParserEngine
+from ppt_parser.plugins import JSONPlugin
+
+
+@pytest.fixture
+def engine_factory() -> Callable[..., ParserEngine]:
+    """创建解析引擎的工厂，参数与 ParserEngine 相同，返回的引擎注册了JSON插件"""
+
+    def create(**options: Any) -> ParserEngine:
+        engine = ParserEngine(**options)
+        engine.plugin_manager.register_plugin(JSONPlugin())
+        return engine
+
+    return create
+
+
+@pytest.fixture
+def parser_engine(request, engine_factory) -> ParserEngine:
+    """
+    创建解析引擎实例
+
+    ParserEngine 的参数可以通过间接参数化传入:
+        @pytest.mark.parametrize("parser_engine", [{"fused": True}], indirect=True)
+    """
+    return engine_factory(**getattr(request, "param", {}))
@@ -0,0 +1,170 @@
+"""
+图表数据处理测试模块
+测试数据系列的数组转换、LTTB和最小/最大值降采样，以及写出降采样后的图表
+"""
+
+import io
+import math
+import zipfile
+import pytest
+from ppt_parser.core import ChartDataProcessor, DocumentBuilder
+from ppt_parser.core import chart_data
+from ppt_parser.core.chart_data import (
+    format_points,
+    is_series_array,
+    lttb_indices,
+    minmax_indices,
+    to_array,
+)
+from ppt_parser.exceptions import WriteError
+from ppt_parser.models.document import Document, Element, Position, Slide
+
+
+def wave(count):
+    """带有一个尖峰和一段缺失数据的正弦序列"""
+    values = [math.sin(index / 50) for index in range(count)]
+    values[count // 3] = 25.0
+    for index in range(count // 2, count // 2 + 10):
+        values[index] = None
+    return values
+
+
+def test_to_array():
+    """测试数值列表转换为数组，非数值的数据保持原样"""
+    values = to_array([1, 2.5, None])
+    assert is_series_array(values)
+    assert list(values[:2]) == [1.0, 2.5] and math.isnan(values[2])
+    assert to_array(["1", 2]) is None
+    assert to_array([True, None]) is None
+    assert to_array([[1, 2], [3, 4]]) is None
+
+
+@pytest.mark.parametrize("select", [lttb_indices, minmax_indices])
+def test_downsample_keeps_shape(select):
+    """测试降采样结果不超过目标点数、升序、跳过缺失点且保留尖峰"""
+    values = to_array(wave(10000))
+    indices = select(values, 200)
+    assert len(indices) <= 200
+    assert indices == sorted(set(indices))
+    assert all(not math.isnan(values[index]) for index in indices)
+    assert 10000 // 3 in indices
+    # 点数不超过目标时保留所有有效数据点
+    assert len(select(values, 20000)) == 10000 - 10
+
+
+def test_lttb_endpoints():
+    """测试LTTB总是保留首尾数据点"""
+    indices = lttb_indices(to_array([None, 1, 5, 2, 8, 3, 9, 4, None]), 4)
+    assert indices[0] == 1 and indices[-1] == 7 and len(indices) == 4
+
+
+def test_numpy_matches_fallback(monkeypatch):
+    """测试NumPy实现与纯Python实现选出相同的数据点"""
+    numpy = pytest.importorskip("numpy")
+    values = wave(5000)
+    expected = {}
+    for select in (lttb_indices, minmax_indices):
+        expected[select] = select(to_array(values), 300)
+    monkeypatch.setattr(chart_data, "np", None)
+    for select in (lttb_indices, minmax_indices):
+        fallback = select(to_array(values), 300)
+        assert fallback == expected[select]
+    assert numpy is not None
+
+
+def test_processor_series_and_labels():
+    """测试多个系列和标签按相同的序号降采样"""
+    processor = ChartDataProcessor(max_points=50, method="minmax")
+    count = 1000
+    content = {
+        "type": "line",
+        "series": [
+            {"name": "A", "data": wave(count)},
+            {"name": "B", "data": list(range(count))},
+        ],
+        "labels": [f"t{index}" for index in range(count)],
+    }
+    result = processor.process(content)
+    first, second = (item["data"] for item in result["series"])
+    assert len(first) == len(second) == len(result["labels"]) <= 50
+    # 第二个系列的值等于原序号，可以验证对应关系
+    assert [f"t{int(value)}" for value in second] == result["labels"]
+    assert result["series"][0]["name"] == "A"
+    assert content["series"][0]["data"] == wave(count)
+
+    assert processor.process("not a chart") == "not a chart"
+    assert processor.process({"data": ["a"]}) == {"data": ["a"]}
+    unchanged = ChartDataProcessor(max_points=None).process({"data": [1, 2, 3]})
+    assert list(unchanged["data"]) == [1.0, 2.0, 3.0]
+
+    with pytest.raises(ValueError):
+        ChartDataProcessor(method="random")
+
+
+def test_format_points():
+    """测试数组格式化"""
+    assert format_points(to_array([1.5, None, 2])) == ["1.5", None, "2.0"]
+    with pytest.raises(ValueError):
+        format_points(to_array([math.inf]))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["loop", "compiled", "trusted"])
+async def test_build_and_write_downsampled_chart(mode):
+    """测试构建时降采样，写出的图表只包含降采样后的数据点"""
+    builder = DocumentBuilder(mode=mode, chart_data=ChartDataProcessor(max_points=100))
+    data = {
+        "title": "监控",
+        "slides": [
+            {
+                "title": "页",
+                "elements": [
+                    {
+                        "type": "chart",
+                        "content": {"type": "line", "data": wave(100000)},
+                        "position": {"x": 0, "y": 0},
+                    }
+                ],
+            }
+        ],
+    }
+    document = await builder.build_document(data)
+    values = document.slides[0].elements[0].content["data"]
+    assert is_series_array(values) and len(values) == 100
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    with zipfile.ZipFile(buffer) as archive:
+        chart = archive.read("ppt/charts/chart1.xml").decode()
+    assert chart.count("<c:pt ") == 100
+    assert "<c:v>25.0</c:v>" in chart
+
+
+def test_array_chart_matches_list_chart():
+    """测试数组数据与列表数据写出相同的图表"""
+    values = [1.5, None, 2.25, -3.0]
+
+    def chart_for(data):
+        document = Document(
+            title="测试",
+            slides=[
+                Slide(
+                    title="页",
+                    elements=[
+                        Element(
+                            type="chart",
+                            content={"type": "bar", "data": data},
+                            position=Position(x=0, y=0),
+                        )
+                    ],
+                )
+            ],
+        )
+        buffer = io.BytesIO()
+        document.save(buffer)
+        with zipfile.ZipFile(buffer) as archive:
+            return archive.read("ppt/charts/chart1.xml")
+
+    assert chart_for(to_array(values)) == chart_for(values)
+    with pytest.raises(WriteError):
+        chart_for(to_array([math.inf]))
@@ -0,0 +1,151 @@
+"""
+紧凑文档测试模块
+测试按列存储的 CompactDocument 与普通文档的一致性和内存占用
+"""
+
+import gc
+import json
+import tracemalloc
+import pytest
+from ppt_parser.exceptions import BuildDocumentError
+from ppt_parser.models.compact import CompactDocument
+from ppt_parser.models.document import Document, Element, Position, Slide, Style
+
+
+def make_deck(num_slides, elements_per_slide):
+    """生成包含各种元素字段组合的文档数据"""
+    slides = []
+    for slide_index in range(num_slides):
+        elements = []
+        for index in range(elements_per_slide):
+            element = {
+                "type": ("text", "image", "shape", "chart")[index % 4],
+                "content": f"内容{index % 7}",
+                "position": {"x": index % 1000, "y": 1.5, "unit": "pt"},
+                "style": {"font_size": 24, "color": "#000000"},
+            }
+            if index % 3 == 0:
+                element["style"] = {
+                    "font_family": "Arial",
+                    "bold": True,
+                    "italic": None,
+                    "opacity": None,
+                    "rotation": 90,
+                    "background_color": "#FFFFFF",
+                }
+            if index % 4 == 3:
+                element["content"] = {"type": "bar", "data": [1, 2, 3]}
+            if index % 5 == 0:
+                element["size"] = {"width": 100, "height": 50}
+            elif index % 5 == 1:
+                element["size"] = {"height": 10}
+            elements.append(element)
+        slides.append(
+            {"title": f"第{slide_index + 1}页", "elements": elements, "layout": "grid"}
+        )
+    return {"title": "紧凑测试", "slides": slides, "metadata": {"author": "测试"}}
+
+
+@pytest.mark.asyncio
+async def test_compact_matches_document(parser_engine):
+    """测试紧凑文档的视图和转换结果与普通文档一致"""
+    input_json = json.dumps(make_deck(3, 20))
+    document = await parser_engine.parse(input_json)
+    compact = await parser_engine.parse_compact(input_json)
+
+    assert compact.element_count == 60
+    assert compact.to_document() == document
+    assert compact.to_dict() == document.to_dict()
+    assert CompactDocument.from_document(document).to_document() == document
+
+    assert len(compact.slides) == 3
+    for slide, expected in zip(compact.slides, document.slides):
+        assert slide.title == expected.title
+        assert slide.layout == "grid"
+        assert len(slide.elements) == len(expected.elements)
+        assert list(slide.elements) == expected.elements
+        assert slide.elements[-1] == expected.elements[-1]
+        assert slide.elements[2:5] == expected.elements[2:5]
+
+    with pytest.raises(IndexError):
+        _ = compact.slides[3]
+    with pytest.raises(IndexError):
+        _ = compact.slides[0].elements[20]
+
+
+@pytest.mark.asyncio
+async def test_compact_elements_are_copies(parser_engine):
+    """测试修改元素视图不影响紧凑文档"""
+    compact = await parser_engine.parse_compact(json.dumps(make_deck(1, 2)))
+    element = compact.slides[0].elements[0]
+    element.position.x = 999
+    element.style.bold = False
+
+    assert compact.slides[0].elements[0].position.x == 0
+    assert compact.slides[0].elements[0].style.bold is True
+
+
+def test_compact_overflow_elements():
+    """测试无法按列存储的元素按原样保存"""
+    elements = [
+        Element(type="text", content="a", position=Position(x=1, y=2), note="额外"),
+        Element(
+            type="text",
+            content="b",
+            position=Position(x=1, y=2),
+            size={"depth": 3},
+        ),
+        Element(type="text", content="c", position=Position(x=1, y=2)),
+    ]
+    document = Document(
+        title="测试", slides=[Slide(title="页", elements=elements, tag="x")]
+    )
+    compact = CompactDocument.from_document(document)
+
+    assert compact.to_document() == document
+    assert compact.slides[0].tag == "x"
+    assert compact.slides[0].elements[0].note == "额外"
+    assert compact.slides[0].elements[1].size == {"depth": 3.0}
+
+
+def test_compact_default_style():
+    """测试默认样式和空字段的还原"""
+    element = Element(type="shape", content=None, position=Position(x=0, y=0))
+    document = Document(title="测试", slides=[Slide(title="页", elements=[element])])
+    restored = CompactDocument.from_document(document).slides[0].elements[0]
+
+    assert restored == element
+    assert restored.style == Style()
+    assert restored.size is None
+
+
+@pytest.mark.asyncio
+async def test_compact_build_errors(parser_engine):
+    """测试紧凑模式下的构建错误"""
+    data = make_deck(1, 1)
+    data["slides"][0]["elements"][0]["position"]["x"] = 5000
+    with pytest.raises(BuildDocumentError):
+        await parser_engine.parse_compact(json.dumps(data))
+
+
+@pytest.mark.asyncio
+async def test_compact_memory(parser_engine):
+    """测试紧凑文档的内存占用远小于普通文档"""
+    parsed = json.loads(json.dumps(make_deck(20, 100)))
+    builder = parser_engine.document_builder
+
+    async def measure(build):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = await build(parsed)
+            gc.collect()
+            return result, tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    document, document_size = await measure(builder.build_document)
+    compact, compact_size = await measure(builder.build_compact_document)
+
+    assert compact.to_document() == document
+    assert compact_size * 10 < document_size
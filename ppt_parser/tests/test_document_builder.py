@@ -3,10 +3,12 @@
 测试文档对象的构建功能
 """
 
+import gc
+import threading
 import pytest
-from typing import List, Dict, Any, Optional, Literal
 from ppt_parser.core import DocumentBuilder
-from ppt_parser.models.document import Document, Slide, Element
+from ppt_parser.core.gc_pause import gc_paused
+from ppt_parser.models.document import Document, Slide, Element, Position, Style
 from ppt_parser.exceptions import BuildDocumentError
 
 
@@ -96,3 +98,154 @@ async def test_build_document_with_multiple_slides(document_builder, valid_doc_d
     valid_doc_data["slides"].append(valid_doc_data["slides"][0].copy())
     document = await document_builder.build_document(valid_doc_data)
     assert len(document.slides) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["compiled", "trusted"])
+async def test_build_modes_match_loop(valid_doc_data, mode):
+    """测试各构建模式的结果与逐个构建一致"""
+    valid_doc_data["theme"] = {"name": "忽略"}
+    slide = valid_doc_data["slides"][0]
+    slide["notes"] = "忽略"
+    slide["elements"].append(
+        {
+            "type": "chart",
+            "content": {"data": [1, 2]},
+            "position": {"x": 1.5, "y": 2.5, "unit": "pt"},
+            "size": {"width": 10.0},
+            "extra": "忽略",
+        }
+    )
+    del valid_doc_data["metadata"]
+
+    expected = await DocumentBuilder().build_document(valid_doc_data)
+    document = await DocumentBuilder(mode=mode).build_document(valid_doc_data)
+
+    assert document == expected
+    assert document.model_dump() == expected.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_compiled_mode_error_indices(valid_doc_data):
+    """测试编译模式的错误映射到幻灯片和元素序号"""
+    builder = DocumentBuilder(mode="compiled")
+    valid_doc_data["slides"].append(
+        {
+            "title": "第二页",
+            "elements": [
+                valid_doc_data["slides"][0]["elements"][0],
+                {"type": "text", "content": "", "position": {"x": 5000, "y": 0}},
+            ],
+        }
+    )
+    with pytest.raises(BuildDocumentError) as exc_info:
+        await builder.build_document(valid_doc_data)
+    error = exc_info.value
+    assert "元素构建失败" in str(error)
+    assert error.stage == "element"
+    assert error.details["slide_index"] == 1
+    assert error.details["element_index"] == 1
+    assert error.details["errors"][0]["loc"] == "slides.1.elements.1.position.x"
+
+    del valid_doc_data["slides"][1]["elements"][1]["type"]
+    with pytest.raises(BuildDocumentError) as exc_info:
+        await builder.build_document(valid_doc_data)
+    assert "元素缺少必需字段: 'type'" in str(exc_info.value)
+
+    valid_doc_data["slides"][1] = {"elements": []}
+    with pytest.raises(BuildDocumentError) as exc_info:
+        await builder.build_document(valid_doc_data)
+    assert exc_info.value.stage == "slide"
+    assert "幻灯片缺少必需字段: 'title'" in str(exc_info.value)
+
+    del valid_doc_data["title"]
+    with pytest.raises(BuildDocumentError) as exc_info:
+        await builder.build_document(valid_doc_data)
+    assert "缺少必需字段" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_trusted_mode_skips_validation(valid_doc_data):
+    """测试可信模式不做模型验证"""
+    valid_doc_data["slides"][0]["elements"][0]["position"]["x"] = 5000
+    document = await DocumentBuilder(mode="trusted").build_document(valid_doc_data)
+    assert document.slides[0].elements[0].position.x == 5000
+    assert document.slides[0].elements[0].style.opacity == 1.0
+
+    with pytest.raises(BuildDocumentError):
+        await DocumentBuilder(mode="compiled").build_document(valid_doc_data)
+
+
+@pytest.mark.asyncio
+async def test_trusted_mode_matches_model_construct(valid_doc_data):
+    """测试可信模式创建的对象与 model_construct 的结果相同"""
+    element_data = valid_doc_data["slides"][0]["elements"][0]
+    element_data["style"] = {"bold": True, "unknown": 1}
+    document = await DocumentBuilder(mode="trusted").build_document(valid_doc_data)
+    element = document.slides[0].elements[0]
+
+    for model, created in (
+        (Style, element.style),
+        (Position, element.position),
+    ):
+        name = model.__name__.lower()
+        expected = model.model_construct(**element_data[name])
+        assert created.__dict__ == expected.__dict__
+        assert created.model_fields_set == expected.model_fields_set
+    assert element.style.model_fields_set == {"bold"}
+    assert element.model_extra == {} and document.slides[0].model_extra == {}
+    assert document.model_fields_set == {"title", "slides", "metadata"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["compiled", "trusted"])
+async def test_pause_gc_is_opt_in(valid_doc_data, monkeypatch, mode):
+    """测试只有设置了pause_gc时才在构建期间暂停循环垃圾回收"""
+    states = []
+    original = DocumentBuilder._complete_element
+
+    def complete(self, *args):
+        states.append(gc.isenabled())
+        return original(self, *args)
+
+    monkeypatch.setattr(DocumentBuilder, "_complete_element", complete)
+    for pause_gc in (False, True):
+        builder = DocumentBuilder(mode=mode, chart_data=object(), pause_gc=pause_gc)
+        await builder.build_document(valid_doc_data)
+        assert gc.isenabled()
+    assert states == [True, False]
+
+
+def test_gc_paused_across_threads():
+    """测试多个线程交错暂停时，最后一个退出后才恢复回收"""
+    entered = threading.Event()
+    release = threading.Event()
+
+    def worker():
+        with gc_paused():
+            entered.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=worker)
+    with gc_paused():
+        thread.start()
+        entered.wait(5)
+    # 先进入的上下文已经退出，另一个线程仍在构建
+    assert not gc.isenabled()
+    release.set()
+    thread.join()
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        with gc_paused():
+            pass
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+
+def test_invalid_build_mode():
+    """测试无效的构建模式"""
+    with pytest.raises(ValueError):
+        DocumentBuilder(mode="fast")
@@ -4,10 +4,9 @@
 """
 
 import pytest
-from typing import List, Dict, Any, Optional, Literal
 from ppt_parser.core import ParserEngine
 from ppt_parser.plugins import JSONPlugin
-from ppt_parser.models.document import Document, Slide, Element
+from ppt_parser.models.document import Document, Slide
 
 
 @pytest.fixture
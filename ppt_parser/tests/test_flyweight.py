@@ -0,0 +1,133 @@
+"""
+享元缓存测试模块
+测试样式和位置实例的共享、淘汰和统计
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pydantic
+import pytest
+from ppt_parser.core import FlyweightCache
+from ppt_parser.exceptions import BuildDocumentError
+from ppt_parser.models.document import Position, Style
+
+
+def make_deck(num_elements):
+    """生成样式和位置大量重复的文档数据"""
+    elements = [
+        {
+            "type": "text",
+            "content": f"文本{index}",
+            "position": {"x": 100, "y": 100 * (index % 2)},
+            "style": {"font_size": 24, "color": "#000000"},
+        }
+        for index in range(num_elements)
+    ]
+    return {"title": "享元测试", "slides": [{"title": "页", "elements": elements}]}
+
+
+@pytest.mark.asyncio
+async def test_flyweight_shares_instances(engine_factory):
+    """测试内容相同的样式和位置共享同一实例"""
+    input_json = json.dumps(make_deck(10))
+    flyweights = FlyweightCache()
+    document = await engine_factory(flyweights=flyweights).parse(input_json)
+    expected = await engine_factory().parse(input_json)
+
+    assert document == expected
+    elements = document.slides[0].elements
+    assert all(element.style is elements[0].style for element in elements)
+    assert elements[0].position is elements[2].position
+    assert elements[0].position is not elements[1].position
+
+    stats = flyweights.stats
+    assert (stats.hits, stats.misses) == (17, 3)
+    assert stats.hit_rate == pytest.approx(0.85)
+
+
+def test_flyweight_instances_are_frozen():
+    """测试共享实例不可修改，且与普通模型比较相等"""
+    flyweights = FlyweightCache()
+    style = flyweights.style({"font_size": 24})
+
+    with pytest.raises(pydantic.ValidationError):
+        style.font_size = 12
+    assert style == Style(font_size=24)
+    assert Style(font_size=24) == style
+    assert style != Style(font_size=12)
+    assert flyweights.position({"x": 1, "y": 2}) == Position(x=1, y=2)
+
+
+def test_flyweight_key_normalization():
+    """测试字段顺序不同或取值相等的数据共享实例"""
+    flyweights = FlyweightCache()
+    first = flyweights.style({"font_size": 24, "bold": True})
+    assert flyweights.style({"bold": True, "font_size": 24}) is first
+    assert flyweights.style({"bold": 1, "font_size": 24.0}) is first
+    assert flyweights.style({"bold": False, "font_size": 24}) is not first
+
+
+@pytest.mark.parametrize("model", [Position, Style])
+@pytest.mark.parametrize("values", [(True, 1, 1.0), (False, 0, 0.0)])
+def test_equal_values_validate_identically(model, values):
+    """测试相等的取值验证结果一致，这是按值相等共用实例的前提"""
+    for field in model.model_fields:
+        results = set()
+        for value in values:
+            data = {"x": 1, "y": 1} if model is Position else {}
+            data[field] = value
+            try:
+                results.add(repr(getattr(model(**data), field)))
+            except (AttributeError, ValueError):
+                results.add("error")
+        assert len(results) == 1, field
+
+
+def test_flyweight_eviction_and_errors():
+    """测试按条目数淘汰，验证失败的取值不缓存"""
+    flyweights = FlyweightCache(max_entries=2)
+    for x in range(5):
+        flyweights.position({"x": x, "y": 0})
+    assert flyweights.stats.entries == 2
+    assert flyweights.stats.evictions == 3
+
+    for _ in range(2):
+        with pytest.raises(pydantic.ValidationError):
+            flyweights.style({"color": "red"})
+        with pytest.raises(pydantic.ValidationError):
+            flyweights.style({"font_family": ["不可哈希"]})
+    assert flyweights.stats.entries == 2
+
+    with pytest.raises(ValueError):
+        FlyweightCache(max_entries=0)
+
+
+def test_flyweight_threads():
+    """测试多个线程同时查找时统计准确，同一取值只共享一个实例"""
+    flyweights = FlyweightCache(max_entries=8)
+    values = [{"x": x % 10, "y": 0} for x in range(2000)]
+
+    def lookup(_):
+        return [flyweights.position(value) for value in values]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lookup, range(8)))
+
+    stats = flyweights.stats
+    assert stats.hits + stats.misses == 8 * len(values)
+    assert stats.entries <= 8
+    for result in results:
+        for position, value in zip(result, values):
+            assert (position.x, position.y) == (value["x"], value["y"])
+
+
+@pytest.mark.asyncio
+async def test_flyweight_build_errors(engine_factory):
+    """测试启用享元缓存时构建错误不变"""
+    data = make_deck(2)
+    data["slides"][0]["elements"][1]["style"]["color"] = "000000"
+    with pytest.raises(BuildDocumentError) as expected:
+        await engine_factory().parse(json.dumps(data))
+    with pytest.raises(BuildDocumentError) as exc_info:
+        await engine_factory(flyweights=FlyweightCache()).parse(json.dumps(data))
+    assert str(exc_info.value) == str(expected.value)
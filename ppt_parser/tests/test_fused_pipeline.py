@@ -0,0 +1,114 @@
+"""
+融合解析管道测试模块
+测试融合模式与默认流程的结果和异常类型一致
+"""
+
+import json
+from typing import Any
+import pytest
+from ppt_parser.plugins import JSONPlugin
+from ppt_parser.exceptions import ParseError, ValidationError, BuildDocumentError
+from ppt_parser.tests import SAMPLE_DOCUMENT
+
+
+@pytest.fixture
+def sample_data():
+    """示例文档数据的副本"""
+    return json.loads(json.dumps(SAMPLE_DOCUMENT))
+
+
+def nest(depth: int):
+    """生成指定层数的嵌套列表"""
+    value: Any = 1
+    for _ in range(depth):
+        value = [value]
+    return value
+
+
+@pytest.mark.asyncio
+async def test_fused_matches_default(engine_factory, sample_data):
+    """测试融合模式构建的文档与默认流程一致"""
+    sample_data["slides"][0]["elements"].append(
+        {
+            "type": "chart",
+            "content": {"type": "bar", "data": [1, 2, 3]},
+            "position": {"x": 10, "y": 20, "unit": "pt"},
+            "style": {"color": "#FF0000", "width": 400},
+            "size": {"width": 300, "height": 200},
+        }
+    )
+    input_json = json.dumps(sample_data)
+
+    expected = await engine_factory(fused=False).parse(input_json)
+    document = await engine_factory(fused=True).parse(input_json)
+
+    assert document == expected
+    assert document.to_dict() == expected.to_dict()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "mutate, error_type",
+    [
+        (lambda d: d.pop("slides"), ValidationError),
+        (lambda d: d.update(slides="x"), ValidationError),
+        (lambda d: d["slides"].append(1), ParseError),
+        (lambda d: d.update(title="  "), ValidationError),
+        (lambda d: d["slides"][0].pop("elements"), ValidationError),
+        (lambda d: d["slides"][0]["elements"][0].pop("type"), ValidationError),
+        (
+            lambda d: d["slides"][0]["elements"][0].update(position={"x": 1}),
+            ValidationError,
+        ),
+        (
+            lambda d: d["slides"][0]["elements"][0].update(position=[1, 2]),
+            ValidationError,
+        ),
+        (
+            lambda d: d["slides"][0]["elements"][0].update(type="video"),
+            BuildDocumentError,
+        ),
+        (
+            lambda d: d["slides"][0]["elements"][0]["position"].update(x=5000),
+            BuildDocumentError,
+        ),
+    ],
+)
+async def test_fused_error_types(engine_factory, sample_data, mutate, error_type):
+    """测试融合模式抛出与默认流程相同的异常类型"""
+    mutate(sample_data)
+    input_json = json.dumps(sample_data)
+
+    with pytest.raises(error_type):
+        await engine_factory(fused=False).parse(input_json)
+    with pytest.raises(error_type):
+        await engine_factory(fused=True).parse(input_json)
+
+
+@pytest.mark.asyncio
+async def test_fused_depth_limit(engine_factory, sample_data):
+    """测试融合模式的深度限制与解码器一致"""
+    element = sample_data["slides"][0]["elements"][0]
+    plugin = JSONPlugin()
+
+    # content位于第5层，最多还能嵌套5层
+    element["content"] = nest(plugin.MAX_DEPTH - 5)
+    document = await engine_factory(fused=True).parse(json.dumps(sample_data))
+    assert document.slides[0].elements[0].content == element["content"]
+
+    element["content"] = nest(plugin.MAX_DEPTH - 4)
+    for fused in (False, True):
+        with pytest.raises(ParseError) as exc_info:
+            await engine_factory(fused=fused).parse(json.dumps(sample_data))
+        assert "深度超过限制" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_fused_element_error_details(engine_factory, sample_data):
+    """测试融合模式的构建错误包含幻灯片和元素索引"""
+    sample_data["slides"][0]["elements"][0]["style"] = {"color": "red"}
+    with pytest.raises(BuildDocumentError) as exc_info:
+        await engine_factory(fused=True).parse(json.dumps(sample_data))
+    assert "元素构建失败" in str(exc_info.value)
+    assert exc_info.value.details["slide_index"] == 0
+    assert exc_info.value.details["element_index"] == 0
@@ -0,0 +1,145 @@
+"""
+图片尺寸读取测试模块
+测试各种图片格式的文件头解析、缓存和构建时补全图片大小
+"""
+
+import io
+import os
+import struct
+import pytest
+from ppt_parser.core import DocumentBuilder, ImageSizeCache
+from ppt_parser.core.image_info import ImageInfo, read_image_info
+
+
+def png(width, height):
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + struct.pack(">I4sII", 13, b"IHDR", width, height)
+        + b"\x08\x06\x00\x00\x00"
+        + b"\x00" * 64
+    )
+
+
+def jpeg(width, height):
+    # SOI、带填充字节的APP0和APP1段，然后是渐进式帧头SOF2
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    app1 = b"\xff\xff\xe1" + struct.pack(">H", 5002) + b"\x00" * 5000
+    sof = b"\xff\xc2" + struct.pack(">HBHHB", 17, 8, height, width, 3) + b"\x00" * 9
+    return b"\xff\xd8" + app0 + app1 + sof + b"\xff\xd9"
+
+
+def bmp(width, height, dib_size=40):
+    header = b"BM" + b"\x00" * 12 + struct.pack("<I", dib_size)
+    if dib_size == 12:
+        return header + struct.pack("<HH", width, height) + b"\x00" * 16
+    return header + struct.pack("<ii", width, height) + b"\x00" * 16
+
+
+def webp(chunk, payload):
+    return b"RIFF" + b"\x00" * 4 + b"WEBP" + chunk + b"\x00" * 4 + payload
+
+
+SAMPLES = [
+    (png(640, 480), ImageInfo("png", 640, 480)),
+    (jpeg(1920, 1080), ImageInfo("jpeg", 1920, 1080)),
+    (b"GIF89a" + struct.pack("<HH", 32, 16) + b"\x00" * 32, ImageInfo("gif", 32, 16)),
+    (bmp(100, -50), ImageInfo("bmp", 100, 50)),
+    (bmp(7, 9, dib_size=12), ImageInfo("bmp", 7, 9)),
+    (
+        webp(b"VP8 ", b"\x00" * 3 + b"\x9d\x01\x2a" + struct.pack("<HH", 300, 200)),
+        ImageInfo("webp", 300, 200),
+    ),
+    (
+        webp(b"VP8L", b"\x2f" + struct.pack("<I", (299) | (199 << 14)) + b"\x00" * 8),
+        ImageInfo("webp", 300, 200),
+    ),
+    (
+        webp(
+            b"VP8X",
+            b"\x00" * 4 + (4095).to_bytes(3, "little") + (2999).to_bytes(3, "little"),
+        ),
+        ImageInfo("webp", 4096, 3000),
+    ),
+]
+
+
+@pytest.mark.parametrize("data,expected", SAMPLES)
+def test_read_image_info(data, expected):
+    """测试从各种格式的文件头读取尺寸"""
+    assert read_image_info(io.BytesIO(data)) == expected
+
+
+@pytest.mark.parametrize(
+    "data", [b"", b"not an image", png(1, 1)[:20], jpeg(10, 10)[:40], b"BM\x00"]
+)
+def test_read_image_info_unknown(data):
+    """测试无法识别或不完整的文件返回None"""
+    assert read_image_info(io.BytesIO(data)) is None
+
+
+def test_image_size_cache(tmp_path):
+    """测试缓存按路径和修改时间复用结果"""
+    (tmp_path / "a.png").write_bytes(png(10, 20))
+    cache = ImageSizeCache(media_root=tmp_path)
+    assert cache.info("a.png") == ImageInfo("png", 10, 20)
+    assert cache.info("a.png") == ImageInfo("png", 10, 20)
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+    (tmp_path / "a.png").write_bytes(png(30, 40) + b"\x00")
+    os.utime(tmp_path / "a.png", ns=(0, 0))
+    assert cache.info("a.png") == ImageInfo("png", 30, 40)
+    assert cache.info("missing.png") is None
+
+    assert cache.default_size("a.png", None) == {"width": 30, "height": 40}
+    assert cache.default_size("a.png", None, "in") == {
+        "width": 30 / 96,
+        "height": 40 / 96,
+    }
+    assert cache.default_size("a.png", {"width": 60}) == {"width": 60, "height": 80}
+    assert cache.default_size("a.png", {"height": 20}) == {"width": 15, "height": 20}
+    assert cache.default_size("a.png", {"width": 1, "height": 1}) == {
+        "width": 1,
+        "height": 1,
+    }
+    assert cache.default_size("missing.png", None) is None
+    assert cache.default_size("a.png", {"width": "wide"}) == {"width": "wide"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["loop", "compiled", "trusted"])
+async def test_build_defaults_image_size(tmp_path, mode):
+    """测试各种构建模式都按图片尺寸补全图片元素的大小"""
+    (tmp_path / "photo.jpg").write_bytes(jpeg(960, 480))
+    builder = DocumentBuilder(mode=mode, image_sizes=ImageSizeCache(tmp_path))
+    data = {
+        "title": "测试",
+        "slides": [
+            {
+                "title": "页",
+                "elements": [
+                    {
+                        "type": "image",
+                        "content": "photo.jpg",
+                        "position": {"x": 0, "y": 0},
+                    },
+                    {
+                        "type": "image",
+                        "content": "photo.jpg",
+                        "position": {"x": 0, "y": 0, "unit": "in"},
+                        "size": {"width": 2},
+                    },
+                    {
+                        "type": "text",
+                        "content": "photo.jpg",
+                        "position": {"x": 0, "y": 0},
+                    },
+                ],
+            }
+        ],
+    }
+    document = await builder.build_document(data)
+    elements = document.slides[0].elements
+    assert elements[0].size == {"width": 960, "height": 480}
+    assert elements[1].size == {"width": 2, "height": 1}
+    assert elements[2].size is None
+    assert "size" not in data["slides"][0]["elements"][0]
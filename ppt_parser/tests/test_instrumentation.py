@@ -0,0 +1,287 @@
+"""
+解析埋点测试模块
+测试各阶段的计时钩子、每次解析的计数和Prometheus文本格式的输出
+"""
+
+import json
+import pytest
+from ppt_parser.core import ParseCache, ParseExecutor
+from ppt_parser.core import InMemoryCollector, Instrumentation, PrometheusExporter
+from ppt_parser.core.instrumentation import (
+    NULL_INSTRUMENTATION,
+    UNKNOWN_FORMAT,
+    ParseStats,
+)
+from ppt_parser.exceptions import ParseError, ValidationError
+from ppt_parser.tests import SAMPLE_DOCUMENT
+
+
+@pytest.fixture
+def input_json():
+    """示例文档的JSON字符串"""
+    return json.dumps(SAMPLE_DOCUMENT, ensure_ascii=False)
+
+
+@pytest.mark.asyncio
+async def test_default_is_noop(engine_factory, input_json):
+    """测试默认埋点不计时也不影响解析结果"""
+    engine = engine_factory()
+    assert engine.instrumentation is NULL_INSTRUMENTATION
+    assert not engine.instrumentation.enabled
+
+    with engine.instrumentation.span("parse") as span:
+        assert span is None
+    document = await engine.parse(input_json)
+    assert document.title == SAMPLE_DOCUMENT["title"]
+
+
+@pytest.mark.asyncio
+async def test_stage_spans_and_stats(engine_factory, input_json):
+    """测试记录每个阶段的耗时和解析计数"""
+    collector = InMemoryCollector()
+    engine = engine_factory(instrumentation=collector)
+    document = await engine.parse(input_json)
+
+    assert collector.span_names() == ["decode", "validate", "build", "parse"]
+    assert all(span.ok and span.seconds >= 0 for span in collector.spans)
+    assert collector.total_seconds("parse") >= collector.total_seconds("build")
+
+    assert len(collector.parses) == 1
+    stats = collector.parses[0]
+    assert stats == ParseStats(
+        format_type="json",
+        input_bytes=len(input_json.encode("utf-8")),
+        slides=len(document.slides),
+        elements=sum(len(slide.elements) for slide in document.slides),
+    )
+    assert stats.ok
+
+    collector.clear()
+    await engine.parse_bytes(input_json.encode("utf-8"))
+    assert collector.parses[0].input_bytes == len(input_json.encode("utf-8"))
+
+
+@pytest.mark.asyncio
+async def test_fused_and_cache_spans(engine_factory, input_json):
+    """测试融合解析和缓存命中的阶段与计数"""
+    collector = InMemoryCollector()
+    engine = engine_factory(fused=True, cache=ParseCache(), instrumentation=collector)
+    await engine.parse(input_json)
+    assert collector.span_names() == ["cache_lookup", "fused", "cache_store", "parse"]
+
+    collector.clear()
+    await engine.parse(input_json)
+    assert collector.span_names() == ["cache_lookup", "parse"]
+    assert collector.parses[0].cache_hit
+    assert collector.parses[0].slides == len(SAMPLE_DOCUMENT["slides"])
+
+
+@pytest.mark.asyncio
+async def test_executor_span(engine_factory, input_json):
+    """测试使用解析执行器时记录整体的执行耗时"""
+    collector = InMemoryCollector()
+    async with ParseExecutor("thread", max_workers=1) as executor:
+        engine = engine_factory(executor=executor, instrumentation=collector)
+        await engine.parse(input_json)
+    assert collector.span_names() == ["executor", "parse"]
+
+
+@pytest.mark.asyncio
+async def test_failed_parse(engine_factory):
+    """测试解析失败时阶段标记为失败，并记录异常类型"""
+    collector = InMemoryCollector()
+    engine = engine_factory(instrumentation=collector)
+
+    with pytest.raises(ParseError):
+        await engine.parse("{invalid")
+    assert collector.spans[0].name == "decode" and not collector.spans[0].ok
+    assert collector.parses[0].error == "ParseError"
+    assert collector.parses[0].input_bytes == len("{invalid")
+
+    collector.clear()
+    with pytest.raises(ValidationError):
+        await engine.parse(json.dumps({"title": "", "slides": []}))
+    assert collector.span_names() == ["decode", "validate", "parse"]
+    assert [span.ok for span in collector.spans] == [True, False, False]
+    assert collector.parses[0].error == "ValidationError"
+    assert collector.parses[0].slides == 0
+
+
+@pytest.mark.asyncio
+async def test_parse_bytes_and_file_stats(engine_factory, input_json, tmp_path):
+    """测试parse_bytes和parse_file各记录一次解析"""
+    collector = InMemoryCollector()
+    engine = engine_factory(instrumentation=collector)
+    size = len(input_json.encode("utf-8"))
+    expected = ParseStats(
+        format_type="json",
+        input_bytes=size,
+        slides=len(SAMPLE_DOCUMENT["slides"]),
+        elements=sum(len(slide["elements"]) for slide in SAMPLE_DOCUMENT["slides"]),
+    )
+
+    await engine.parse_bytes(memoryview(input_json.encode("utf-8")))
+    assert collector.parses == [expected]
+    assert collector.span_names() == ["decode", "validate", "build", "parse"]
+
+    collector.clear()
+    path = tmp_path / "deck.json"
+    path.write_text(input_json, encoding="utf-8")
+    await engine.parse_file(path)
+    assert collector.parses == [expected]
+    assert collector.span_names()[-1] == "parse"
+
+    collector.clear()
+    with pytest.raises(ParseError):
+        await engine.parse_file(tmp_path / "missing.json")
+    assert len(collector.parses) == 1
+    stats = collector.parses[0]
+    assert stats.error == "ParseError" and stats.input_bytes == 0
+    assert collector.span_names() == ["parse"] and not collector.spans[0].ok
+
+
+@pytest.mark.asyncio
+async def test_parse_many_stats(engine_factory, input_json):
+    """测试批量解析为每个输入记录一次解析"""
+    collector = InMemoryCollector()
+    engine = engine_factory(instrumentation=collector)
+    inputs = [input_json, "{invalid", input_json.encode("utf-8")]
+
+    results = [result async for result in engine.parse_many(inputs, ordered=True)]
+    assert [result.ok for result in results] == [True, False, True]
+    assert [stats.error for stats in collector.parses] == [None, "ParseError", None]
+    assert collector.span_names().count("parse") == 3
+    assert [stats.input_bytes for stats in collector.parses] == [
+        len(input_json.encode("utf-8")),
+        len("{invalid"),
+        len(input_json.encode("utf-8")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_compact_incremental_and_stream_stats(engine_factory, input_json):
+    """测试紧凑、增量和流式解析同样记录解析计数"""
+    collector = InMemoryCollector()
+    engine = engine_factory(instrumentation=collector)
+    size = len(input_json.encode("utf-8"))
+    slides = len(SAMPLE_DOCUMENT["slides"])
+    elements = sum(len(slide["elements"]) for slide in SAMPLE_DOCUMENT["slides"])
+    expected = ParseStats("json", input_bytes=size, slides=slides, elements=elements)
+
+    await engine.parse_compact(input_json)
+    document = await engine.parse_incremental(input_json)
+    await engine.parse_incremental(input_json, document)
+    streamed = [
+        slide async for slide in engine.parse_stream(input_json.encode("utf-8"))
+    ]
+    assert len(streamed) == slides
+    assert collector.parses == [expected] * 4
+    assert collector.span_names() == ["parse"] * 4
+
+    collector.clear()
+    with pytest.raises(ParseError):
+        _ = [slide async for slide in engine.parse_stream(input_json)]
+    with pytest.raises(ValidationError):
+        await engine.parse_compact(json.dumps({"title": "", "slides": []}))
+    assert [stats.error for stats in collector.parses] == [
+        "ParseError",
+        "ValidationError",
+    ]
+    assert not any(span.ok for span in collector.spans)
+
+
+@pytest.mark.asyncio
+async def test_custom_hooks(engine_factory, input_json):
+    """测试子类只覆盖计时钩子即可接收阶段耗时"""
+
+    class Timer(Instrumentation):
+        def __init__(self):
+            self.stages = {}
+
+        def record_span(self, name, seconds, ok):
+            self.stages[name] = seconds
+
+    timer = Timer()
+    await engine_factory(instrumentation=timer).parse(input_json)
+    assert set(timer.stages) == {"decode", "validate", "build", "parse"}
+
+
+@pytest.mark.asyncio
+async def test_prometheus_exporter(engine_factory, input_json):
+    """测试Prometheus文本格式的输出"""
+    exporter = PrometheusExporter(buckets=[0.5, 60])
+    engine = engine_factory(cache=ParseCache(), instrumentation=exporter)
+    await engine.parse(input_json)
+    await engine.parse(input_json)
+    with pytest.raises(ParseError):
+        await engine.parse("[]")
+
+    lines = exporter.render().splitlines()
+    assert "# TYPE ppt_parser_stage_duration_seconds histogram" in lines
+    assert (
+        'ppt_parser_stage_duration_seconds_bucket{stage="build",status="ok",le="+Inf"} 1'
+        in lines
+    )
+    assert (
+        'ppt_parser_stage_duration_seconds_count{stage="parse",status="ok"} 2' in lines
+    )
+    assert (
+        'ppt_parser_stage_duration_seconds_count{stage="decode",status="error"} 1'
+        in lines
+    )
+    assert 'ppt_parser_parses_total{format="json",status="ok"} 2' in lines
+    assert 'ppt_parser_parses_total{format="json",status="error"} 1' in lines
+    assert 'ppt_parser_cache_hits_total{format="json"} 1' in lines
+    input_bytes = 2 * len(input_json.encode("utf-8")) + 2
+    assert f'ppt_parser_input_bytes_total{{format="json"}} {input_bytes}' in lines
+    slides = 2 * len(SAMPLE_DOCUMENT["slides"])
+    assert f'ppt_parser_slides_total{{format="json"}} {slides}' in lines
+
+    # 直方图的桶是累计的，且每个指标都有HELP和TYPE
+    buckets = [
+        int(line.rsplit(" ", 1)[1])
+        for line in lines
+        if line.startswith(
+            'ppt_parser_stage_duration_seconds_bucket{stage="parse",status="ok"'
+        )
+    ]
+    assert buckets == sorted(buckets) and buckets[-1] == 2
+    assert sum(line.startswith("# TYPE") for line in lines) == 6
+
+    exporter.reset()
+    assert "ppt_parser_parses_total{" not in exporter.render()
+
+
+@pytest.mark.asyncio
+async def test_unregistered_format_label(engine_factory, input_json):
+    """测试未注册的格式类型统一记为unknown，标签取值不随输入增长"""
+    exporter = PrometheusExporter()
+    engine = engine_factory(instrumentation=exporter)
+    engine.MAX_INPUT_SIZE = 100
+    for index in range(5):
+        with pytest.raises(ParseError):
+            await engine.parse("{}", format_type=f"format-{index}")
+    # 输入大小检查在查找插件之前失败
+    with pytest.raises(ParseError):
+        await engine.parse(input_json, format_type="other")
+    with pytest.raises(ParseError):
+        await engine.parse(input_json)
+
+    text = exporter.render()
+    assert f'ppt_parser_parses_total{{format="{UNKNOWN_FORMAT}",status="error"}} 6' in (
+        text.splitlines()
+    )
+    assert 'ppt_parser_parses_total{format="json",status="error"} 1' in text
+    assert "format-" not in text and '"other"' not in text
+
+
+def test_prometheus_exporter_labels_and_buckets():
+    """测试标签值转义和桶参数检查"""
+    exporter = PrometheusExporter(namespace="app")
+    exporter.record_parse(ParseStats(format_type='a"b\\c\n'))
+    assert 'app_parses_total{format="a\\"b\\\\c\\n",status="ok"} 1' in exporter.render()
+
+    with pytest.raises(ValueError):
+        PrometheusExporter(buckets=[])
+    with pytest.raises(ValueError):
+        PrometheusExporter(buckets=[1, 0.5])
@@ -0,0 +1,205 @@
+"""
+JSON解码后端一致性测试模块
+对当前环境中每个可用的后端运行相同的用例，结果和错误都必须与标准库一致
+"""
+
+import json
+import pickle
+import pytest
+from ppt_parser.plugins import JSONPlugin
+from ppt_parser.plugins.json_backends import (
+    available_backends,
+    get_backend,
+    stdlib_loads,
+)
+from ppt_parser.exceptions import ParseError
+
+BACKENDS = available_backends()
+
+INPUT_TYPES = {
+    "str": lambda text: text,
+    "bytes": lambda text: text.encode("utf-8", "surrogatepass"),
+    "memoryview": lambda text: memoryview(text.encode("utf-8", "surrogatepass")),
+}
+
+# 解码成功的输入，覆盖第三方解码器与标准库行为不同的情况
+VALID_DOCUMENTS = [
+    '{"title": "测试", "slides": []}',
+    ' {"a" : [ ] , "b": {}} ',
+    '{"a": 1, "a": 2}',
+    "[-0, -0.0, 0.1, 1E2, 1e-400, 1e400, -1e400]",
+    "[NaN, Infinity, -Infinity]",
+    "[9223372036854775807, 18446744073709551615, 18446744073709551616]",
+    "[-9223372036854775809, 123456789012345678901234567890]",
+    '"1234567890123456789012345"',
+    '"\\ud800 \\udfff \\ud83d\\ude00 \\u0000 \\/ \\u00e9"',
+    '"﻿"',
+    '{"emoji": "😀", "中文": "内容"}',
+]
+
+# 解码失败的输入
+INVALID_DOCUMENTS = [
+    "",
+    "   ",
+    '{"title": "测试", "slides": [',
+    "[1,]",
+    '{"a": 1}x',
+    '"\x01"',
+    "{'a': 1}",
+    "[1, 2",
+    "nul",
+]
+
+
+def outcome(loads, data, max_depth=None):
+    """解码结果的可比较形式：repr区分int/float、-0.0和NaN"""
+    try:
+        return "ok", repr(loads(data, max_depth))
+    except (json.JSONDecodeError, UnicodeDecodeError, RecursionError) as e:
+        return type(e).__name__, str(e)
+
+
+def nest(depth: int):
+    """生成指定层数的嵌套列表文本"""
+    return "[" * depth + "1" + "]" * depth
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    return get_backend(request.param)
+
+
+@pytest.mark.parametrize("input_type", INPUT_TYPES)
+@pytest.mark.parametrize("text", VALID_DOCUMENTS)
+def test_valid_documents(backend, text, input_type):
+    """测试解码结果与标准库完全相同"""
+    data = INPUT_TYPES[input_type](text)
+    expected = outcome(stdlib_loads, text)
+    assert expected[0] == "ok"
+    assert outcome(backend.loads, data) == expected
+    assert repr(json.loads(text)) == expected[1]
+
+
+@pytest.mark.parametrize("input_type", INPUT_TYPES)
+@pytest.mark.parametrize("text", INVALID_DOCUMENTS)
+def test_invalid_documents(backend, text, input_type):
+    """测试错误类型和错误信息与标准库完全相同"""
+    data = INPUT_TYPES[input_type](text)
+    expected = outcome(stdlib_loads, data)
+    assert expected[0] != "ok"
+    assert outcome(backend.loads, data) == expected
+
+
+@pytest.mark.parametrize("input_type", INPUT_TYPES)
+@pytest.mark.parametrize(
+    "text, max_depth",
+    [
+        (nest(10), 10),
+        (nest(11), 10),
+        ('{"a": {"b": [1, {"c": []}]}}', 4),
+        ('{"a": {"b": [1, {"c": [2]}]}}', 4),
+        ('{"a": "[[[[[[[[[[[["}', 1),
+        ("[" * 100000 + "]" * 100000, 10),
+        ('[[[[[[[[[[[[1, "', 10),
+    ],
+)
+def test_depth_limit(backend, text, max_depth, input_type):
+    """测试深度限制与标准库一致"""
+    data = INPUT_TYPES[input_type](text)
+    expected = outcome(stdlib_loads, data, max_depth)
+    assert outcome(backend.loads, data, max_depth) == expected
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"\xff\xfe{\x00}\x00",
+        '{"a": "测试"}'.encode("utf-16"),
+        '{"a": "测试"}'.encode("utf-16-le"),
+        '{"a": "测试"}'.encode("utf-32-be"),
+        b'\xef\xbb\xbf{"a": 1}',
+        b'{"a": "\xff"}',
+        b'{"a": "\xed\xa0\x80"}',
+    ],
+)
+def test_encodings(backend, data):
+    """测试非UTF-8编码、BOM和无效字节与标准库一致"""
+    assert outcome(backend.loads, data) == outcome(stdlib_loads, data)
+
+
+def test_bom_string(backend):
+    """测试以BOM开头的字符串与标准库一样报错（同样内容的bytes可以解码）"""
+    text = "\ufeff{}"
+    assert outcome(backend.loads, text) == outcome(stdlib_loads, text)
+    assert outcome(stdlib_loads, text)[0] == "JSONDecodeError"
+
+
+def test_large_buffer_long_number(backend):
+    """测试超过扫描块大小的输入中跨块的长数字"""
+    padding = " " * (1024 * 1024 - 10)
+    text = f"[{padding}123456789012345678901234567890]"
+    assert backend.loads(text.encode()) == [123456789012345678901234567890]
+    assert backend.loads(text) == [123456789012345678901234567890]
+
+
+def test_string_passed_through(backend, monkeypatch):
+    """测试字符串原样交给第三方解码器，孤立的代理字符交给标准库处理"""
+    if backend.name == "json":
+        pytest.skip("标准库后端没有快速路径")
+    inputs = []
+    decode = type(backend)._decode
+
+    def record(self, data):
+        inputs.append(data)
+        return decode(self, data)
+
+    monkeypatch.setattr(type(backend), "_decode", record)
+    text = '{"title": "测试", "slides": []}'
+    assert backend.loads(text) == json.loads(text)
+    assert inputs == [text] and inputs[0] is text
+
+    text = '["\ud800"]'
+    assert outcome(backend.loads, text) == outcome(stdlib_loads, text)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "text",
+    ['{"title": "测试", "slides": [', "[1, 2]", nest(20), '{"a": NaN}'],
+)
+async def test_plugin_errors_identical(text):
+    """测试插件在所有后端下给出相同的结果和错误信息"""
+    outcomes = set()
+    for name in BACKENDS:
+        plugin = JSONPlugin(backend=name)
+        try:
+            outcomes.add(repr(await plugin.parse(text)))
+        except ParseError as e:
+            outcomes.add(str(e))
+        outcomes.add(await plugin.validate_format(text))
+    # 结果（或错误信息）与validate_format的返回值各一个
+    assert len(outcomes) == 2
+
+
+def test_default_backend():
+    """测试默认使用可用的最快后端，标准库后端总是可用"""
+    assert BACKENDS[-1] == "json"
+    assert JSONPlugin().backend.name == BACKENDS[0]
+    assert JSONPlugin(backend="json").backend.name == "json"
+
+
+def test_unknown_backend():
+    """测试未知或未安装的后端"""
+    with pytest.raises(ValueError, match="未知"):
+        JSONPlugin(backend="yaml")
+    for name in ("orjson", "msgspec"):
+        if name not in BACKENDS:
+            with pytest.raises(ValueError, match="未安装"):
+                JSONPlugin(backend=name)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_plugin_pickle(name):
+    """测试插件连同后端可以序列化传给工作进程"""
+    plugin = pickle.loads(pickle.dumps(JSONPlugin(backend=name)))
+    assert plugin.backend.name == name
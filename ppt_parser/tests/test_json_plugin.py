@@ -0,0 +1,89 @@
+"""
+JSON插件测试模块
+测试JSON解析和嵌套深度限制
+"""
+
+import json
+import pytest
+from ppt_parser.plugins import JSONPlugin
+from ppt_parser.plugins.json_plugin import DepthLimitedJSONDecoder, check_json_depth
+from ppt_parser.exceptions import ParseError
+
+
+@pytest.fixture
+def json_plugin():
+    """创建JSON插件实例"""
+    return JSONPlugin()
+
+
+def nest(depth: int, leaf=1):
+    """生成指定层数的嵌套列表"""
+    value = leaf
+    for _ in range(depth):
+        value = [value]
+    return value
+
+
+@pytest.mark.parametrize("as_bytes", [False, True])
+@pytest.mark.parametrize(
+    "value, max_depth, allowed",
+    [
+        (1, 0, True),
+        ([], 0, True),
+        ([1], 0, False),
+        (nest(11), 10, False),
+        (nest(10), 10, True),
+        (nest(10, leaf=[]), 10, True),
+        (nest(10, leaf={}), 10, True),
+        (nest(10, leaf={"k": 1}), 10, False),
+        ({"a": {"b": [1, {"c": []}]}}, 4, True),
+        ({"a": {"b": [1, {"c": [2]}]}}, 4, False),
+    ],
+)
+def test_check_json_depth(value, max_depth, allowed, as_bytes):
+    """测试深度扫描与逐层检查的语义一致"""
+    text = json.dumps(value, indent=1)
+    data = text.encode("utf-8") if as_bytes else text
+    if allowed:
+        check_json_depth(data, max_depth)
+    else:
+        with pytest.raises(RecursionError):
+            check_json_depth(data, max_depth)
+
+
+def test_check_json_depth_ignores_brackets_in_strings():
+    """测试字符串中的括号和转义引号不影响深度"""
+    text = json.dumps({"a": '[[[[{{{{"\\"', "b": ["]]]}}}", "\\\\"]})
+    check_json_depth(text, 2)
+
+
+def test_check_json_depth_hostile_input():
+    """测试超深输入不会触发解释器的递归限制"""
+    text = "[" * 100000 + "]" * 100000
+    with pytest.raises(RecursionError):
+        check_json_depth(text, 10)
+
+
+def test_decoder_result_unchanged():
+    """测试解码器在深度范围内返回完整的解码结果"""
+    data = {"title": "测试", "slides": [{"elements": [{"content": nest(3)}]}]}
+    decoded = json.loads(json.dumps(data), cls=DepthLimitedJSONDecoder, max_depth=10)
+    assert decoded == data
+
+
+@pytest.mark.asyncio
+async def test_parse_too_deep(json_plugin):
+    """测试解析超过深度限制的输入"""
+    text = json.dumps({"title": "测试", "slides": nest(json_plugin.MAX_DEPTH)})
+    with pytest.raises(ParseError) as exc_info:
+        await json_plugin.parse(text)
+    assert "深度超过限制" in str(exc_info.value)
+    assert await json_plugin.validate_format(text) is False
+
+
+@pytest.mark.asyncio
+async def test_parse_syntax_error(json_plugin):
+    """测试格式无效的输入仍然报告JSON解析错误"""
+    with pytest.raises(ParseError) as exc_info:
+        await json_plugin.parse('{"title": "测试", "slides": [')
+    assert "JSON解析错误" in str(exc_info.value)
@@ -0,0 +1,82 @@
+"""
+延迟导入测试模块
+测试包的导出名称按需导入，以及模型验证器在首次使用时才生成
+"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+import pytest
+import ppt_parser.core
+import ppt_parser.exceptions
+import ppt_parser.plugins
+import ppt_parser.writer
+
+
+def run_isolated(source: str) -> str:
+    """在新的解释器进程中运行代码，返回标准输出"""
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(source)],
+        cwd=Path(__file__).parents[2],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_package_import_does_not_load_submodules():
+    """测试只导入包时不加载子模块和pydantic"""
+    output = run_isolated(
+        """
+        import sys
+        import ppt_parser.core, ppt_parser.exceptions, ppt_parser.plugins
+        import ppt_parser.writer
+        print(sorted(
+            name for name in sys.modules
+            if name == "pydantic" or name.count(".") == 2
+        ))
+        """
+    )
+    assert output == "[]"
+
+
+def test_models_build_schema_on_first_use():
+    """测试导入引擎时不生成模型验证器，第一次解析时生成"""
+    output = run_isolated(
+        """
+        import asyncio
+        from ppt_parser.core import ParserEngine
+        from ppt_parser.models.document import Document
+        print(Document.__pydantic_complete__)
+        document = asyncio.run(ParserEngine().parse(
+            '{"title": "t", "slides": [{"title": "s", "elements": []}]}'
+        ))
+        print(Document.__pydantic_complete__, document.slides[0].title)
+        """
+    )
+    assert output.splitlines()[-2:] == ["False", "True s"]
+
+
+@pytest.mark.parametrize(
+    "package",
+    [ppt_parser.core, ppt_parser.exceptions, ppt_parser.plugins, ppt_parser.writer],
+)
+def test_exports_resolve(package):
+    """测试所有导出名称都可以访问，并出现在 dir() 中"""
+    for name in package.__all__:
+        value = getattr(package, name)
+        assert value.__name__ == name
+        assert name in dir(package)
+
+
+def test_unknown_attribute():
+    """测试访问不存在的名称时抛出AttributeError"""
+    with pytest.raises(AttributeError, match="NotExported"):
+        _ = ppt_parser.core.NotExported
+
+    with pytest.raises(ImportError):
+        from ppt_parser.exceptions import (  # noqa: F401 pylint: disable=no-name-in-module,unused-import
+            NotExported,
+        )
@@ -0,0 +1,198 @@
+"""
+日志配置测试模块
+测试队列模式、丢弃策略、采样和解析日志的结构化字段
+"""
+
+import json
+import logging
+import queue
+import threading
+import pytest
+from ppt_parser.core import parser_engine as parser_engine_module
+from ppt_parser.core.logger import (
+    BoundedQueueHandler,
+    CoreLogger,
+    SamplingFilter,
+    StructuredFormatter,
+)
+from ppt_parser.tests import SAMPLE_DOCUMENT
+
+
+class ListHandler(logging.Handler):
+    """保存日志记录和处理线程的处理器"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = set()
+        self.setFormatter(StructuredFormatter("%(message)s"))
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.add(threading.current_thread())
+
+    @property
+    def messages(self):
+        return [self.format(record) for record in self.records]
+
+
+@pytest.fixture(autouse=True)
+def restore_logger():
+    """测试结束后恢复默认的同步模式"""
+    yield
+    CoreLogger.configure()
+
+
+def make_record(message, *args, level=logging.INFO, lineno=1):
+    """创建日志记录"""
+    return logging.LogRecord("ppt_parser", level, __file__, lineno, message, args, None)
+
+
+def test_queue_mode_writes_on_background_thread():
+    """测试队列模式下由后台线程格式化和写入，停止时写完剩余记录"""
+    handler = ListHandler()
+    logger = CoreLogger.configure(mode="queue", handlers=[handler])
+    assert CoreLogger.get_logger() is logger
+
+    values = ["原值"]
+    logger.info("值: %s", values)
+    values[0] = "修改后"
+    logger.debug("不输出")
+    CoreLogger.shutdown()
+
+    assert handler.messages == ["值: ['原值']"]
+    assert threading.current_thread() not in handler.threads
+    assert logger.handlers == []
+
+
+def test_sync_mode_uses_given_handlers():
+    """测试同步模式在调用线程中写入"""
+    handler = ListHandler()
+    logger = CoreLogger.configure(handlers=[handler], level=logging.DEBUG)
+    logger.debug("调试 %d", 1)
+    assert handler.messages == ["调试 1"]
+    assert handler.threads == {threading.current_thread()}
+    assert CoreLogger.dropped() == 0
+
+
+@pytest.mark.parametrize(
+    "policy, kept", [("drop_new", ["0", "1"]), ("drop_oldest", ["2", "3"])]
+)
+def test_drop_policy(policy, kept):
+    """测试队列已满时按策略丢弃记录"""
+    handler = BoundedQueueHandler(queue.Queue(2), policy)
+    for index in range(4):
+        handler.handle(make_record(str(index)))
+
+    assert handler.dropped == 2
+    assert [handler.queue.get_nowait().msg for _ in range(2)] == kept
+
+
+def test_full_queue_shutdown():
+    """测试队列已满时仍能停止后台线程，且不阻塞记录日志的线程"""
+    release = threading.Event()
+
+    class SlowHandler(ListHandler):
+        def emit(self, record):
+            release.wait(5)
+            super().emit(record)
+
+    handler = SlowHandler()
+    logger = CoreLogger.configure(mode="queue", handlers=[handler], queue_size=2)
+    for index in range(10):
+        logger.info("记录 %d", index)
+    assert CoreLogger.dropped() >= 7
+    release.set()
+    CoreLogger.shutdown()
+    assert 1 <= len(handler.records) <= 3
+
+
+def test_sampling_filter():
+    """测试按调用位置对INFO记录采样，WARNING记录全部保留"""
+    sampling = SamplingFilter(3)
+    kept = [sampling.filter(make_record("高频 %d", index)) for index in range(7)]
+    assert kept == [True, False, False, True, False, False, True]
+    assert sampling.filter(make_record("低频", lineno=2))
+    assert all(
+        sampling.filter(make_record("警告", level=logging.WARNING)) for _ in range(5)
+    )
+
+    # 同一位置预先格式化的不同消息共用一个计数
+    sampling = SamplingFilter(2)
+    kept = [sampling.filter(make_record(f"第{index}次")) for index in range(1000)]
+    assert kept.count(True) == 500
+    assert len(sampling._counts) == 1
+    with pytest.raises(ValueError):
+        SamplingFilter(0)
+
+
+def test_configure_sampling_and_validation():
+    """测试配置采样以及无效参数不会改变现有配置"""
+    handler = ListHandler()
+    logger = CoreLogger.configure(handlers=[handler], info_sample_every=2)
+    for index in range(4):
+        logger.info("第%d次", index)
+    logger.error("错误")
+    assert handler.messages == ["第0次", "第2次", "错误"]
+
+    for options in (
+        {"mode": "async"},
+        {"queue_size": 0},
+        {"info_sample_every": 0},
+        {"mode": "queue", "drop_policy": "block"},
+    ):
+        with pytest.raises(ValueError):
+            CoreLogger.configure(**options)
+    assert logger.handlers == [handler]
+
+    # 重新配置后同一个处理器不再采样
+    CoreLogger.configure(handlers=[handler])
+    logger.info("第%d次", 4)
+    logger.info("第%d次", 5)
+    assert handler.messages[-2:] == ["第4次", "第5次"]
+
+
+@pytest.mark.asyncio
+async def test_parse_log_fields(parser_engine):
+    """测试解析完成的日志带有编号、耗时和大小字段"""
+    handler = ListHandler()
+    CoreLogger.configure(handlers=[handler])
+    input_json = json.dumps(SAMPLE_DOCUMENT, ensure_ascii=False)
+    await parser_engine.parse(input_json)
+    await parser_engine.parse(input_json)
+
+    start, done = handler.records[0], handler.records[1]
+    assert start.parse_id == done.parse_id
+    assert handler.records[2].parse_id == done.parse_id + 1
+    assert done.format_type == "json"
+    assert done.duration_ms >= 0
+    assert done.input_bytes == len(input_json.encode("utf-8"))
+    assert done.slides == len(SAMPLE_DOCUMENT["slides"])
+    assert done.elements == sum(
+        len(slide["elements"]) for slide in SAMPLE_DOCUMENT["slides"]
+    )
+    assert handler.messages[1].startswith(
+        f"文档解析完成 parse_id={done.parse_id} format_type=json duration_ms="
+    )
+
+
+@pytest.mark.asyncio
+async def test_disabled_info_skips_fields(parser_engine):
+    """测试INFO级别未启用时不记录解析日志"""
+    handler = ListHandler()
+    CoreLogger.configure(handlers=[handler], level=logging.WARNING)
+    await parser_engine.parse(json.dumps(SAMPLE_DOCUMENT))
+    assert not handler.records
+
+
+@pytest.mark.asyncio
+async def test_input_bytes_counted_in_chunks(parser_engine, monkeypatch):
+    """测试非ASCII输入的大小分段计算"""
+    # 每段7个字符，输入跨越多个分段
+    monkeypatch.setattr(parser_engine_module, "_SIZE_STEP", 7)
+    handler = ListHandler()
+    CoreLogger.configure(handlers=[handler])
+    input_json = json.dumps({**SAMPLE_DOCUMENT, "title": "标题" * 50}, ensure_ascii=False)
+    await parser_engine.parse(input_json)
+
+    assert handler.records[1].input_bytes == len(input_json.encode("utf-8"))
@@ -0,0 +1,107 @@
+"""
+图片媒体缓存测试模块
+测试图片按内容去重，以及缓存的失效和字节预算
+"""
+
+import io
+import os
+import zipfile
+import pytest
+from ppt_parser.models.document import Document, Element, Position, Slide
+from ppt_parser.writer import MediaCache, PPTXWriter
+from ppt_parser.writer.media import default_media_cache
+
+
+def image_slide(*paths):
+    """引用给定图片的幻灯片"""
+    return Slide(
+        title="页",
+        elements=[
+            Element(type="image", content=path, position=Position(x=0, y=0))
+            for path in paths
+        ],
+    )
+
+
+def save(slides, media_root, cache):
+    """写出幻灯片并返回压缩包内容"""
+    buffer = io.BytesIO()
+    with PPTXWriter(buffer, media_root=media_root, media_cache=cache) as writer:
+        writer.add_slides(slides)
+    with zipfile.ZipFile(buffer) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+@pytest.fixture
+def images(tmp_path):
+    """两个内容相同、路径不同的图片和一个不同的图片"""
+    (tmp_path / "logo.png").write_bytes(b"logo" * 100)
+    (tmp_path / "copy").mkdir()
+    (tmp_path / "copy" / "logo.png").write_bytes(b"logo" * 100)
+    (tmp_path / "photo.jpg").write_bytes(b"photo" * 100)
+    return tmp_path
+
+
+def test_identical_images_are_stored_once(images):
+    """测试内容相同的图片在包中只保存一份，所有关系指向同一部件"""
+    slides = [image_slide("logo.png", "photo.jpg") for _ in range(3)]
+    slides.append(image_slide(str(images / "copy" / "logo.png")))
+    package = save(slides, images, MediaCache())
+
+    media = sorted(name for name in package if name.startswith("ppt/media/"))
+    assert media == ["ppt/media/image1.png", "ppt/media/image2.jpg"]
+    assert package["ppt/media/image1.png"] == b"logo" * 100
+    for number in range(1, 5):
+        rels = package[f"ppt/slides/_rels/slide{number}.xml.rels"].decode()
+        assert 'Target="../media/image1.png"' in rels
+    assert b'Extension="jpg"' in package["[Content_Types].xml"]
+
+
+def test_cache_reused_across_saves(images):
+    """测试多次保存时不重复读取和压缩相同的图片"""
+    cache = MediaCache()
+    first = save([image_slide("logo.png", "photo.jpg")], images, cache)
+    assert cache.stats.misses == 2
+    second = save([image_slide("photo.jpg", "logo.png")], images, cache)
+    assert cache.stats.hits == 2
+    assert len(cache) == 2
+    assert first["ppt/media/image1.png"] == second["ppt/media/image2.png"]
+
+    # 文件修改后重新读取
+    (images / "logo.png").write_bytes(b"new logo" * 100)
+    os.utime(images / "logo.png", ns=(0, 0))
+    third = save([image_slide("logo.png")], images, cache)
+    assert third["ppt/media/image1.png"] == b"new logo" * 100
+    assert cache.stats.misses == 3
+
+    cache.clear()
+    assert len(cache) == 0 and cache.stats.size_bytes == 0
+
+
+def test_cache_byte_budget(tmp_path):
+    """测试缓存按字节预算淘汰，超过单条上限的图片直接从文件写入"""
+    for index in range(5):
+        (tmp_path / f"{index}.png").write_bytes(os.urandom(1000))
+    (tmp_path / "large.png").write_bytes(os.urandom(5000))
+
+    cache = MediaCache(max_bytes=2500, max_entry_bytes=2000)
+    names = [f"{index}.png" for index in range(5)] + ["large.png"]
+    package = save([image_slide(*names)], tmp_path, cache)
+
+    assert cache.stats.size_bytes <= 2500
+    assert cache.stats.evictions >= 3
+    assert package["ppt/media/image6.png"] == (tmp_path / "large.png").read_bytes()
+
+    with pytest.raises(ValueError):
+        MediaCache(max_bytes=0)
+
+
+def test_document_save_uses_shared_cache(images):
+    """测试默认使用进程级共享缓存"""
+    document = Document(title="测试", slides=[image_slide("logo.png")])
+    first, second = io.BytesIO(), io.BytesIO()
+    document.save(first, media_root=images)
+    hits = default_media_cache.stats.hits
+    document.save(second, media_root=images)
+    assert default_media_cache.stats.hits == hits + 1
+    assert first.getvalue() == second.getvalue()
@@ -0,0 +1,213 @@
+"""
+MessagePack插件测试模块
+测试内置编解码器、深度和长度限制，以及通过引擎解析MessagePack输入
+"""
+
+import json
+import struct
+import pytest
+from ppt_parser.core import ParserEngine
+from ppt_parser.exceptions import ParseError
+from ppt_parser.plugins import JSONPlugin, MessagePackPlugin
+from ppt_parser.plugins.msgpack_codec import (
+    HAS_MSGPACK,
+    MessagePackError,
+    available_backends,
+    packb,
+    unpackb,
+)
+from . import SAMPLE_DOCUMENT
+
+BACKENDS = available_backends()
+
+
+def nest(depth: int, leaf=1):
+    """生成指定层数的嵌套列表"""
+    value = leaf
+    for _ in range(depth):
+        value = [value]
+    return value
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "value, encoded",
+    [
+        (None, b"\xc0"),
+        (True, b"\xc3"),
+        (False, b"\xc2"),
+        (0, b"\x00"),
+        (127, b"\x7f"),
+        (128, b"\xcc\x80"),
+        (256, b"\xcd\x01\x00"),
+        (65536, b"\xce\x00\x01\x00\x00"),
+        (2**32, b"\xcf\x00\x00\x00\x01\x00\x00\x00\x00"),
+        (-1, b"\xff"),
+        (-32, b"\xe0"),
+        (-33, b"\xd0\xdf"),
+        (-129, b"\xd1\xff\x7f"),
+        (-(2**31) - 1, b"\xd3\xff\xff\xff\xff\x7f\xff\xff\xff"),
+        (1.5, b"\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00"),
+        ("", b"\xa0"),
+        ("a", b"\xa1a"),
+        ("a" * 32, b"\xd9\x20" + b"a" * 32),
+        ("a" * 256, b"\xda\x01\x00" + b"a" * 256),
+        (b"\x00", b"\xc4\x01\x00"),
+        ([], b"\x90"),
+        ([1, 2], b"\x92\x01\x02"),
+        ((1, 2), b"\x92\x01\x02"),
+        (list(range(16)), b"\xdc\x00\x10" + bytes(range(16))),
+        ({}, b"\x80"),
+        ({"a": 1}, b"\x81\xa1a\x01"),
+    ],
+)
+def test_packb_spec(value, encoded):
+    """测试编码结果符合MessagePack规范的最短编码"""
+    assert packb(value) == encoded
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        SAMPLE_DOCUMENT,
+        {"中文": "内容", "emoji": "😀", "nested": {"list": [1, -1, 0.25, None]}},
+        [2**64 - 1, -(2**63), 2**31, -(2**15), 3.141592653589793, -0.0],
+        ["x" * 70000, b"\xff" * 300, list(range(70000))],
+        {f"key{index}": index for index in range(70000)},
+    ],
+)
+def test_round_trip(backend, value):
+    """测试编码后解码得到相同的数据"""
+    assert unpackb(packb(value), backend=backend) == value
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (b"\xca" + struct.pack(">f", 1.5), 1.5),
+        (b"\xd9\x01a", "a"),
+        (b"\xde\x00\x01\xa1a\x01", {"a": 1}),
+        (b"\xdd\x00\x00\x00\x01\x01", [1]),
+        (b"\xd2\xff\xff\xff\xff", -1),
+        (b"\xcf\xff\xff\xff\xff\xff\xff\xff\xff", 2**64 - 1),
+    ],
+)
+def test_unpack_non_minimal_encodings(backend, data, expected):
+    """测试解码其他编码器可能生成的非最短编码"""
+    assert unpackb(data, backend=backend) == expected
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        (b"", "不完整"),
+        (b"\x92\x01", "不完整"),
+        (b"\xa5abc", "不完整"),
+        (b"\xcd\x01", "不完整"),
+        (b"\xdd\xff\xff\xff\xff", "不完整"),
+        (b"\xdf\xff\xff\xff\xff\x01", "不完整"),
+        (b"\xc6\xff\xff\xff\xff", "不完整"),
+        (b"\x01\x02", "多余的字节"),
+        (b"\xc1", "0xc1"),
+        (b"\xd4\x01\x00", "扩展类型"),
+        (b"\xd6\xff\x00\x00\x00\x00", "扩展类型"),
+        (b"\x81\x01\x01", "键必须是字符串"),
+        (b"\xa2\xff\xfe", "UTF-8"),
+    ],
+)
+def test_invalid_data(backend, data, message):
+    """测试无效数据，声明的长度超过输入大小时不会预先分配内存"""
+    with pytest.raises(MessagePackError, match=message):
+        unpackb(data, backend=backend)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "value",
+    [
+        nest(10),
+        nest(11),
+        nest(10, leaf=[]),
+        nest(10, leaf={}),
+        nest(10, leaf={"k": 1}),
+        {"a": {"b": [1, {"c": []}]}},
+        nest(200),
+    ],
+)
+async def test_depth_limit_matches_json(backend, value):
+    """测试深度限制与JSONPlugin相同"""
+    document = {"title": "测试", "slides": value}
+    json_valid = await JSONPlugin().validate_format(json.dumps(document))
+    plugin = MessagePackPlugin(backend=backend)
+    assert await plugin.validate_format(packb(document)) is json_valid
+    if not json_valid:
+        with pytest.raises(ParseError, match="深度超过限制"):
+            await plugin.parse(packb(document))
+
+
+@pytest.mark.asyncio
+async def test_parse_errors():
+    """测试插件把解码错误转换为ParseError"""
+    plugin = MessagePackPlugin()
+    with pytest.raises(ParseError, match="字节数据"):
+        await plugin.parse(json.dumps(SAMPLE_DOCUMENT))
+    with pytest.raises(ParseError, match="根节点必须是映射"):
+        await plugin.parse(packb([1, 2]))
+    with pytest.raises(ParseError, match="MessagePack解析错误"):
+        await plugin.parse(packb(SAMPLE_DOCUMENT)[:-1])
+    assert await plugin.validate_format(b"\xc1") is False
+
+    # 融合解析模式不在解码时检查深度，超深的输入仍然不会导致崩溃
+    with pytest.raises(ParseError, match="深度超过限制"):
+        await plugin.decode(b"\x91" * 100000 + b"\x01")
+
+
+def test_unknown_backend():
+    """测试未知或未安装的后端"""
+    with pytest.raises(ValueError):
+        MessagePackPlugin(backend="cbor")
+    if not HAS_MSGPACK:
+        with pytest.raises(ValueError):
+            MessagePackPlugin(backend="msgpack")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fused", [False, True])
+async def test_engine_parse(fused, tmp_path):
+    """测试引擎解析MessagePack输入的结果与JSON相同"""
+    engine = ParserEngine(fused=fused)
+    expected = await engine.parse(json.dumps(SAMPLE_DOCUMENT))
+    data = packb(SAMPLE_DOCUMENT)
+
+    assert await engine.parse(data, format_type="msgpack") == expected
+    assert await engine.parse_bytes(memoryview(data), "msgpack") == expected
+
+    path = tmp_path / "deck.msgpack"
+    path.write_bytes(data)
+    assert await engine.parse_file(path, format_type="msgpack") == expected
+
+    with pytest.raises(ParseError):
+        await engine.parse(packb({"title": "测试", "slides": [1]}), "msgpack")
+
+
+@pytest.mark.asyncio
+async def test_engine_size_limit(monkeypatch):
+    """测试引擎的输入大小限制同样作用于MessagePack输入"""
+    engine = ParserEngine()
+    data = packb(SAMPLE_DOCUMENT)
+    monkeypatch.setattr(ParserEngine, "MAX_INPUT_SIZE", len(data) - 1)
+    with pytest.raises(ParseError, match="大小限制"):
+        await engine.parse(data, format_type="msgpack")
+
+
+@pytest.mark.skipif(not HAS_MSGPACK, reason="未安装msgpack")
+def test_msgpack_library_interop():
+    """测试内置编码器与msgpack库的编码结果相同"""
+    import msgpack
+
+    value = {"title": "测试", "values": [1, -1, 2**40, 0.5, None, True, "x" * 40]}
+    assert packb(value) == msgpack.packb(value, use_bin_type=True)
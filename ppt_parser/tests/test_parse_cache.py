@@ -0,0 +1,215 @@
+"""
+解析缓存测试模块
+测试缓存命中、LRU淘汰、文档隔离和磁盘持久化
+"""
+
+import json
+import pickle
+import threading
+import pytest
+from ppt_parser.core import ParseCache, MemoryCacheBackend
+from ppt_parser.core import parse_cache as parse_cache_module
+from ppt_parser.core import ChartDataProcessor, DiskCacheBackend
+from ppt_parser.exceptions import BuildDocumentError, ValidationError
+from ppt_parser.models.document import Document
+from ppt_parser.tests import SAMPLE_DOCUMENT
+
+
+@pytest.fixture
+def input_json():
+    """示例文档的JSON字符串"""
+    return json.dumps(SAMPLE_DOCUMENT)
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_returns_independent_copies(engine_factory, input_json):
+    """测试命中时返回互不共享的文档副本"""
+    cache = ParseCache()
+    engine = engine_factory(cache=cache)
+
+    first = await engine.parse(input_json)
+    first.slides[0].elements[0].content = "已修改"
+    second = await engine.parse(input_json)
+    third = await engine.parse(input_json)
+
+    assert second.slides[0].elements[0].content == "Hello World"
+    assert second == third
+    assert second is not third
+    assert second.slides[0] is not third.slides[0]
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.entries) == (2, 1, 1)
+    assert stats.hit_rate == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_cache_key_includes_format_type(input_json):
+    """测试缓存键区分格式类型"""
+    assert ParseCache.make_key(input_json, "json") != ParseCache.make_key(
+        input_json, "yaml"
+    )
+    assert ParseCache.make_key(input_json, "json") == ParseCache.make_key(
+        input_json.encode("utf-8"), "json"
+    )
+
+
+def test_cache_key_hashes_in_chunks(monkeypatch):
+    """测试字符串分段计入哈希，结果与整体编码的字节数据相同"""
+    text = json.dumps({**SAMPLE_DOCUMENT, "title": "标题" * 20}, ensure_ascii=False)
+    expected = ParseCache.make_key(text.encode("utf-8"), "json")
+    monkeypatch.setattr(parse_cache_module, "_HASH_STEP", 7)
+    assert ParseCache.make_key(text, "json") == expected
+    assert ParseCache.make_key(memoryview(text.encode("utf-8")), "json") == expected
+
+
+@pytest.mark.asyncio
+async def test_lone_surrogate_input(engine_factory):
+    """测试含有单独代理字符的输入使用缓存时与不使用缓存时报告相同的错误"""
+    input_json = '{"title": "\ud800", "slides": []}'
+    for cache in (None, ParseCache()):
+        with pytest.raises(BuildDocumentError):
+            await engine_factory(cache=cache).parse(input_json)
+
+
+def test_stats_from_threads():
+    """测试多个线程同时读写时统计信息不丢失"""
+    cache = ParseCache()
+    document = Document(title="测试", slides=[])
+    cache.put("hit", document)
+
+    def worker():
+        for _ in range(200):
+            cache.get("hit")
+            cache.get("miss")
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (cache.stats.hits, cache.stats.misses) == (800, 800)
+
+
+@pytest.mark.asyncio
+async def test_cache_skips_failures(engine_factory):
+    """测试解析失败的结果不会被缓存"""
+    cache = ParseCache()
+    engine = engine_factory(cache=cache)
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            await engine.parse('{"title": " ", "slides": []}')
+    assert cache.stats.entries == 0
+    assert cache.stats.misses == 2
+
+
+def test_memory_backend_lru_eviction():
+    """测试按字节预算的LRU淘汰"""
+    backend = MemoryCacheBackend(max_bytes=30)
+    assert backend.put("a", b"x" * 10) == 0
+    assert backend.put("b", b"x" * 10) == 0
+    assert backend.put("c", b"x" * 10) == 0
+    backend.get("a")
+
+    assert backend.put("d", b"x" * 10) == 1
+    assert backend.get("b") is None
+    assert backend.get("a") is not None
+    assert backend.size_bytes == 30
+
+    # 超出预算的单个条目不缓存
+    assert backend.put("e", b"x" * 31) == 0
+    assert backend.get("e") is None
+
+
+def test_cache_eviction_stats():
+    """测试淘汰计数"""
+    document = {"title": "测试", "slides": []}
+    cache = ParseCache(max_bytes=10 * 1024)
+    for index in range(50):
+        cache.put(str(index), Document(**document, metadata={"i": "x" * 500}))
+    stats = cache.stats
+    assert stats.evictions > 0
+    assert stats.entries + stats.evictions == 50
+    assert stats.size_bytes <= 10 * 1024
+
+
+@pytest.mark.asyncio
+async def test_disk_backend_survives_restart(engine_factory, tmp_path, input_json):
+    """测试磁盘缓存在重新创建后仍然有效"""
+    engine = engine_factory(
+        cache=ParseCache(backend=DiskCacheBackend(tmp_path, 1 << 20))
+    )
+    expected = await engine.parse(input_json)
+
+    cache = ParseCache(backend=DiskCacheBackend(tmp_path, 1 << 20))
+    document = await engine_factory(cache=cache).parse(input_json)
+
+    assert document == expected
+    assert cache.stats.hits == 1
+
+
+def test_disk_backend_lru_order_restored(tmp_path):
+    """测试磁盘缓存重启后按最近使用顺序淘汰"""
+    backend = DiskCacheBackend(tmp_path, max_bytes=30)
+    for key in ("a", "b", "c"):
+        backend.put(key, b"x" * 10)
+    backend.get("a")
+
+    restarted = DiskCacheBackend(tmp_path, max_bytes=30)
+    assert len(restarted) == 3
+    restarted.put("d", b"x" * 10)
+    assert restarted.get("b") is None
+    assert restarted.get("a") == b"x" * 10
+    assert len(list(tmp_path.glob("*" + DiskCacheBackend.SUFFIX))) == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_key_includes_engine_config(engine_factory, input_json):
+    """测试配置不同的引擎共用缓存时互不命中"""
+    cache = ParseCache()
+    await engine_factory(cache=cache).parse(input_json)
+    await engine_factory(cache=cache, fused=True).parse(input_json)
+    await engine_factory(cache=cache, build_mode="compiled").parse(input_json)
+    await engine_factory(cache=cache, chart_data=ChartDataProcessor()).parse(input_json)
+    assert cache.stats.hits == 0
+
+    await engine_factory(cache=cache, build_mode="compiled").parse(input_json)
+    assert cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_entries_are_not_unpickled(engine_factory, tmp_path, input_json):
+    """测试磁盘上被替换或损坏的条目按未命中处理，不会反序列化pickle数据"""
+    backend = DiskCacheBackend(tmp_path, 1 << 20)
+    engine = engine_factory(cache=ParseCache(backend=backend))
+    expected = await engine.parse(input_json)
+    [path] = tmp_path.glob("*" + DiskCacheBackend.SUFFIX)
+
+    marker = tmp_path / "executed"
+    path.write_bytes(pickle.dumps(Payload(str(marker))))
+    cache = ParseCache(backend=DiskCacheBackend(tmp_path, 1 << 20))
+    engine = engine_factory(cache=cache)
+    assert await engine.parse(input_json) == expected
+    assert not marker.exists()
+    assert (cache.stats.hits, cache.stats.misses) == (0, 1)
+
+    # 解析结果重新写入后可以命中
+    assert await engine.parse(input_json) == expected
+    assert cache.stats.hits == 1
+
+
+def test_unsupported_values_are_not_cached():
+    """测试快照无法保存的值不缓存"""
+    cache = ParseCache()
+    cache.put("key", Document(title="测试", slides=[], metadata={"data": {1, 2}}))
+    assert cache.stats.entries == 0
+    assert cache.get("key") is None
+
+
+class Payload:
+    """反序列化时创建文件的pickle数据"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return (open, (self.path, "w"))
@@ -0,0 +1,162 @@
+"""
+解析执行器测试模块
+测试在线程池和进程池中运行解析阶段
+"""
+
+import asyncio
+import json
+import threading
+from typing import Set
+import pytest
+from ppt_parser.core import ParserEngine, ParseExecutor
+from ppt_parser.core import ChartDataProcessor, FlyweightCache
+from ppt_parser.models.document import FrozenStyle
+from ppt_parser.plugins import JSONPlugin
+from ppt_parser.exceptions import ParseError, ValidationError, BuildDocumentError
+from ppt_parser.tests import SAMPLE_DOCUMENT
+
+
+class ThreadRecordingPlugin(JSONPlugin):
+    """记录解析所在线程的JSON插件"""
+
+    threads: Set[threading.Thread] = set()
+
+    async def parse(self, input_data):
+        self.threads.add(threading.get_ident())
+        return await super().parse(input_data)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+@pytest.mark.parametrize("fused", [False, True])
+async def test_executor_parse(engine_factory, kind, fused):
+    """测试执行器模式的解析结果与直接解析一致"""
+    input_json = json.dumps(SAMPLE_DOCUMENT)
+    expected = await engine_factory().parse(input_json)
+
+    async with ParseExecutor(kind, max_workers=2) as executor:
+        engine = engine_factory(executor=executor, fused=fused)
+        documents = await asyncio.gather(*(engine.parse(input_json) for _ in range(4)))
+
+    assert all(document == expected for document in documents)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_executor_error_types(engine_factory, kind):
+    """测试工作者中的异常类型和详细信息保持不变"""
+    data = json.loads(json.dumps(SAMPLE_DOCUMENT))
+    async with ParseExecutor(kind, max_workers=1) as executor:
+        engine = engine_factory(executor=executor)
+
+        with pytest.raises(ParseError):
+            await engine.parse("{invalid json")
+
+        data["title"] = " "
+        with pytest.raises(ValidationError):
+            await engine.parse(json.dumps(data))
+
+        data["title"] = "测试"
+        data["slides"][0]["elements"][0]["type"] = "video"
+        with pytest.raises(BuildDocumentError):
+            await engine.parse(json.dumps(data))
+
+        engine.fused = True
+        with pytest.raises(BuildDocumentError) as exc_info:
+            await engine.parse(json.dumps(data))
+        assert exc_info.value.details["element_index"] == 0
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_off_loop():
+    """测试解析阶段不在事件循环线程中运行"""
+    ThreadRecordingPlugin.threads.clear()
+    async with ParseExecutor("thread", max_workers=2) as executor:
+        engine = ParserEngine(executor=executor)
+        engine.plugin_manager.register_plugin(ThreadRecordingPlugin())
+        await engine.parse(json.dumps(SAMPLE_DOCUMENT))
+
+    assert ThreadRecordingPlugin.threads
+    assert threading.get_ident() not in ThreadRecordingPlugin.threads
+
+
+@pytest.mark.asyncio
+async def test_executor_checks_before_offload(engine_factory):
+    """测试大小限制和格式检查在提交到工作者之前完成"""
+    executor = ParseExecutor("thread", max_workers=1)
+    try:
+        engine = engine_factory(executor=executor)
+        with pytest.raises(ParseError) as exc_info:
+            await engine.parse("{}", "unsupported")
+        assert "不支持的格式类型" in str(exc_info.value)
+    finally:
+        executor.shutdown()
+
+
+def test_executor_invalid_kind():
+    """测试无效的执行器类型"""
+    with pytest.raises(ValueError):
+        ParseExecutor("fiber")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_executor_parse_file(engine_factory, kind, tmp_path):
+    """测试执行器模式下解析映射到内存的文件"""
+    path = tmp_path / "deck.json"
+    path.write_text(json.dumps(SAMPLE_DOCUMENT), encoding="utf-8")
+    expected = await engine_factory().parse_file(path)
+
+    async with ParseExecutor(kind, max_workers=1) as executor:
+        document = await engine_factory(executor=executor).parse_file(path)
+
+    assert document == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_executor_uses_build_config(engine_factory, kind):
+    """测试工作者按调用方的构建器配置构建文档"""
+    data = json.loads(json.dumps(SAMPLE_DOCUMENT))
+    # 验证器不检查颜色格式，只有跳过模型验证的trusted模式能构建成功
+    data["slides"][0]["elements"][0]["style"] = {"color": "red"}
+    trusted_json = json.dumps(data)
+    data["slides"][0]["elements"][0]["style"] = {"color": "#FF0000"}
+    data["slides"][0]["elements"].append(
+        {
+            "type": "chart",
+            "content": {"type": "line", "data": list(range(10))},
+            "position": {"x": 0, "y": 0},
+        }
+    )
+    chart_json = json.dumps(data)
+    chart_options = {
+        "flyweights": FlyweightCache(),
+        "chart_data": ChartDataProcessor(max_points=3),
+    }
+
+    async with ParseExecutor(kind, max_workers=1) as executor:
+        engine = engine_factory(executor=executor)
+        with pytest.raises(BuildDocumentError):
+            await engine.parse(trusted_json)
+
+        engine = engine_factory(executor=executor, build_mode="trusted")
+        document = await engine.parse(trusted_json)
+        expected = await engine_factory(build_mode="trusted").parse(trusted_json)
+        assert document == expected
+        assert document.slides[0].elements[0].style.color == "red"
+
+        engine = engine_factory(executor=executor, **chart_options)
+        documents = [await engine.parse(chart_json) for _ in range(2)]
+        expected = await engine_factory(**chart_options).parse(chart_json)
+
+    for document in documents:
+        elements = document.slides[0].elements
+        assert type(elements[0].style) is FrozenStyle
+        assert list(elements[-1].content["data"]) == list(
+            expected.slides[0].elements[-1].content["data"]
+        )
+        assert len(elements[-1].content["data"]) == 3
+    if kind == "thread":
+        # 线程池直接使用调用方的缓存
+        assert chart_options["flyweights"].stats.hits > 0
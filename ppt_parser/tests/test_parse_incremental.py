@@ -0,0 +1,157 @@
+"""
+增量解析测试模块
+测试 ParserEngine.parse_incremental 对未变化幻灯片的复用
+"""
+
+import copy
+import json
+import pytest
+from ppt_parser.core import ChartDataProcessor, DocumentBuilder, ParserEngine
+from ppt_parser.core.incremental import slide_digest
+from ppt_parser.plugins import JSONPlugin
+from ppt_parser.exceptions import ValidationError
+
+
+@pytest.fixture
+def parser_engine():
+    """创建解析引擎实例，并统计构建的幻灯片数量"""
+    engine = ParserEngine()
+    engine.plugin_manager.register_plugin(JSONPlugin())
+    engine.built_slides = 0
+    build_slide = engine.document_builder.build_slide
+
+    async def counting_build_slide(slide_data):
+        engine.built_slides += 1
+        return await build_slide(slide_data)
+
+    engine.document_builder.build_slide = counting_build_slide
+    return engine
+
+
+@pytest.fixture
+def deck_data():
+    """包含多页幻灯片的文档数据"""
+    slides = []
+    for index in range(6):
+        slides.append(
+            {
+                "title": f"第{index + 1}页",
+                "elements": [
+                    {
+                        "type": "text",
+                        "content": f"内容{index}",
+                        "position": {"x": 10 * index, "y": 20},
+                        "style": {"font_size": 12 + index},
+                    }
+                ],
+            }
+        )
+    return {"title": "增量测试", "slides": slides, "metadata": {"author": "测试"}}
+
+
+@pytest.mark.asyncio
+async def test_incremental_reuses_unchanged_slides(parser_engine, deck_data):
+    """测试只重建修改过的幻灯片"""
+    first = await parser_engine.parse_incremental(json.dumps(deck_data))
+    assert first == await parser_engine.parse(json.dumps(deck_data))
+    assert parser_engine.built_slides == 6
+
+    changed = copy.deepcopy(deck_data)
+    changed["slides"][2]["elements"][0]["content"] = "已修改"
+    changed["title"] = "新标题"
+    second = await parser_engine.parse_incremental(json.dumps(changed), first)
+
+    assert parser_engine.built_slides == 7
+    assert second == await parser_engine.parse(json.dumps(changed))
+    for index in range(6):
+        if index == 2:
+            assert second.slides[index] is not first.slides[index]
+        else:
+            assert second.slides[index] is first.slides[index]
+    assert first.slides[2].elements[0].content == "内容2"
+
+
+@pytest.mark.asyncio
+async def test_incremental_reorder_and_duplicates(parser_engine, deck_data):
+    """测试调整顺序不重建，重复的幻灯片不共享同一对象"""
+    first = await parser_engine.parse_incremental(json.dumps(deck_data))
+
+    changed = copy.deepcopy(deck_data)
+    changed["slides"].reverse()
+    changed["slides"].append(copy.deepcopy(changed["slides"][0]))
+    second = await parser_engine.parse_incremental(json.dumps(changed), first)
+
+    assert parser_engine.built_slides == 7
+    assert [id(slide) for slide in second.slides[:6]] == [
+        id(slide) for slide in reversed(first.slides)
+    ]
+    assert second.slides[6] == second.slides[0]
+    assert second.slides[6] is not second.slides[0]
+
+
+@pytest.mark.asyncio
+async def test_incremental_previous_from_parse(parser_engine, deck_data):
+    """测试普通解析得到的文档不会被复用"""
+    previous = await parser_engine.parse(json.dumps(deck_data))
+    document = await parser_engine.parse_incremental(json.dumps(deck_data), previous)
+
+    assert document == previous
+    assert all(a is not b for a, b in zip(document.slides, previous.slides))
+
+
+@pytest.mark.asyncio
+async def test_incremental_validation_errors(parser_engine, deck_data):
+    """测试修改后的幻灯片和顶层字段仍然会被验证"""
+    first = await parser_engine.parse_incremental(json.dumps(deck_data))
+
+    changed = copy.deepcopy(deck_data)
+    del changed["slides"][4]["elements"][0]["position"]
+    with pytest.raises(ValidationError):
+        await parser_engine.parse_incremental(json.dumps(changed), first)
+
+    changed = copy.deepcopy(deck_data)
+    changed["title"] = " "
+    with pytest.raises(ValidationError):
+        await parser_engine.parse_incremental(json.dumps(changed), first)
+
+
+@pytest.mark.asyncio
+async def test_builder_config_change_rebuilds(parser_engine, deck_data):
+    """测试构建器配置或构建模式变化后不复用之前构建的幻灯片"""
+    deck_data["slides"][0]["elements"].append(
+        {
+            "type": "chart",
+            "content": {"type": "line", "data": list(range(50))},
+            "position": {"x": 0, "y": 0},
+        }
+    )
+    input_json = json.dumps(deck_data)
+    first = await parser_engine.parse_incremental(input_json)
+
+    parser_engine.document_builder = DocumentBuilder(
+        chart_data=ChartDataProcessor(max_points=10)
+    )
+    second = await parser_engine.parse_incremental(input_json, first)
+    assert not any(a is b for a, b in zip(first.slides, second.slides))
+    assert len(second.slides[0].elements[1].content["data"]) == 10
+
+    # 配置相同时照常复用
+    third = await parser_engine.parse_incremental(input_json, second)
+    assert all(a is b for a, b in zip(second.slides, third.slides))
+
+    parser_engine.document_builder = DocumentBuilder(
+        mode="compiled", chart_data=ChartDataProcessor(max_points=10)
+    )
+    fourth = await parser_engine.parse_incremental(input_json, third)
+    assert not any(a is b for a, b in zip(third.slides, fourth.slides))
+
+
+def test_slide_digest():
+    """测试摘要区分内容和值类型"""
+    slide = {"title": "a", "elements": [{"content": 1}]}
+    assert slide_digest(slide) == slide_digest(copy.deepcopy(slide))
+    assert slide_digest(slide) != slide_digest({"title": "b", "elements": []})
+    assert slide_digest(slide) != slide_digest(
+        {"title": "a", "elements": [{"content": True}]}
+    )
+    assert slide_digest(slide, ("loop",)) != slide_digest(slide, ("compiled",))
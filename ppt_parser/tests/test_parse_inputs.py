@@ -0,0 +1,131 @@
+"""
+缓冲区输入测试模块
+测试 ParserEngine.parse_bytes、parse_file 以及缓冲区输入的大小检查
+"""
+
+import json
+from typing import List
+import pytest
+from ppt_parser.core import ParserEngine, ParseCache
+from ppt_parser.plugins import JSONPlugin
+from ppt_parser.exceptions import ParseError, ValidationError
+from ppt_parser.tests import SAMPLE_DOCUMENT
+
+
+class TextOnlyPlugin(JSONPlugin):
+    """只接收字符串输入的插件"""
+
+    ACCEPTS_BUFFERS = False
+    received: List[str] = []
+
+    def get_format_type(self):
+        return "text-json"
+
+    async def parse(self, input_data):
+        self.received.append(type(input_data))
+        return await super().parse(input_data)
+
+
+@pytest.fixture
+def parser_engine():
+    """创建解析引擎实例"""
+    engine = ParserEngine()
+    engine.plugin_manager.register_plugin(JSONPlugin())
+    engine.plugin_manager.register_plugin(TextOnlyPlugin())
+    return engine
+
+
+@pytest.fixture
+def input_json():
+    """包含非ASCII字符的示例文档"""
+    return json.dumps(dict(SAMPLE_DOCUMENT, title="测试文档"), ensure_ascii=False)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fused", [False, True])
+async def test_parse_bytes_and_file(parser_engine, input_json, tmp_path, fused):
+    """测试字节数据和文件的解析结果与字符串一致"""
+    parser_engine.fused = fused
+    expected = await parser_engine.parse(input_json)
+    encoded = input_json.encode("utf-8")
+
+    assert await parser_engine.parse_bytes(encoded) == expected
+    assert await parser_engine.parse_bytes(bytearray(encoded)) == expected
+    assert await parser_engine.parse_bytes(memoryview(encoded)) == expected
+
+    path = tmp_path / "deck.json"
+    path.write_bytes(encoded)
+    assert await parser_engine.parse_file(path) == expected
+    assert await parser_engine.parse_file(str(path)) == expected
+
+
+@pytest.mark.asyncio
+async def test_parse_file_errors(parser_engine, input_json, tmp_path):
+    """测试文件解析失败时映射被正确释放"""
+    with pytest.raises(ParseError):
+        await parser_engine.parse_file(tmp_path / "missing.json")
+
+    path = tmp_path / "empty.json"
+    path.write_bytes(b"")
+    with pytest.raises(ParseError):
+        await parser_engine.parse_file(path)
+
+    data = json.loads(input_json)
+    data["title"] = " "
+    path.write_text(json.dumps(data), encoding="utf-8")
+    with pytest.raises(ValidationError):
+        await parser_engine.parse_file(path)
+
+    path.write_bytes(b'{"title": "\xff"}')
+    with pytest.raises(ParseError):
+        await parser_engine.parse_file(path)
+
+
+@pytest.mark.asyncio
+async def test_text_only_plugin_receives_str(parser_engine, input_json):
+    """测试不接收缓冲区的插件总是收到字符串"""
+    TextOnlyPlugin.received.clear()
+    expected = await parser_engine.parse(input_json)
+    document = await parser_engine.parse_bytes(
+        memoryview(input_json.encode("utf-8")), "text-json"
+    )
+
+    assert document == expected
+    assert TextOnlyPlugin.received == [str]
+
+    with pytest.raises(ParseError):
+        await parser_engine.parse_bytes(b"\xff\xfe", "text-json")
+
+
+@pytest.mark.asyncio
+async def test_input_size_limit(parser_engine, tmp_path):
+    """测试各种输入形式的大小检查"""
+    parser_engine.MAX_INPUT_SIZE = 100
+
+    # 字符数未超限但UTF-8编码后超限
+    with pytest.raises(ParseError) as exc_info:
+        await parser_engine.parse("测" * 40)
+    assert "超过大小限制" in str(exc_info.value)
+
+    with pytest.raises(ParseError) as exc_info:
+        await parser_engine.parse_bytes(b" " * 101)
+    assert "超过大小限制" in str(exc_info.value)
+
+    path = tmp_path / "large.json"
+    path.write_bytes(b" " * 101)
+    with pytest.raises(ParseError) as exc_info:
+        await parser_engine.parse_file(path)
+    assert "超过大小限制" in str(exc_info.value)
+
+    # 大小恰好在限制内的输入进入解析阶段
+    with pytest.raises(ParseError) as exc_info:
+        await parser_engine.parse("测" * 33)
+    assert "JSON解析错误" in str(exc_info.value)
+
+
+def test_cache_key_for_buffers(input_json):
+    """测试字符串和缓冲区输入的缓存键一致"""
+    encoded = input_json.encode("utf-8")
+    assert ParseCache.make_key(input_json, "json") == ParseCache.make_key(
+        memoryview(encoded), "json"
+    )
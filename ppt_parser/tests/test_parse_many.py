@@ -0,0 +1,108 @@
+"""
+批量解析测试模块
+测试 ParserEngine.parse_many 的并发控制和逐项结果
+"""
+
+import asyncio
+import json
+import pytest
+from ppt_parser.core import ParseExecutor, BatchResult
+from ppt_parser.core.batch import run_batch
+from ppt_parser.exceptions import ParseError, ValidationError
+from ppt_parser.tests import SAMPLE_DOCUMENT
+
+
+def make_inputs(count):
+    """生成标题不同的输入，序号为3的倍数的输入无效"""
+    inputs = []
+    for index in range(count):
+        if index % 3 == 0:
+            inputs.append('{"title": " ", "slides": []}')
+        else:
+            data = dict(SAMPLE_DOCUMENT, title=f"文档{index}")
+            inputs.append(json.dumps(data))
+    return inputs
+
+
+async def collect(results):
+    """收集异步迭代器的所有结果"""
+    return [result async for result in results]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [False, True])
+async def test_parse_many_results(engine_factory, ordered):
+    """测试逐项返回结果，单项失败不影响其他项"""
+    results = await collect(
+        engine_factory().parse_many(make_inputs(10), ordered=ordered, concurrency=4)
+    )
+
+    assert sorted(result.index for result in results) == list(range(10))
+    if ordered:
+        assert [result.index for result in results] == list(range(10))
+    for result in results:
+        assert isinstance(result, BatchResult)
+        if result.index % 3 == 0:
+            assert not result.ok
+            assert isinstance(result.error, ValidationError)
+        else:
+            assert result.ok
+            assert result.document.title == f"文档{result.index}"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_parse_many_with_executor(engine_factory, kind):
+    """测试使用执行器并行批量解析"""
+
+    async def inputs():
+        for input_data in make_inputs(12):
+            yield input_data
+
+    async with ParseExecutor(kind, max_workers=2) as executor:
+        engine = engine_factory(executor=executor)
+        results = await collect(engine.parse_many(inputs(), ordered=True))
+
+    assert [result.index for result in results] == list(range(12))
+    assert sum(result.ok for result in results) == 8
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [False, True])
+async def test_run_batch_bounded_concurrency(ordered):
+    """测试未返回的项目数量不超过并发上限"""
+    active = 0
+    peak = 0
+    consumed = []
+
+    async def parse(delay):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(delay)
+        active -= 1
+        if delay < 0.002:
+            raise ParseError("失败")
+        return delay
+
+    def inputs():
+        for index in range(20):
+            consumed.append(index)
+            yield 0.001 * (index % 5)
+
+    outstanding = 0
+    async for result in run_batch(parse, inputs(), concurrency=3, ordered=ordered):
+        outstanding = max(outstanding, len(consumed) - result.index)
+        assert isinstance(result.error, ParseError) or result.document is not None
+
+    assert peak <= 3
+    assert len(consumed) == 20
+    if ordered:
+        assert outstanding <= 3
+
+
+@pytest.mark.asyncio
+async def test_run_batch_invalid_concurrency():
+    """测试无效的并发数"""
+    with pytest.raises(ValueError):
+        await collect(run_batch(lambda x: x, [], concurrency=0))
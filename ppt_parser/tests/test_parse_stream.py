@@ -0,0 +1,247 @@
+"""
+流式解析测试模块
+测试 ParserEngine.parse_stream 和增量JSON读取器
+"""
+
+import io
+import json
+import threading
+import time
+import pytest
+from ppt_parser.core.stream_source import iter_chunks
+from ppt_parser.plugins import JSONPlugin
+from ppt_parser.plugins.json_stream import IncrementalSlideReader
+from ppt_parser.exceptions import ParseError, ValidationError
+from ppt_parser.models.document import Slide
+
+
+@pytest.fixture
+def deck_data():
+    """包含多页幻灯片的文档数据"""
+    slides = []
+    for index in range(5):
+        slides.append(
+            {
+                "title": f'第{index + 1}页 [\\"{{',
+                "elements": [
+                    {
+                        "type": "chart",
+                        "content": {"type": "bar", "data": [index, [], {}]},
+                        "position": {"x": 10 * index, "y": 20},
+                        "style": {"font_size": 12 + index, "bold": True},
+                    }
+                ],
+                "layout": None,
+            }
+        )
+    return {"title": "流式测试", "slides": slides, "metadata": {"author": "测试"}}
+
+
+async def collect(engine, source, **kwargs):
+    """收集流式解析生成的所有幻灯片"""
+    return [slide async for slide in engine.parse_stream(source, **kwargs)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+async def test_parse_stream_matches_parse(parser_engine, deck_data, chunk_size):
+    """测试流式解析的结果与完整解析一致"""
+    input_json = json.dumps(deck_data, ensure_ascii=False, indent=2)
+    document = await parser_engine.parse(input_json)
+
+    slides = await collect(
+        parser_engine, input_json.encode("utf-8"), chunk_size=chunk_size
+    )
+
+    assert all(isinstance(slide, Slide) for slide in slides)
+    assert slides == document.slides
+
+
+@pytest.mark.asyncio
+async def test_parse_stream_sources(parser_engine, deck_data, tmp_path):
+    """测试不同类型的输入源"""
+    input_bytes = json.dumps(deck_data).encode("utf-8")
+    path = tmp_path / "deck.json"
+    path.write_bytes(input_bytes)
+
+    async def async_chunks():
+        for start in range(0, len(input_bytes), 100):
+            yield input_bytes[start : start + 100]
+
+    expected = await collect(parser_engine, input_bytes)
+    assert len(expected) == 5
+    assert await collect(parser_engine, path) == expected
+    assert await collect(parser_engine, io.BytesIO(input_bytes)) == expected
+    assert await collect(parser_engine, async_chunks()) == expected
+    chunks = [input_bytes[start : start + 100] for start in range(0, 1000, 100)]
+    chunks.append(input_bytes[1000:].decode("utf-8"))
+    assert await collect(parser_engine, iter(chunks)) == expected
+
+
+@pytest.mark.asyncio
+async def test_parse_stream_rejects_str(parser_engine, deck_data):
+    """测试字符串输入源被明确拒绝，不会当作文件路径打开"""
+    with pytest.raises(ParseError) as exc_info:
+        await collect(parser_engine, json.dumps(deck_data))
+    assert "pathlib.Path" in str(exc_info.value)
+    with pytest.raises(TypeError):
+        async for _ in iter_chunks("deck.json"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_sync_sources_read_off_loop(parser_engine, deck_data):
+    """测试同步文件对象和同步迭代器在线程池中读取，不阻塞事件循环"""
+    input_bytes = json.dumps(deck_data).encode("utf-8")
+    loop_thread = threading.get_ident()
+    threads = set()
+
+    class File(io.BytesIO):
+        def read(self, size=-1):
+            threads.add(threading.get_ident())
+            return super().read(size)
+
+    def chunks():
+        for start in range(0, len(input_bytes), 100):
+            threads.add(threading.get_ident())
+            yield input_bytes[start : start + 100]
+
+    expected = await collect(parser_engine, input_bytes)
+    assert await collect(parser_engine, File(input_bytes), chunk_size=100) == expected
+    assert await collect(parser_engine, chunks()) == expected
+    assert threads and loop_thread not in threads
+
+
+@pytest.mark.asyncio
+async def test_parse_stream_yields_before_end(parser_engine, deck_data):
+    """测试在slides数组读取完成之前就开始生成幻灯片"""
+    input_bytes = json.dumps(deck_data).encode("utf-8")
+    first_slide_end = input_bytes.index(b'"layout": null}') + 15
+    received = []
+
+    async def chunks():
+        yield input_bytes[: first_slide_end + 1]
+        # 此时第一页应当已经生成
+        received.append(len(slides))
+        yield input_bytes[first_slide_end + 1 :]
+
+    slides = []
+    async for slide in parser_engine.parse_stream(chunks()):
+        slides.append(slide)
+
+    assert received == [1]
+    assert len(slides) == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "input_json, error_type, message",
+    [
+        ('{"slides": []}', ParseError, "缺少必需字段: title"),
+        ('{"title": "测试"}', ParseError, "缺少必需字段: slides"),
+        ('{"title": "测试", "slides": {}}', ParseError, "slides必须是数组"),
+        ('{"title": "测试", "slides": [1]}', ParseError, "幻灯片必须是对象"),
+        (
+            '{"title": "测试", "slides": [{"title": "a", "elements": []',
+            ParseError,
+            "数据不完整",
+        ),
+        ('{"title": "测试", "slides": [{"x": ]}', ParseError, "JSON解析错误"),
+        ('[{"title": "测试"}]', ParseError, "JSON根节点必须是对象"),
+        ('{"title": " ", "slides": []}', ValidationError, "文档标题不能为空"),
+        ('{"title": "测试", "slides": [{"title": "a"}]}', ValidationError, "elements"),
+    ],
+)
+async def test_parse_stream_errors(parser_engine, input_json, error_type, message):
+    """测试流式解析的错误处理"""
+    with pytest.raises(error_type) as exc_info:
+        await collect(parser_engine, input_json.encode("utf-8"), chunk_size=3)
+    assert message in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_parse_stream_depth_limit(parser_engine):
+    """测试流式解析的深度限制与完整解析一致"""
+    content = 1
+    for _ in range(JSONPlugin.MAX_DEPTH - 4):
+        content = [content]
+    element = {"type": "text", "content": content, "position": {"x": 0, "y": 0}}
+    input_json = json.dumps(
+        {"title": "测试", "slides": [{"title": "a", "elements": [element]}]}
+    )
+
+    with pytest.raises(ParseError) as exc_info:
+        await parser_engine.parse(input_json)
+    assert "深度超过限制" in str(exc_info.value)
+    with pytest.raises(ParseError) as exc_info:
+        await collect(parser_engine, input_json.encode("utf-8"))
+    assert "深度超过限制" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_parse_stream_slide_size_limit(parser_engine, deck_data):
+    """测试单个幻灯片的大小限制"""
+    parser_engine.MAX_INPUT_SIZE = 100
+    with pytest.raises(ParseError) as exc_info:
+        await collect(parser_engine, json.dumps(deck_data).encode("utf-8"))
+    assert "超过大小限制" in str(exc_info.value)
+
+
+def test_reader_bounded_buffer(deck_data):
+    """测试读取器只缓存未处理完的数据"""
+    deck_data["slides"] = deck_data["slides"] * 200
+    input_bytes = json.dumps(deck_data).encode("utf-8")
+    reader = IncrementalSlideReader(max_depth=10)
+    largest_buffer = 0
+    count = 0
+    for start in range(0, len(input_bytes), 256):
+        count += len(reader.feed(input_bytes[start : start + 256]))
+        largest_buffer = max(largest_buffer, len(reader._buffer))
+    reader.close()
+
+    assert count == 1000
+    assert reader.fields == {"title": "流式测试", "metadata": {"author": "测试"}}
+    assert largest_buffer < 1024
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4096])
+def test_reader_resumes_inside_strings(chunk_size):
+    """测试一块数据在字符串中间结束时，下一块从断开的位置继续扫描"""
+    text = '文本 \\ "转义" [{' * (4096 if chunk_size > 1 else 16)
+    element = {"type": "text", "content": text, "position": {"x": 0, "y": 0}}
+    data = {
+        "title": text,
+        "slides": [{"title": "页", "elements": [element], "notes": [text]}],
+    }
+    input_bytes = json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    reader = IncrementalSlideReader(max_depth=10)
+    slides = []
+    for start in range(0, len(input_bytes), chunk_size):
+        slides += reader.feed(input_bytes[start : start + chunk_size])
+        if reader._state in ("field", "slide"):
+            # 已经收到的数据都扫描过，不会在下一块重新扫描
+            assert len(reader._buffer) - reader._scan_pos <= 1
+    reader.close()
+
+    assert slides == data["slides"]
+    assert reader.fields == {"title": text}
+
+
+def test_reader_large_string_is_linear():
+    """测试在小块中读取数MB的字符串，耗时与数据大小成线性关系"""
+    text = "x" * (4 * 1024 * 1024)
+    element = {"type": "text", "content": text, "position": {"x": 0, "y": 0}}
+    input_bytes = json.dumps(
+        {"title": "测试", "slides": [{"title": "页", "elements": [element]}]}
+    ).encode("utf-8")
+
+    reader = IncrementalSlideReader()
+    slides = []
+    start_time = time.perf_counter()
+    for start in range(0, len(input_bytes), 1024):
+        slides += reader.feed(input_bytes[start : start + 1024])
+    reader.close()
+    # 从字符串开头重新扫描时需要数十秒
+    assert time.perf_counter() - start_time < 5
+    assert slides[0]["elements"][0]["content"] == text
@@ -4,20 +4,7 @@
 """
 
 import pytest
-from typing import Dict, Any
-from typing import List, Dict, Any, Optional, Literal
-from ppt_parser.core import ParserEngine
-from ppt_parser.plugins import JSONPlugin
-from ppt_parser.exceptions import ParseError, ValidationError, BuildDocumentError
-
-
-@pytest.fixture
-async def parser_engine():
-    """创建解析引擎实例"""
-    engine = ParserEngine()
-    plugin = JSONPlugin()
-    engine.plugin_manager.register_plugin(plugin)
-    return engine
+from ppt_parser.exceptions import ParseError, ValidationError
 
 
 @pytest.fixture
@@ -0,0 +1,105 @@
+"""
+插件管理器测试模块
+测试插件的发现、延迟加载和注册
+"""
+
+import sys
+import textwrap
+import pytest
+from ppt_parser.core import ParserEngine, PluginManager
+from ppt_parser.core import plugin_manager as plugin_manager_module
+from ppt_parser.exceptions import PluginError
+from ppt_parser.plugins import JSONPlugin
+
+PLUGIN_SOURCE = """
+from ppt_parser.plugins.base_plugin import BasePlugin
+
+
+class FakePlugin(BasePlugin):
+    def get_format_type(self):
+        return "fake"
+
+    async def parse(self, input_data):
+        return {"title": input_data, "slides": []}
+
+    async def validate_format(self, input_data):
+        return True
+"""
+
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch):
+    """在临时目录中创建一个插件模块，返回其模块名"""
+    name = f"fake_plugin_{tmp_path.name.replace('-', '_')}"
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent(PLUGIN_SOURCE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield name
+    sys.modules.pop(name, None)
+
+
+def test_builtin_plugin_is_lazy():
+    """测试内置插件无需手动注册，第一次获取时才创建"""
+    manager = PluginManager()
+    assert "json" in manager.get_supported_formats()
+    assert not manager.is_loaded("json")
+    assert isinstance(manager.get_plugin("json"), JSONPlugin)
+    assert manager.is_loaded("json")
+    assert manager.get_plugin("json") is manager.get_plugin("json")
+    assert manager.get_supported_formats().count("json") == 1
+
+    assert PluginManager(discover=False).get_supported_formats() == []
+
+
+def test_entry_point_plugin_imported_on_first_use(plugin_module, monkeypatch):
+    """测试入口点中的插件只在第一次获取时导入"""
+    monkeypatch.setattr(
+        plugin_manager_module,
+        "_entry_point_plugins",
+        lambda: (("fake", f"{plugin_module}:FakePlugin"),),
+    )
+    manager = PluginManager()
+    assert set(manager.get_supported_formats()) == {"json", "msgpack", "fake"}
+    assert plugin_module not in sys.modules
+
+    plugin = manager.get_plugin("fake")
+    assert plugin.get_format_type() == "fake"
+    assert plugin_module in sys.modules
+    assert manager.get_plugin("missing") is None
+
+
+def test_manual_registration_takes_priority(plugin_module):
+    """测试手动注册的插件优先，注销后不再可用"""
+    manager = PluginManager()
+    plugin = JSONPlugin()
+    manager.register_plugin(plugin)
+    assert manager.get_plugin("json") is plugin
+
+    manager.unregister_plugin("json")
+    assert manager.get_plugin("json") is None
+
+    manager.register_lazy("fake", f"{plugin_module}:FakePlugin")
+    assert not manager.is_loaded("fake")
+    assert manager.get_plugin("fake").get_format_type() == "fake"
+
+
+def test_plugin_load_errors(plugin_module):
+    """测试无法导入或格式类型不一致的插件"""
+    manager = PluginManager(discover=False)
+    manager.register_lazy("missing", "no_such_module:Plugin")
+    with pytest.raises(PluginError) as exc_info:
+        manager.get_plugin("missing")
+    assert exc_info.value.plugin_name == "no_such_module:Plugin"
+
+    manager.register_lazy("other", f"{plugin_module}:FakePlugin")
+    with pytest.raises(PluginError):
+        manager.get_plugin("other")
+
+
+@pytest.mark.asyncio
+async def test_engine_parses_without_registration():
+    """测试解析引擎无需手动注册JSON插件"""
+    engine = ParserEngine()
+    document = await engine.parse(
+        '{"title": "测试", "slides": [{"title": "页", "elements": []}]}'
+    )
+    assert document.title == "测试"
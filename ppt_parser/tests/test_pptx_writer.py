@@ -0,0 +1,370 @@
+"""
+PPTX写入器测试模块
+测试写出的压缩包结构、流式输出和内存占用
+"""
+
+import io
+import json
+import posixpath
+import tracemalloc
+import zipfile
+from xml.etree import ElementTree
+import pytest
+from ppt_parser.core import ParserEngine
+from ppt_parser.plugins import JSONPlugin
+from ppt_parser.exceptions import WriteError
+from ppt_parser.models.compact import CompactDocument
+from ppt_parser.models.document import Document, Element, Position, Slide, Style
+from ppt_parser.writer import PPTXWriter
+from ppt_parser.writer import zip_stream
+from ppt_parser.writer.zip_stream import ZipStreamWriter
+
+NS_RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+NS_TYPES = "{http://schemas.openxmlformats.org/package/2006/content-types}"
+NS_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+
+# 最小的PNG文件头，写入器不解码图片内容
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+class UnseekableSink:
+    """只支持写入的输出流，模拟HTTP响应体"""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+    def flush(self):
+        pass
+
+
+class CountingSink(UnseekableSink):
+    """只统计写入字节数的输出流"""
+
+    def __init__(self):
+        super().__init__()
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        return len(data)
+
+
+@pytest.fixture
+def document(tmp_path):
+    """包含各类元素的文档"""
+    (tmp_path / "logo.png").write_bytes(PNG_BYTES)
+    elements = [
+        Element(
+            type="text",
+            content="第一行\n第二行 <&>",
+            position=Position(x=10, y=20),
+            style=Style(font_size=24, color="#FF0000", bold=True, rotation=90),
+        ),
+        Element(
+            type="shape",
+            content={"shape": "ellipse", "text": "圆"},
+            position=Position(x=1, y=1, unit="in"),
+            style=Style(background_color="#00FF00", opacity=0.5),
+            size={"width": 2, "height": 1},
+        ),
+        Element(type="image", content="logo.png", position=Position(x=0, y=0)),
+        Element(
+            type="chart",
+            content={"type": "line", "data": [1, 2.5, None], "labels": ["a", "b", "c"]},
+            position=Position(x=100, y=100),
+        ),
+    ]
+    return Document(
+        title="测试文档",
+        metadata={"author": "测试", "version": "1.0"},
+        slides=[
+            Slide(title="第一页", elements=elements, background={"color": "#FFFFFF"}),
+            Slide(title="第二页"),
+        ],
+    )
+
+
+def read_package(data: bytes):
+    """读取压缩包，检查所有XML部件格式正确并返回部件内容"""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        package = {name: archive.read(name) for name in archive.namelist()}
+    for name, content in package.items():
+        if name.endswith((".xml", ".rels")):
+            ElementTree.fromstring(content)
+    return package
+
+
+def check_relationships(package):
+    """检查所有关系的目标部件都存在，且每个部件都有内容类型"""
+    types = ElementTree.fromstring(package["[Content_Types].xml"])
+    defaults = {item.get("Extension") for item in types.iter(f"{NS_TYPES}Default")}
+    overrides = {item.get("PartName") for item in types.iter(f"{NS_TYPES}Override")}
+    for name in package:
+        if name == "[Content_Types].xml":
+            continue
+        extension = name.rsplit(".", 1)[1]
+        assert f"/{name}" in overrides or extension in defaults, name
+    assert all(part[1:] in package for part in overrides)
+
+    for name, content in package.items():
+        if not name.endswith(".rels"):
+            continue
+        source_dir = posixpath.dirname(posixpath.dirname(name))
+        for rel in ElementTree.fromstring(content).iter(f"{NS_RELS}Relationship"):
+            target = posixpath.normpath(posixpath.join(source_dir, rel.get("Target")))
+            assert target in package, (name, target)
+
+
+def test_save_package_structure(document, tmp_path):
+    """测试写出的包结构完整，关系和内容类型一致"""
+    output = tmp_path / "deck.pptx"
+    document.save(output, media_root=tmp_path)
+    package = read_package(output.read_bytes())
+    check_relationships(package)
+
+    presentation = ElementTree.fromstring(package["ppt/presentation.xml"])
+    assert len(list(presentation.iter(f"{NS_P}sldId"))) == 2
+    assert package["ppt/media/image1.png"] == PNG_BYTES
+    assert "ppt/charts/chart1.xml" in package
+
+    slide = package["ppt/slides/slide1.xml"].decode("utf-8")
+    assert "第二行 &lt;&amp;&gt;" in slide
+    assert 'rot="5400000"' in slide
+    assert 'prst="ellipse"' in slide
+    assert '<a:off x="914400" y="914400"/>' in slide
+    assert "<dc:creator>测试</dc:creator>" in package["docProps/core.xml"].decode()
+
+
+def test_save_to_unseekable_stream(document, tmp_path):
+    """测试直接写入不支持定位的流"""
+    sink = UnseekableSink()
+    document.save(sink, media_root=tmp_path)
+    package = read_package(sink.buffer.getvalue())
+
+    buffer = io.BytesIO()
+    document.save(buffer, media_root=tmp_path)
+    assert package == read_package(buffer.getvalue())
+
+
+def test_save_deterministic(document, tmp_path):
+    """测试相同的文档总是写出相同的字节"""
+    first, second = io.BytesIO(), io.BytesIO()
+    document.save(first, media_root=tmp_path)
+    document.save(second, media_root=tmp_path)
+    assert first.getvalue() == second.getvalue()
+
+    compact = io.BytesIO()
+    CompactDocument.from_document(document).save(compact, media_root=tmp_path)
+    assert compact.getvalue() == first.getvalue()
+
+
+def test_parallel_save_is_identical(document, tmp_path):
+    """测试多进程渲染与单进程写出的字节完全相同"""
+    document = document.model_copy(update={"slides": document.slides * 20})
+    serial = io.BytesIO()
+    document.save(serial, media_root=tmp_path)
+
+    parallel = io.BytesIO()
+    with PPTXWriter(
+        parallel,
+        title=document.title,
+        metadata=document.metadata,
+        media_root=tmp_path,
+        workers=2,
+        batch_size=3,
+    ) as writer:
+        writer.add_slides(document.slides)
+    assert writer.slide_count == 40
+    assert parallel.getvalue() == serial.getvalue()
+
+    compact = io.BytesIO()
+    CompactDocument.from_document(document).save(
+        compact, media_root=tmp_path, workers=2
+    )
+    assert compact.getvalue() == serial.getvalue()
+
+
+def test_parallel_save_errors(tmp_path):
+    """测试工作进程中的渲染错误带有正确的幻灯片序号，且不留下输出文件"""
+    slides = [Slide(title="页") for _ in range(10)]
+    slides[7] = Slide(
+        title="页",
+        elements=[
+            Element(type="chart", content={"type": "radar"}, position={"x": 0, "y": 0})
+        ],
+    )
+    output = tmp_path / "deck.pptx"
+    with pytest.raises(WriteError) as exc_info:
+        Document(title="测试", slides=slides).save(output, workers=2)
+    assert exc_info.value.slide_index == 7
+    assert exc_info.value.details["element_index"] == 0
+    assert not output.exists()
+
+    with pytest.raises(ValueError):
+        PPTXWriter(io.BytesIO(), workers=-1)
+
+
+@pytest.mark.asyncio
+async def test_stream_parse_to_writer():
+    """测试将流式解析的幻灯片直接写入"""
+    engine = ParserEngine()
+    engine.plugin_manager.register_plugin(JSONPlugin())
+    slides = [
+        {
+            "title": f"第{index}页",
+            "elements": [
+                {"type": "text", "content": "内容", "position": {"x": 0, "y": 0}}
+            ],
+        }
+        for index in range(5)
+    ]
+    input_bytes = json.dumps({"title": "流式", "slides": slides}).encode("utf-8")
+
+    buffer = io.BytesIO()
+    with PPTXWriter(buffer, title="流式") as writer:
+        async for slide in engine.parse_stream(input_bytes):
+            writer.add_slide(slide)
+
+    assert writer.slide_count == 5
+    package = read_package(buffer.getvalue())
+    check_relationships(package)
+    assert "ppt/slides/slide5.xml" in package
+
+
+def test_writer_memory_is_constant(monkeypatch):
+    """测试写入器的内存占用不随幻灯片数量增长"""
+    # 中央目录在内存中最多保留DIRECTORY_SPOOL_SIZE字节，调低后两种规模都会转存
+    monkeypatch.setattr(zip_stream, "DIRECTORY_SPOOL_SIZE", 16 * 1024)
+    slide = Slide(
+        title="页",
+        elements=[
+            Element(type="text", content="内容" * 20, position=Position(x=0, y=0)),
+            Element(
+                type="chart",
+                content={"type": "bar", "data": list(range(50))},
+                position=Position(x=0, y=0),
+            ),
+        ],
+    )
+
+    def peak_memory(slide_count):
+        sink = CountingSink()
+        tracemalloc.start()
+        try:
+            with PPTXWriter(sink, title="内存") as writer:
+                for _ in range(slide_count):
+                    writer.add_slide(slide)
+            return sink.size, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    small_size, small_peak = peak_memory(50)
+    large_size, large_peak = peak_memory(2000)
+    assert large_size > small_size * 20
+    assert large_peak < small_peak * 1.5
+
+
+def test_zip_stream_entries(monkeypatch):
+    """测试ZIP写入器的各种写入方式，以及条目超出限制时使用ZIP64格式"""
+    # 降低限制，使少量条目就触发ZIP64，并让中央目录转存到临时文件
+    monkeypatch.setattr(zip_stream, "_MAX_ENTRIES", 3)
+    monkeypatch.setattr(zip_stream, "DIRECTORY_SPOOL_SIZE", 64)
+
+    large = bytes(range(256)) * 5000
+    sink = UnseekableSink()
+    with ZipStreamWriter(sink) as archive:
+        archive.write("a.xml", b"<a/>")
+        archive.write_chunks("目录/b.xml", [b"<b>", b"text", b"</b>"])
+        archive.write_file("c.bin", io.BytesIO(large))
+        archive.write_compressed("d.txt", zip_stream.deflate(b"payload", 9))
+    assert archive.entry_count == 4
+
+    with zipfile.ZipFile(io.BytesIO(sink.buffer.getvalue())) as reader:
+        assert reader.testzip() is None
+        assert reader.namelist() == ["a.xml", "目录/b.xml", "c.bin", "d.txt"]
+        assert reader.read("目录/b.xml") == b"<b>text</b>"
+        assert reader.read("c.bin") == large
+        assert reader.read("d.txt") == b"payload"
+        assert reader.getinfo("a.xml").date_time == (1980, 1, 1, 0, 0, 0)
+
+    with pytest.raises(ValueError):
+        archive.write("e.xml", b"")
+
+
+def test_write_errors(tmp_path):
+    """测试无法写出的内容"""
+    output = tmp_path / "deck.pptx"
+    missing = Document(
+        title="测试",
+        slides=[
+            Slide(
+                title="页",
+                elements=[
+                    Element(
+                        type="image", content="missing.png", position={"x": 0, "y": 0}
+                    )
+                ],
+            )
+        ],
+    )
+    with pytest.raises(WriteError) as exc_info:
+        missing.save(output, media_root=tmp_path)
+    assert "无法读取图片文件" in str(exc_info.value)
+    assert not output.exists()
+
+    chart = Document(
+        title="测试",
+        slides=[
+            Slide(title="页"),
+            Slide(
+                title="页",
+                elements=[
+                    Element(
+                        type="chart",
+                        content={"type": "radar"},
+                        position={"x": 0, "y": 0},
+                    )
+                ],
+            ),
+        ],
+    )
+    with pytest.raises(WriteError) as exc_info:
+        chart.save(io.BytesIO())
+    assert exc_info.value.slide_index == 1
+    assert exc_info.value.details["element_index"] == 0
+
+    writer = PPTXWriter(io.BytesIO())
+    writer.close()
+    with pytest.raises(WriteError):
+        writer.add_slide(Slide(title="页"))
+
+
+@pytest.mark.parametrize(
+    "style, size, message",
+    [
+        ({"color": '#"/><x a="1'}, None, "无效的颜色"),
+        ({"background_color": "red"}, None, "无效的颜色"),
+        ({"font_size": '1"/><x a="'}, None, "无效的字体大小"),
+        ({"font_size": 10.5}, None, "无效的字体大小"),
+        ({"color": "#000000", "opacity": "0.5"}, None, "无效的透明度"),
+        ({"rotation": float("nan")}, None, "无效的旋转角度"),
+        ({}, {"width": '1"/><x a="'}, "无效的宽度"),
+    ],
+)
+def test_unvalidated_style_is_rejected(style, size, message):
+    """测试跳过模型验证构建的元素在写入时重新检查颜色和数值，不会写出注入的XML"""
+    element = Element.model_construct(
+        type="text",
+        content="文本",
+        position=Position(x=0, y=0),
+        style=Style.model_construct(**style),
+        size=size,
+    )
+    document = Document(title="测试", slides=[Slide(title="页", elements=[element])])
+    with pytest.raises(WriteError) as exc_info:
+        document.save(io.BytesIO())
+    assert message in str(exc_info.value)
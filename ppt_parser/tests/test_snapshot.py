@@ -0,0 +1,208 @@
+"""
+文档快照测试模块
+测试二进制快照的往返一致性、跳过验证的加载、版本和损坏数据的处理
+"""
+
+import json
+import struct
+import zlib
+import pytest
+from pydantic import ValidationError as PydanticValidationError
+from ppt_parser.core import ParserEngine
+from ppt_parser.models.compact import CompactDocument
+from ppt_parser.models.document import Document, Element, Position, Slide, Style
+from ppt_parser.models.snapshot import SNAPSHOT_VERSION, SnapshotError
+from . import SAMPLE_DOCUMENT
+from .test_compact_document import make_deck
+
+HEADER_SIZE = struct.calcsize("<4sHHIIIII")
+
+
+def load_all(data):
+    """用三种方式加载快照"""
+    return [
+        Document.from_bytes(data),
+        Document.from_bytes(data, trusted=True),
+        CompactDocument.from_bytes(data).to_document(),
+    ]
+
+
+def reseal(data: bytes) -> bytes:
+    """修改快照内容后重新计算校验和"""
+    body = data[HEADER_SIZE:]
+    header = bytearray(data[:HEADER_SIZE])
+    struct.pack_into("<I", header, HEADER_SIZE - 4, zlib.crc32(body))
+    return bytes(header) + body
+
+
+def edge_case_document() -> Document:
+    """包含各种无法按列保存的字段和特殊值的文档"""
+    elements = [
+        Element(type="text", content="a", position=Position(x=1, y=2), note="额外"),
+        Element(
+            type="image",
+            content=b"\x89PNG",
+            position=Position(x=0.5, y=0, unit="cm"),
+            size={"depth": 3},
+        ),
+        Element(
+            type="shape",
+            content=None,
+            position=Position(x=1, y=2),
+            style=Style(rotation=-0.0, opacity=None, bold=None),
+            size={"height": 10},
+        ),
+        Element(
+            type="chart",
+            content={"type": "bar", "data": [1, 2.5, None], "标签": "😀"},
+            position=Position(x=1000, y=1000),
+        ),
+        Element(type="text", content="\ud800孤立代理", position=Position(x=1, y=2)),
+        Element(type="text", content="", position=Position(x=1, y=2)),
+    ]
+    return Document(
+        title="边界",
+        theme={"font": "Arial"},
+        metadata={},
+        owner="测试",
+        slides=[
+            Slide(
+                title="页1",
+                elements=elements,
+                background={"color": "#FFFFFF"},
+                notes="备注",
+                tag="x",
+            ),
+            Slide(title="空页"),
+            Slide(title="a", layout="a", notes="a", elements=elements[:1]),
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_round_trip():
+    """测试三种加载方式都还原出相同的文档"""
+    engine = ParserEngine()
+    document = await engine.parse(json.dumps(make_deck(4, 25)))
+    data = document.to_bytes()
+
+    for restored in load_all(data):
+        assert restored == document
+        assert restored.to_dict() == document.to_dict()
+    assert len(data) < len(json.dumps(document.to_dict()).encode("utf-8"))
+
+
+def test_round_trip_edge_cases():
+    """测试额外字段、二进制内容、代理字符、-0.0和空值的还原"""
+    document = edge_case_document()
+    for restored in load_all(document.to_bytes()):
+        assert restored == document
+        elements = restored.slides[0].elements
+        assert elements[0].note == "额外"
+        assert elements[1].content == b"\x89PNG"
+        assert elements[1].size == {"depth": 3.0}
+        assert str(elements[2].style.rotation) == "-0.0"
+        assert elements[2].style.bold is None
+        assert elements[4].content == "\ud800孤立代理"
+        assert restored.slides[0].tag == "x"
+        assert restored.slides[1].elements == []
+        assert restored.owner == "测试"
+
+
+def test_trusted_models():
+    """测试跳过验证创建的对象与验证创建的对象行为相同且互不共享"""
+    document = Document.from_dict(make_deck(1, 6))
+    restored = Document.from_bytes(document.to_bytes(), trusted=True)
+    first, second = restored.slides[0].elements[1:3]
+
+    assert type(first.position) is Position
+    assert type(first.style) is Style
+    assert first.style == second.style
+    assert restored.model_dump() == document.model_dump()
+    assert restored.model_copy(deep=True) == document
+    assert first.position.model_fields_set == {"x", "y", "unit"}
+    assert first.style.model_fields_set == set(Style.model_fields)
+    assert first.model_extra == {}
+
+    first.style.bold = True
+    first.position.x = 7
+    assert second.style.bold is not True
+    assert document.slides[0].elements[1].position.x != 7
+
+
+def test_compact_snapshot():
+    """测试紧凑文档和普通文档生成相同的快照"""
+    document = edge_case_document()
+    compact = CompactDocument.from_document(document)
+    data = document.to_bytes()
+
+    assert compact.to_bytes() == data
+    loaded = CompactDocument.from_bytes(memoryview(data))
+    assert loaded.to_bytes() == data
+    assert loaded.slides[0].notes == "备注"
+    assert loaded.slides[0].tag == "x"
+    assert list(loaded.slides[0].elements) == document.slides[0].elements
+
+    # 加载后的紧凑文档可以继续追加幻灯片
+    loaded.append_slide(document.slides[0])
+    assert loaded.to_document().slides[-1] == document.slides[0]
+
+
+def test_untrusted_validation():
+    """测试默认加载会验证字段值，跳过验证时不检查"""
+    element = Element.model_construct(
+        type="text", content="a", position=Position.model_construct(x=5000, y=0)
+    )
+    document = Document.model_construct(
+        title="测试", slides=[Slide.model_construct(title="页", elements=[element])]
+    )
+    data = document.to_bytes()
+
+    with pytest.raises(PydanticValidationError):
+        Document.from_bytes(data)
+    restored = Document.from_bytes(data, trusted=True)
+    assert restored.slides[0].elements[0].position.x == 5000
+
+
+@pytest.mark.parametrize(
+    "corrupt, message",
+    [
+        (lambda data: data[:10], "不完整"),
+        (lambda data: data[:-1], "校验失败"),
+        (lambda data: b"XXXX" + data[4:], "不是文档快照"),
+        (lambda data: data[:4] + b"\x02\x00" + data[6:], "不支持的快照版本: 2"),
+        (lambda data: data[:-3] + bytes([data[-3] ^ 1]) + data[-2:], "校验失败"),
+        (lambda data: reseal(data + b"\x00"), "多余的字节"),
+        (lambda data: reseal(data[:-4] + struct.pack("<i", 10**6)), "超出范围"),
+        (lambda data: reseal(data[:-4] + struct.pack("<i", -(10**6))), "超出范围"),
+        (lambda data: reseal(data[:-1]), "不完整"),
+    ],
+)
+def test_invalid_snapshot(corrupt, message):
+    """测试损坏、截断或版本不受支持的快照"""
+    data = corrupt(Document.from_dict(SAMPLE_DOCUMENT).to_bytes())
+    for load in (
+        Document.from_bytes,
+        lambda data: Document.from_bytes(data, trusted=True),
+        CompactDocument.from_bytes,
+    ):
+        with pytest.raises(SnapshotError, match=message):
+            load(data)
+
+
+def test_version_in_header():
+    """测试快照头部记录了格式版本"""
+    data = Document.from_dict(SAMPLE_DOCUMENT).to_bytes()
+    assert data[:4] == b"PPTS"
+    assert struct.unpack_from("<H", data, 4)[0] == SNAPSHOT_VERSION
+
+
+def test_unsupported_values():
+    """测试无法保存的值"""
+    document = Document.from_dict(SAMPLE_DOCUMENT)
+    document.slides[0].elements[0].content = {"big": 2**70}
+    with pytest.raises(SnapshotError, match="无法保存"):
+        document.to_bytes()
+    document.slides[0].elements[0].content = {1: "a"}
+    with pytest.raises(SnapshotError, match="无法保存"):
+        document.to_bytes()
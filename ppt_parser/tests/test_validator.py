@@ -4,9 +4,10 @@
 """
 
 import pytest
-from typing import List, Dict, Any, Optional, Literal
 from ppt_parser.core import Validator
+from ppt_parser.core.validator import compile_schema
 from ppt_parser.exceptions import ValidationError
+from ppt_parser.models.document import Document
 
 
 @pytest.fixture
@@ -76,3 +77,90 @@ async def test_validate_missing_element_required_fields(validator, valid_data):
     with pytest.raises(ValidationError) as exc_info:
         await validator.validate(valid_data)
     assert "元素缺少必需字段" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_validate_fail_fast_reports_first_error(validator, valid_data):
+    """测试默认模式只报告第一个错误及其JSON指针"""
+    element = valid_data["slides"][0]["elements"][0]
+    del element["type"]
+    element["position"] = {"x": 0}
+    with pytest.raises(ValidationError) as exc_info:
+        await validator.validate(valid_data)
+    assert exc_info.value.field == "/slides/0/elements/0/type"
+    assert exc_info.value.validation_errors == [
+        {"field": "/slides/0/elements/0/type", "error": "元素缺少必需字段: type"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_validate_exhaustive(valid_data):
+    """测试完整模式收集所有错误"""
+    valid_data["title"] = " "
+    valid_data["slides"].append(1)
+    element = valid_data["slides"][0]["elements"][0]
+    element["position"] = {"y": 0}
+    element["style"] = None
+    element["size"] = "large"
+
+    with pytest.raises(ValidationError) as exc_info:
+        await Validator(mode="exhaustive").validate(valid_data)
+    error = exc_info.value
+    assert error.message == "文档标题不能为空"
+    assert [(item["field"], item["error"]) for item in error.validation_errors] == [
+        ("/title", "文档标题不能为空"),
+        ("/slides/0/elements/0/position/x", "position缺少必需字段: x"),
+        ("/slides/0/elements/0/style", "style必须是字典类型"),
+        ("/slides/0/elements/0/size", "size必须是字典类型"),
+        ("/slides/1", "幻灯片数据必须是字典类型"),
+    ]
+    assert "truncated" not in error.details
+
+
+@pytest.mark.asyncio
+async def test_validate_exhaustive_error_cap(valid_data):
+    """测试完整模式的错误数量上限"""
+    valid_data["slides"] = [1] * 10
+    with pytest.raises(ValidationError) as exc_info:
+        await Validator(mode="exhaustive", max_errors=3).validate(valid_data)
+    assert len(exc_info.value.validation_errors) == 3
+    assert exc_info.value.details["truncated"] is True
+
+
+@pytest.mark.asyncio
+async def test_validate_rules_from_models(validator, valid_data):
+    """测试由模型字段注解生成的规则"""
+    valid_data["theme"] = None
+    valid_data["slides"][0]["background"] = None
+    assert await validator.validate(valid_data) is True
+
+    valid_data["slides"][0]["background"] = "#FFFFFF"
+    with pytest.raises(ValidationError) as exc_info:
+        await validator.validate(valid_data)
+    assert exc_info.value.message == "background必须是字典类型"
+
+
+@pytest.mark.asyncio
+async def test_validate_slide_and_header(validator):
+    """测试单独验证幻灯片和文档属性"""
+    with pytest.raises(ValidationError) as exc_info:
+        await validator.validate_slide({"title": "页"}, 3)
+    assert exc_info.value.field == "/slides/3/elements"
+
+    assert await validator.validate_header({"title": "测试"}) is True
+    with pytest.raises(ValidationError):
+        await validator.validate_header({"title": "测试", "metadata": []})
+
+
+def test_compiled_schema_cached():
+    """测试验证函数只生成一次"""
+    assert compile_schema(Document) is compile_schema(Document)
+    assert compile_schema(Document).check({"title": "测试", "slides": []}) is True
+
+
+def test_validator_invalid_options():
+    """测试无效的验证模式和错误上限"""
+    with pytest.raises(ValueError):
+        Validator(mode="lazy")
+    with pytest.raises(ValueError):
+        Validator(max_errors=0)
@@ -0,0 +1,23 @@
+"""
+PPTX写入模块
+将文档对象写出为PowerPoint演示文稿
+
+导出的名称在首次访问时才导入所在的子模块。
+"""
+
+from typing import TYPE_CHECKING
+from .. import _lazy
+
+# 导出名称 -> 所在的子模块
+__getattr__, __dir__, __all__ = _lazy.attach(
+    __name__,
+    {
+        "MediaCache": ".media",
+        "PPTXWriter": ".pptx_writer",
+        "save_document": ".pptx_writer",
+    },
+)
+
+if TYPE_CHECKING:
+    from .media import MediaCache
+    from .pptx_writer import PPTXWriter, save_document
@@ -0,0 +1,202 @@
+"""
+图表部件生成
+将图表元素的内容转换为DrawingML图表部件（ppt/charts/chartN.xml）
+
+图表内容的格式:
+    ```python
+    {"type": "bar", "data": [1, 2, 3], "labels": ["一月", "二月", "三月"]}
+    {
+        "type": "line",
+        "title": "趋势",
+        "series": [{"name": "A", "data": [1, 2]}, {"name": "B", "data": [3, 4]}],
+    }
+    ```
+
+数据直接写入图表部件（numLit/strLit），不附带嵌入的工作簿。数据可以是列表，
+也可以是构建时由 ChartDataProcessor 转换的数值数组，数组按整列格式化。
+"""
+
+import math
+from numbers import Real
+from typing import Any, Dict, Iterator, List, Sequence
+from ..core.chart_data import format_points, is_series_array
+from ..exceptions import WriteError
+from .parts import NS_A, NS_C, NS_R, XML_HEADER, xml_text
+
+# 支持的图表类型：内容中的type -> (图表元素, 柱形方向)
+CHART_TYPES = {
+    "bar": ("barChart", "col"),
+    "column": ("barChart", "col"),
+    "horizontal_bar": ("barChart", "bar"),
+    "line": ("lineChart", None),
+    "pie": ("pieChart", None),
+}
+
+# 坐标轴ID，同一图表内唯一即可
+_CATEGORY_AXIS_ID = 500000001
+_VALUE_AXIS_ID = 500000002
+
+
+def chart_xml(content: Any) -> str:
+    """
+    生成图表部件
+
+    Args:
+        content: 图表元素的内容
+
+    Returns:
+        str: 图表部件的XML
+
+    Raises:
+        WriteError: 图表内容无效
+    """
+    if not isinstance(content, dict):
+        raise WriteError("图表内容必须是字典类型")
+    chart_type = content.get("type", "bar")
+    if chart_type not in CHART_TYPES:
+        raise WriteError(f"不支持的图表类型: {chart_type}")
+    tag, direction = CHART_TYPES[chart_type]
+
+    series = _series(content)
+    labels = content.get("labels", content.get("categories"))
+    if labels is not None and not isinstance(labels, (list, tuple)):
+        raise WriteError("图表labels必须是列表类型")
+
+    parts = [
+        XML_HEADER,
+        f'<c:chartSpace xmlns:c="{NS_C}" xmlns:a="{NS_A}" xmlns:r="{NS_R}">',
+        '<c:roundedCorners val="0"/><c:chart>',
+    ]
+    title = content.get("title")
+    if title:
+        parts.append(_title_xml(title))
+    parts.append(f'<c:autoTitleDeleted val="{0 if title else 1}"/>')
+    parts.append(f"<c:plotArea><c:layout/><c:{tag}>")
+
+    if tag == "barChart":
+        parts.append(f'<c:barDir val="{direction}"/><c:grouping val="clustered"/>')
+    elif tag == "lineChart":
+        parts.append('<c:grouping val="standard"/>')
+    parts.append(f'<c:varyColors val="{1 if tag == "pieChart" else 0}"/>')
+
+    for index, (name, values) in enumerate(series):
+        parts.extend(_series_xml(tag, index, name, values, labels))
+
+    if tag == "barChart":
+        parts.append('<c:gapWidth val="150"/>')
+    elif tag == "lineChart":
+        parts.append('<c:marker val="1"/>')
+    if tag == "pieChart":
+        parts.append('<c:firstSliceAng val="0"/>')
+    else:
+        parts.append(
+            f'<c:axId val="{_CATEGORY_AXIS_ID}"/><c:axId val="{_VALUE_AXIS_ID}"/>'
+        )
+    parts.append(f"</c:{tag}>")
+    if tag != "pieChart":
+        parts.append(_axes_xml(direction == "bar"))
+    parts.append("</c:plotArea>")
+    if len(series) > 1 or tag == "pieChart":
+        parts.append('<c:legend><c:legendPos val="r"/><c:overlay val="0"/></c:legend>')
+    parts.append('<c:plotVisOnly val="1"/></c:chart></c:chartSpace>')
+    return "".join(parts)
+
+
+def _series(content: Dict[str, Any]) -> List[tuple]:
+    """读取图表内容中的数据系列，返回(名称, 数值列表)列表"""
+    if "series" in content:
+        series = content["series"]
+        if not isinstance(series, list) or not all(
+            isinstance(item, dict) for item in series
+        ):
+            raise WriteError("图表series必须是字典列表")
+        result = [(item.get("name"), item.get("data")) for item in series]
+    else:
+        result = [(content.get("name"), content.get("data"))]
+
+    for _, values in result:
+        if not isinstance(values, (list, tuple)) and not is_series_array(values):
+            raise WriteError("图表数据必须是数值列表")
+    return result
+
+
+def _series_xml(
+    tag: str, index: int, name: Any, values: Sequence[Any], labels: Any
+) -> Iterator[str]:
+    """生成单个数据系列"""
+    yield f'<c:ser><c:idx val="{index}"/><c:order val="{index}"/>'
+    if name is not None:
+        yield f"<c:tx><c:v>{xml_text(name)}</c:v></c:tx>"
+    if tag == "barChart":
+        yield '<c:invertIfNegative val="0"/>'
+    elif tag == "lineChart":
+        yield '<c:marker><c:symbol val="none"/></c:marker>'
+
+    if labels:
+        yield f'<c:cat><c:strLit><c:ptCount val="{len(labels)}"/>'
+        for point, label in enumerate(labels):
+            yield f'<c:pt idx="{point}"><c:v>{xml_text(label)}</c:v></c:pt>'
+        yield "</c:strLit></c:cat>"
+
+    yield (
+        "<c:val><c:numLit><c:formatCode>General</c:formatCode>"
+        f'<c:ptCount val="{len(values)}"/>'
+    )
+    if is_series_array(values):
+        try:
+            texts = format_points(values)
+        except ValueError as e:
+            raise WriteError(str(e)) from e
+    else:
+        texts = [None if value is None else format_number(value) for value in values]
+    for point, text in enumerate(texts):
+        if text is None:
+            # 缺失的数据点不写入，图表中显示为空白
+            continue
+        yield f'<c:pt idx="{point}"><c:v>{text}</c:v></c:pt>'
+    yield "</c:numLit></c:val>"
+    if tag == "lineChart":
+        yield '<c:smooth val="0"/>'
+    yield "</c:ser>"
+
+
+def format_number(value: Any) -> str:
+    """
+    将数据点格式化为图表中的数值文本
+
+    Raises:
+        WriteError: 不是有限的数值
+    """
+    if isinstance(value, bool) or not isinstance(value, Real):
+        raise WriteError(f"图表数据必须是数值: {value!r}")
+    if isinstance(value, int):
+        return str(value)
+    value = float(value)
+    if not math.isfinite(value):
+        raise WriteError(f"图表数据必须是有限的数值: {value!r}")
+    return repr(value)
+
+
+def _title_xml(title: Any) -> str:
+    """生成图表标题"""
+    return (
+        "<c:title><c:tx><c:rich><a:bodyPr/><a:lstStyle/>"
+        f'<a:p><a:r><a:rPr lang="zh-CN"/><a:t>{xml_text(title)}</a:t></a:r></a:p>'
+        '</c:rich></c:tx><c:overlay val="0"/></c:title>'
+    )
+
+
+def _axes_xml(horizontal: bool) -> str:
+    """生成分类轴和数值轴"""
+    category_position, value_position = ("l", "b") if horizontal else ("b", "l")
+    return (
+        f'<c:catAx><c:axId val="{_CATEGORY_AXIS_ID}"/>'
+        '<c:scaling><c:orientation val="minMax"/></c:scaling>'
+        f'<c:delete val="0"/><c:axPos val="{category_position}"/>'
+        f'<c:crossAx val="{_VALUE_AXIS_ID}"/></c:catAx>'
+        f'<c:valAx><c:axId val="{_VALUE_AXIS_ID}"/>'
+        '<c:scaling><c:orientation val="minMax"/></c:scaling>'
+        f'<c:delete val="0"/><c:axPos val="{value_position}"/>'
+        "<c:majorGridlines/>"
+        f'<c:crossAx val="{_CATEGORY_AXIS_ID}"/></c:valAx>'
+    )
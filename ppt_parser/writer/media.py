@@ -0,0 +1,200 @@
+"""
+图片媒体缓存
+按内容哈希识别图片，缓存读取并压缩好的图片数据，相同的图片只读取和压缩一次
+
+缓存分两层：
+    - 路径层：(路径, 修改时间, 文件大小) -> 内容哈希。文件没有变化时不需要重新读取；
+    - 内容层：(内容哈希, 压缩级别) -> 压缩结果。不同路径下内容相同的图片共享同一份数据。
+
+内容层按字节预算做LRU淘汰。超过 max_entry_bytes 的大图片不进入内容层，
+写入时直接从文件分块压缩，内存占用与图片大小无关。
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+from ..core.parse_cache import CacheStats
+from .zip_stream import CompressedEntry, deflate
+
+# 默认内存预算（64MB）
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# 默认可缓存的单个图片文件大小上限（8MB）
+DEFAULT_MAX_ENTRY_BYTES = 8 * 1024 * 1024
+
+# 路径层最多记录的文件数
+DEFAULT_MAX_PATHS = 16384
+
+# 计算大文件哈希时每次读取的字节数
+_CHUNK_SIZE = 1024 * 1024
+
+PathKey = Tuple[str, int, int]
+
+
+@dataclass(frozen=True)
+class MediaItem:
+    """
+    一个图片文件的加载结果
+
+    Attributes:
+        digest: 图片内容的SHA-256哈希（十六进制）
+        path: 图片文件路径
+        entry: 压缩后的数据，图片过大不缓存时为None，写入时从文件读取
+    """
+
+    digest: str
+    path: str
+    entry: Optional[CompressedEntry] = None
+
+
+class MediaCache:
+    """
+    进程级图片媒体缓存
+
+    示例:
+        ```python
+        cache = MediaCache(max_bytes=256 * 1024 * 1024)
+        with PPTXWriter("deck.pptx", media_cache=cache) as writer:
+            writer.add_slides(slides)
+        print(cache.stats.hit_rate)
+        ```
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES,
+        max_paths: int = DEFAULT_MAX_PATHS,
+    ):
+        """
+        初始化媒体缓存
+
+        Args:
+            max_bytes: 压缩数据的字节预算，超出时按最近最少使用的顺序淘汰
+            max_entry_bytes: 可缓存的单个图片文件大小上限
+            max_paths: 路径层最多记录的文件数
+
+        Raises:
+            ValueError: 参数无效
+        """
+        if max_bytes <= 0:
+            raise ValueError("缓存字节预算必须大于0")
+        if max_entry_bytes <= 0 or max_paths <= 0:
+            raise ValueError("缓存条目上限必须大于0")
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.max_paths = max_paths
+        self._paths: "OrderedDict[PathKey, str]" = OrderedDict()
+        self._entries: "OrderedDict[Tuple[str, int], CompressedEntry]" = OrderedDict()
+        self._size_bytes = 0
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """缓存统计信息的快照"""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+            )
+
+    def load(self, path: Union[str, os.PathLike], compresslevel: int) -> MediaItem:
+        """
+        加载图片文件
+
+        文件没有变化且内容已缓存时不读取文件；否则读取文件、计算哈希并压缩，
+        大小不超过 max_entry_bytes 的结果写入缓存。
+
+        Args:
+            path: 图片文件路径
+            compresslevel: 压缩级别（0-9）
+
+        Returns:
+            MediaItem: 内容哈希和压缩后的数据
+
+        Raises:
+            OSError: 无法读取文件
+        """
+        path = os.fspath(path)
+        stat = os.stat(path)
+        path_key = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            digest = self._paths.get(path_key)
+            if digest is not None:
+                self._paths.move_to_end(path_key)
+                entry = self._entries.get((digest, compresslevel))
+                if entry is not None:
+                    self._entries.move_to_end((digest, compresslevel))
+                    self._stats.hits += 1
+                    return MediaItem(digest, path, entry)
+            self._stats.misses += 1
+
+        if stat.st_size > self.max_entry_bytes:
+            if digest is None:
+                digest = _file_digest(path)
+                self._remember_path(path_key, digest)
+            return MediaItem(digest, path)
+
+        with open(path, "rb") as source:
+            data = source.read()
+        digest = hashlib.sha256(data).hexdigest()
+        self._remember_path(path_key, digest)
+
+        with self._lock:
+            # 其他路径下内容相同的图片可能已经压缩过
+            entry = self._entries.get((digest, compresslevel))
+        if entry is None:
+            entry = deflate(data, compresslevel)
+            self._store(digest, compresslevel, entry)
+        return MediaItem(digest, path, entry)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._paths.clear()
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember_path(self, path_key: PathKey, digest: str) -> None:
+        """记录文件对应的内容哈希"""
+        with self._lock:
+            self._paths[path_key] = digest
+            self._paths.move_to_end(path_key)
+            while len(self._paths) > self.max_paths:
+                self._paths.popitem(last=False)
+
+    def _store(self, digest: str, compresslevel: int, entry: CompressedEntry) -> None:
+        """写入压缩结果并按字节预算淘汰"""
+        key = (digest, compresslevel)
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            self._size_bytes += len(entry.data)
+            while self._size_bytes > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self._size_bytes -= len(dropped.data)
+                self._stats.evictions += 1
+
+
+def _file_digest(path: str) -> str:
+    """分块计算文件内容的SHA-256哈希"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# 进程级默认缓存，所有未指定 media_cache 的写入器共享
+default_media_cache = MediaCache()
@@ -0,0 +1,408 @@
+"""
+PPTX包中的固定部件
+包括主题、母版、版式等与文档内容无关的部件，以及按幻灯片数量生成的
+presentation.xml、关系文件和内容类型清单
+"""
+
+from typing import Any, Dict, Iterable, Iterator, Optional
+from xml.sax.saxutils import escape
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# 双引号属性值中需要额外转义的字符
+_ATTR_ENTITIES = {'"': "&quot;"}
+
+# XML 1.0 不允许的控制字符（保留制表符、换行和回车）
+_INVALID_XML_CHARS = dict.fromkeys(
+    [code for code in range(0x20) if code not in (0x09, 0x0A, 0x0D)] + [0xFFFE, 0xFFFF]
+)
+
+# 命名空间
+NS_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+NS_C = "http://schemas.openxmlformats.org/drawingml/2006/chart"
+NS_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+NS_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+# 关系类型
+REL_OFFICE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+REL_PACKAGE = "http://schemas.openxmlformats.org/package/2006/relationships"
+REL_DOCUMENT = f"{REL_OFFICE}/officeDocument"
+REL_CORE = f"{REL_PACKAGE}/metadata/core-properties"
+REL_APP = f"{REL_OFFICE}/extended-properties"
+REL_SLIDE = f"{REL_OFFICE}/slide"
+REL_SLIDE_MASTER = f"{REL_OFFICE}/slideMaster"
+REL_SLIDE_LAYOUT = f"{REL_OFFICE}/slideLayout"
+REL_THEME = f"{REL_OFFICE}/theme"
+REL_PRES_PROPS = f"{REL_OFFICE}/presProps"
+REL_VIEW_PROPS = f"{REL_OFFICE}/viewProps"
+REL_TABLE_STYLES = f"{REL_OFFICE}/tableStyles"
+REL_IMAGE = f"{REL_OFFICE}/image"
+REL_CHART = f"{REL_OFFICE}/chart"
+
+# 内容类型
+_CT_PML = "application/vnd.openxmlformats-officedocument.presentationml"
+_CT_DML = "application/vnd.openxmlformats-officedocument.drawingml"
+CT_PRESENTATION = f"{_CT_PML}.presentation.main+xml"
+CT_SLIDE = f"{_CT_PML}.slide+xml"
+CT_SLIDE_MASTER = f"{_CT_PML}.slideMaster+xml"
+CT_SLIDE_LAYOUT = f"{_CT_PML}.slideLayout+xml"
+CT_PRES_PROPS = f"{_CT_PML}.presProps+xml"
+CT_VIEW_PROPS = f"{_CT_PML}.viewProps+xml"
+CT_TABLE_STYLES = f"{_CT_PML}.tableStyles+xml"
+CT_THEME = "application/vnd.openxmlformats-officedocument.theme+xml"
+CT_CHART = f"{_CT_DML}.chart+xml"
+CT_CORE = "application/vnd.openxmlformats-package.core-properties+xml"
+CT_APP = "application/vnd.openxmlformats-officedocument.extended-properties+xml"
+CT_RELS = "application/vnd.openxmlformats-package.relationships+xml"
+
+# 支持的图片格式：扩展名 -> 内容类型
+IMAGE_CONTENT_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "gif": "image/gif",
+    "bmp": "image/bmp",
+    "tif": "image/tiff",
+    "tiff": "image/tiff",
+    "webp": "image/webp",
+}
+
+# 幻灯片尺寸（16:9），单位EMU
+SLIDE_WIDTH = 12192000
+SLIDE_HEIGHT = 6858000
+
+# 固定部件在包中的路径，按写入顺序排列
+THEME_PART = "ppt/theme/theme1.xml"
+SLIDE_MASTER_PART = "ppt/slideMasters/slideMaster1.xml"
+SLIDE_LAYOUT_PART = "ppt/slideLayouts/slideLayout1.xml"
+
+# 标题占位符的位置
+_TITLE_XFRM = (
+    '<a:xfrm><a:off x="838200" y="365125"/><a:ext cx="10515600" cy="1325563"/></a:xfrm>'
+)
+
+_EMPTY_GROUP = (
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+    '<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/>'
+    '<a:chOff x="0" y="0"/><a:chExt cx="0" cy="0"/></a:xfrm></p:grpSpPr>'
+)
+
+_TITLE_PLACEHOLDER = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="2" name="Title 1"/>'
+    '<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr>'
+    '<p:nvPr><p:ph type="title"/></p:nvPr></p:nvSpPr>'
+    "<p:spPr>{xfrm}</p:spPr>"
+    '<p:txBody><a:bodyPr/><a:lstStyle/><a:p><a:endParaRPr lang="zh-CN"/></a:p>'
+    "</p:txBody></p:sp>"
+)
+
+THEME_XML = (
+    XML_HEADER + f'<a:theme xmlns:a="{NS_A}" name="Office Theme">'
+    "<a:themeElements>"
+    '<a:clrScheme name="Office">'
+    '<a:dk1><a:sysClr val="windowText" lastClr="000000"/></a:dk1>'
+    '<a:lt1><a:sysClr val="window" lastClr="FFFFFF"/></a:lt1>'
+    '<a:dk2><a:srgbClr val="44546A"/></a:dk2>'
+    '<a:lt2><a:srgbClr val="E7E6E6"/></a:lt2>'
+    '<a:accent1><a:srgbClr val="4472C4"/></a:accent1>'
+    '<a:accent2><a:srgbClr val="ED7D31"/></a:accent2>'
+    '<a:accent3><a:srgbClr val="A5A5A5"/></a:accent3>'
+    '<a:accent4><a:srgbClr val="FFC000"/></a:accent4>'
+    '<a:accent5><a:srgbClr val="5B9BD5"/></a:accent5>'
+    '<a:accent6><a:srgbClr val="70AD47"/></a:accent6>'
+    '<a:hlink><a:srgbClr val="0563C1"/></a:hlink>'
+    '<a:folHlink><a:srgbClr val="954F72"/></a:folHlink>'
+    "</a:clrScheme>"
+    '<a:fontScheme name="Office">'
+    '<a:majorFont><a:latin typeface="Calibri Light"/><a:ea typeface=""/>'
+    '<a:cs typeface=""/></a:majorFont>'
+    '<a:minorFont><a:latin typeface="Calibri"/><a:ea typeface=""/>'
+    '<a:cs typeface=""/></a:minorFont>'
+    "</a:fontScheme>"
+    '<a:fmtScheme name="Office">'
+    "<a:fillStyleLst>"
+    '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    "</a:fillStyleLst>"
+    "<a:lnStyleLst>"
+    '<a:ln w="6350"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill></a:ln>'
+    '<a:ln w="12700"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill></a:ln>'
+    '<a:ln w="19050"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill></a:ln>'
+    "</a:lnStyleLst>"
+    "<a:effectStyleLst>"
+    "<a:effectStyle><a:effectLst/></a:effectStyle>"
+    "<a:effectStyle><a:effectLst/></a:effectStyle>"
+    "<a:effectStyle><a:effectLst/></a:effectStyle>"
+    "</a:effectStyleLst>"
+    "<a:bgFillStyleLst>"
+    '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    "</a:bgFillStyleLst>"
+    "</a:fmtScheme>"
+    "</a:themeElements>"
+    "</a:theme>"
+)
+
+SLIDE_MASTER_XML = (
+    XML_HEADER + f'<p:sldMaster xmlns:a="{NS_A}" xmlns:r="{NS_R}" xmlns:p="{NS_P}">'
+    "<p:cSld>"
+    '<p:bg><p:bgRef idx="1001"><a:schemeClr val="bg1"/></p:bgRef></p:bg>'
+    f"<p:spTree>{_EMPTY_GROUP}{_TITLE_PLACEHOLDER.format(xfrm=_TITLE_XFRM)}"
+    "</p:spTree>"
+    "</p:cSld>"
+    '<p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" accent1="accent1" '
+    'accent2="accent2" accent3="accent3" accent4="accent4" accent5="accent5" '
+    'accent6="accent6" hlink="hlink" folHlink="folHlink"/>'
+    '<p:sldLayoutIdLst><p:sldLayoutId id="2147483649" r:id="rId1"/>'
+    "</p:sldLayoutIdLst>"
+    "</p:sldMaster>"
+)
+
+SLIDE_LAYOUT_XML = (
+    XML_HEADER + f'<p:sldLayout xmlns:a="{NS_A}" xmlns:r="{NS_R}" xmlns:p="{NS_P}" '
+    'type="titleOnly" preserve="1">'
+    '<p:cSld name="Title Only">'
+    f"<p:spTree>{_EMPTY_GROUP}{_TITLE_PLACEHOLDER.format(xfrm='')}</p:spTree>"
+    "</p:cSld>"
+    "<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr>"
+    "</p:sldLayout>"
+)
+
+PRES_PROPS_XML = (
+    XML_HEADER
+    + f'<p:presentationPr xmlns:a="{NS_A}" xmlns:r="{NS_R}" xmlns:p="{NS_P}"/>'
+)
+
+VIEW_PROPS_XML = (
+    XML_HEADER + f'<p:viewPr xmlns:a="{NS_A}" xmlns:r="{NS_R}" xmlns:p="{NS_P}">'
+    '<p:normalViewPr><p:restoredLeft sz="15620"/><p:restoredTop sz="94660"/>'
+    "</p:normalViewPr>"
+    '<p:gridSpacing cx="72008" cy="72008"/>'
+    "</p:viewPr>"
+)
+
+TABLE_STYLES_XML = (
+    XML_HEADER + f'<a:tblStyleLst xmlns:a="{NS_A}" '
+    'def="{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}"/>'
+)
+
+APP_XML = (
+    XML_HEADER + "<Properties "
+    'xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties" '
+    'xmlns:vt="http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes">'
+    "<Application>ppt_parser</Application>"
+    "<PresentationFormat>On-screen Show (16:9)</PresentationFormat>"
+    "</Properties>"
+)
+
+
+def relationships_xml(relationships: Iterable[tuple]) -> str:
+    """
+    生成关系文件
+
+    Args:
+        relationships: (rId, 关系类型, 目标路径)序列
+
+    Returns:
+        str: 关系文件内容
+    """
+    parts = [XML_HEADER, f'<Relationships xmlns="{NS_RELS}">']
+    for rel_id, rel_type, target in relationships:
+        parts.append(
+            f'<Relationship Id="{rel_id}" Type="{rel_type}" '
+            f'Target="{escape(target, _ATTR_ENTITIES)}"/>'
+        )
+    parts.append("</Relationships>")
+    return "".join(parts)
+
+
+PACKAGE_RELS_XML = relationships_xml(
+    [
+        ("rId1", REL_DOCUMENT, "ppt/presentation.xml"),
+        ("rId2", REL_CORE, "docProps/core.xml"),
+        ("rId3", REL_APP, "docProps/app.xml"),
+    ]
+)
+
+SLIDE_MASTER_RELS_XML = relationships_xml(
+    [
+        ("rId1", REL_SLIDE_LAYOUT, "../slideLayouts/slideLayout1.xml"),
+        ("rId2", REL_THEME, "../theme/theme1.xml"),
+    ]
+)
+
+SLIDE_LAYOUT_RELS_XML = relationships_xml(
+    [("rId1", REL_SLIDE_MASTER, "../slideMasters/slideMaster1.xml")]
+)
+
+# presentation.xml.rels 中固定关系的数量，幻灯片的rId从其后开始编号
+_PRESENTATION_FIXED_RELS = (
+    (REL_SLIDE_MASTER, "slideMasters/slideMaster1.xml"),
+    (REL_THEME, "theme/theme1.xml"),
+    (REL_PRES_PROPS, "presProps.xml"),
+    (REL_VIEW_PROPS, "viewProps.xml"),
+    (REL_TABLE_STYLES, "tableStyles.xml"),
+)
+
+
+def core_xml(title: str, metadata: Optional[Dict[str, Any]]) -> str:
+    """
+    生成文档属性部件
+
+    Args:
+        title: 文档标题
+        metadata: 文档元数据，使用其中的author、created、modified和version，可以为None
+
+    Returns:
+        str: docProps/core.xml 的内容
+    """
+    parts = [
+        XML_HEADER,
+        "<cp:coreProperties "
+        'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:dcterms="http://purl.org/dc/terms/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">',
+        f"<dc:title>{xml_text(title)}</dc:title>",
+    ]
+    author = _metadata_text(metadata, "author")
+    if author:
+        parts.append(f"<dc:creator>{author}</dc:creator>")
+    version = _metadata_text(metadata, "version")
+    if version:
+        parts.append(f"<cp:version>{version}</cp:version>")
+    for name in ("created", "modified"):
+        value = _metadata_text(metadata, name)
+        if value:
+            parts.append(
+                f'<dcterms:{name} xsi:type="dcterms:W3CDTF">{value}</dcterms:{name}>'
+            )
+    parts.append("</cp:coreProperties>")
+    return "".join(parts)
+
+
+def presentation_xml(slide_count: int) -> Iterator[str]:
+    """
+    逐段生成presentation.xml
+
+    Args:
+        slide_count: 幻灯片数量
+
+    Yields:
+        str: 部件内容片段
+    """
+    yield XML_HEADER
+    yield (
+        f'<p:presentation xmlns:a="{NS_A}" xmlns:r="{NS_R}" xmlns:p="{NS_P}" '
+        'saveSubsetFonts="1">'
+        '<p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/>'
+        "</p:sldMasterIdLst>"
+    )
+    if slide_count:
+        yield "<p:sldIdLst>"
+        first = len(_PRESENTATION_FIXED_RELS) + 1
+        for index in range(slide_count):
+            yield f'<p:sldId id="{256 + index}" r:id="rId{first + index}"/>'
+        yield "</p:sldIdLst>"
+    yield (
+        f'<p:sldSz cx="{SLIDE_WIDTH}" cy="{SLIDE_HEIGHT}"/>'
+        '<p:notesSz cx="6858000" cy="9144000"/>'
+        "</p:presentation>"
+    )
+
+
+def presentation_rels_xml(slide_count: int) -> Iterator[str]:
+    """
+    逐段生成presentation.xml的关系文件
+
+    Args:
+        slide_count: 幻灯片数量
+
+    Yields:
+        str: 部件内容片段
+    """
+    yield XML_HEADER
+    yield f'<Relationships xmlns="{NS_RELS}">'
+    for index, (rel_type, target) in enumerate(_PRESENTATION_FIXED_RELS, 1):
+        yield f'<Relationship Id="rId{index}" Type="{rel_type}" Target="{target}"/>'
+    first = len(_PRESENTATION_FIXED_RELS) + 1
+    for index in range(slide_count):
+        yield (
+            f'<Relationship Id="rId{first + index}" Type="{REL_SLIDE}" '
+            f'Target="slides/slide{index + 1}.xml"/>'
+        )
+    yield "</Relationships>"
+
+
+def content_types_xml(
+    slide_count: int, chart_count: int, image_extensions: Iterable[str]
+) -> Iterator[str]:
+    """
+    逐段生成[Content_Types].xml
+
+    幻灯片和图表部件按编号连续命名，清单只需要它们的数量。
+
+    Args:
+        slide_count: 幻灯片数量
+        chart_count: 图表数量
+        image_extensions: 包中出现的图片扩展名
+
+    Yields:
+        str: 部件内容片段
+    """
+    yield XML_HEADER
+    yield f'<Types xmlns="{NS_TYPES}">'
+    yield f'<Default Extension="rels" ContentType="{CT_RELS}"/>'
+    yield '<Default Extension="xml" ContentType="application/xml"/>'
+    for extension in sorted(image_extensions):
+        yield (
+            f'<Default Extension="{extension}" '
+            f'ContentType="{IMAGE_CONTENT_TYPES[extension]}"/>'
+        )
+    for part, content_type in (
+        ("/ppt/presentation.xml", CT_PRESENTATION),
+        (f"/{SLIDE_MASTER_PART}", CT_SLIDE_MASTER),
+        (f"/{SLIDE_LAYOUT_PART}", CT_SLIDE_LAYOUT),
+        (f"/{THEME_PART}", CT_THEME),
+        ("/ppt/presProps.xml", CT_PRES_PROPS),
+        ("/ppt/viewProps.xml", CT_VIEW_PROPS),
+        ("/ppt/tableStyles.xml", CT_TABLE_STYLES),
+        ("/docProps/core.xml", CT_CORE),
+        ("/docProps/app.xml", CT_APP),
+    ):
+        yield f'<Override PartName="{part}" ContentType="{content_type}"/>'
+    for index in range(1, slide_count + 1):
+        yield (
+            f'<Override PartName="/ppt/slides/slide{index}.xml" '
+            f'ContentType="{CT_SLIDE}"/>'
+        )
+    for index in range(1, chart_count + 1):
+        yield (
+            f'<Override PartName="/ppt/charts/chart{index}.xml" '
+            f'ContentType="{CT_CHART}"/>'
+        )
+    yield "</Types>"
+
+
+def xml_text(value: Any) -> str:
+    """
+    将值转换为可以放入XML文本节点的字符串
+
+    XML 1.0 不允许的控制字符会被删除。
+    """
+    return escape(str(value).translate(_INVALID_XML_CHARS))
+
+
+def xml_attr(value: Any) -> str:
+    """将值转换为可以放入双引号属性值的字符串"""
+    return escape(str(value).translate(_INVALID_XML_CHARS), _ATTR_ENTITIES)
+
+
+def _metadata_text(metadata: Optional[Dict[str, Any]], name: str) -> str:
+    """读取元数据中的文本字段，不存在或为空时返回空字符串"""
+    value = (metadata or {}).get(name)
+    return xml_text(value) if value not in (None, "") else ""
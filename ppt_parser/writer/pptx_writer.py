@@ -0,0 +1,406 @@
+"""
+PPTX写入器
+将幻灯片逐个写入PPTX（OOXML）压缩包，内存占用与幻灯片数量无关
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Union,
+    cast,
+)
+from ..exceptions import WriteError
+from ..models.document import Slide
+from . import parts
+from .media import MediaCache, default_media_cache
+from .slide_renderer import LAYOUT_REL_ID, RenderedSlide, render_batch, render_slide
+from .zip_stream import CompressedEntry, ZipStreamWriter
+
+WriteTarget = Union[str, os.PathLike, BinaryIO]
+
+# 默认的压缩级别
+DEFAULT_COMPRESSLEVEL = 6
+
+# 并行渲染时每个任务包含的幻灯片数量
+DEFAULT_BATCH_SIZE = 16
+
+
+class PPTXWriter:
+    """
+    流式PPTX写入器
+
+    每调用一次 add_slide，幻灯片部件、它的关系文件以及引用的图表和图片就立即
+    写入压缩包，写入器只记录幻灯片和图表的数量、出现过的图片扩展名，
+    以及每个不同图片内容对应的媒体部件名称。
+    presentation.xml、它的关系文件和[Content_Types].xml 中的幻灯片条目
+    在 close 时按数量逐段生成；压缩包的中央目录由 ZipStreamWriter 转存到
+    临时文件，因此写出任意数量的幻灯片所需的内存都是固定的。所有条目使用
+    固定的时间戳，相同的文档总是生成相同的字节。
+
+    输出可以是文件路径，也可以是任何可写的二进制文件对象；不支持定位的流
+    （例如HTTP响应体）同样可以直接写入。
+
+    指定 workers 后，幻灯片按 batch_size 分批交给进程池渲染和压缩，
+    写入器按提交顺序取回结果并依次写入，输出与单进程写入的字节完全相同。
+    未写入的批次最多为工作进程数的2倍，内存占用仍然与幻灯片数量无关。
+
+    图片按内容哈希去重：内容相同的图片（即使路径不同）在包中只保存一份，
+    所有引用它的幻灯片关系都指向同一个媒体部件。读取和压缩好的图片数据保存
+    在进程级的 MediaCache 中，多次保存引用相同图片的文档时不会重复读取和压缩。
+
+    示例:
+        ```python
+        with PPTXWriter("deck.pptx", title="报告") as writer:
+            async for slide in engine.parse_stream(Path("deck.json")):
+                writer.add_slide(slide)
+        ```
+    """
+
+    def __init__(
+        self,
+        target: WriteTarget,
+        title: str = "",
+        metadata: Optional[Dict[str, Any]] = None,
+        media_root: Optional[Union[str, os.PathLike]] = None,
+        compresslevel: int = DEFAULT_COMPRESSLEVEL,
+        workers: int = 0,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        media_cache: Optional[MediaCache] = None,
+    ):
+        """
+        创建写入器并写入与幻灯片无关的固定部件
+
+        Args:
+            target: 输出文件路径或二进制文件对象（文件对象不会被关闭）
+            title: 文档标题
+            metadata: 文档元数据，写入文档属性
+            media_root: 图片元素中相对路径的基准目录，默认为当前工作目录
+            compresslevel: 压缩级别（0-9）
+            workers: 渲染幻灯片的工作进程数量，0表示在当前进程中渲染
+            batch_size: 并行渲染时每个任务包含的幻灯片数量
+            media_cache: 图片媒体缓存，默认使用进程级共享缓存
+
+        Raises:
+            ValueError: workers或batch_size无效
+            WriteError: 无法创建输出文件
+        """
+        if workers < 0:
+            raise ValueError(f"工作进程数量不能为负数: {workers}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size必须大于0: {batch_size}")
+        self.media_root = Path(media_root) if media_root is not None else None
+        self.compresslevel = compresslevel
+        self.slide_count = 0
+        self.chart_count = 0
+        self.image_count = 0
+        self._image_extensions: Set[str] = set()
+        self.media_cache = (
+            media_cache if media_cache is not None else default_media_cache
+        )
+        # 内容哈希 -> 媒体部件名称
+        self._media: Dict[str, str] = {}
+        self._closed = False
+        self.workers = workers
+        self.batch_size = batch_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._batch: List[Any] = []
+        self._pending: Deque[Future] = deque()
+        self._submitted = 0
+
+        self._file: BinaryIO
+        if isinstance(target, (str, os.PathLike)):
+            try:
+                self._file = open(target, "wb")  # pylint: disable=consider-using-with
+            except OSError as e:
+                raise WriteError(f"无法创建输出文件: {str(e)}") from e
+            self._path: Optional[Union[str, os.PathLike]] = target
+        else:
+            self._file = target
+            self._path = None
+        self._zip = ZipStreamWriter(self._file, compresslevel)
+
+        try:
+            self._write_part("_rels/.rels", parts.PACKAGE_RELS_XML)
+            self._write_part("docProps/core.xml", parts.core_xml(title, metadata))
+            self._write_part("docProps/app.xml", parts.APP_XML)
+            self._write_part(parts.THEME_PART, parts.THEME_XML)
+            self._write_part(parts.SLIDE_MASTER_PART, parts.SLIDE_MASTER_XML)
+            self._write_part(
+                "ppt/slideMasters/_rels/slideMaster1.xml.rels",
+                parts.SLIDE_MASTER_RELS_XML,
+            )
+            self._write_part(parts.SLIDE_LAYOUT_PART, parts.SLIDE_LAYOUT_XML)
+            self._write_part(
+                "ppt/slideLayouts/_rels/slideLayout1.xml.rels",
+                parts.SLIDE_LAYOUT_RELS_XML,
+            )
+            self._write_part("ppt/presProps.xml", parts.PRES_PROPS_XML)
+            self._write_part("ppt/viewProps.xml", parts.VIEW_PROPS_XML)
+            self._write_part("ppt/tableStyles.xml", parts.TABLE_STYLES_XML)
+        except BaseException:
+            self.abort()
+            raise
+        if workers:
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+
+    def add_slide(self, slide: Slide) -> None:
+        """
+        渲染并写入一个幻灯片
+
+        Args:
+            slide: 幻灯片对象
+
+        Raises:
+            WriteError: 幻灯片内容无法写出，或写入器已关闭。并行渲染时，
+                错误在写入出错的批次时（之后的 add_slide 或 close）抛出
+        """
+        self._check_open()
+        if self._executor is None:
+            self.write_rendered(render_slide(slide, self.slide_count))
+            return
+        # 紧凑文档的幻灯片视图引用整个文档，先转换为独立的幻灯片再传给工作进程
+        to_slide = getattr(slide, "to_slide", None)
+        self._batch.append(to_slide() if to_slide is not None else slide)
+        if len(self._batch) >= self.batch_size:
+            self._submit_batch()
+
+    def write_rendered(self, rendered: RenderedSlide) -> None:
+        """
+        写入一个已经渲染好的幻灯片
+
+        Args:
+            rendered: render_slide 或 render_batch 的结果
+
+        Raises:
+            WriteError: 图片无法读取，或写入器已关闭
+        """
+        self._check_open()
+        slide_number = self.slide_count + 1
+        relationships = [
+            (LAYOUT_REL_ID, parts.REL_SLIDE_LAYOUT, "../slideLayouts/slideLayout1.xml")
+        ]
+        # 先写入引用的部件，图片读取失败时不会留下引用了不存在部件的幻灯片
+        for relationship in rendered.relationships:
+            if relationship.kind == "chart":
+                self.chart_count += 1
+                name = f"chart{self.chart_count}.xml"
+                self._write_part(f"ppt/charts/{name}", relationship.payload)
+                relationships.append(
+                    (relationship.rel_id, parts.REL_CHART, f"../charts/{name}")
+                )
+            else:
+                # 图片的payload是文件路径，extension总是存在
+                name = self._add_image(
+                    cast(str, relationship.payload), cast(str, relationship.extension)
+                )
+                relationships.append(
+                    (relationship.rel_id, parts.REL_IMAGE, f"../media/{name}")
+                )
+
+        self._write_part(f"ppt/slides/slide{slide_number}.xml", rendered.xml)
+        self._write_part(
+            f"ppt/slides/_rels/slide{slide_number}.xml.rels",
+            parts.relationships_xml(relationships),
+        )
+        self.slide_count = slide_number
+
+    def add_slides(self, slides: Iterable[Slide]) -> None:
+        """
+        依次写入多个幻灯片
+
+        Args:
+            slides: 幻灯片序列或迭代器
+
+        Raises:
+            WriteError: 幻灯片内容无法写出
+        """
+        for slide in slides:
+            self.add_slide(slide)
+
+    def close(self) -> None:
+        """
+        写入presentation.xml、关系文件和内容类型清单，完成压缩包
+
+        Raises:
+            WriteError: 写入失败
+        """
+        if self._closed:
+            return
+        try:
+            self._drain()
+            self._write_part(
+                "ppt/presentation.xml", parts.presentation_xml(self.slide_count)
+            )
+            self._write_part(
+                "ppt/_rels/presentation.xml.rels",
+                parts.presentation_rels_xml(self.slide_count),
+            )
+            self._write_part(
+                "[Content_Types].xml",
+                parts.content_types_xml(
+                    self.slide_count, self.chart_count, self._image_extensions
+                ),
+            )
+            self._zip.close()
+        except BaseException:
+            self.abort()
+            raise
+        self._closed = True
+        self._shutdown_executor()
+        if self._path is not None:
+            self._file.close()
+
+    def abort(self) -> None:
+        """放弃写入：关闭输出，如果输出是由写入器创建的文件则将其删除"""
+        if self._closed:
+            return
+        self._closed = True
+        self._shutdown_executor()
+        try:
+            self._zip.abort()
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
+        if self._path is not None:
+            self._file.close()
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "PPTXWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _check_open(self) -> None:
+        """检查写入器是否仍可写入"""
+        if self._closed:
+            raise WriteError("写入器已关闭")
+
+    def _submit_batch(self) -> None:
+        """将当前批次交给进程池，未写入的批次过多时先写入最早的批次"""
+        if not self._batch or self._executor is None:
+            return
+        self._pending.append(
+            self._executor.submit(
+                render_batch, self._batch, self._submitted, self.compresslevel
+            )
+        )
+        self._submitted += len(self._batch)
+        self._batch = []
+        while len(self._pending) > 2 * self.workers:
+            self._write_next_batch()
+
+    def _write_next_batch(self) -> None:
+        """等待最早提交的批次并按顺序写入"""
+        for rendered in self._pending.popleft().result():
+            self.write_rendered(rendered)
+
+    def _drain(self) -> None:
+        """写入所有尚未写入的幻灯片"""
+        if self._executor is None:
+            return
+        self._submit_batch()
+        while self._pending:
+            self._write_next_batch()
+
+    def _shutdown_executor(self) -> None:
+        """关闭进程池，取消尚未开始的批次"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+        self._batch = []
+
+    def _write_part(
+        self, name: str, content: Union[str, Iterable[str], CompressedEntry]
+    ) -> None:
+        """写入一个XML部件，content可以是字符串、字符串片段的迭代器或压缩结果"""
+        try:
+            if isinstance(content, CompressedEntry):
+                self._zip.write_compressed(name, content)
+            elif isinstance(content, str):
+                self._zip.write(name, content.encode("utf-8"))
+            else:
+                self._zip.write_chunks(
+                    name, (chunk.encode("utf-8") for chunk in content)
+                )
+        except OSError as e:
+            raise WriteError(f"写入输出失败: {str(e)}", details={"part": name}) from e
+
+    def _add_image(self, path: str, extension: str) -> str:
+        """写入图片文件，内容已经写入过时直接复用，返回媒体部件名称"""
+        source = Path(path)
+        if self.media_root is not None and not source.is_absolute():
+            source = self.media_root / source
+        try:
+            item = self.media_cache.load(source, self.compresslevel)
+        except OSError as e:
+            raise WriteError(
+                f"无法读取图片文件: {path}",
+                slide_index=self.slide_count,
+                details={"reason": str(e)},
+            ) from e
+        name = self._media.get(item.digest)
+        if name is not None:
+            return name
+
+        self.image_count += 1
+        name = f"image{self.image_count}.{extension}"
+        part = f"ppt/media/{name}"
+        try:
+            if item.entry is not None:
+                self._zip.write_compressed(part, item.entry)
+            else:
+                with open(item.path, "rb") as image:
+                    self._zip.write_file(part, image)
+        except OSError as e:
+            raise WriteError(f"写入输出失败: {str(e)}", details={"part": part}) from e
+        self._media[item.digest] = name
+        self._image_extensions.add(extension)
+        return name
+
+
+def save_document(
+    document: Any,
+    target: WriteTarget,
+    media_root: Optional[Union[str, os.PathLike]] = None,
+    compresslevel: int = DEFAULT_COMPRESSLEVEL,
+    workers: int = 0,
+) -> None:
+    """
+    将文档保存为PPTX
+
+    Args:
+        document: Document 或 CompactDocument
+        target: 输出文件路径或二进制文件对象
+        media_root: 图片元素中相对路径的基准目录
+        compresslevel: 压缩级别（0-9）
+        workers: 渲染幻灯片的工作进程数量，0表示在当前进程中渲染
+
+    Raises:
+        WriteError: 写入失败
+    """
+    with PPTXWriter(
+        target,
+        title=document.title,
+        metadata=document.metadata,
+        media_root=media_root,
+        compresslevel=compresslevel,
+        workers=workers,
+    ) as writer:
+        writer.add_slides(document.slides)
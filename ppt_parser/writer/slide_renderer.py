@@ -0,0 +1,429 @@
+"""
+幻灯片渲染
+将单个幻灯片转换为幻灯片部件的XML
+
+渲染只依赖幻灯片本身：图片和图表在幻灯片内按顺序分配关系ID，图片文件的
+读取、媒体和图表部件的全局编号都由写入器完成。因此多个幻灯片可以在不同的
+进程中渲染和压缩（render_batch），再由写入器按顺序写入。
+"""
+
+import math
+import posixpath
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, cast
+from ..exceptions import WriteError
+from ..models.document import Element, Slide, Style
+from .charts import chart_xml
+from .parts import IMAGE_CONTENT_TYPES, NS_A, NS_P, NS_R, XML_HEADER, xml_attr, xml_text
+from .zip_stream import CompressedEntry, deflate
+
+# 每个位置单位对应的EMU数
+EMU_PER_UNIT = {"px": 9525, "pt": 12700, "in": 914400, "cm": 360000}
+
+# 没有指定大小时各类元素的默认大小（px）
+DEFAULT_SIZES = {
+    "text": (400, 50),
+    "image": (200, 150),
+    "shape": (200, 100),
+    "chart": (480, 300),
+}
+
+# 形状元素支持的预设形状
+SHAPE_PRESETS = frozenset(
+    [
+        "rect",
+        "roundRect",
+        "ellipse",
+        "triangle",
+        "rtTriangle",
+        "diamond",
+        "parallelogram",
+        "trapezoid",
+        "pentagon",
+        "hexagon",
+        "octagon",
+        "star5",
+        "rightArrow",
+        "leftArrow",
+        "upArrow",
+        "downArrow",
+        "chevron",
+        "heart",
+        "cloud",
+        "can",
+        "cube",
+        "line",
+    ]
+)
+
+# 幻灯片关系中rId1固定指向版式
+LAYOUT_REL_ID = "rId1"
+
+_SLIDE_OPEN = (
+    XML_HEADER + f'<p:sld xmlns:a="{NS_A}" xmlns:r="{NS_R}" xmlns:p="{NS_P}"><p:cSld>'
+)
+_TREE_OPEN = (
+    "<p:spTree>"
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+    '<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/>'
+    '<a:chOff x="0" y="0"/><a:chExt cx="0" cy="0"/></a:xfrm></p:grpSpPr>'
+)
+_SLIDE_CLOSE = (
+    "</p:spTree></p:cSld><p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>"
+)
+_CHART_URI = "http://schemas.openxmlformats.org/drawingml/2006/chart"
+_HEX_COLOR = re.compile(r"#[0-9A-Fa-f]{6}")
+
+
+@dataclass
+class SlideRelationship:
+    """
+    幻灯片引用的外部部件
+
+    Attributes:
+        rel_id: 关系ID
+        kind: 部件类型，"image"或"chart"
+        payload: 图片为文件路径，图表为图表部件的XML（或其压缩结果）
+        extension: 图片的扩展名（小写）
+    """
+
+    rel_id: str
+    kind: str
+    payload: Union[str, CompressedEntry]
+    extension: Optional[str] = None
+
+
+@dataclass
+class RenderedSlide:
+    """
+    渲染后的幻灯片
+
+    Attributes:
+        xml: 幻灯片部件的XML（或其压缩结果）
+        relationships: 幻灯片引用的图片和图表，按关系ID顺序排列
+    """
+
+    xml: Union[str, CompressedEntry]
+    relationships: List[SlideRelationship] = field(default_factory=list)
+
+
+def render_slide(slide: Slide, slide_index: int = 0) -> RenderedSlide:
+    """
+    渲染单个幻灯片
+
+    Args:
+        slide: 幻灯片对象
+        slide_index: 幻灯片序号，用于错误信息
+
+    Returns:
+        RenderedSlide: 幻灯片XML及其引用的部件
+
+    Raises:
+        WriteError: 元素内容无法写出
+    """
+    relationships: List[SlideRelationship] = []
+    parts = [_SLIDE_OPEN]
+    background = _background_xml(slide.background)
+    if background:
+        parts.append(background)
+    parts.append(_TREE_OPEN)
+    parts.append(_title_xml(slide.title))
+
+    # 组为1，标题为2，元素从3开始编号
+    for index, element in enumerate(slide.elements):
+        shape_id = index + 3
+        try:
+            parts.append(_element_xml(element, shape_id, relationships))
+        except WriteError as e:
+            e.slide_index = slide_index
+            e.add_detail("slide_index", slide_index)
+            e.add_detail("element_index", index)
+            raise
+
+    parts.append(_SLIDE_CLOSE)
+    return RenderedSlide("".join(parts), relationships)
+
+
+def render_batch(
+    slides: Sequence[Slide], first_index: int, compresslevel: int
+) -> List[RenderedSlide]:
+    """
+    渲染并压缩一批幻灯片
+
+    在工作进程中执行，幻灯片XML和图表部件都以压缩后的形式返回，写入器只需
+    按顺序写入压缩包。压缩结果与写入器直接压缩的字节完全相同。
+
+    Args:
+        slides: 幻灯片列表
+        first_index: 第一个幻灯片的序号
+        compresslevel: 压缩级别（0-9）
+
+    Returns:
+        List[RenderedSlide]: 按输入顺序排列的渲染结果
+
+    Raises:
+        WriteError: 元素内容无法写出
+    """
+    results = []
+    for offset, slide in enumerate(slides):
+        rendered = render_slide(slide, first_index + offset)
+        # render_slide 的结果还没有压缩，XML都是字符串
+        rendered.xml = deflate(cast(str, rendered.xml).encode("utf-8"), compresslevel)
+        for relationship in rendered.relationships:
+            if relationship.kind == "chart":
+                relationship.payload = deflate(
+                    cast(str, relationship.payload).encode("utf-8"), compresslevel
+                )
+        results.append(rendered)
+    return results
+
+
+def _element_xml(
+    element: Element, shape_id: int, relationships: List[SlideRelationship]
+) -> str:
+    """渲染单个元素"""
+    style = element.style
+    if element.type == "chart":
+        rel_id = f"rId{len(relationships) + 2}"
+        relationships.append(
+            SlideRelationship(rel_id, "chart", chart_xml(element.content))
+        )
+        # 图形框使用p:xfrm，不支持旋转
+        return _chart_frame_xml(shape_id, _bounds_xml(element, "p:xfrm"), rel_id)
+
+    rotation = _number(style.rotation or 0, "旋转角度")
+    rot = f' rot="{xml_attr(round(rotation * 60000))}"' if rotation else ""
+    xfrm = _bounds_xml(element, "a:xfrm", rot)
+    if element.type == "image":
+        rel_id = _add_image(element.content, relationships)
+        return _picture_xml(shape_id, xfrm, rel_id, style)
+    if element.type == "shape":
+        preset, text = _shape_content(element.content)
+        return _shape_xml(shape_id, f"Shape {shape_id}", xfrm, preset, text, style)
+    text = "" if element.content is None else element.content
+    return _shape_xml(shape_id, f"TextBox {shape_id}", xfrm, None, text, style)
+
+
+def _bounds_xml(element: Element, tag: str, attributes: str = "") -> str:
+    """元素的位置和大小"""
+    position = element.position
+    scale = EMU_PER_UNIT.get(position.unit)
+    if scale is None:
+        raise WriteError(f"不支持的位置单位: {position.unit!r}")
+    size = element.size or {}
+    default_width, default_height = DEFAULT_SIZES[element.type]
+    if "width" in size:
+        width = _number(size["width"], "宽度") * scale
+    else:
+        width = default_width * EMU_PER_UNIT["px"]
+    if "height" in size:
+        height = _number(size["height"], "高度") * scale
+    else:
+        height = default_height * EMU_PER_UNIT["px"]
+    x = round(_number(position.x, "X坐标") * scale)
+    y = round(_number(position.y, "Y坐标") * scale)
+
+    return (
+        f'<{tag}{attributes}><a:off x="{xml_attr(x)}" y="{xml_attr(y)}"/>'
+        f'<a:ext cx="{xml_attr(max(round(width), 0))}" '
+        f'cy="{xml_attr(max(round(height), 0))}"/></{tag}>'
+    )
+
+
+def _shape_xml(
+    shape_id: int,
+    name: str,
+    xfrm: str,
+    preset: Optional[str],
+    text: Any,
+    style: Style,
+) -> str:
+    """渲染文本框（preset为None）或预设形状"""
+    if preset is None:
+        non_visual = '<p:cNvSpPr txBox="1"/>'
+        geometry = "rect"
+        fill = _fill_xml(style.background_color, style.opacity) or "<a:noFill/>"
+    else:
+        non_visual = "<p:cNvSpPr/>"
+        geometry = preset
+        fill = _fill_xml(style.background_color, style.opacity) or _fill_xml(
+            None, style.opacity, scheme="accent1"
+        )
+    return (
+        f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="{name}"/>{non_visual}'
+        f"<p:nvPr/></p:nvSpPr>"
+        f'<p:spPr>{xfrm}<a:prstGeom prst="{geometry}"><a:avLst/></a:prstGeom>{fill}'
+        "</p:spPr>"
+        f"{_text_body_xml(text, style)}</p:sp>"
+    )
+
+
+def _text_body_xml(text: Any, style: Style) -> str:
+    """渲染文本内容，每行一个段落"""
+    run_properties = _run_properties_xml(style)
+    paragraphs = []
+    for line in str(text).split("\n"):
+        if line:
+            paragraphs.append(
+                f"<a:p><a:r>{run_properties}<a:t>{xml_text(line)}</a:t></a:r></a:p>"
+            )
+        else:
+            paragraphs.append('<a:p><a:endParaRPr lang="zh-CN"/></a:p>')
+    return (
+        '<p:txBody><a:bodyPr wrap="square" rtlCol="0"/><a:lstStyle/>'
+        f"{''.join(paragraphs)}</p:txBody>"
+    )
+
+
+def _run_properties_xml(style: Style) -> str:
+    """文字格式"""
+    attributes = ['lang="zh-CN"']
+    if style.font_size:
+        font_size = style.font_size
+        if isinstance(font_size, bool) or not isinstance(font_size, int):
+            raise WriteError(f"无效的字体大小: {font_size!r}")
+        attributes.append(f'sz="{xml_attr(font_size * 100)}"')
+    if style.bold:
+        attributes.append('b="1"')
+    if style.italic:
+        attributes.append('i="1"')
+    if style.underline:
+        attributes.append('u="sng"')
+
+    children = _fill_xml(style.color, style.opacity)
+    if style.font_family:
+        typeface = xml_attr(style.font_family)
+        children += f'<a:latin typeface="{typeface}"/><a:ea typeface="{typeface}"/>'
+    if children:
+        return f"<a:rPr {' '.join(attributes)}>{children}</a:rPr>"
+    return f"<a:rPr {' '.join(attributes)}/>"
+
+
+def _fill_xml(
+    color: Optional[str], opacity: Optional[float], scheme: Optional[str] = None
+) -> str:
+    """纯色填充，color和scheme都为空时返回空字符串"""
+    if color:
+        tag, value = "a:srgbClr", _color_value(color)
+    elif scheme:
+        tag, value = "a:schemeClr", scheme
+    else:
+        return ""
+    value = xml_attr(value)
+    if opacity is not None and _number(opacity, "透明度") < 1:
+        alpha = f'<a:alpha val="{xml_attr(round(opacity * 100000))}"/>'
+        return f'<a:solidFill><{tag} val="{value}">{alpha}</{tag}></a:solidFill>'
+    return f'<a:solidFill><{tag} val="{value}"/></a:solidFill>'
+
+
+def _color_value(color: Any) -> str:
+    """
+    检查"#RRGGBB"形式的颜色，返回大写的十六进制值
+
+    以受信任模式构建的文档跳过了模型的格式约束，写入前需要重新检查，
+    否则颜色中的引号等字符会破坏XML。
+
+    Raises:
+        WriteError: 颜色格式无效
+    """
+    if not isinstance(color, str) or not _HEX_COLOR.fullmatch(color):
+        raise WriteError(f"无效的颜色: {color!r}")
+    return color[1:].upper()
+
+
+def _number(value: Any, name: str) -> Union[int, float]:
+    """
+    检查写入XML的数值
+
+    Raises:
+        WriteError: 不是有限的数值
+    """
+    if (
+        isinstance(value, bool)
+        or not isinstance(value, (int, float))
+        or not math.isfinite(value)
+    ):
+        raise WriteError(f"无效的{name}: {value!r}")
+    return value
+
+
+def _picture_xml(shape_id: int, xfrm: str, rel_id: str, style: Style) -> str:
+    """渲染图片"""
+    alpha = ""
+    if style.opacity is not None and _number(style.opacity, "透明度") < 1:
+        alpha = f'<a:alphaModFix amt="{xml_attr(round(style.opacity * 100000))}"/>'
+    return (
+        f'<p:pic><p:nvPicPr><p:cNvPr id="{shape_id}" name="Picture {shape_id}"/>'
+        '<p:cNvPicPr><a:picLocks noChangeAspect="1"/></p:cNvPicPr><p:nvPr/>'
+        "</p:nvPicPr>"
+        f'<p:blipFill><a:blip r:embed="{rel_id}">{alpha}</a:blip>'
+        "<a:stretch><a:fillRect/></a:stretch></p:blipFill>"
+        f'<p:spPr>{xfrm}<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></p:spPr>'
+        "</p:pic>"
+    )
+
+
+def _chart_frame_xml(shape_id: int, xfrm: str, rel_id: str) -> str:
+    """渲染引用图表部件的图形框"""
+    return (
+        "<p:graphicFrame><p:nvGraphicFramePr>"
+        f'<p:cNvPr id="{shape_id}" name="Chart {shape_id}"/>'
+        "<p:cNvGraphicFramePr/><p:nvPr/></p:nvGraphicFramePr>"
+        f"{xfrm}"
+        f'<a:graphic><a:graphicData uri="{_CHART_URI}">'
+        f'<c:chart xmlns:c="{_CHART_URI}" r:id="{rel_id}"/>'
+        "</a:graphicData></a:graphic></p:graphicFrame>"
+    )
+
+
+def _add_image(content: Any, relationships: List[SlideRelationship]) -> str:
+    """登记图片引用，返回关系ID"""
+    path = content.get("path") if isinstance(content, dict) else content
+    if not isinstance(path, str) or not path:
+        raise WriteError("图片内容必须是文件路径")
+    extension = posixpath.splitext(path.replace("\\", "/"))[1][1:].lower()
+    if extension not in IMAGE_CONTENT_TYPES:
+        raise WriteError(f"不支持的图片格式: {path}")
+
+    rel_id = f"rId{len(relationships) + 2}"
+    relationships.append(SlideRelationship(rel_id, "image", path, extension))
+    return rel_id
+
+
+def _shape_content(content: Any) -> Tuple[str, Any]:
+    """读取形状元素的预设形状和文本"""
+    if isinstance(content, dict):
+        preset = content.get("shape", "rect")
+        text = content.get("text", "")
+    else:
+        preset = "rect"
+        text = "" if content is None else content
+    if preset not in SHAPE_PRESETS:
+        raise WriteError(f"不支持的形状类型: {preset}")
+    return preset, "" if text is None else text
+
+
+def _title_xml(title: str) -> str:
+    """渲染标题占位符"""
+    return (
+        '<p:sp><p:nvSpPr><p:cNvPr id="2" name="Title 1"/>'
+        '<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr>'
+        '<p:nvPr><p:ph type="title"/></p:nvPr></p:nvSpPr><p:spPr/>'
+        "<p:txBody><a:bodyPr/><a:lstStyle/>"
+        f'<a:p><a:r><a:rPr lang="zh-CN"/><a:t>{xml_text(title)}</a:t></a:r></a:p>'
+        "</p:txBody></p:sp>"
+    )
+
+
+def _background_xml(background: Optional[Dict[str, Any]]) -> str:
+    """渲染幻灯片背景，只支持{"color": "#RRGGBB"}形式的纯色背景"""
+    if not background or "color" not in background:
+        return ""
+    color = background["color"]
+    if not isinstance(color, str) or not _HEX_COLOR.fullmatch(color):
+        raise WriteError(f"无效的背景颜色: {color!r}")
+    return (
+        f'<p:bg><p:bgPr><a:solidFill><a:srgbClr val="{xml_attr(color[1:].upper())}"/>'
+        "</a:solidFill><a:effectLst/></p:bgPr></p:bg>"
+    )
@@ -0,0 +1,314 @@
+"""
+只追加的ZIP写入器
+按顺序写入条目，只向输出流追加数据，不需要定位，内存占用不随条目数量增长
+
+标准库的 zipfile 为每个条目保留一个 ZipInfo 对象用于最后写出中央目录，
+条目很多时这部分内存会持续增长。这里在写入每个条目时就生成它的中央目录
+记录，超过一定大小后转存到临时文件中，关闭时再复制到输出末尾。
+
+每个条目先在内存中完整压缩，本地文件头中直接写入CRC和大小，不使用数据
+描述符，兼容性最好；图片等大文件先分块压缩到临时文件中。条目数超过65535
+或偏移量超过4GB时自动使用ZIP64格式。
+"""
+
+import shutil
+import struct
+import tempfile
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable
+
+# 压缩方法
+DEFLATED = 8
+
+# 所有条目使用固定的修改时间（1980-01-01 00:00:00），相同的输入生成相同的字节
+_DOS_TIME = 0
+_DOS_DATE = (0 << 9) | (1 << 5) | 1
+
+# 中央目录在内存中保留的最大字节数，超过后转存到临时文件
+DIRECTORY_SPOOL_SIZE = 1024 * 1024
+
+# 分块压缩文件时每次读取的字节数
+_CHUNK_SIZE = 64 * 1024
+
+# 超过这些值时需要使用ZIP64格式
+_MAX_ENTRIES = 0xFFFF
+_MAX_SIZE = 0xFFFFFFFF
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+_ZIP64_END_RECORD = struct.Struct("<IQHHIIQQQQ")
+_ZIP64_LOCATOR = struct.Struct("<IIQI")
+
+# 通用标志位：文件名使用UTF-8编码
+_FLAG_UTF8 = 0x0800
+
+
+@dataclass(frozen=True)
+class CompressedEntry:
+    """
+    已经压缩好的条目数据
+
+    Attributes:
+        data: deflate 压缩后的数据
+        crc: 原始数据的CRC32
+        size: 原始数据的字节数
+    """
+
+    data: bytes
+    crc: int
+    size: int
+
+
+def deflate(data: bytes, compresslevel: int) -> CompressedEntry:
+    """
+    压缩一个条目的数据
+
+    可以在其他进程中调用，结果交给 ZipStreamWriter.write_compressed 写入。
+    相同的数据和压缩级别总是得到相同的字节。
+
+    Args:
+        data: 原始数据
+        compresslevel: 压缩级别（0-9）
+
+    Returns:
+        CompressedEntry: 压缩后的条目数据
+    """
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+    return CompressedEntry(
+        compressor.compress(data) + compressor.flush(), zlib.crc32(data), len(data)
+    )
+
+
+class ZipStreamWriter:
+    """
+    只追加的ZIP写入器
+
+    示例:
+        ```python
+        with ZipStreamWriter(output) as archive:
+            archive.write("a.xml", b"<a/>")
+        ```
+    """
+
+    def __init__(self, fileobj: BinaryIO, compresslevel: int = 6):
+        """
+        初始化写入器
+
+        Args:
+            fileobj: 可写的二进制输出流，不需要支持定位
+            compresslevel: 压缩级别（0-9）
+        """
+        self.fileobj = fileobj
+        self.compresslevel = compresslevel
+        self.entry_count = 0
+        self._offset = 0
+        self._directory = (
+            tempfile.SpooledTemporaryFile(  # pylint: disable=consider-using-with
+                max_size=DIRECTORY_SPOOL_SIZE
+            )
+        )
+        self._closed = False
+
+    def write(self, name: str, data: bytes) -> None:
+        """
+        压缩并写入一个条目
+
+        Args:
+            name: 条目名称
+            data: 条目数据
+        """
+        self.write_compressed(name, deflate(data, self.compresslevel))
+
+    def write_compressed(self, name: str, entry: CompressedEntry) -> None:
+        """
+        写入一个已经压缩好的条目
+
+        Args:
+            name: 条目名称
+            entry: deflate 的结果
+        """
+        self._write_header(name, entry.crc, len(entry.data), entry.size)
+        self._write(entry.data)
+
+    def write_file(self, name: str, source: BinaryIO) -> None:
+        """
+        分块压缩并写入一个文件
+
+        Args:
+            name: 条目名称
+            source: 打开的二进制文件
+        """
+        self.write_chunks(name, iter(lambda: source.read(_CHUNK_SIZE), b""))
+
+    def write_chunks(self, name: str, chunks: Iterable[bytes]) -> None:
+        """
+        逐块压缩并写入一个条目
+
+        压缩结果先写入临时文件（较小时保存在内存中），得到大小和CRC之后
+        再写入输出，内存占用与条目大小无关。
+
+        Args:
+            name: 条目名称
+            chunks: 条目数据的分块
+        """
+        compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, -15)
+        crc = 0
+        size = 0
+        with tempfile.SpooledTemporaryFile(max_size=DIRECTORY_SPOOL_SIZE) as spool:
+            for chunk in chunks:
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                spool.write(compressor.compress(chunk))
+            spool.write(compressor.flush())
+
+            compressed_size = spool.tell()
+            spool.seek(0)
+            self._write_header(name, crc, compressed_size, size)
+            self._offset += compressed_size
+            shutil.copyfileobj(spool, self.fileobj, _CHUNK_SIZE)
+
+    def close(self) -> None:
+        """写入中央目录和结束记录"""
+        if self._closed:
+            return
+        self._closed = True
+        directory_offset = self._offset
+        directory_size = self._directory.tell()
+        self._directory.seek(0)
+        shutil.copyfileobj(self._directory, self.fileobj, _CHUNK_SIZE)
+        self._directory.close()
+        self._offset += directory_size
+
+        entries = self.entry_count
+        if (
+            entries > _MAX_ENTRIES
+            or directory_offset >= _MAX_SIZE
+            or directory_size >= _MAX_SIZE
+        ):
+            zip64_offset = self._offset
+            self._write(
+                _ZIP64_END_RECORD.pack(
+                    0x06064B50,
+                    _ZIP64_END_RECORD.size - 12,
+                    45,
+                    45,
+                    0,
+                    0,
+                    entries,
+                    entries,
+                    directory_size,
+                    directory_offset,
+                )
+            )
+            self._write(_ZIP64_LOCATOR.pack(0x07064B50, 0, zip64_offset, 1))
+            entries = min(entries, _MAX_ENTRIES)
+            directory_offset = min(directory_offset, _MAX_SIZE)
+            directory_size = min(directory_size, _MAX_SIZE)
+
+        self._write(
+            _END_RECORD.pack(
+                0x06054B50,
+                0,
+                0,
+                entries,
+                entries,
+                directory_size,
+                directory_offset,
+                0,
+            )
+        )
+        flush = getattr(self.fileobj, "flush", None)
+        if flush is not None:
+            flush()
+
+    def abort(self) -> None:
+        """放弃写入，释放临时文件（输出流中已写入的数据不会撤回）"""
+        self._closed = True
+        self._directory.close()
+
+    def __enter__(self) -> "ZipStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _write(self, data: bytes) -> None:
+        """向输出追加数据"""
+        self.fileobj.write(data)
+        self._offset += len(data)
+
+    def _write_header(
+        self, name: str, crc: int, compressed_size: int, size: int
+    ) -> None:
+        """写入本地文件头，并记录对应的中央目录条目"""
+        if self._closed:
+            raise ValueError("ZIP写入器已关闭")
+        encoded = name.encode("utf-8")
+        flags = 0 if encoded.isascii() else _FLAG_UTF8
+        offset = self._offset
+
+        large = compressed_size >= _MAX_SIZE or size >= _MAX_SIZE
+        local_extra = b""
+        if large:
+            local_extra = struct.pack("<HHQQ", 1, 16, size, compressed_size)
+        version = 45 if large or offset >= _MAX_SIZE else 20
+
+        self._write(
+            _LOCAL_HEADER.pack(
+                0x04034B50,
+                version,
+                flags,
+                DEFLATED,
+                _DOS_TIME,
+                _DOS_DATE,
+                crc,
+                _MAX_SIZE if large else compressed_size,
+                _MAX_SIZE if large else size,
+                len(encoded),
+                len(local_extra),
+            )
+        )
+        self._write(encoded)
+        self._write(local_extra)
+
+        # 中央目录中的ZIP64扩展字段只包含超出范围的值，顺序固定
+        zip64_values = []
+        if large:
+            zip64_values += [size, compressed_size]
+        if offset >= _MAX_SIZE:
+            zip64_values.append(offset)
+        central_extra = b""
+        if zip64_values:
+            central_extra = struct.pack(
+                f"<HH{len(zip64_values)}Q", 1, 8 * len(zip64_values), *zip64_values
+            )
+
+        self._directory.write(
+            _CENTRAL_HEADER.pack(
+                0x02014B50,
+                version,
+                version,
+                flags,
+                DEFLATED,
+                _DOS_TIME,
+                _DOS_DATE,
+                crc,
+                _MAX_SIZE if large else compressed_size,
+                _MAX_SIZE if large else size,
+                len(encoded),
+                len(central_extra),
+                0,
+                0,
+                0,
+                0,
+                min(offset, _MAX_SIZE),
+            )
+        )
+        self._directory.write(encoded)
+        self._directory.write(central_extra)
+        self.entry_count += 1